@@ -0,0 +1,2 @@
+#! /bin/bash
+python manage.py benchmark --seed ${BENCHMARK_BASELINE:+--compare benchmarks/${BENCHMARK_BASELINE}.json}
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+asyncviews.py: File, containing async views for a project.
+"""
+
+
+from typing import Any, Callable, ClassVar, Optional
+from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed
+from asgiref.sync import sync_to_async
+from django.views import View
+from rest_framework import viewsets
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.query import QuerySet
+from rest_framework.response import Response
+from rest_framework.exceptions import NotFound
+from django.views.decorators.csrf import csrf_exempt
+
+
+class AsyncViewSetView(View):
+    """
+    AsyncViewSetView: Serves read-only action of a viewset as async view under ASGI.
+    Authentication, permissions, filters, pagination, serializers and exception handling are the
+    ones of viewset_class, only the handler of the action is a coroutine, so the worker serves
+    other requests while the action waits for database. Requests with other methods are passed to
+    the fallback view, e.g. create action of the same route.
+    """
+
+    viewset_class: ClassVar[Optional[type[viewsets.GenericViewSet]]] = None
+    action: ClassVar[Optional[str]] = None
+    fallback: ClassVar[Optional[Callable[..., HttpResponse]]] = None
+
+    @classmethod
+    def as_view(cls, **initkwargs: dict) -> Callable[..., Any]:
+        """
+        as_view: Returns view, that is exempt from CSRF checks as views of DRF, because requests
+        are authenticated with JWT in the header instead of session cookie.
+
+        Returns:
+            Callable[..., Any]: View function.
+        """
+
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def get_viewset(self, request: HttpRequest, *args: tuple, **kwargs: dict) -> Any:
+        """
+        get_viewset: Returns viewset instance, that is set up for the action.
+
+        Args:
+            request (HttpRequest): Request instance.
+
+        Returns:
+            Any: Viewset instance.
+        """
+
+        viewset: Any = self.viewset_class(
+            action_map={request.method.lower(): self.action},
+            args=args,
+            kwargs=kwargs,
+            format_kwarg=None,
+        )
+        viewset.headers = viewset.default_response_headers
+        viewset.request = viewset.initialize_request(request, *args, **kwargs)
+        return viewset
+
+    async def get(self, request: HttpRequest, *args: tuple, **kwargs: dict) -> HttpResponse:
+        """
+        get: Runs the action of the viewset.
+
+        Args:
+            request (HttpRequest): Request instance.
+
+        Returns:
+            HttpResponse: Rendered response.
+        """
+
+        viewset: Any = self.get_viewset(request, *args, **kwargs)
+
+        try:
+            await sync_to_async(viewset.initial)(viewset.request, *args, **kwargs)
+            response: Response = await getattr(self, self.action)(viewset, viewset.request)
+        except Exception as error:
+            response = await sync_to_async(viewset.handle_exception)(error)
+
+        response = viewset.finalize_response(viewset.request, response, *args, **kwargs)
+        return response.render()
+
+    async def post(self, request: HttpRequest, *args: tuple, **kwargs: dict) -> HttpResponse:
+        """
+        post: Passes request to the fallback view.
+
+        Args:
+            request (HttpRequest): Request instance.
+
+        Returns:
+            HttpResponse: Response of the fallback view or HTTP 405 if there is no fallback view.
+        """
+
+        if self.fallback is None:
+            return HttpResponseNotAllowed(['GET', 'HEAD', 'OPTIONS'])
+
+        response: HttpResponse = await sync_to_async(self.fallback)(request, *args, **kwargs)
+
+        if hasattr(response, 'render'):
+            response = await sync_to_async(response.render)()
+
+        return response
+
+    put = patch = delete = post
+
+    async def aget_object(self, viewset: Any) -> Any:
+        """
+        aget_object: Returns the resource of detail action with async ORM.
+
+        Args:
+            viewset (Any): Viewset instance.
+
+        Raises:
+            NotFound: Raises when the resource does not exist.
+
+        Returns:
+            Any: Resource instance.
+        """
+
+        queryset: QuerySet = viewset.filter_queryset(viewset.get_queryset())
+        lookup: str = viewset.lookup_url_kwarg or viewset.lookup_field
+
+        try:
+            instance: Any = await queryset.aget(**{viewset.lookup_field: viewset.kwargs[lookup]})
+        except (ObjectDoesNotExist, ValueError):
+            raise NotFound()
+
+        await sync_to_async(viewset.check_object_permissions)(viewset.request, instance)
+        return instance
+
+    async def apaginate(self, viewset: Any, queryset: QuerySet) -> Response:
+        """
+        apaginate: Returns page of the queryset, that is read and serialized in a worker thread.
+
+        Args:
+            viewset (Any): Viewset instance.
+            queryset (QuerySet): Resources.
+
+        Returns:
+            Response: HTTP 200 with page.
+        """
+
+        def paginate() -> Response:
+            page: list = viewset.paginate_queryset(queryset)
+            return viewset.get_paginated_response(viewset.get_serializer(page, many=True).data)
+
+        return await sync_to_async(paginate)()
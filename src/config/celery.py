@@ -4,7 +4,8 @@ celery.py: File, containing celery app for an car_salon_activities project.
 
 
 import os
-from celery import Celery
+from celery import Task, Celery, signals
+from config.dbrouters import replica_router
 
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
@@ -14,3 +15,35 @@ app: type[Celery] = Celery('config')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
 app.autodiscover_tasks()
+
+
+@signals.before_task_publish.connect
+def pin_published_task(headers: dict, **kwargs: dict) -> None:
+    """
+    pin_published_task: Marks task, that is published by a pinned writer, to read from master.
+
+    Args:
+        headers (dict): Headers of the task message.
+    """
+
+    if replica_router.is_pinned():
+        headers['db_pinned'] = True
+
+
+@signals.task_prerun.connect
+def pin_running_task(task: Task, **kwargs: dict) -> None:
+    """
+    pin_running_task: Resets pin of the worker and pins task, that is published by a writer.
+    Eager tasks run within the caller and keep its pin.
+
+    Args:
+        task (Task): Task that is going to run.
+    """
+
+    if task.request.is_eager:
+        return
+
+    replica_router.reset()
+
+    if task.request.get('db_pinned'):
+        replica_router.pin()
@@ -3,17 +3,149 @@ dbrouters.py: File, containing routers for database operations.
 """
 
 
-from typing import Any
+import random
+import logging
+from time import monotonic
+from typing import Any, ClassVar, Optional
+from contextvars import ContextVar
+from django.db import DatabaseError, connections
+from django.conf import settings
 
 
-class KubernetesRouter:
+logger = logging.getLogger(__name__)
+
+pinned_until: ContextVar[float] = ContextVar('pinned_until', default=0.0)
+
+written: ContextVar[bool] = ContextVar('written', default=False)
+
+
+class ReplicaRouter:
     """
-    KubernetesRouter: A router to control all database operations on models in the all applications.
+    ReplicaRouter: A router, that spreads reads over the pool of replicas and writes to master.
+    Every write pins the current request or task to master for DATABASE_REPLICAS['PIN_SECONDS'],
+    so it reads its own writes. Lag of every replica is checked at most once in
+    DATABASE_REPLICAS['LAG_CHECK_SECONDS'] and replicas, that lag more than
+    DATABASE_REPLICAS['MAX_LAG_SECONDS'] or do not answer, are skipped. Reads go to master when
+    there are no healthy replicas.
     """
 
+    lag_query: ClassVar[str] = (
+        'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+        'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+    )
+
+    lags: ClassVar[dict[str, tuple[float, float]]] = {}
+
+    def get_master(self) -> str:
+        """
+        get_master: Returns alias of master database.
+
+        Returns:
+            str: Database alias.
+        """
+
+        return settings.DATABASE_REPLICAS['MASTER']
+
+    def get_replicas(self) -> list[str]:
+        """
+        get_replicas: Returns aliases of replica databases.
+
+        Returns:
+            list[str]: Database aliases.
+        """
+
+        return settings.DATABASE_REPLICAS['REPLICAS']
+
+    def pin(self, seconds: Optional[float] = None) -> None:
+        """
+        pin: Sends reads of the current request or task to master.
+
+        Args:
+            seconds (Optional[float]): Duration of the pin. Defaults to None
+            (DATABASE_REPLICAS['PIN_SECONDS']).
+        """
+
+        if seconds is None:
+            seconds = settings.DATABASE_REPLICAS['PIN_SECONDS']
+
+        pinned_until.set(max(pinned_until.get(), monotonic() + seconds))
+
+    def reset(self) -> None:
+        """
+        reset: Unpins the current request or task, must be called when it starts.
+        """
+
+        pinned_until.set(0.0)
+        written.set(False)
+
+    def is_pinned(self) -> bool:
+        """
+        is_pinned: Checks if reads of the current request or task go to master.
+
+        Returns:
+            bool: True if the pin has not expired.
+        """
+
+        return pinned_until.get() > monotonic()
+
+    def has_written(self) -> bool:
+        """
+        has_written: Checks if the current request or task has written to master.
+
+        Returns:
+            bool: True if there has been a write since the last reset.
+        """
+
+        return written.get()
+
+    def get_lag(self, alias: str) -> float:
+        """
+        get_lag: Returns replication lag of the replica, that is checked once in an interval.
+
+        Args:
+            alias (str): Database alias of the replica.
+
+        Returns:
+            float: Lag in seconds, infinity if the replica does not answer.
+        """
+
+        now: float = monotonic()
+        checked_at, lag = self.lags.get(alias, (float('-inf'), 0.0))
+
+        if now - checked_at < settings.DATABASE_REPLICAS['LAG_CHECK_SECONDS']:
+            return lag
+
+        lag = 0.0
+
+        if connections[alias].vendor == 'postgresql':
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute(self.lag_query)
+                    lag = float(cursor.fetchone()[0] or 0)
+            except DatabaseError as error:
+                logger.warning(f'Replica {alias} is not available: {error}')
+                lag = float('inf')
+
+        self.lags[alias] = (now, lag)
+        return lag
+
+    def get_healthy_replicas(self) -> list[str]:
+        """
+        get_healthy_replicas: Returns replicas, whose lag does not exceed the threshold.
+
+        Returns:
+            list[str]: Database aliases.
+        """
+
+        return [
+            alias
+            for alias in self.get_replicas()
+            if self.get_lag(alias) <= settings.DATABASE_REPLICAS['MAX_LAG_SECONDS']
+        ]
+
     def db_for_read(self, model: Any, **hints: dict) -> str:
         """
-        db_for_read: Sets database for reading.
+        db_for_read: Sets database for reading, master if the reader is pinned to it.
 
         Args:
             model (Any): Model on which operation is performing.
@@ -22,11 +154,20 @@ class KubernetesRouter:
             str: Database for reading.
         """
 
-        return 'default'
+        instance: Any = hints.get('instance')
+
+        if self.is_pinned():
+            return self.get_master()
+
+        if instance is not None and instance._state.db == self.get_master():
+            return self.get_master()
+
+        replicas: list[str] = self.get_healthy_replicas()
+        return random.choice(replicas) if replicas else self.get_master()
 
     def db_for_write(self, model: Any, **hints: dict) -> str:
         """
-        db_for_write: Sets database for writing.
+        db_for_write: Sets database for writing and pins the writer to master.
 
         Args:
             model (Any): Model on which operation is performing.
@@ -35,7 +176,23 @@ class KubernetesRouter:
             str: Database for writing.
         """
 
-        return 'master'
+        self.pin()
+        written.set(True)
+        return self.get_master()
+
+    def allow_relation(self, first: Any, second: Any, **hints: dict) -> bool:
+        """
+        allow_relation: Allows relations between instances of master and replicas.
+
+        Args:
+            first (Any): First instance.
+            second (Any): Second instance.
+
+        Returns:
+            bool: True, because replicas have the same data as master.
+        """
+
+        return True
 
     def allow_migrate(self, db: str, app_label: str, model_name: Any = None, **hints: dict) -> bool:
         """
@@ -50,4 +207,7 @@ class KubernetesRouter:
             bool: True if migrations can be applied otherwise False.
         """
 
-        return db == 'master'
+        return db == self.get_master()
+
+
+replica_router: ReplicaRouter = ReplicaRouter()
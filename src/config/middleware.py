@@ -0,0 +1,104 @@
+"""
+middleware.py: File, containing middlewares for an car_salon_activities project.
+"""
+
+
+import asyncio
+from typing import Any, Union, Callable, ClassVar, Awaitable
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from config.dbrouters import replica_router
+
+
+class ReplicaPinMiddleware:
+    """
+    ReplicaPinMiddleware: Keeps reads of a client on master for a while after it has written.
+    Request, that writes, sets cookie for DATABASE_REPLICAS['PIN_SECONDS'], so the following
+    requests of the client read from master till replicas have caught up. The middleware works in
+    both sync and async mode, so async views under ASGI do not switch to a thread for it.
+    """
+
+    sync_capable: ClassVar[bool] = True
+    async_capable: ClassVar[bool] = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        """
+        __init__: Instantiates ReplicaPinMiddleware instance.
+
+        Args:
+            get_response (Callable[[HttpRequest], Any]): Next handler.
+        """
+
+        self.get_response: Callable[[HttpRequest], Any] = get_response
+
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request: HttpRequest) -> Union[HttpResponse, Awaitable[HttpResponse]]:
+        """
+        __call__: Pins the request to master if its client has written recently.
+
+        Args:
+            request (HttpRequest): Request instance.
+
+        Returns:
+            Union[HttpResponse, Awaitable[HttpResponse]]: Response instance or coroutine in
+            async mode.
+        """
+
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        self.process_request(request)
+        return self.process_response(self.get_response(request))
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """
+        __acall__: Async version of __call__.
+
+        Args:
+            request (HttpRequest): Request instance.
+
+        Returns:
+            HttpResponse: Response instance.
+        """
+
+        self.process_request(request)
+        return self.process_response(await self.get_response(request))
+
+    def process_request(self, request: HttpRequest) -> None:
+        """
+        process_request: Resets pin of the previous request and pins the client, that has written.
+
+        Args:
+            request (HttpRequest): Request instance.
+        """
+
+        replica_router.reset()
+
+        if settings.DATABASE_REPLICAS['PIN_COOKIE'] in request.COOKIES:
+            replica_router.pin()
+
+    def process_response(self, response: HttpResponse) -> HttpResponse:
+        """
+        process_response: Sets pin cookie if the request has written.
+
+        Args:
+            response (HttpResponse): Response instance.
+
+        Returns:
+            HttpResponse: Response instance.
+        """
+
+        options: dict = settings.DATABASE_REPLICAS
+
+        if replica_router.has_written():
+            response.set_cookie(
+                options['PIN_COOKIE'],
+                '1',
+                max_age=options['PIN_SECONDS'],
+                httponly=True,
+                samesite='Lax',
+            )
+
+        return response
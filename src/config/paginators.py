@@ -3,7 +3,16 @@ paginators.py: File, containing paginators for a project.
 """
 
 
-from typing import ClassVar
+import json
+from typing import Any, Union, ClassVar, Iterator
+from django.db import connections
+from django.http import StreamingHttpResponse
+from django.db.models import Q
+from rest_framework.utils import encoders
+from django.db.models.query import QuerySet
+from rest_framework.request import Request
+from rest_framework.response import Response
+from django.core.handlers.asgi import ASGIRequest
 from rest_framework.pagination import CursorPagination
 
 
@@ -22,3 +31,113 @@ class CustomCursorPagination(CursorPagination):
     cursor_query_param: ClassVar[str] = 'cursor'
     cursor_query_description: ClassVar[str] = 'The pagination cursor value.'
     invalid_cursor_message: ClassVar[str] = 'Invalid cursor value.'
+
+
+class RelatedCursorPagination(CustomCursorPagination):
+    """
+    RelatedCursorPagination: Pagination class for related resources of a resource.
+    Related resources are always ordered by creation, because ordering of the viewset is
+    specified for the resource itself.
+
+    Args:
+        CustomCursorPagination (_type_): Superclass for a RelatedCursorPagination.
+    """
+
+    ordering: ClassVar[str] = '-created_at'
+
+
+class RelatedListMixin:
+    """
+    RelatedListMixin: Returns related resources of a resource in pages or as NDJSON stream.
+    Related resources are paginated with cursors by default. With ?stream=ndjson they are read
+    from database in chunks of stream_chunk_size rows and every row is written as one JSON line,
+    so memory does not grow with number of rows. Chunks are read by server-side cursor or, when
+    server-side cursors are disabled for pgbouncer transaction pooling, by keyset queries.
+    ASGI handler of Django 4.1 iterates streaming responses in the event loop, where queries are
+    not allowed, so requests served by ASGI handler always get pages.
+    """
+
+    related_pagination_class: ClassVar[type[CursorPagination]] = RelatedCursorPagination
+    stream_query_param: ClassVar[str] = 'stream'
+    stream_chunk_size: ClassVar[int] = 2000
+
+    def list_related(
+        self, request: Request, queryset: QuerySet
+    ) -> Union[Response, StreamingHttpResponse]:
+        """
+        list_related: Returns page of related resources or stream of all of them.
+
+        Args:
+            request (Request): Request instance.
+            queryset (QuerySet): Related resources.
+
+        Returns:
+            Union[Response, StreamingHttpResponse]: HTTP 200 with page or NDJSON stream.
+        """
+
+        if request.query_params.get(self.stream_query_param) == 'ndjson' and not isinstance(
+            request._request, ASGIRequest
+        ):
+            return StreamingHttpResponse(
+                self.stream_related(queryset), content_type='application/x-ndjson'
+            )
+
+        paginator: CursorPagination = self.related_pagination_class()
+        page: list = paginator.paginate_queryset(queryset, request)
+        return paginator.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    def stream_related(self, queryset: QuerySet) -> Iterator[bytes]:
+        """
+        stream_related: Yields related resources as JSON lines.
+
+        Args:
+            queryset (QuerySet): Related resources.
+
+        Yields:
+            Iterator[bytes]: Serialized resource with line break.
+        """
+
+        serializer_class: type = self.get_serializer_class()
+        context: dict = self.get_serializer_context()
+        ordering: str = self.related_pagination_class.ordering
+        tiebreaker: str = '-pk' if ordering.startswith('-') else 'pk'
+
+        for instance in self.iterate_related(queryset.order_by(ordering, tiebreaker)):
+            data: dict = serializer_class(instance, context=context).data
+            yield json.dumps(data, cls=encoders.JSONEncoder).encode() + b'\n'
+
+    def iterate_related(self, queryset: QuerySet) -> Iterator:
+        """
+        iterate_related: Yields related resources, reading stream_chunk_size rows at a time.
+        Without server-side cursors every chunk is a separate query, that continues after the last
+        row of the previous chunk, so the whole result is never fetched at once.
+
+        Args:
+            queryset (QuerySet): Related resources ordered by a field and primary key.
+
+        Yields:
+            Iterator: Resource instance.
+        """
+
+        if not connections[queryset.db].settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+            yield from queryset.iterator(chunk_size=self.stream_chunk_size)
+            return
+
+        ordering: str = queryset.query.order_by[0]
+        field: str = ordering.lstrip('-')
+        lookup: str = 'lt' if ordering.startswith('-') else 'gt'
+        chunk: list = list(queryset[: self.stream_chunk_size])
+
+        while chunk:
+            yield from chunk
+
+            if len(chunk) < self.stream_chunk_size:
+                return
+
+            last: Any = chunk[-1]
+            chunk = list(
+                queryset.filter(
+                    Q(**{f'{field}__{lookup}': getattr(last, field)})
+                    | Q(**{field: getattr(last, field), f'pk__{lookup}': last.pk})
+                )[: self.stream_chunk_size]
+            )
@@ -36,6 +36,8 @@ DEBUG: bool = os.getenv('DEBUG') == 'True'
 
 KUBERNETES: bool = os.getenv('KUBERNETES') == 'True'
 
+ASYNC_VIEWS: bool = os.getenv('DJANGO_SERVER_MODE') == 'asgi'
+
 ALLOWED_HOSTS: Optional[list] = os.getenv('ALLOWED_HOSTS', 'localhost').split(',')
 
 DEFAULT_CHARSET: str = 'utf8'
@@ -73,10 +75,34 @@ MIDDLEWARE: list = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'config.middleware.ReplicaPinMiddleware',
 ]
 
 # ---------------------------- DATABASES --------------------------------------
 
+DATABASE_POOLING: dict = {
+    'MODE': os.getenv('DB_POOLING_MODE', 'persistent'),
+    'MODES': {
+        'none': {
+            'CONN_MAX_AGE': 0,
+            'CONN_HEALTH_CHECKS': False,
+            'DISABLE_SERVER_SIDE_CURSORS': False,
+        },
+        'persistent': {
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+            'DISABLE_SERVER_SIDE_CURSORS': False,
+        },
+        'pgbouncer': {
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+            'DISABLE_SERVER_SIDE_CURSORS': True,
+        },
+    },
+}
+
+DATABASE_CONNECTION: dict = DATABASE_POOLING['MODES'][DATABASE_POOLING['MODE']]
+
 DATABASES: dict = {
     'default': {
         'ENGINE': os.getenv('DB_ENGINE'),
@@ -85,10 +111,28 @@ DATABASES: dict = {
         'PORT': os.getenv('DB_PORT'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASSWORD'),
-        'CONN_MAX_AGE': 0,
+        **DATABASE_CONNECTION,
     },
 }
 
+for number, host in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(','))):
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_REPLICAS: dict = {
+    'MASTER': 'default',
+    'REPLICAS': [alias for alias in DATABASES if alias != 'default'],
+    'PIN_SECONDS': float(os.getenv('DB_PIN_SECONDS', 5)),
+    'PIN_COOKIE': 'db_pinned',
+    'MAX_LAG_SECONDS': float(os.getenv('DB_MAX_LAG_SECONDS', 2)),
+    'LAG_CHECK_SECONDS': 1,
+}
+
+DATABASE_ROUTERS: list = ['config.dbrouters.ReplicaRouter']
+
 # ---------------------------- TEMPLATE SETTINGS -------------------------------
 
 TEMPLATES: list = [
@@ -213,6 +257,11 @@ LOGGING: dict = {
             'level': 'INFO',
             'propagate': False,
         },
+        'core': {
+            'handlers': ['console_dev_long', 'console_prd', 'mail_prd'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
@@ -263,6 +312,34 @@ JWT_TOKEN: dict = {
     'ENCODE_ALG': 'HS256',
     'DECODE_ALGS': ['HS256'],
     'HEADER_NAME': 'HTTP_AUTHORIZATION',
+    'PAYLOAD_CACHE_SIZE': 10000,
+    'KEYS_DIR': os.getenv('JWT_KEYS_DIR'),
+    'SIGNING_KEY_ID': os.getenv('JWT_SIGNING_KEY_ID'),
+    'JWKS_MAX_AGE_SECONDS': 300,
+}
+
+# ------------------------ USER CACHE SETTINGS ---------------------------------
+
+USER_CACHE: dict = {
+    'LOCAL_SIZE': 1024,
+    'LOCAL_TTL_SECONDS': 5,
+    'SHARED': True,
+    'SHARED_TTL_SECONDS': 300,
+}
+
+# ------------------------ PURCHASING SETTINGS ---------------------------------
+
+PURCHASING: dict = {
+    'SHOWROOMS_PER_TASK': 10,
+}
+
+# -------------------------- OFFERS SETTINGS -----------------------------------
+
+OFFERS: dict = {
+    'MAX_ATTEMPTS': 3,
+    'BATCH_MODE': os.getenv('OFFERS_BATCH_MODE') == 'True',
+    'BATCH_SIZE': 500,
+    'BATCH_INTERVAL_SECONDS': 2.0,
 }
 
 # ------------------------ RABBITMQ SETTINGS -----------------------------------
@@ -285,6 +362,126 @@ REDIS: dict = {
     'DATABASE_NUMBER': os.getenv('REDIS_DB_NUMBER'),
 }
 
+# ------------------------- CACHE SETTINGS -------------------------------------
+
+CACHES: dict = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': (
+            f"{REDIS['PROTOCOL']}://:{REDIS['PASS']}@"
+            f"{REDIS['HOST']}:{REDIS['PORT']}/{REDIS['DATABASE_NUMBER']}"
+        ),
+        'KEY_PREFIX': 'car_showroom',
+    },
+}
+
+# ------------------------ DISCOUNTS SETTINGS ----------------------------------
+
+DISCOUNTS: dict = {
+    'INDEX_TTL_SECONDS': 300,
+    'SCHEDULER_URL': CACHES['default']['LOCATION'],
+    'SCHEDULER_INTERVAL_SECONDS': 10.0,
+}
+
+# -------------------------- CHARTS SETTINGS -----------------------------------
+
+CHARTS: dict = {
+    'CACHE_TIMEOUT_SECONDS': 24 * 60 * 60,
+}
+
+# ------------------------ LAST LOGIN SETTINGS ---------------------------------
+
+LAST_LOGIN: dict = {
+    'BUFFERED': True,
+    'FLUSH_SIZE': 500,
+    'FLUSH_INTERVAL_SECONDS': 5.0,
+    'DURABLE': os.getenv('LAST_LOGIN_DURABLE') == 'True',
+    'DURABLE_URL': CACHES['default']['LOCATION'],
+}
+
+# ------------------------ RESPONSE CACHE SETTINGS -----------------------------
+
+RESPONSE_CACHE: dict = {
+    'TIMEOUT_SECONDS': 10 * 60,
+    'WATCHED_MODELS': [
+        'core.CarModel',
+        'supplier.SupplierModel',
+        'supplier.SupplierCar',
+        'supplier.SupplierModel_showrooms',
+    ],
+    'APPEND_ONLY_MODELS': [
+        'showroom.ShowroomHistory',
+        'supplier.SupplierHistory',
+        'customer.CustomerHistory',
+    ],
+    'OWNER_FIELDS': {
+        'showroom.ShowroomHistory': 'showroom',
+        'supplier.SupplierHistory': 'supplier',
+        'customer.CustomerHistory': 'customer',
+    },
+}
+
+# ---------------------------- MAIL SETTINGS -----------------------------------
+
+MAIL: dict = {
+    'QUEUE_URL': CACHES['default']['LOCATION'],
+    'BATCH_SIZE': 100,
+    'BATCH_DELAY_SECONDS': 1.0,
+    'DOMAIN_RATES': {
+        'default': 10,
+    },
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF_SECONDS': 30,
+    'LOCK_TIMEOUT_SECONDS': 10 * 60,
+}
+
+# ----------------------- ACCOUNT PURGE SETTINGS -------------------------------
+
+ACCOUNT_PURGE: dict = {
+    'INACTIVE_YEARS': 1,
+    'BATCH_SIZE': 500,
+    'SLEEP_SECONDS': 0.1,
+    'MAX_SECONDS': 30 * 60,
+}
+
+# ------------------------- SOFT DELETE SETTINGS -------------------------------
+
+SOFT_DELETE: dict = {
+    'ASYNC_THRESHOLD': 10000,
+    'CHUNK_SIZE': 1000,
+    'SLEEP_SECONDS': 0.05,
+    'PROGRESS_TIMEOUT_SECONDS': 24 * 60 * 60,
+}
+
+# -------------------------- BENCHMARK SETTINGS --------------------------------
+
+BENCHMARK: dict = {
+    'VOLUMES': {
+        'cars': 2000,
+        'suppliers': 100,
+        'supplier_cars': 50000,
+        'showrooms': 50,
+        'customers': 1000,
+        'offers': 2000,
+    },
+    'ENDPOINTS': {
+        'cars': '/api/v1/core/cars/',
+        'showrooms': '/api/v1/showroom/showrooms/',
+        'showroom_cars': '/api/v1/showroom/showrooms/{showroom}/get_cars/',
+        'showroom_analytics': '/api/v1/showroom/showrooms/{showroom}/get_analytics/',
+        'suppliers': '/api/v1/supplier/suppliers/',
+        'supplier_cars': '/api/v1/supplier/suppliers/{supplier}/get_cars/',
+        'customers': '/api/v1/customer/customers/',
+        'customer_statistics': '/api/v1/customer/customers/{customer}/get_statistics/',
+    },
+    'REQUESTS': 500,
+    'CONCURRENCY': 8,
+    'TASK_CALLS': 20,
+    'OUTPUT_DIR': Path(os.getenv('BENCHMARK_OUTPUT_DIR', BASE_DIR / 'benchmarks')),
+    'TOLERANCE': 0.2,
+    'REVISION': os.getenv('BENCHMARK_REVISION'),
+}
+
 # ------------------------- CELERY SETTINGS ------------------------------------
 
 CELERY_ENABLE_UTC: bool = True
@@ -332,9 +529,17 @@ CELERY_BEAT_SCHEDULE: dict = {
         'task': 'jauth.tasks.clear_database_from_waste_accounts',
         'schedule': crontab(minute=0, hour=0),
     },
-    'delete_discounts_every_minute': {
+    'delete_finished_discounts': {
         'task': 'core.tasks.delete_finished_discounts',
-        'schedule': crontab(minute='*'),
+        'schedule': DISCOUNTS['SCHEDULER_INTERVAL_SECONDS'],
+    },
+    'activate_started_discounts': {
+        'task': 'core.tasks.activate_started_discounts',
+        'schedule': DISCOUNTS['SCHEDULER_INTERVAL_SECONDS'],
+    },
+    'sync_discount_schedule_every_hour': {
+        'task': 'core.tasks.sync_discount_schedule',
+        'schedule': crontab(minute=0),
     },
     'check_suppliers_every_hour': {
         'task': 'core.tasks.check_suppliers',
@@ -346,6 +551,18 @@ CELERY_BEAT_SCHEDULE: dict = {
     },
 }
 
+if OFFERS['BATCH_MODE']:
+    CELERY_BEAT_SCHEDULE['settle_customer_offers'] = {
+        'task': 'core.tasks.settle_customer_offers',
+        'schedule': OFFERS['BATCH_INTERVAL_SECONDS'],
+    }
+
+if LAST_LOGIN['DURABLE']:
+    CELERY_BEAT_SCHEDULE['flush_last_logins'] = {
+        'task': 'jauth.tasks.flush_last_logins',
+        'schedule': LAST_LOGIN['FLUSH_INTERVAL_SECONDS'],
+    }
+
 # ---------------------- DJANGO DEBUG TOOLBAR SETTINGS -------------------------
 
 if DEBUG:
@@ -387,7 +604,7 @@ if KUBERNETES:
             'PORT': os.getenv('DB_PORT'),
             'USER': os.getenv('DB_USER'),
             'PASSWORD': os.getenv('DB_PASSWORD'),
-            'CONN_MAX_AGE': 0,
+            **DATABASE_CONNECTION,
         },
         'default': {
             'ENGINE': os.getenv('DB_ENGINE'),
@@ -396,11 +613,20 @@ if KUBERNETES:
             'PORT': os.getenv('SERVICE_DATABASE_PUBLIC_SERVICE_PORT'),
             'USER': os.getenv('DB_USER'),
             'PASSWORD': os.getenv('DB_PASSWORD'),
-            'CONN_MAX_AGE': 0,
+            **DATABASE_CONNECTION,
         },
     }
 
-    DATABASE_ROUTERS = ['config.dbrouters.KubernetesRouter']
+    for number, record in enumerate(list(srv_records)[1:]):
+        DATABASES[f'replica_{number}'] = {
+            **DATABASES['default'],
+            'HOST': record.target,
+            'PORT': os.getenv('DB_PORT'),
+        }
+
+    DATABASE_REPLICAS['MASTER'] = 'master'
+
+    DATABASE_REPLICAS['REPLICAS'] = [alias for alias in DATABASES if alias != 'master']
 
     CELERY_BROKER_URL = (
         f"{RABBITMQ['PROTOCOL']}://"
@@ -419,6 +645,14 @@ if KUBERNETES:
         f"{REDIS['DATABASE_NUMBER']}"
     )
 
+    CACHES['default']['LOCATION'] = CELERY_RESULT_BACKEND
+
+    DISCOUNTS['SCHEDULER_URL'] = CELERY_RESULT_BACKEND
+
+    LAST_LOGIN['DURABLE_URL'] = CELERY_RESULT_BACKEND
+
+    MAIL['QUEUE_URL'] = CELERY_RESULT_BACKEND
+
 # -------------------------- OTHER SETTINGS ------------------------------------
 
 WSGI_APPLICATION: str = 'config.wsgi.application'
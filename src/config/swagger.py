@@ -4,7 +4,7 @@ swagger.py: File, containg swagger settings for a project.
 
 
 from rest_framework import serializers
-from drf_spectacular.utils import inline_serializer
+from drf_spectacular.utils import OpenApiParameter, inline_serializer
 
 
 UnauthorizedSerializer = inline_serializer(
@@ -45,3 +45,32 @@ TokenPairSerializer = inline_serializer(
         ),
     },
 )
+
+JWKSSerializer = inline_serializer(
+    name='JWKS',
+    fields={
+        'keys': serializers.ListField(
+            child=serializers.DictField(),
+            default=[{'kty': 'RSA', 'kid': 'key_id', 'alg': 'RS256', 'use': 'sig'}],
+        ),
+    },
+)
+
+RelatedListParameters = [
+    OpenApiParameter(
+        name='cursor',
+        type=str,
+        description='The pagination cursor value.',
+    ),
+    OpenApiParameter(
+        name='page_size',
+        type=int,
+        description='Number of results to return per page.',
+    ),
+    OpenApiParameter(
+        name='stream',
+        type=str,
+        enum=['ndjson'],
+        description='Returns every result as JSON line instead of pages (WSGI mode only).',
+    ),
+]
@@ -0,0 +1,271 @@
+"""
+analytics.py: File, containing sales analytics for a core application.
+"""
+
+
+from typing import ClassVar, Optional
+from decimal import Decimal
+from datetime import date
+from django.db.models import Avg, Sum, Count, Model
+from django.db.models.query import QuerySet
+from rest_framework.request import Request
+from rest_framework.response import Response
+from django.db.models.functions import TruncDay, TruncWeek
+from core.responses import response_cache
+from core.api.v1.serializers import SalesQuerySerializer, SalesStatisticsSerializer
+
+
+class SalesAnalytics:
+    """
+    SalesAnalytics: Aggregates history of sales in database.
+    Revenue and number of sold cars are grouped by day or week with one GROUP BY query and totals
+    are summed from these buckets, top cars are grouped with one more query, so statistics never
+    load history rows. Responses are cached by response cache for the owner of the history and
+    are invalidated by new history entries of the owner only.
+    """
+
+    buckets: ClassVar[dict] = {
+        'day': TruncDay,
+        'week': TruncWeek,
+    }
+
+    top_size: ClassVar[int] = 5
+
+    def get_buckets(self, history: QuerySet, price: str, bucket: str) -> list[dict]:
+        """
+        get_buckets: Returns revenue and number of sales for every day or week.
+
+        Args:
+            history (QuerySet): History entries.
+            price (str): Name of the price field.
+            bucket (str): Size of the bucket, day or week.
+
+        Returns:
+            list[dict]: Buckets ordered by period.
+        """
+
+        return list(self.get_buckets_queryset(history, price, bucket))
+
+    def get_buckets_queryset(self, history: QuerySet, price: str, bucket: str) -> QuerySet:
+        """
+        get_buckets_queryset: Returns GROUP BY query of revenue and number of sales.
+
+        Args:
+            history (QuerySet): History entries.
+            price (str): Name of the price field.
+            bucket (str): Size of the bucket, day or week.
+
+        Returns:
+            QuerySet: Buckets ordered by period.
+        """
+
+        return (
+            history.annotate(period=self.buckets[bucket]('created_at'))
+            .values('period')
+            .annotate(revenue=Sum(price), units=Count('pk'))
+            .order_by('period')
+        )
+
+    def get_top_cars(self, history: QuerySet, price: str) -> list[dict]:
+        """
+        get_top_cars: Returns the most sold cars with their revenue and average price.
+
+        Args:
+            history (QuerySet): History entries.
+            price (str): Name of the price field.
+
+        Returns:
+            list[dict]: At most top_size cars ordered by number of sales.
+        """
+
+        return list(self.get_top_cars_queryset(history, price))
+
+    def get_top_cars_queryset(self, history: QuerySet, price: str) -> QuerySet:
+        """
+        get_top_cars_queryset: Returns GROUP BY query of the most sold cars.
+
+        Args:
+            history (QuerySet): History entries.
+            price (str): Name of the price field.
+
+        Returns:
+            QuerySet: At most top_size cars ordered by number of sales.
+        """
+
+        return (
+            history.filter(car__isnull=False)
+            .values('car', 'car__brand')
+            .annotate(units=Count('pk'), revenue=Sum(price), average_price=Avg(price))
+            .order_by('-units', '-revenue', 'car')[: self.top_size]
+        )
+
+    def get_statistics(
+        self,
+        history: QuerySet,
+        price: str,
+        bucket: str = 'day',
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+    ) -> dict:
+        """
+        get_statistics: Returns statistics of sales.
+
+        Args:
+            history (QuerySet): History entries.
+            price (str): Name of the price field.
+            bucket (str): Size of the bucket, day or week. Defaults to 'day'.
+            since (Optional[date]): First day of the statistics. Defaults to None.
+            until (Optional[date]): Last day of the statistics. Defaults to None.
+
+        Returns:
+            dict: Revenue, units, average price, top cars and buckets.
+        """
+
+        history = self.filter_history(history, since, until)
+        return self.build_statistics(
+            self.get_buckets(history, price, bucket), self.get_top_cars(history, price)
+        )
+
+    async def aget_statistics(
+        self,
+        history: QuerySet,
+        price: str,
+        bucket: str = 'day',
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+    ) -> dict:
+        """
+        aget_statistics: Async version of get_statistics, that reads buckets with async ORM.
+
+        Args:
+            history (QuerySet): History entries.
+            price (str): Name of the price field.
+            bucket (str): Size of the bucket, day or week. Defaults to 'day'.
+            since (Optional[date]): First day of the statistics. Defaults to None.
+            until (Optional[date]): Last day of the statistics. Defaults to None.
+
+        Returns:
+            dict: Revenue, units, average price, top cars and buckets.
+        """
+
+        history = self.filter_history(history, since, until)
+        buckets: QuerySet = self.get_buckets_queryset(history, price, bucket)
+        top_cars: QuerySet = self.get_top_cars_queryset(history, price)
+
+        return self.build_statistics(
+            [entry async for entry in buckets], [entry async for entry in top_cars]
+        )
+
+    def filter_history(
+        self, history: QuerySet, since: Optional[date], until: Optional[date]
+    ) -> QuerySet:
+        """
+        filter_history: Returns active history entries of the period.
+
+        Args:
+            history (QuerySet): History entries.
+            since (Optional[date]): First day of the statistics.
+            until (Optional[date]): Last day of the statistics.
+
+        Returns:
+            QuerySet: History entries of the period.
+        """
+
+        history = history.filter(is_active=True)
+
+        if since is not None:
+            history = history.filter(created_at__date__gte=since)
+
+        if until is not None:
+            history = history.filter(created_at__date__lte=until)
+
+        return history
+
+    def build_statistics(self, buckets: list[dict], top_cars: list[dict]) -> dict:
+        """
+        build_statistics: Returns statistics, whose totals are summed from buckets.
+
+        Args:
+            buckets (list[dict]): Buckets ordered by period.
+            top_cars (list[dict]): The most sold cars.
+
+        Returns:
+            dict: Revenue, units, average price, top cars and buckets.
+        """
+
+        revenue: Decimal = sum((entry['revenue'] for entry in buckets), Decimal(0))
+        units: int = sum(entry['units'] for entry in buckets)
+
+        return {
+            'revenue': revenue,
+            'units': units,
+            'average_price': revenue / units if units else None,
+            'top_cars': [
+                {
+                    'car': entry['car'],
+                    'brand': entry['car__brand'],
+                    'units': entry['units'],
+                    'revenue': entry['revenue'],
+                    'average_price': entry['average_price'],
+                }
+                for entry in top_cars
+            ],
+            'buckets': buckets,
+        }
+
+    def respond(self, request: Request, owner: Model, price: str) -> Response:
+        """
+        respond: Returns cached statistics of sales for query parameters of the request.
+
+        Args:
+            request (Request): Request instance.
+            owner (Model): Showroom, supplier or customer instance, whose history is shown.
+            price (str): Name of the price field.
+
+        Returns:
+            Response: HTTP 200 with statistics or HTTP 400 if query parameters are not correct.
+        """
+
+        query: SalesQuerySerializer = SalesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        history: QuerySet = owner.history.all()
+
+        return response_cache.respond(
+            request,
+            'analytics',
+            [history.model],
+            lambda: Response(
+                SalesStatisticsSerializer(
+                    self.get_statistics(history, price, **query.validated_data)
+                ).data
+            ),
+            owner_id=owner.pk,
+        )
+
+    async def arespond(self, request: Request, owner: Model, price: str) -> Response:
+        """
+        arespond: Async version of respond for async views.
+
+        Args:
+            request (Request): Request instance.
+            owner (Model): Showroom, supplier or customer instance, whose history is shown.
+            price (str): Name of the price field.
+
+        Returns:
+            Response: HTTP 200 with statistics or HTTP 400 if query parameters are not correct.
+        """
+
+        query: SalesQuerySerializer = SalesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        history: QuerySet = owner.history.all()
+
+        async def handler() -> Response:
+            statistics: dict = await self.aget_statistics(history, price, **query.validated_data)
+            return Response(SalesStatisticsSerializer(statistics).data)
+
+        return await response_cache.arespond(
+            request, 'analytics', [history.model], handler, owner_id=owner.pk
+        )
+
+
+sales_analytics: SalesAnalytics = SalesAnalytics()
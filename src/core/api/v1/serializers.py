@@ -34,3 +34,106 @@ class CarSerializer(serializers.ModelSerializer):
             'last_updated',
             'is_active',
         ]
+
+
+class SalesQuerySerializer(serializers.Serializer):
+    """
+    SalesQuerySerializer: Validates query parameters of sales statistics.
+
+    Args:
+        serializers.Serializer (_type_): Builtin superclass for a SalesQuerySerializer.
+    """
+
+    bucket = serializers.ChoiceField(choices=['day', 'week'], default='day')
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+    def validate(self, data: dict) -> dict:
+        """
+        validate: Validates period of statistics.
+
+        Args:
+            data (dict): Non-validated data.
+
+        Raises:
+            serializers.SerializerError: When since is more than until.
+
+        Returns:
+            dict: Validated data.
+        """
+
+        if 'since' in data and 'until' in data and data['since'] > data['until']:
+            raise serializers.ValidationError('Since must be less than or equal to until')
+
+        return data
+
+
+class SalesCarSerializer(serializers.Serializer):
+    """
+    SalesCarSerializer: Serializes sales of one car.
+
+    Args:
+        serializers.Serializer (_type_): Builtin superclass for a SalesCarSerializer.
+    """
+
+    car = serializers.IntegerField()
+    brand = serializers.CharField()
+    units = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=20, decimal_places=2)
+    average_price = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class SalesBucketSerializer(serializers.Serializer):
+    """
+    SalesBucketSerializer: Serializes sales of one day or week.
+
+    Args:
+        serializers.Serializer (_type_): Builtin superclass for a SalesBucketSerializer.
+    """
+
+    period = serializers.DateTimeField()
+    units = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=20, decimal_places=2)
+
+
+class SalesStatisticsSerializer(serializers.Serializer):
+    """
+    SalesStatisticsSerializer: Serializes statistics of sales.
+
+    Args:
+        serializers.Serializer (_type_): Builtin superclass for a SalesStatisticsSerializer.
+    """
+
+    revenue = serializers.DecimalField(max_digits=20, decimal_places=2)
+    units = serializers.IntegerField()
+    average_price = serializers.DecimalField(max_digits=14, decimal_places=2, allow_null=True)
+    top_cars = SalesCarSerializer(many=True)
+    buckets = SalesBucketSerializer(many=True)
+
+
+class SoftDeletionJobSerializer(serializers.Serializer):
+    """
+    SoftDeletionJobSerializer: Serializes id of the soft deletion job.
+
+    Args:
+        serializers.Serializer (_type_): Builtin superclass for a SoftDeletionJobSerializer.
+    """
+
+    job = serializers.CharField()
+
+
+class SoftDeletionSerializer(serializers.Serializer):
+    """
+    SoftDeletionSerializer: Serializes progress of the soft deletion job.
+
+    Args:
+        serializers.Serializer (_type_): Builtin superclass for a SoftDeletionSerializer.
+    """
+
+    status = serializers.ChoiceField(choices=['pending', 'running', 'finished'])
+    model = serializers.CharField()
+    pk = serializers.IntegerField()
+    relations = serializers.ListField(child=serializers.CharField())
+    total = serializers.IntegerField()
+    done = serializers.IntegerField()
+    rows = serializers.DictField(child=serializers.IntegerField())
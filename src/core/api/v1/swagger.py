@@ -6,7 +6,7 @@ swagger.py: File, containg schema extensions for extend schema decorator.
 from rest_framework import status
 from drf_spectacular.utils import OpenApiResponse
 from config.swagger import ForbiddenSerializer, UnauthorizedSerializer
-from core.api.v1.serializers import CarSerializer
+from core.api.v1.serializers import CarSerializer, SoftDeletionSerializer
 
 
 car_create_schema_extension: dict = {
@@ -62,3 +62,19 @@ car_destroy_schema_extension: dict = {
         status.HTTP_403_FORBIDDEN: ForbiddenSerializer,
     },
 }
+
+deletion_retrieve_schema_extension: dict = {
+    'summary': 'Showing progress of soft deletion',
+    'description': """
+      Shows status of the soft deletion job and number of deactivated rows of every model.
+    """,
+    'responses': {
+        status.HTTP_200_OK: SoftDeletionSerializer,
+        status.HTTP_401_UNAUTHORIZED: UnauthorizedSerializer,
+        status.HTTP_403_FORBIDDEN: ForbiddenSerializer,
+        status.HTTP_404_NOT_FOUND: OpenApiResponse(
+            response=None,
+            description='Job does not exist or its progress has expired.',
+        ),
+    },
+}
@@ -3,6 +3,8 @@ urls.py: File, containing routes for a core application.
 """
 
 
+from django.conf import settings
+from django.urls import path
 from rest_framework.routers import SimpleRouter
 from core.api.v1 import views
 
@@ -12,5 +14,18 @@ app_name: str = 'core'
 router: SimpleRouter = SimpleRouter()
 
 router.register(prefix='cars', viewset=views.CarViewSet, basename='car')
+router.register(prefix='deletions', viewset=views.SoftDeletionViewSet, basename='deletion')
 
 urlpatterns: list = router.urls
+
+if settings.ASYNC_VIEWS:
+    urlpatterns = [
+        path(
+            'cars/',
+            views.CarListAsyncView.as_view(
+                viewset_class=views.CarViewSet,
+                fallback=views.CarViewSet.as_view({'post': 'create'}),
+            ),
+            name='car-list-async',
+        ),
+    ] + urlpatterns
@@ -3,24 +3,30 @@ views.py: File, containing views for a core application.
 """
 
 
-from typing import ClassVar
+from typing import Any, ClassVar, Optional
 from rest_framework import mixins, status, viewsets
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from django.db.models.query import QuerySet
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
 from core.models import CarModel
 from core.services import CarService
+from core.analytics import sales_analytics
+from core.deletions import SoftDeletion, soft_deletion
+from core.responses import CachedResponseMixin, response_cache
+from config.asyncviews import AsyncViewSetView
 from core.api.v1.swagger import (
     car_list_schema_extension,
     car_create_schema_extension,
     car_destroy_schema_extension,
     car_retrieve_schema_extension,
+    deletion_retrieve_schema_extension,
 )
-from core.api.v1.serializers import CarSerializer
+from core.api.v1.serializers import CarSerializer, SoftDeletionSerializer
 
 
 @extend_schema(tags=['Car'])
@@ -31,6 +37,7 @@ from core.api.v1.serializers import CarSerializer
     retrieve=extend_schema(**car_retrieve_schema_extension),
 )
 class CarViewSet(
+    CachedResponseMixin,
     viewsets.GenericViewSet,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -48,6 +55,7 @@ class CarViewSet(
         DELETE -> destroy
 
     Args:
+        CachedResponseMixin (_type_): Serves list and retrieve from the response cache.
         viewsets.GenericViewSet (_type_): Builtin superclass for a CarViewset.
         mixins.CreateModelMixin (_type_): Builtin superclass for a CarViewset.
         mixins.ListModelMixin (_type_): Builtin superclass for a CarViewset.
@@ -101,3 +109,104 @@ class CarViewSet(
 
         self.service.set_car_as_inactive(self.get_object())
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema(tags=['Deletion'])
+@extend_schema_view(
+    retrieve=extend_schema(**deletion_retrieve_schema_extension),
+)
+class SoftDeletionViewSet(viewsets.ViewSet):
+    """
+    SoftDeletionViewSet: Reports progress of soft deletion jobs.
+    Maps HTTP methods to actions:
+        GET -> retrieve
+
+    Args:
+        viewsets.ViewSet (_type_): Builtin superclass for a SoftDeletionViewSet.
+    """
+
+    soft_deletion: ClassVar[SoftDeletion] = soft_deletion
+
+    permission_classes: ClassVar[list] = [IsAdminUser]
+
+    def retrieve(self, request: Request, pk: str) -> Response:
+        """
+        retrieve: Returns progress of the soft deletion job.
+
+        Args:
+            request (Request): Request instance.
+            pk (str): Id of the job.
+
+        Raises:
+            NotFound: Raises when job does not exist or its progress has expired.
+
+        Returns:
+            Response: HTTP 200 if has permissions otherwise 401/403/404.
+        """
+
+        progress: Optional[dict] = self.soft_deletion.get_progress(pk)
+
+        if progress is None:
+            raise NotFound('Soft deletion job is not found.')
+
+        return Response(SoftDeletionSerializer(progress).data, status=status.HTTP_200_OK)
+
+
+class CarListAsyncView(AsyncViewSetView):
+    """
+    CarListAsyncView: Serves list of cars from the response cache or reads it in async mode.
+    Create action of the same route is passed to the fallback view.
+
+    Args:
+        AsyncViewSetView (_type_): Superclass for a CarListAsyncView.
+    """
+
+    action: ClassVar[str] = 'list'
+
+    async def list(self, viewset: CarViewSet, request: Request) -> Response:
+        """
+        list: Returns cached page of cars.
+
+        Args:
+            viewset (CarViewSet): Viewset instance.
+            request (Request): Request instance.
+
+        Returns:
+            Response: HTTP 200 if has permissions otherwise 401/403.
+        """
+
+        return await response_cache.arespond(
+            request,
+            viewset.get_cache_scope(request),
+            viewset.get_cache_models(),
+            lambda: self.apaginate(viewset, viewset.filter_queryset(viewset.get_queryset())),
+        )
+
+
+class SalesAnalyticsAsyncView(AsyncViewSetView):
+    """
+    SalesAnalyticsAsyncView: Serves sales analytics of a showroom, supplier or customer with
+    async ORM.
+
+    Args:
+        AsyncViewSetView (_type_): Superclass for a SalesAnalyticsAsyncView.
+    """
+
+    action: ClassVar[str] = 'get_analytics'
+
+    price: ClassVar[str] = 'sale_price'
+
+    async def get_analytics(self, viewset: Any, request: Request) -> Response:
+        """
+        get_analytics: Returns sales analytics of the resource, that is computed in database.
+
+        Args:
+            viewset (Any): Viewset instance.
+            request (Request): Request instance.
+
+        Returns:
+            Response: HTTP 200 if has permissions otherwise 400/401/403/404.
+        """
+
+        instance: Any = await self.aget_object(viewset)
+        return await sales_analytics.arespond(request, instance, self.price)
@@ -19,3 +19,17 @@ class CoreConfig(AppConfig):
     name: ClassVar[str] = 'core'
     label: ClassVar[str] = 'core'
     verbose_name: ClassVar[str] = 'Core application'
+
+    def ready(self) -> None:
+        """
+        ready: Connects signals, that invalidate cached responses and charts, in every process.
+        """
+
+        from django.conf import settings
+        from core.charts import car_chart_resolver
+        from core.responses import response_cache
+
+        response_cache.watch_models(settings.RESPONSE_CACHE['WATCHED_MODELS'])
+        response_cache.watch_models(settings.RESPONSE_CACHE['APPEND_ONLY_MODELS'], deletes=False)
+        response_cache.partition_models(settings.RESPONSE_CACHE['OWNER_FIELDS'])
+        car_chart_resolver.watch()
@@ -0,0 +1,203 @@
+"""
+benchmarks.py: File, containing load driver for benchmarks of a core application.
+"""
+
+
+import math
+import asyncio
+from time import perf_counter
+from typing import Any, Callable, Iterable
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.test import Client
+from django.core.handlers.asgi import ASGIHandler
+from jauth.models import User
+from jauth.backends import TokenBackend
+
+
+class LoadDriver:
+    """
+    LoadDriver: Sends concurrent requests to the project handlers and times celery tasks.
+    With DJANGO_SERVER_MODE=asgi requests go to ASGI handler with all of them in flight in one
+    event loop, as in one uvicorn worker. Otherwise requests go through WSGI handler from
+    concurrency threads, as in sync gunicorn workers. Requests skip network, so the results show
+    cost of the project code, database and cache.
+    """
+
+    def get_headers(self, user: User) -> dict[str, str]:
+        """
+        get_headers: Returns headers, that authenticate requests of the user with access token.
+
+        Args:
+            user (User): User instance.
+
+        Returns:
+            dict[str, str]: Header names and values.
+        """
+
+        token: str = TokenBackend.generate_token(type='access', user_id=user.pk)
+        return {
+            'authorization': f"{settings.JWT_TOKEN['TOKEN_TYPE']} {token}",
+            'host': next(
+                (host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost'
+            ),
+        }
+
+    def measure(
+        self, urls: list[str], headers: dict[str, str], concurrency: int
+    ) -> tuple[float, list[tuple[float, int]]]:
+        """
+        measure: Sends requests to the handler of the current serving mode.
+
+        Args:
+            urls (list[str]): Urls of the requests.
+            headers (dict[str, str]): Headers of the requests.
+            concurrency (int): Number of requests in flight.
+
+        Returns:
+            tuple[float, list[tuple[float, int]]]: Total seconds, seconds and status of every
+            request.
+        """
+
+        if settings.ASYNC_VIEWS:
+            return asyncio.run(self.measure_async(urls, headers, concurrency))
+
+        return self.measure_sync(urls, headers, concurrency)
+
+    def measure_sync(
+        self, urls: list[str], headers: dict[str, str], concurrency: int
+    ) -> tuple[float, list[tuple[float, int]]]:
+        """
+        measure_sync: Sends requests through WSGI handler from concurrency threads.
+
+        Args:
+            urls (list[str]): Urls of the requests.
+            headers (dict[str, str]): Headers of the requests.
+            concurrency (int): Number of threads.
+
+        Returns:
+            tuple[float, list[tuple[float, int]]]: Total seconds, seconds and status of every
+            request.
+        """
+
+        environ: dict[str, str] = {
+            f"HTTP_{name.upper().replace('-', '_')}": value for name, value in headers.items()
+        }
+
+        def send(url: str) -> tuple[float, int]:
+            started: float = perf_counter()
+            status: int = Client().get(url, **environ).status_code
+            return perf_counter() - started, status
+
+        send(urls[0])
+        started: float = perf_counter()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results: list[tuple[float, int]] = list(executor.map(send, urls))
+
+        return perf_counter() - started, results
+
+    async def measure_async(
+        self, urls: list[str], headers: dict[str, str], concurrency: int
+    ) -> tuple[float, list[tuple[float, int]]]:
+        """
+        measure_async: Sends requests to ASGI handler with concurrency requests in flight.
+
+        Args:
+            urls (list[str]): Urls of the requests.
+            headers (dict[str, str]): Headers of the requests.
+            concurrency (int): Number of requests in flight.
+
+        Returns:
+            tuple[float, list[tuple[float, int]]]: Total seconds, seconds and status of every
+            request.
+        """
+
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        application: ASGIHandler = ASGIHandler()
+
+        async def send(url: str) -> tuple[float, int]:
+            parts = urlsplit(url)
+            scope: dict = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': parts.path,
+                'query_string': parts.query.encode(),
+                'headers': [(name.encode(), value.encode()) for name, value in headers.items()],
+                'server': (headers['host'], 80),
+                'client': ('127.0.0.1', 0),
+            }
+            messages: list[dict] = []
+
+            async def receive() -> dict:
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+            async def collect(message: dict) -> None:
+                messages.append(message)
+
+            async with semaphore:
+                started: float = perf_counter()
+                await application(scope, receive, collect)
+                return perf_counter() - started, messages[0]['status']
+
+        await send(urls[0])
+        started: float = perf_counter()
+        results: list[tuple[float, int]] = await asyncio.gather(*[send(url) for url in urls])
+        return perf_counter() - started, results
+
+    def time(self, task: Callable[..., Any], calls: Iterable[tuple]) -> tuple[float, list[float]]:
+        """
+        time: Runs the task in the current process once for every tuple of arguments.
+
+        Args:
+            task (Callable[..., Any]): Celery task or function.
+            calls (Iterable[tuple]): Arguments of every call.
+
+        Returns:
+            tuple[float, list[float]]: Total seconds and seconds of every call.
+        """
+
+        latencies: list[float] = []
+        started: float = perf_counter()
+
+        for args in calls:
+            called: float = perf_counter()
+            task(*args)
+            latencies.append(perf_counter() - called)
+
+        return perf_counter() - started, latencies
+
+    def summarize(self, elapsed: float, latencies: list[float], failed: int = 0) -> dict:
+        """
+        summarize: Returns throughput and latency percentiles of the measurement.
+
+        Args:
+            elapsed (float): Total seconds.
+            latencies (list[float]): Seconds of every request or call.
+            failed (int): Number of failed requests. Defaults to 0.
+
+        Returns:
+            dict: Count, rate per second, percentiles in milliseconds and number of failures.
+        """
+
+        ordered: list[float] = sorted(latencies)
+
+        def percentile(rank: float) -> float:
+            return round(ordered[max(math.ceil(len(ordered) * rank) - 1, 0)] * 1000, 3)
+
+        return {
+            'count': len(ordered),
+            'seconds': round(elapsed, 6),
+            'per_second': round(len(ordered) / elapsed, 3) if elapsed else 0.0,
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+            'p99_ms': percentile(0.99),
+            'failed': failed,
+        }
+
+
+load_driver: LoadDriver = LoadDriver()
@@ -0,0 +1,202 @@
+"""
+charts.py: File, containing resolution of showroom charts to cars for a core application.
+"""
+
+
+import json
+import hashlib
+from uuid import uuid4
+from typing import Any, ClassVar, Optional
+from operator import or_
+from functools import reduce
+from django.conf import settings
+from django.db.models import Q, Min, Model, signals
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from core.models import CarModel
+
+
+class CarChartResolver:
+    """
+    CarChartResolver: Finds the first car (by pk) that matches every chart of a showroom.
+    Charts that filter by the same fields are resolved with one grouped query, charts with
+    lookups are resolved one by one. Resolved car ids are cached by hash of normalized charts,
+    so identical charts are resolved once till a car is saved or deleted. Bulk writes of cars
+    do not send signals and must call invalidate by themselves.
+    """
+
+    version_key: ClassVar[str] = 'cars:charts:version'
+
+    def normalize(self, charts: list) -> list[dict]:
+        """
+        normalize: Returns charts without duplicates with keys in sorted order.
+
+        Args:
+            charts (list): Charts from request.
+
+        Raises:
+            TypeError: Raises when charts are not a list of objects.
+
+        Returns:
+            list[dict]: Normalized charts.
+        """
+
+        if not isinstance(charts, list) or not all(isinstance(chart, dict) for chart in charts):
+            raise TypeError('Charts must be a list of objects.')
+
+        normalized: dict[str, dict] = {}
+
+        for chart in charts:
+            normalized.setdefault(
+                json.dumps(chart, sort_keys=True, default=str), dict(sorted(chart.items()))
+            )
+
+        return list(normalized.values())
+
+    def get_key(self, charts: list[dict]) -> str:
+        """
+        get_key: Returns cache key of normalized charts.
+
+        Args:
+            charts (list[dict]): Normalized charts.
+
+        Returns:
+            str: Cache key.
+        """
+
+        digest: str = hashlib.sha256(
+            json.dumps(charts, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+        return f'cars:charts:{cache.get(self.version_key)}:{digest}'
+
+    def get_fields(self, chart: dict) -> Optional[tuple]:
+        """
+        get_fields: Returns names of the chart keys if every key is a concrete car field.
+
+        Args:
+            chart (dict): Normalized chart.
+
+        Returns:
+            Optional[tuple]: Field names or None if chart has lookups, relations or no keys.
+        """
+
+        try:
+            fields: list = [CarModel._meta.get_field(key) for key in chart]
+        except FieldDoesNotExist:
+            return None
+
+        if not fields or any(field.is_relation or not field.concrete for field in fields):
+            return None
+
+        return tuple(chart)
+
+    def get_values(self, chart: dict) -> tuple:
+        """
+        get_values: Returns chart values converted to python types of car fields.
+
+        Args:
+            chart (dict): Normalized chart with car fields only.
+
+        Returns:
+            tuple: Converted values.
+        """
+
+        return tuple(CarModel._meta.get_field(key).to_python(value) for key, value in chart.items())
+
+    def query(self, charts: list[dict]) -> list[int]:
+        """
+        query: Finds ids of the first car matching every chart in database.
+
+        Args:
+            charts (list[dict]): Normalized charts.
+
+        Returns:
+            list[int]: Ids of the found cars in order of charts without duplicates.
+        """
+
+        groups: dict[tuple, list[dict]] = {}
+        found: dict[int, Optional[int]] = {}
+
+        for index, chart in enumerate(charts):
+            fields: Optional[tuple] = self.get_fields(chart)
+
+            if fields is None:
+                found[index] = (
+                    CarModel.objects.filter(**chart)
+                    .order_by('pk')
+                    .values_list('pk', flat=True)
+                    .first()
+                )
+            else:
+                groups.setdefault(fields, []).append(chart)
+
+        first_cars: dict[tuple, dict[tuple, int]] = {}
+
+        for fields, group in groups.items():
+            first_cars[fields] = {
+                tuple(values): pk
+                for *values, pk in CarModel.objects.filter(
+                    reduce(or_, [Q(**chart) for chart in group])
+                )
+                .values(*fields)
+                .annotate(first_pk=Min('pk'))
+                .values_list(*fields, 'first_pk')
+            }
+
+        for index, chart in enumerate(charts):
+            if index not in found:
+                found[index] = first_cars[tuple(chart)].get(self.get_values(chart))
+
+        return list(dict.fromkeys(pk for _, pk in sorted(found.items()) if pk is not None))
+
+    def resolve(self, charts: Any) -> list[int]:
+        """
+        resolve: Returns ids of the first car matching every chart.
+
+        Args:
+            charts (Any): Charts from request.
+
+        Returns:
+            list[int]: Ids of the found cars.
+        """
+
+        normalized: list[dict] = self.normalize(charts)
+        key: str = self.get_key(normalized)
+        car_ids: Optional[list[int]] = cache.get(key)
+
+        if car_ids is None:
+            car_ids = self.query(normalized)
+            cache.set(key, car_ids, timeout=settings.CHARTS['CACHE_TIMEOUT_SECONDS'])
+
+        return car_ids
+
+    def invalidate(self) -> None:
+        """
+        invalidate: Invalidates cached charts of every process.
+        """
+
+        cache.set(self.version_key, uuid4().hex, timeout=None)
+
+    def receive(self, sender: type[Model], **kwargs: Any) -> None:
+        """
+        receive: Invalidates cached charts, when a car has been saved or deleted.
+
+        Args:
+            sender (type[Model]): Model class.
+        """
+
+        self.invalidate()
+
+    def watch(self) -> None:
+        """
+        watch: Connects signals of cars, so every save or delete of a car invalidates charts.
+        """
+
+        signals.post_save.connect(self.receive, sender=CarModel, dispatch_uid='car_chart_resolver')
+        signals.post_delete.connect(
+            self.receive, sender=CarModel, dispatch_uid='car_chart_resolver'
+        )
+
+
+car_chart_resolver: CarChartResolver = CarChartResolver()
@@ -0,0 +1,206 @@
+"""
+deletions.py: File, containing soft deletion of resources for a core application.
+"""
+
+
+import logging
+from time import sleep
+from uuid import uuid4
+from typing import ClassVar, Optional
+from collections import Counter
+from django.db import router, transaction
+from django.apps import apps
+from django.conf import settings
+from django.utils import timezone
+from django.db.models import Model
+from django.core.cache import cache
+from django.db.models.query import QuerySet
+from core.responses import response_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+class SoftDeletion:
+    """
+    SoftDeletion: Deactivates resource with its related rows by set-based updates.
+    Every relation is deactivated with one UPDATE, so related rows are never loaded, and the
+    resource with its relations is deactivated in one transaction. Deferred relations, e.g.
+    history, that have more than SOFT_DELETE['ASYNC_THRESHOLD'] active rows are deactivated by
+    background job in chunks of SOFT_DELETE['CHUNK_SIZE'] rows, every chunk in its own short
+    transaction. Progress of the job is kept in cache.
+    """
+
+    key_prefix: ClassVar[str] = 'deletions'
+
+    def get_key(self, job: str) -> str:
+        """
+        get_key: Returns cache key of the job progress.
+
+        Args:
+            job (str): Id of the job.
+
+        Returns:
+            str: Cache key.
+        """
+
+        return f'{self.key_prefix}:{job}'
+
+    def get_related(self, instance: Model, relation: str) -> QuerySet:
+        """
+        get_related: Returns active related rows of the resource.
+
+        Args:
+            instance (Model): Resource instance.
+            relation (str): Name of the reverse foreign key.
+
+        Returns:
+            QuerySet: Active related rows.
+        """
+
+        return getattr(instance, relation).filter(is_active=True)
+
+    def deactivate(self, queryset: QuerySet) -> int:
+        """
+        deactivate: Deactivates rows of the queryset with one UPDATE.
+
+        Args:
+            queryset (QuerySet): Rows to deactivate.
+
+        Returns:
+            int: Number of deactivated rows.
+        """
+
+        return queryset.update(is_active=False, last_updated=timezone.now())
+
+    def delete(
+        self, instance: Model, relations: list[str], deferred: Optional[list[str]] = None
+    ) -> Optional[str]:
+        """
+        delete: Deactivates the resource and its related rows or schedules job for deferred rows.
+
+        Args:
+            instance (Model): Resource instance.
+            relations (list[str]): Names of the reverse foreign keys, that are always deactivated
+            with the resource.
+            deferred (Optional[list[str]]): Names of the reverse foreign keys, that are
+            deactivated by job when they are too many. Defaults to None.
+
+        Returns:
+            Optional[str]: Id of the job, that must be run by run method, or None if every row
+            is deactivated.
+        """
+
+        model: type[Model] = type(instance)
+        deferred = deferred or []
+        total: int = sum(self.get_related(instance, relation).count() for relation in deferred)
+        is_deferred: bool = total > settings.SOFT_DELETE['ASYNC_THRESHOLD']
+        deleted: Counter = Counter()
+
+        with transaction.atomic(using=router.db_for_write(model)):
+            deleted[model._meta.label] += self.deactivate(
+                model._base_manager.filter(pk=instance.pk)
+            )
+
+            for relation in relations if is_deferred else relations + deferred:
+                related: QuerySet = self.get_related(instance, relation)
+                deleted[related.model._meta.label] += self.deactivate(related)
+
+        instance.is_active = False
+        self.invalidate(instance, relations if is_deferred else relations + deferred)
+        logger.info(f'Deactivated {dict(deleted)} of {model._meta.label} {instance.pk}.')
+
+        if not is_deferred:
+            return None
+
+        job: str = uuid4().hex
+        cache.set(
+            self.get_key(job),
+            {
+                'status': 'pending',
+                'model': model._meta.label,
+                'pk': instance.pk,
+                'relations': deferred,
+                'total': total,
+                'done': 0,
+                'rows': {},
+            },
+            timeout=settings.SOFT_DELETE['PROGRESS_TIMEOUT_SECONDS'],
+        )
+        return job
+
+    def run(self, job: str) -> Counter:
+        """
+        run: Deactivates related rows of the job chunk by chunk and reports progress.
+
+        Args:
+            job (str): Id of the job.
+
+        Returns:
+            Counter: Number of deactivated rows for every model label.
+        """
+
+        options: dict = settings.SOFT_DELETE
+        progress: Optional[dict] = cache.get(self.get_key(job))
+        deleted: Counter = Counter()
+
+        if progress is None:
+            logger.warning(f'Soft deletion {job} does not exist.')
+            return deleted
+
+        model: type[Model] = apps.get_model(progress['model'])
+        instance: Model = model._base_manager.get(pk=progress['pk'])
+        progress['status'] = 'running'
+        cache.set(self.get_key(job), progress, timeout=options['PROGRESS_TIMEOUT_SECONDS'])
+
+        for relation in progress['relations']:
+            related: QuerySet = self.get_related(instance, relation)
+            label: str = related.model._meta.label
+
+            while pks := list(related.values_list('pk', flat=True)[: options['CHUNK_SIZE']]):
+                with transaction.atomic(using=router.db_for_write(related.model)):
+                    count: int = self.deactivate(related.model._base_manager.filter(pk__in=pks))
+
+                deleted[label] += count
+                progress['rows'][label] = deleted[label]
+                progress['done'] += count
+                cache.set(self.get_key(job), progress, timeout=options['PROGRESS_TIMEOUT_SECONDS'])
+                sleep(options['SLEEP_SECONDS'])
+
+        progress['status'] = 'finished'
+        cache.set(self.get_key(job), progress, timeout=options['PROGRESS_TIMEOUT_SECONDS'])
+        self.invalidate(instance, progress['relations'])
+
+        logger.info(f'Soft deletion {job} deactivated {dict(deleted)}.')
+        return deleted
+
+    def get_progress(self, job: str) -> Optional[dict]:
+        """
+        get_progress: Returns progress of the job.
+
+        Args:
+            job (str): Id of the job.
+
+        Returns:
+            Optional[dict]: Status, resource, total and done number of rows and number of rows
+            for every model label or None if the job does not exist.
+        """
+
+        return cache.get(self.get_key(job))
+
+    def invalidate(self, instance: Model, relations: list[str]) -> None:
+        """
+        invalidate: Invalidates cached responses of the resource and its related rows.
+
+        Args:
+            instance (Model): Resource instance.
+            relations (list[str]): Names of the reverse foreign keys.
+        """
+
+        response_cache.invalidate(
+            type(instance),
+            *[instance._meta.get_field(relation).related_model for relation in relations],
+        )
+
+
+soft_deletion: SoftDeletion = SoftDeletion()
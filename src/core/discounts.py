@@ -0,0 +1,292 @@
+"""
+discounts.py: File, containing in-memory indexes of active discounts for a core application.
+"""
+
+
+from uuid import uuid4
+from typing import ClassVar, Iterable, Optional, NamedTuple
+from decimal import Decimal
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.utils import timezone
+from django.db.models import Model
+from django.core.cache import cache
+from showroom.models import ShowroomCar, ShowroomCarDiscount
+from supplier.models import SupplierCar, SupplierCarDiscount
+
+
+class DiscountEntry(NamedTuple):
+    """
+    DiscountEntry: Best active discount of the car with car row of the discount owner.
+    """
+
+    discount_id: int
+    owner_id: int
+    precent: Decimal
+    finish_date: datetime
+    car: Optional[Model]
+
+
+class DiscountIndex:
+    """
+    DiscountIndex: In-process index of the best active discount for every car.
+    Index is built in bulk and rebuilt when it is invalidated by any process, when the earliest
+    indexed discount expires or when its lifetime is over. Entry of the car is rebuilt alone,
+    when its car row is discarded by any process.
+    """
+
+    discount_model: ClassVar[type[Model]]
+    car_model: ClassVar[type[Model]]
+    owner_field: ClassVar[str]
+    version_key: ClassVar[str]
+
+    def __init__(self) -> None:
+        """
+        __init__: Instantiates DiscountIndex instance.
+        """
+
+        self.entries: dict[int, DiscountEntry] = {}
+        self.car_versions: dict[int, Optional[str]] = {}
+        self.version: Optional[str] = None
+        self.valid_until: Optional[datetime] = None
+
+    def get_car_version_key(self, car_id: int) -> str:
+        """
+        get_car_version_key: Returns cache key of the car entry version.
+
+        Args:
+            car_id (int): Car's pk.
+
+        Returns:
+            str: Cache key of the car entry version.
+        """
+
+        return f'{self.version_key}:{car_id}'
+
+    def get_car_versions(self, car_ids: Iterable[int]) -> dict[int, Optional[str]]:
+        """
+        get_car_versions: Returns shared versions of the car entries.
+
+        Args:
+            car_ids (Iterable[int]): Ids of the cars.
+
+        Returns:
+            dict[int, Optional[str]]: Version or None for every car id.
+        """
+
+        keys: dict[int, str] = {car_id: self.get_car_version_key(car_id) for car_id in car_ids}
+        versions: dict = cache.get_many(keys.values()) if keys else {}
+
+        return {car_id: versions.get(key) for car_id, key in keys.items()}
+
+    def get_discounts(self, car_ids: Optional[Iterable[int]] = None) -> dict[int, DiscountEntry]:
+        """
+        get_discounts: Returns best active discount without car row for every car.
+        Discounts, that have already finished but have not been deactivated yet, are skipped.
+
+        Args:
+            car_ids (Optional[Iterable[int]]): Ids of the cars. Defaults to None (all cars).
+
+        Returns:
+            dict[int, DiscountEntry]: Discount entry for every car id.
+        """
+
+        discount_name: str = self.discount_model._meta.model_name
+        through: type = self.discount_model.cars.through
+        discounts: dict[int, DiscountEntry] = {}
+
+        rows = through.objects.filter(
+            **{
+                f'{discount_name}__is_active': True,
+                f'{discount_name}__finish_date__gt': timezone.now(),
+            }
+        )
+
+        if car_ids is not None:
+            rows = rows.filter(carmodel_id__in=car_ids)
+
+        for car_id, discount_id, owner_id, precent, finish_date in rows.order_by(
+            f'{discount_name}_id'
+        ).values_list(
+            'carmodel_id',
+            f'{discount_name}_id',
+            f'{discount_name}__{self.owner_field}_id',
+            f'{discount_name}__precent',
+            f'{discount_name}__finish_date',
+        ):
+            if car_id not in discounts or precent < discounts[car_id].precent:
+                discounts[car_id] = DiscountEntry(discount_id, owner_id, precent, finish_date, None)
+
+        return discounts
+
+    def get_cars(self, discounts: dict[int, DiscountEntry]) -> dict[tuple[int, int], Model]:
+        """
+        get_cars: Returns the cheapest active car of discount owner for every discount entry.
+
+        Args:
+            discounts (dict[int, DiscountEntry]): Discount entry for every car id.
+
+        Returns:
+            dict[tuple[int, int], Model]: Car row for every (owner id, car id).
+        """
+
+        wanted: set = {(entry.owner_id, car_id) for car_id, entry in discounts.items()}
+        cars: dict[tuple[int, int], Model] = {}
+
+        if not wanted:
+            return cars
+
+        for car in (
+            self.car_model.objects.select_related(self.owner_field)
+            .filter(
+                is_active=True,
+                car_id__in={car_id for _, car_id in wanted},
+                **{f'{self.owner_field}_id__in': {owner_id for owner_id, _ in wanted}},
+            )
+            .order_by('price', 'pk')
+        ):
+            key: tuple[int, int] = (getattr(car, f'{self.owner_field}_id'), car.car_id)
+
+            if key in wanted and key not in cars:
+                cars[key] = car
+
+        return cars
+
+    def build(self, car_ids: Optional[Iterable[int]] = None) -> None:
+        """
+        build: Builds index for all cars or rebuilds entries of specified cars.
+        Index is valid until the earliest finish date, that is in the future. Versions of the
+        rebuilt entries are remembered, so entries discarded by other processes are detected.
+
+        Args:
+            car_ids (Optional[Iterable[int]]): Ids of the cars. Defaults to None (all cars).
+        """
+
+        now: datetime = timezone.now()
+
+        if car_ids is None:
+            self.version = cache.get(self.version_key)
+            self.entries = {}
+            self.car_versions = {}
+            self.valid_until = now + timedelta(seconds=settings.DISCOUNTS['INDEX_TTL_SECONDS'])
+        else:
+            car_ids = list(car_ids)
+            self.car_versions.update(self.get_car_versions(car_ids))
+
+            for car_id in car_ids:
+                self.entries.pop(car_id, None)
+
+        discounts: dict[int, DiscountEntry] = self.get_discounts(car_ids)
+
+        if car_ids is None:
+            self.car_versions = self.get_car_versions(discounts)
+
+        cars: dict[tuple[int, int], Model] = self.get_cars(discounts)
+
+        for car_id, entry in discounts.items():
+            self.entries[car_id] = entry._replace(car=cars.get((entry.owner_id, car_id)))
+
+            if entry.finish_date > now and (
+                self.valid_until is None or entry.finish_date < self.valid_until
+            ):
+                self.valid_until = entry.finish_date
+
+    def is_fresh(self) -> bool:
+        """
+        is_fresh: Checks if index has not been invalidated and its discounts have not expired.
+
+        Returns:
+            bool: True if index is fresh otherwise False.
+        """
+
+        return (
+            self.valid_until is not None
+            and timezone.now() < self.valid_until
+            and cache.get(self.version_key) == self.version
+        )
+
+    def ensure_fresh(self) -> None:
+        """
+        ensure_fresh: Rebuilds index if it is not fresh.
+        """
+
+        if not self.is_fresh():
+            self.build()
+
+    def get(self, car_id: int) -> Optional[DiscountEntry]:
+        """
+        get: Returns best active discount of the car.
+        Entry is rebuilt first, if it has been discarded by any process.
+
+        Args:
+            car_id (int): Car's pk.
+
+        Returns:
+            Optional[DiscountEntry]: Discount entry or None if car has no active discounts.
+        """
+
+        if car_id in self.entries and (
+            cache.get(self.get_car_version_key(car_id)) != self.car_versions.get(car_id)
+        ):
+            self.build([car_id])
+
+        return self.entries.get(car_id)
+
+    def discard(self, car_id: int) -> None:
+        """
+        discard: Rebuilds entry of the car, when car row of its discount owner has been sold.
+        Version of the car entry is bumped, so other processes rebuild only this entry instead
+        of the whole index. Version lives as long as the index, since indexes built before it
+        expire by then.
+
+        Args:
+            car_id (int): Car's pk.
+        """
+
+        cache.set(
+            self.get_car_version_key(car_id),
+            uuid4().hex,
+            timeout=settings.DISCOUNTS['INDEX_TTL_SECONDS'],
+        )
+        self.build([car_id])
+
+    def invalidate(self) -> None:
+        """
+        invalidate: Invalidates the whole index in every process after bulk changes of discounts.
+        """
+
+        cache.set(self.version_key, uuid4().hex, timeout=None)
+        self.valid_until = None
+
+
+class SupplierDiscountIndex(DiscountIndex):
+    """
+    SupplierDiscountIndex: Index of the best active supplier discount for every car.
+
+    Args:
+        DiscountIndex (_type_): Base index of active discounts.
+    """
+
+    discount_model: ClassVar[type[SupplierCarDiscount]] = SupplierCarDiscount
+    car_model: ClassVar[type[SupplierCar]] = SupplierCar
+    owner_field: ClassVar[str] = 'supplier'
+    version_key: ClassVar[str] = 'discounts:supplier:version'
+
+
+class ShowroomDiscountIndex(DiscountIndex):
+    """
+    ShowroomDiscountIndex: Index of the best active showroom discount for every car.
+
+    Args:
+        DiscountIndex (_type_): Base index of active discounts.
+    """
+
+    discount_model: ClassVar[type[ShowroomCarDiscount]] = ShowroomCarDiscount
+    car_model: ClassVar[type[ShowroomCar]] = ShowroomCar
+    owner_field: ClassVar[str] = 'showroom'
+    version_key: ClassVar[str] = 'discounts:showroom:version'
+
+
+supplier_discount_index: SupplierDiscountIndex = SupplierDiscountIndex()
+
+showroom_discount_index: ShowroomDiscountIndex = ShowroomDiscountIndex()
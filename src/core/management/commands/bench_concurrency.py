@@ -0,0 +1,80 @@
+"""
+bench_concurrency.py: File, containing benchmark of concurrent requests for a project.
+"""
+
+
+from argparse import ArgumentParser
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from jauth.models import User
+from core.benchmarks import load_driver
+
+
+class Command(BaseCommand):
+    """
+    Command: Measures throughput and latency of concurrent requests to an endpoint.
+    With DJANGO_SERVER_MODE=asgi requests go through ASGI handler and async views, all of them
+    are in flight in one event loop, as in one uvicorn worker. Otherwise requests go through WSGI
+    handler in concurrency threads, as in sync gunicorn workers. Run the command in both modes to
+    compare the profiles.
+
+    Args:
+        BaseCommand (_type_): Builtin superclass for a BenchConcurrencyCommand.
+    """
+
+    help: str = 'Measures throughput and latency of concurrent requests to an endpoint.'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """
+        add_arguments: Adds command arguments.
+
+        Args:
+            parser (ArgumentParser): Argument parser.
+        """
+
+        parser.add_argument('--url', default='/api/v1/core/cars/')
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--user-id', type=int, default=None)
+        parser.add_argument('--uncached', action='store_true')
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        """
+        handle: Main entrypoint that will be called when it is applied as manage.py command.
+
+        Raises:
+            CommandError: Raises when there is no admin to authenticate.
+        """
+
+        users = User.objects.filter(is_staff=True).order_by('pk')
+
+        if options['user_id'] is not None:
+            users = users.filter(pk=options['user_id'])
+
+        user: User = users.first()
+
+        if user is None:
+            raise CommandError('There is no admin to authenticate.')
+
+        urls: list[str] = [
+            (
+                f"{options['url']}{'&' if '?' in options['url'] else '?'}bench={number}"
+                if options['uncached']
+                else options['url']
+            )
+            for number in range(options['requests'])
+        ]
+        elapsed, results = load_driver.measure(
+            urls, load_driver.get_headers(user), options['concurrency']
+        )
+        summary: dict = load_driver.summarize(
+            elapsed,
+            [latency for latency, _ in results],
+            sum(1 for _, status in results if status >= 400),
+        )
+        self.stdout.write(
+            f"{'asgi' if settings.ASYNC_VIEWS else 'wsgi'}: "
+            f"{summary['per_second']:.1f} requests/s, p50 {summary['p50_ms']:.1f} ms, "
+            f"p95 {summary['p95_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms, "
+            f"{summary['failed']} failed"
+        )
@@ -0,0 +1,105 @@
+"""
+bench_connections.py: File, containing benchmark of database connection setup for a project.
+"""
+
+
+from time import perf_counter
+from argparse import ArgumentParser
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.conf import settings
+from django.core.signals import request_started, request_finished
+from django.db.backends.signals import connection_created
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """
+    Command: Compares cost of database connections per request for connection pooling modes.
+    Every request is simulated by request_started and request_finished signals around one query,
+    so connections are opened and closed exactly as in gunicorn workers and celery tasks.
+
+    Args:
+        BaseCommand (_type_): Builtin superclass for a BenchConnectionsCommand.
+    """
+
+    help: str = 'Compares cost of database connections per request for connection pooling modes.'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """
+        add_arguments: Adds command arguments.
+
+        Args:
+            parser (ArgumentParser): Argument parser.
+        """
+
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--modes', nargs='+', default=list(settings.DATABASE_POOLING['MODES']))
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        """
+        handle: Main entrypoint that will be called when it is applied as manage.py command.
+
+        Raises:
+            CommandError: Raises when a mode is not in DATABASE_POOLING['MODES'].
+        """
+
+        modes: dict = settings.DATABASE_POOLING['MODES']
+
+        if unknown := set(options['modes']) - set(modes):
+            raise CommandError(f'Unknown pooling modes: {", ".join(sorted(unknown))}.')
+
+        results: dict[str, tuple[float, int]] = {
+            mode: self._measure(options['database'], modes[mode], options['requests'])
+            for mode in options['modes']
+        }
+        baseline: float = max(elapsed for elapsed, _ in results.values())
+
+        for mode, (elapsed, opened) in results.items():
+            self.stdout.write(
+                f'{mode}: {elapsed * 1000 / options["requests"]:.3f} ms/request, '
+                f'{opened} connections opened ({baseline / elapsed:.1f}x)'
+            )
+
+    def _measure(self, database: str, options: dict, requests: int) -> tuple[float, int]:
+        """
+        _measure: Returns duration of the requests and number of opened connections.
+
+        Args:
+            database (str): Database alias.
+            options (dict): Connection settings of the pooling mode.
+            requests (int): Number of requests.
+
+        Returns:
+            tuple[float, int]: Seconds and number of connections.
+        """
+
+        connection = connections[database]
+        saved: dict = {key: connection.settings_dict[key] for key in options}
+        opened: list[str] = []
+
+        def count(sender: type, connection: object, **kwargs: dict) -> None:
+            opened.append(connection.alias)
+
+        connection.close()
+        connection.settings_dict.update(options)
+        connection_created.connect(count, weak=False)
+
+        try:
+            started: float = perf_counter()
+
+            for _ in range(requests):
+                request_started.send(sender=self.__class__)
+
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+
+                request_finished.send(sender=self.__class__)
+
+            elapsed: float = perf_counter() - started
+        finally:
+            connection_created.disconnect(count)
+            connection.close()
+            connection.settings_dict.update(saved)
+
+        return elapsed, opened.count(database)
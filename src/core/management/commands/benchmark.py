@@ -0,0 +1,305 @@
+"""
+benchmark.py: File, containing load test of API endpoints and celery tasks for a project.
+"""
+
+
+import json
+import subprocess
+from typing import Any, Callable, ClassVar, Optional
+from pathlib import Path
+from argparse import ArgumentParser
+from django.db import connection
+from django.conf import settings
+from django.utils import timezone
+from django.core.management import call_command
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from core.tasks import find_suppliers, buy_supplier_cars, make_customer_offer
+from core.models import CarModel
+from jauth.models import User
+from config.celery import app
+from core.benchmarks import load_driver
+from customer.models import CustomerModel, CustomerOffer
+from showroom.models import ShowroomCar, ShowroomModel
+from supplier.models import SupplierCar, SupplierModel
+
+
+class Command(BaseCommand):
+    """
+    Command: Measures throughput and latency of API endpoints and wall-clock time of celery tasks.
+    Endpoints are requested by an admin with access token, so every request goes through JWT
+    authentication. Tasks run eagerly in the current process. Tasks run before endpoints, so
+    endpoints read stock and history, that tasks have made. Results are written to JSON file
+    named after the revision and can be compared with results of another revision.
+
+    Args:
+        BaseCommand (_type_): Builtin superclass for a BenchmarkCommand.
+    """
+
+    help: str = 'Measures throughput and latency of API endpoints and time of celery tasks.'
+
+    tasks: ClassVar[dict[str, Callable[..., Any]]] = {
+        'find_suppliers': find_suppliers,
+        'buy_supplier_cars': buy_supplier_cars,
+        'make_customer_offer': make_customer_offer,
+    }
+
+    volumes: ClassVar[dict[str, Any]] = {
+        'cars': CarModel.objects,
+        'suppliers': SupplierModel.objects,
+        'supplier_cars': SupplierCar.objects,
+        'showrooms': ShowroomModel.objects,
+        'showroom_cars': ShowroomCar.objects,
+        'customers': CustomerModel.objects,
+        'offers': CustomerOffer.objects,
+    }
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """
+        add_arguments: Adds command arguments.
+
+        Args:
+            parser (ArgumentParser): Argument parser.
+        """
+
+        options: dict = settings.BENCHMARK
+
+        parser.add_argument('--seed', action='store_true')
+        parser.add_argument('--requests', type=int, default=options['REQUESTS'])
+        parser.add_argument('--concurrency', type=int, default=options['CONCURRENCY'])
+        parser.add_argument('--task-calls', type=int, default=options['TASK_CALLS'])
+        parser.add_argument('--endpoints', nargs='*', default=list(options['ENDPOINTS']))
+        parser.add_argument('--tasks', nargs='*', default=list(self.tasks))
+        parser.add_argument('--uncached', action='store_true')
+        parser.add_argument('--output', type=Path, default=None)
+        parser.add_argument('--compare', type=Path, default=None)
+        parser.add_argument('--tolerance', type=float, default=options['TOLERANCE'])
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        """
+        handle: Main entrypoint that will be called when it is applied as manage.py command.
+
+        Raises:
+            CommandError: Raises when an endpoint or a task is unknown or results have regressed.
+        """
+
+        endpoints: dict[str, str] = settings.BENCHMARK['ENDPOINTS']
+
+        unknown: set[str] = (set(options['endpoints']) - set(endpoints)) | (
+            set(options['tasks']) - set(self.tasks)
+        )
+
+        if unknown:
+            raise CommandError(f'Unknown endpoints or tasks: {", ".join(sorted(unknown))}.')
+
+        if options['seed']:
+            call_command('fill', **settings.BENCHMARK['VOLUMES'], stdout=self.stdout)
+
+        revision: str = self._get_revision()
+        results: dict = {
+            'revision': revision,
+            'created_at': timezone.now().isoformat(),
+            'profile': 'asgi' if settings.ASYNC_VIEWS else 'wsgi',
+            'database': connection.vendor,
+            'options': {
+                key: options[key] for key in ('requests', 'concurrency', 'task_calls', 'uncached')
+            },
+            'volumes': {name: manager.count() for name, manager in self.volumes.items()},
+            'tasks': {
+                name: self._measure_task(name, options['task_calls']) for name in options['tasks']
+            },
+        }
+        results['endpoints'] = self._measure_endpoints(
+            {name: endpoints[name] for name in options['endpoints']},
+            options['requests'],
+            options['concurrency'],
+            options['uncached'],
+        )
+
+        for group in ('tasks', 'endpoints'):
+            for name, summary in results[group].items():
+                self.stdout.write(
+                    f"{name}: {summary['count']} in {summary['seconds']:.3f} s, "
+                    f"{summary['per_second']:.1f}/s, p50 {summary['p50_ms']:.1f} ms, "
+                    f"p95 {summary['p95_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms, "
+                    f"{summary['failed']} failed"
+                )
+
+        output: Path = options['output'] or settings.BENCHMARK['OUTPUT_DIR'] / f'{revision}.json'
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=4) + '\n')
+        self.stdout.write(f'Results are written to {output}.')
+
+        if options['compare'] is not None:
+            baseline: dict = json.loads(options['compare'].read_text())
+            regressions: list[str] = self._compare(results, baseline, options['tolerance'])
+
+            if regressions:
+                raise CommandError(
+                    f"Regressions against {baseline['revision']}: {'; '.join(regressions)}."
+                )
+
+            self.stdout.write(f"No regressions against {baseline['revision']}.")
+
+    def _get_revision(self) -> str:
+        """
+        _get_revision: Returns revision of the code, that is benchmarked.
+
+        Returns:
+            str: BENCHMARK['REVISION'], git commit or timestamp if there is no git repository.
+        """
+
+        if settings.BENCHMARK['REVISION']:
+            return settings.BENCHMARK['REVISION']
+
+        try:
+            revision: str = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            revision = timezone.now().strftime('%Y%m%d%H%M%S')
+
+        return revision
+
+    def _get_admin(self) -> User:
+        """
+        _get_admin: Returns admin, whose access token authenticates requests.
+
+        Returns:
+            User: User instance.
+        """
+
+        user, _ = User.objects.get_or_create(
+            username='benchmark',
+            defaults={
+                'email': 'benchmark@mail.com',
+                'password': make_password(None),
+                'is_staff': True,
+            },
+        )
+        return user
+
+    def _get_calls(self, name: str, count: int) -> list[tuple]:
+        """
+        _get_calls: Returns arguments of task calls.
+
+        Args:
+            name (str): Name of the task.
+            count (int): Maximal number of calls.
+
+        Returns:
+            list[tuple]: Arguments of every call.
+        """
+
+        if name == 'find_suppliers':
+            queryset: Any = ShowroomModel.objects.filter(is_active=True)
+        elif name == 'make_customer_offer':
+            queryset = CustomerOffer.objects.filter(is_active=True)
+        else:
+            return [()]
+
+        return [(pk,) for pk in queryset.order_by('pk').values_list('pk', flat=True)[:count]]
+
+    def _measure_task(self, name: str, count: int) -> dict:
+        """
+        _measure_task: Runs the task eagerly, so subtasks run in the current process as well.
+
+        Args:
+            name (str): Name of the task.
+            count (int): Maximal number of calls.
+
+        Returns:
+            dict: Summary of the calls.
+        """
+
+        always_eager: bool = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+
+        try:
+            elapsed, latencies = load_driver.time(self.tasks[name], self._get_calls(name, count))
+        finally:
+            app.conf.task_always_eager = always_eager
+
+        return load_driver.summarize(elapsed, latencies) if latencies else {}
+
+    def _measure_endpoints(
+        self, endpoints: dict[str, str], requests: int, concurrency: int, uncached: bool
+    ) -> dict[str, dict]:
+        """
+        _measure_endpoints: Sends concurrent requests to every endpoint.
+
+        Args:
+            endpoints (dict[str, str]): Names and url templates of the endpoints.
+            requests (int): Number of requests to every endpoint.
+            concurrency (int): Number of requests in flight.
+            uncached (bool): Makes every url unique, so responses are not served from cache.
+
+        Returns:
+            dict[str, dict]: Summaries of the endpoints, that have resources for their urls.
+        """
+
+        headers: dict[str, str] = load_driver.get_headers(self._get_admin())
+        resources: dict[str, Optional[Any]] = {
+            'showroom': ShowroomModel.objects.filter(is_active=True).order_by('pk').first(),
+            'supplier': SupplierModel.objects.filter(is_active=True).order_by('pk').first(),
+            'customer': CustomerModel.objects.filter(is_active=True).order_by('pk').first(),
+        }
+        summaries: dict[str, dict] = {}
+
+        for name, template in endpoints.items():
+            needed: list[str] = [key for key in resources if f'{{{key}}}' in template]
+
+            if any(resources[key] is None for key in needed):
+                self.stdout.write(f'{name}: skipped, there are no resources for {template}.')
+                continue
+
+            url: str = template.format(**{key: resources[key].pk for key in needed})
+            urls: list[str] = [
+                f"{url}{'&' if '?' in url else '?'}bench={number}" if uncached else url
+                for number in range(requests)
+            ]
+            elapsed, results = load_driver.measure(urls, headers, concurrency)
+            summaries[name] = load_driver.summarize(
+                elapsed,
+                [latency for latency, _ in results],
+                sum(1 for _, status in results if status >= 400),
+            )
+
+        return summaries
+
+    def _compare(self, results: dict, baseline: dict, tolerance: float) -> list[str]:
+        """
+        _compare: Finds endpoints and tasks, that are slower than in the baseline.
+
+        Args:
+            results (dict): Current results.
+            baseline (dict): Results of another revision.
+            tolerance (float): Allowed relative slowdown.
+
+        Returns:
+            list[str]: Descriptions of the regressions.
+        """
+
+        regressions: list[str] = []
+
+        for group in ('tasks', 'endpoints'):
+            for name, summary in results[group].items():
+                previous: dict = baseline.get(group, {}).get(name) or {}
+
+                if not summary or not previous:
+                    continue
+
+                for metric in ('p50_ms', 'p95_ms'):
+                    if summary[metric] > previous[metric] * (1 + tolerance):
+                        regressions.append(
+                            f'{name} {metric} {previous[metric]:.1f} -> {summary[metric]:.1f}'
+                        )
+
+                if summary['failed'] > previous['failed']:
+                    regressions.append(f"{name} failed {previous['failed']} -> {summary['failed']}")
+
+        return regressions
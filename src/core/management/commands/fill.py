@@ -3,12 +3,19 @@ fill.py: File, containing commands for a project.
 """
 
 
-from random import choice, choices, randint, uniform
+from random import choice, sample, choices, randint, uniform
 from string import digits, ascii_uppercase
+from typing import ClassVar
+from argparse import ArgumentParser
 from datetime import datetime, timedelta
 from django.db.models import Max, Min
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
+from core.charts import car_chart_resolver
 from core.models import CarModel
+from jauth.models import User
+from customer.models import CustomerModel, CustomerOffer
+from showroom.models import ShowroomModel
 from supplier.models import SupplierCar, SupplierModel, SupplierCarDiscount
 from core.enums.enums import Brands, TransmissionTypes
 
@@ -16,27 +23,62 @@ from core.enums.enums import Brands, TransmissionTypes
 class Command(BaseCommand):
     """
     Command: Generates suppliers data for database.
+    Volumes of generated data can be set by options, e.g. to seed database for benchmarks.
+    Showrooms, customers and offers are not generated by default.
 
     Args:
         BaseCommand (_type_): Builtin superclass for a FillDbCommand.
     """
 
+    volumes: ClassVar[dict[str, int]] = {
+        'cars': 9,
+        'suppliers': 14,
+        'supplier_cars': 999,
+        'showrooms': 0,
+        'customers': 0,
+        'offers': 0,
+    }
+
+    batch_size: ClassVar[int] = 1000
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """
+        add_arguments: Adds command arguments.
+
+        Args:
+            parser (ArgumentParser): Argument parser.
+        """
+
+        for volume, count in self.volumes.items():
+            parser.add_argument(f"--{volume.replace('_', '-')}", type=int, default=count)
+
     def handle(self, *args: tuple, **options: dict) -> None:
         """
         handle: Main entrypoint that will be called when it is applied as manage.py command.
         """
 
-        self._generate_cars()
-        self._generate_suppliers()
-        self._generate_supplier_cars()
+        volumes: dict[str, int] = {
+            volume: options.get(volume, count) for volume, count in self.volumes.items()
+        }
+
+        self._generate_cars(volumes['cars'])
+        self._generate_suppliers(volumes['suppliers'])
+        self._generate_supplier_cars(volumes['supplier_cars'])
         self._generate_supplier_discounts()
+        self._generate_showrooms(volumes['showrooms'])
+        self._generate_customers(volumes['customers'])
+        self._generate_customer_offers(volumes['offers'])
 
-    def _generate_cars(self) -> None:
+    def _generate_cars(self, count: int = 9) -> None:
         """
-        _generate_cars: Generates cars for a project.
+        _generate_cars: Generates cars for a project and invalidates cached charts after all of
+        them, so charts of generated showrooms are resolved to the new cars.
+
+        Args:
+            count (int): Number of cars. Defaults to 9.
         """
 
-        for i in range(1, 10):
+        for i in range(count):
             CarModel.objects.get_or_create(
                 brand=choice(Brands.choices)[0],
                 transmission_type=choice(TransmissionTypes.choices)[0],
@@ -44,12 +86,17 @@ class Command(BaseCommand):
                 miliage=randint(1000, 200000),
             )
 
-    def _generate_suppliers(self) -> None:
+        car_chart_resolver.invalidate()
+
+    def _generate_suppliers(self, count: int = 14) -> None:
         """
         _generate_suppliers: Generates suppliers for a project.
+
+        Args:
+            count (int): Number of suppliers. Defaults to 14.
         """
 
-        for i in range(1, 15):
+        for i in range(count):
             SupplierModel.objects.get_or_create(
                 name=f'supplier#{self._generate_random_string()}',
                 creation_year=randint(1900, datetime.now().year),
@@ -58,24 +105,31 @@ class Command(BaseCommand):
                 discount_for_unique_customers=uniform(0.2, 0.5),
             )
 
-    def _generate_supplier_cars(self) -> None:
+    def _generate_supplier_cars(self, count: int = 999) -> None:
         """
         _generate_supplier_cars: Generates supplier cars for a project.
+
+        Args:
+            count (int): Number of supplier cars. Defaults to 999.
         """
 
-        supplier_ids: dict = SupplierModel.objects.aggregate(Min('id'), Max('id'))
-        car_ids: dict = CarModel.objects.aggregate(Min('id'), Max('id'))
+        supplier_ids: list[int] = list(SupplierModel.objects.values_list('id', flat=True))
+        car_ids: list[int] = list(CarModel.objects.values_list('id', flat=True))
 
-        for i in range(1, 1000):
-            SupplierCar.objects.get_or_create(
-                supplier=SupplierModel.objects.get(
-                    id=randint(supplier_ids['id__min'], supplier_ids['id__max'])
-                ),
-                car=CarModel.objects.get(
-                    id=randint(car_ids['id__min'], car_ids['id__max']),
-                ),
-                price=randint(1000, 100000),
-            )
+        if not supplier_ids or not car_ids:
+            return
+
+        SupplierCar.objects.bulk_create(
+            [
+                SupplierCar(
+                    supplier_id=choice(supplier_ids),
+                    car_id=choice(car_ids),
+                    price=randint(1000, 100000),
+                )
+                for i in range(count)
+            ],
+            batch_size=self.batch_size,
+        )
 
     def _generate_supplier_discounts(self) -> None:
         """
@@ -98,6 +152,87 @@ class Command(BaseCommand):
             if created is True:
                 discount.cars.add(*choices(car_ids_list, k=2))
 
+    def _generate_showrooms(self, count: int) -> None:
+        """
+        _generate_showrooms: Generates showrooms with charts of existing cars for a project.
+
+        Args:
+            count (int): Number of showrooms.
+        """
+
+        kinds: list[tuple] = list(
+            CarModel.objects.values_list('brand', 'transmission_type').distinct()
+        )
+
+        for i in range(count):
+            charts: list[dict] = [
+                {'brand': brand, 'transmission_type': transmission_type}
+                for brand, transmission_type in sample(kinds, k=min(len(kinds), 3))
+            ]
+            showroom, created = ShowroomModel.objects.get_or_create(
+                name=f'showroom#{self._generate_random_string()}',
+                defaults={
+                    'creation_year': randint(1900, datetime.now().year),
+                    'balance': randint(100000, 10000000),
+                    'location': choice(['BY', 'DE', 'PL', 'US']),
+                    'charts': charts,
+                },
+            )
+
+            if created is True:
+                showroom.appropriate_cars.set(car_chart_resolver.resolve(charts))
+
+    def _generate_customers(self, count: int) -> None:
+        """
+        _generate_customers: Generates users and their customers for a project.
+
+        Args:
+            count (int): Number of customers.
+        """
+
+        names: set[str] = {f'customer{self._generate_random_string()}' for i in range(count)}
+        names -= set(User.objects.filter(username__in=names).values_list('username', flat=True))
+        password: str = make_password(None)
+        users: list[User] = User.objects.bulk_create(
+            [
+                User(username=name, email=f'{name.lower()}@mail.com', password=password)
+                for name in names
+            ],
+            batch_size=self.batch_size,
+        )
+        CustomerModel.objects.bulk_create(
+            [CustomerModel(user=user, balance=randint(1000, 1000000)) for user in users],
+            batch_size=self.batch_size,
+        )
+
+    def _generate_customer_offers(self, count: int) -> None:
+        """
+        _generate_customer_offers: Generates pending offers of customers for a project.
+
+        Args:
+            count (int): Number of offers.
+        """
+
+        customer_ids: list[int] = list(CustomerModel.objects.values_list('id', flat=True))
+        car_ids: list[int] = list(
+            ShowroomModel.appropriate_cars.through.objects.values_list('carmodel_id', flat=True)
+        ) or list(CarModel.objects.values_list('id', flat=True))
+
+        if not customer_ids or not car_ids:
+            return
+
+        CustomerOffer.objects.bulk_create(
+            [
+                CustomerOffer(
+                    customer_id=choice(customer_ids),
+                    car_id=choice(car_ids),
+                    max_price=randint(1000, 150000),
+                )
+                for i in range(count)
+            ],
+            batch_size=self.batch_size,
+        )
+
     def _generate_random_string(self) -> str:
         """
         _generate_random_string: Generates random string.
@@ -0,0 +1,470 @@
+"""
+offers.py: File, containing customer offer matching for a core application.
+"""
+
+
+import logging
+from typing import Iterable, Optional
+from decimal import Decimal
+from django.db import router, transaction
+from django.conf import settings
+from django.utils import timezone
+from django.db.models import Case, When, Count, IntegerField
+from core.discounts import DiscountEntry, ShowroomDiscountIndex, showroom_discount_index
+from core.responses import response_cache
+from customer.models import CustomerModel, CustomerOffer, CustomerHistory
+from showroom.models import ShowroomCar, ShowroomModel, ShowroomHistory
+from core.reservations import ReservationConflictError, inventory_reservation
+
+
+logger = logging.getLogger(__name__)
+
+
+class OfferMatcher:
+    """
+    OfferMatcher: Buys the cheapest showroom car for customer offers.
+    The cheapest active listing of the car is read from the partial (car, price, id) index of
+    showroom cars, discounts are taken from the discount index and customer purchases are
+    counted in the database, so every offer is settled in a bounded number of queries.
+    Pending offers can also be settled in batches: offers and available showroom cars are locked
+    with skip_locked, matched in one pass and committed with bulk writes.
+    """
+
+    def __init__(self, discount_index: Optional[ShowroomDiscountIndex] = None) -> None:
+        """
+        __init__: Instantiates OfferMatcher instance.
+
+        Args:
+            discount_index (Optional[ShowroomDiscountIndex]): Index of active showroom discounts.
+        """
+
+        self.discount_index: ShowroomDiscountIndex = discount_index or showroom_discount_index
+
+    def get_cheapest_car(self, car_id: int) -> Optional[ShowroomCar]:
+        """
+        get_cheapest_car: Returns the cheapest active showroom car with one index range read.
+
+        Args:
+            car_id (int): Car's pk.
+
+        Returns:
+            Optional[ShowroomCar]: ShowroomCar instance with selected showroom or None.
+        """
+
+        return (
+            ShowroomCar.objects.select_related('showroom')
+            .filter(car_id=car_id, is_active=True)
+            .order_by('price', 'pk')
+            .first()
+        )
+
+    def get_purchase_count(self, customer: CustomerModel) -> int:
+        """
+        get_purchase_count: Returns number of showroom purchases of the customer.
+
+        Args:
+            customer (CustomerModel): Customer instance.
+
+        Returns:
+            int: Number of purchases.
+        """
+
+        return ShowroomHistory.objects.filter(customer=customer).count()
+
+    def get_unique_customer_discount(
+        self, purchase_count: int, showroom: ShowroomModel
+    ) -> Decimal | int:
+        """
+        get_unique_customer_discount: Returns unique discount for customer if it has it otherwise 1.
+
+        Args:
+            purchase_count (int): Number of showroom purchases of the customer.
+            showroom (ShowroomModel): Showroom instance.
+
+        Returns:
+            Decimal | int: Customer unique discount.
+        """
+
+        if showroom.number_of_sales <= purchase_count:
+            return showroom.discount_for_unique_customers
+        return 1
+
+    def match(self, offer: CustomerOffer) -> Optional[tuple[ShowroomCar, Decimal]]:
+        """
+        match: Finds showroom car with the lowest price for the offer.
+
+        Args:
+            offer (CustomerOffer): CustomerOffer instance with selected customer.
+
+        Returns:
+            Optional[tuple[ShowroomCar, Decimal]]: Showroom car and its price or None.
+        """
+
+        cheapest_car: Optional[ShowroomCar] = self.get_cheapest_car(offer.car_id)
+
+        if cheapest_car is None:
+            return None
+
+        chosen_car: ShowroomCar = cheapest_car
+        price: Decimal = cheapest_car.price * self.get_unique_customer_discount(
+            self.get_purchase_count(offer.customer), cheapest_car.showroom
+        )
+
+        self.discount_index.ensure_fresh()
+        discount: Optional[DiscountEntry] = self.discount_index.get(offer.car_id)
+
+        if (
+            discount is not None
+            and discount.car is not None
+            and discount.car.price * discount.precent <= price
+        ):
+            chosen_car = discount.car
+            price = discount.car.price * discount.precent
+
+        if offer.max_price > price and offer.customer.balance >= price:
+            return chosen_car, price
+        return None
+
+    def settle(self, offer: CustomerOffer, showroom_car: ShowroomCar, price: Decimal) -> bool:
+        """
+        settle: Sells showroom car to the customer in one transaction.
+        Showroom car is claimed and customer balance is debited with conditional updates, so the
+        car is never sold twice and the balance never goes below zero.
+
+        Args:
+            offer (CustomerOffer): CustomerOffer instance with selected customer.
+            showroom_car (ShowroomCar): ShowroomCar instance with selected showroom.
+            price (Decimal): Purchase price.
+
+        Returns:
+            bool: True if showroom car has been sold otherwise False.
+        """
+
+        using: str = router.db_for_write(ShowroomCar)
+
+        try:
+            with transaction.atomic(using=using):
+                inventory_reservation.claim(
+                    ShowroomCar, [showroom_car.pk], using, user=offer.customer
+                )
+                inventory_reservation.debit(CustomerModel, {offer.customer_id: price}, using)
+
+                ShowroomHistory.objects.create(
+                    showroom=showroom_car.showroom,
+                    car_id=showroom_car.car_id,
+                    sale_price=price,
+                    customer=offer.customer,
+                )
+                CustomerHistory.objects.create(
+                    customer=offer.customer,
+                    car_id=showroom_car.car_id,
+                    purchase_price=price,
+                    showroom=showroom_car.showroom.name,
+                )
+                transaction.on_commit(
+                    lambda: self.invalidate([(offer, showroom_car, price)]), using=using
+                )
+        except ReservationConflictError as error:
+            logger.info(f'Offer {offer.pk} is not settled: {error}')
+            return False
+
+        showroom_car.is_active = False
+        return True
+
+    def invalidate(self, purchases: list[tuple[CustomerOffer, ShowroomCar, Decimal]]) -> None:
+        """
+        invalidate: Invalidates cached history of the showrooms and customers and discards sold
+        showroom cars, that are held by the discount index.
+
+        Args:
+            purchases (list[tuple[CustomerOffer, ShowroomCar, Decimal]]): Committed purchases.
+        """
+
+        response_cache.invalidate_owners(
+            ShowroomHistory, [showroom_car.showroom_id for _, showroom_car, _ in purchases]
+        )
+        response_cache.invalidate_owners(
+            CustomerHistory, [offer.customer_id for offer, _, _ in purchases]
+        )
+
+        for _, showroom_car, _ in purchases:
+            discount: Optional[DiscountEntry] = self.discount_index.get(showroom_car.car_id)
+
+            if (
+                discount is not None
+                and discount.car is not None
+                and discount.car.pk == showroom_car.pk
+            ):
+                self.discount_index.discard(showroom_car.car_id)
+
+    def run(self, offer_id: int) -> None:
+        """
+        run: Buys showroom car for the offer.
+        Offer is claimed first, so it is settled once even if it is picked by batch settlement.
+        If the chosen car is sold by concurrent offer, the offer is matched again with refreshed
+        customer balance at most OFFERS['MAX_ATTEMPTS'] times. Offer, that is not settled, is
+        released back to pending offers.
+
+        Args:
+            offer_id (int): CustomerOffer's pk.
+        """
+
+        if not CustomerOffer.objects.filter(pk=offer_id, is_active=True).update(
+            is_active=False, last_updated=timezone.now()
+        ):
+            return
+
+        offer: CustomerOffer = CustomerOffer.objects.select_related('customer').get(pk=offer_id)
+
+        for attempt in range(settings.OFFERS['MAX_ATTEMPTS']):
+            if attempt:
+                offer.customer.refresh_from_db(fields=['balance'])
+
+            match: Optional[tuple[ShowroomCar, Decimal]] = self.match(offer)
+
+            if match is None:
+                self.release(offer_id)
+                return
+
+            showroom_car, price = match
+
+            if self.settle(offer, showroom_car, price):
+                return
+
+            discount: Optional[DiscountEntry] = self.discount_index.get(showroom_car.car_id)
+
+            if discount is not None and discount.car is showroom_car:
+                self.discount_index.discard(showroom_car.car_id)
+
+        logger.warning(f'Offer {offer_id} is not settled: showroom cars are sold concurrently.')
+        self.release(offer_id)
+
+    def release(self, offer_id: int) -> None:
+        """
+        release: Returns claimed offer to pending offers, so it is matched by the next run.
+
+        Args:
+            offer_id (int): CustomerOffer's pk.
+        """
+
+        CustomerOffer.objects.filter(pk=offer_id, is_active=False).update(
+            is_active=True, last_updated=timezone.now()
+        )
+
+    def get_pending_offers(self) -> list[CustomerOffer]:
+        """
+        get_pending_offers: Locks and returns the oldest pending offers.
+        Offers locked by concurrent settlement are skipped.
+
+        Returns:
+            list[CustomerOffer]: CustomerOffer instances with selected customers.
+        """
+
+        return list(
+            inventory_reservation.lock_available(CustomerOffer.objects)
+            .select_related('customer')
+            .order_by('created_at', 'pk')[: settings.OFFERS['BATCH_SIZE']]
+        )
+
+    def get_purchase_counts(self, customer_ids: Iterable[int]) -> dict[int, int]:
+        """
+        get_purchase_counts: Returns number of showroom purchases for every customer.
+
+        Args:
+            customer_ids (Iterable[int]): Ids of the customers.
+
+        Returns:
+            dict[int, int]: Number of purchases for every customer id.
+        """
+
+        return dict(
+            ShowroomHistory.objects.filter(customer_id__in=customer_ids)
+            .values('customer_id')
+            .annotate(count=Count('pk'))
+            .values_list('customer_id', 'count')
+        )
+
+    def get_available_cars(self, car_ids: Iterable[int]) -> dict[int, list[ShowroomCar]]:
+        """
+        get_available_cars: Locks and returns active showroom cars ordered by price for every car.
+        Showroom cars locked by concurrent settlement are skipped, so they are never claimed twice.
+
+        Args:
+            car_ids (Iterable[int]): Ids of the cars.
+
+        Returns:
+            dict[int, list[ShowroomCar]]: Showroom cars with selected showrooms for every car id.
+        """
+
+        available_cars: dict[int, list[ShowroomCar]] = {}
+
+        for showroom_car in (
+            inventory_reservation.lock_available(ShowroomCar.objects)
+            .select_related('showroom')
+            .filter(car_id__in=car_ids)
+            .order_by('price', 'pk')
+        ):
+            available_cars.setdefault(showroom_car.car_id, []).append(showroom_car)
+
+        return available_cars
+
+    def plan_batch(
+        self,
+        offers: list[CustomerOffer],
+        purchase_counts: dict[int, int],
+        available_cars: dict[int, list[ShowroomCar]],
+    ) -> list[tuple[CustomerOffer, ShowroomCar, Decimal]]:
+        """
+        plan_batch: Matches offers in order of creation with available showroom cars.
+        Matched showroom cars are removed from available cars, purchase counts and customer
+        balances are updated in memory.
+
+        Args:
+            offers (list[CustomerOffer]): Pending offers.
+            purchase_counts (dict[int, int]): Number of purchases for every customer id.
+            available_cars (dict[int, list[ShowroomCar]]): Available showroom cars by car id.
+
+        Returns:
+            list[tuple[CustomerOffer, ShowroomCar, Decimal]]: Offers with bought cars and prices.
+        """
+
+        purchases: list[tuple[CustomerOffer, ShowroomCar, Decimal]] = []
+        balances: dict[int, Decimal] = {}
+
+        for offer in offers:
+            balances.setdefault(offer.customer_id, offer.customer.balance)
+            cars: list[ShowroomCar] = available_cars.get(offer.car_id, [])
+
+            if not cars:
+                continue
+
+            chosen_car: ShowroomCar = cars[0]
+            price: Decimal = chosen_car.price * self.get_unique_customer_discount(
+                purchase_counts.get(offer.customer_id, 0), chosen_car.showroom
+            )
+            discount: Optional[DiscountEntry] = self.discount_index.get(offer.car_id)
+
+            if discount is not None:
+                car_with_max_discount: Optional[ShowroomCar] = next(
+                    (car for car in cars if car.showroom_id == discount.owner_id), None
+                )
+
+                if (
+                    car_with_max_discount is not None
+                    and car_with_max_discount.price * discount.precent <= price
+                ):
+                    chosen_car = car_with_max_discount
+                    price = car_with_max_discount.price * discount.precent
+
+            if offer.max_price > price and balances[offer.customer_id] >= price:
+                cars.remove(chosen_car)
+                balances[offer.customer_id] -= price
+                purchase_counts[offer.customer_id] = purchase_counts.get(offer.customer_id, 0) + 1
+                purchases.append((offer, chosen_car, price))
+
+        return purchases
+
+    def commit_batch(
+        self,
+        offers: list[CustomerOffer],
+        purchases: list[tuple[CustomerOffer, ShowroomCar, Decimal]],
+    ) -> None:
+        """
+        commit_batch: Saves purchases and closes all offers of the batch with bulk writes.
+        Showroom cars are claimed and customer balances are debited with conditional updates.
+
+        Args:
+            offers (list[CustomerOffer]): Offers of the batch.
+            purchases (list[tuple[CustomerOffer, ShowroomCar, Decimal]]): Offers with bought
+            cars and prices.
+
+        Raises:
+            ReservationConflictError: Raises when showroom car is sold or balance is not enough.
+        """
+
+        using: str = router.db_for_write(CustomerOffer)
+        now = timezone.now()
+        debits: dict[int, Decimal] = {}
+
+        for offer, showroom_car, price in purchases:
+            showroom_car.is_active = False
+            showroom_car.user_id = offer.customer_id
+            debits[offer.customer_id] = debits.get(offer.customer_id, 0) + price
+
+        CustomerOffer.objects.filter(pk__in=[offer.pk for offer in offers]).update(
+            is_active=False, last_updated=now
+        )
+
+        if not purchases:
+            return
+
+        inventory_reservation.claim(
+            ShowroomCar,
+            [showroom_car.pk for _, showroom_car, _ in purchases],
+            using,
+            user=Case(
+                *[
+                    When(pk=showroom_car.pk, then=offer.customer_id)
+                    for offer, showroom_car, _ in purchases
+                ],
+                output_field=IntegerField(),
+            ),
+        )
+        inventory_reservation.debit(CustomerModel, debits, using)
+        ShowroomHistory.objects.bulk_create(
+            [
+                ShowroomHistory(
+                    showroom_id=showroom_car.showroom_id,
+                    car_id=showroom_car.car_id,
+                    sale_price=price,
+                    customer_id=offer.customer_id,
+                )
+                for offer, showroom_car, price in purchases
+            ]
+        )
+        CustomerHistory.objects.bulk_create(
+            [
+                CustomerHistory(
+                    customer_id=offer.customer_id,
+                    car_id=showroom_car.car_id,
+                    purchase_price=price,
+                    showroom=showroom_car.showroom.name,
+                )
+                for offer, showroom_car, price in purchases
+            ]
+        )
+
+    def run_batch(self) -> int:
+        """
+        run_batch: Settles a batch of pending offers in one transaction.
+        If any showroom car or balance of the batch has been changed concurrently, the batch is
+        rolled back and its offers are settled by the next run.
+
+        Returns:
+            int: Number of settled offers.
+        """
+
+        self.discount_index.ensure_fresh()
+        using: str = router.db_for_write(CustomerOffer)
+
+        try:
+            with transaction.atomic(using=using):
+                offers: list[CustomerOffer] = self.get_pending_offers()
+
+                if not offers:
+                    return 0
+
+                purchases: list[tuple[CustomerOffer, ShowroomCar, Decimal]] = self.plan_batch(
+                    offers,
+                    self.get_purchase_counts({offer.customer_id for offer in offers}),
+                    self.get_available_cars({offer.car_id for offer in offers}),
+                )
+                self.commit_batch(offers, purchases)
+
+                if purchases:
+                    transaction.on_commit(lambda: self.invalidate(purchases), using=using)
+        except ReservationConflictError as error:
+            logger.warning(f'Offer batch is postponed till the next run: {error}')
+            return 0
+
+        return len(purchases)
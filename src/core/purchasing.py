@@ -0,0 +1,413 @@
+"""
+purchasing.py: File, containing batched purchasing pipeline for a core application.
+"""
+
+
+import logging
+from typing import Iterable, Optional
+from decimal import Decimal
+from django.db import router, transaction
+from django.utils import timezone
+from django.db.models import Count
+from django.db.models.query import QuerySet
+from core.discounts import DiscountEntry, SupplierDiscountIndex, supplier_discount_index
+from core.responses import response_cache
+from core.selection import SupplierSelectionEngine
+from showroom.models import ShowroomCar, ShowroomModel, ShowroomHistory
+from supplier.models import SupplierCar, SupplierHistory
+from core.reservations import ReservationConflictError, inventory_reservation
+
+
+logger = logging.getLogger(__name__)
+
+
+class PurchasingPipeline:
+    """
+    PurchasingPipeline: Buys supplier cars for showrooms.
+    Supplier cars and history counts are preloaded in a few queries, active discounts are taken
+    from the discount index, purchases are decided in memory and committed per showroom with bulk
+    writes.
+    """
+
+    def __init__(
+        self,
+        selection_engine: Optional[SupplierSelectionEngine] = None,
+        discount_index: Optional[SupplierDiscountIndex] = None,
+    ) -> None:
+        """
+        __init__: Instantiates PurchasingPipeline instance.
+
+        Args:
+            selection_engine (Optional[SupplierSelectionEngine]): Engine that scores suppliers.
+            discount_index (Optional[SupplierDiscountIndex]): Index of active supplier discounts.
+        """
+
+        self.selection_engine: SupplierSelectionEngine = (
+            selection_engine or SupplierSelectionEngine()
+        )
+        self.discount_index: SupplierDiscountIndex = discount_index or supplier_discount_index
+
+    def get_showrooms(self, showrooms: QuerySet) -> list[ShowroomModel]:
+        """
+        get_showrooms: Returns showrooms with prefetched cars, suppliers and history count.
+
+        Args:
+            showrooms (QuerySet): Showrooms queryset.
+
+        Returns:
+            list[ShowroomModel]: Showroom instances.
+        """
+
+        return list(
+            showrooms.annotate(
+                supplier_history_count=Count('supplier_history', distinct=True),
+            )
+            .prefetch_related(
+                'appropriate_cars',
+                'current_suppliers',
+            )
+            .order_by('pk')
+        )
+
+    def get_sales_counts(
+        self, showrooms: Iterable[ShowroomModel], using: Optional[str] = None
+    ) -> dict[int, dict[int, int]]:
+        """
+        get_sales_counts: Returns number of active history entries for every car of showrooms.
+
+        Args:
+            showrooms (Iterable[ShowroomModel]): Showroom instances.
+            using (Optional[str]): Database to read from. Defaults to None.
+
+        Returns:
+            dict[int, dict[int, int]]: Number of sales of every car id for every showroom id.
+        """
+
+        sales_counts: dict[int, dict[int, int]] = {}
+
+        for showroom_id, car_id, count in (
+            ShowroomHistory.objects.using(using)
+            .filter(
+                showroom__in=[showroom.pk for showroom in showrooms],
+                car__isnull=False,
+                is_active=True,
+            )
+            .values('showroom_id', 'car_id')
+            .annotate(count=Count('pk'))
+            .values_list('showroom_id', 'car_id', 'count')
+        ):
+            sales_counts.setdefault(showroom_id, {})[car_id] = count
+
+        return sales_counts
+
+    def get_supplier_cars(
+        self, car_ids: Iterable[int], using: Optional[str] = None
+    ) -> dict[int, list[SupplierCar]]:
+        """
+        get_supplier_cars: Returns active supplier cars ordered by price for every car.
+        Supplier cars are read without locks, so concurrent runs plan from the same candidates
+        and the conditional claim in commit decides which of them buys the car.
+
+        Args:
+            car_ids (Iterable[int]): Ids of the cars.
+            using (Optional[str]): Database to read from. Defaults to None.
+
+        Returns:
+            dict[int, list[SupplierCar]]: Supplier cars for every car id.
+        """
+
+        supplier_cars: dict[int, list[SupplierCar]] = {}
+
+        for supplier_car in (
+            SupplierCar.objects.using(using)
+            .select_related('supplier')
+            .filter(car_id__in=car_ids, is_active=True)
+            .order_by('price', 'pk')
+        ):
+            supplier_cars.setdefault(supplier_car.car_id, []).append(supplier_car)
+
+        return supplier_cars
+
+    def get_cars_by_priority(self, showroom: ShowroomModel, sales_counts: dict[int, int]) -> list:
+        """
+        get_cars_by_priority: Returns appropriate car ids of the showroom ordered by priority.
+        Cars with sales go first ordered by number of sales, then other appropriate cars.
+
+        Args:
+            showroom (ShowroomModel): Showroom instance with prefetched appropriate cars.
+            sales_counts (dict[int, int]): Number of sales for every car id of the showroom.
+
+        Returns:
+            list: Ordered by priority list with car ids.
+        """
+
+        car_ids: list = [car.pk for car in showroom.appropriate_cars.all()]
+
+        return sorted(
+            (car_id for car_id in car_ids if car_id in sales_counts),
+            key=lambda car_id: sales_counts[car_id],
+        ) + [car_id for car_id in car_ids if car_id not in sales_counts]
+
+    def get_unique_showroom_discount(
+        self, showroom: ShowroomModel, supplier_car: SupplierCar
+    ) -> Decimal | int:
+        """
+        get_unique_showroom_discount: Returns unique discount for showroom if it has it otherwise 1.
+
+        Args:
+            showroom (ShowroomModel): Showroom instance with supplier history count.
+            supplier_car (SupplierCar): SupplierCar instance with selected supplier.
+
+        Returns:
+            Decimal | int: Showroom unique discount.
+        """
+
+        if supplier_car.supplier.number_of_sales <= showroom.supplier_history_count:
+            return supplier_car.supplier.discount_for_unique_customers
+        return 1
+
+    def choose_supplier_car(
+        self,
+        showroom: ShowroomModel,
+        car_id: int,
+        supplier_cars: list[SupplierCar],
+        purchase_metrics_count: int,
+    ) -> Optional[SupplierCar]:
+        """
+        choose_supplier_car: Returns the cheapest supplier car among current suppliers of showroom.
+
+        Args:
+            showroom (ShowroomModel): Showroom instance with prefetched current suppliers.
+            car_id (int): Car's pk.
+            supplier_cars (list[SupplierCar]): Available supplier cars of the car.
+            purchase_metrics_count (int): Max number of sales among active suppliers.
+
+        Returns:
+            Optional[SupplierCar]: SupplierCar instance or None.
+        """
+
+        supplier_ids: set = {supplier.pk for supplier in showroom.current_suppliers.all()}
+
+        return self.selection_engine.score(
+            [
+                supplier_car
+                for supplier_car in supplier_cars
+                if supplier_car.supplier_id in supplier_ids
+            ],
+            purchase_metrics_count,
+        ).get(car_id)
+
+    def plan(
+        self,
+        showroom: ShowroomModel,
+        sales_counts: dict[int, int],
+        supplier_cars: dict[int, list[SupplierCar]],
+        purchase_metrics_count: int,
+    ) -> list[tuple[SupplierCar, Decimal]]:
+        """
+        plan: Decides which supplier cars the showroom buys and at what price.
+        Bought supplier cars are removed from available supplier cars, balance and supplier
+        history count of the showroom are updated in memory.
+
+        Args:
+            showroom (ShowroomModel): Showroom instance from get_showrooms.
+            sales_counts (dict[int, int]): Number of sales for every car id of the showroom.
+            supplier_cars (dict[int, list[SupplierCar]]): Available supplier cars by car id.
+            purchase_metrics_count (int): Max number of sales among active suppliers.
+
+        Returns:
+            list[tuple[SupplierCar, Decimal]]: Bought supplier cars with purchase prices.
+        """
+
+        purchases: list[tuple[SupplierCar, Decimal]] = []
+
+        for car_id in self.get_cars_by_priority(showroom, sales_counts):
+            available_cars: list[SupplierCar] = supplier_cars.get(car_id, [])
+
+            supplier_car: Optional[SupplierCar] = self.choose_supplier_car(
+                showroom, car_id, available_cars, purchase_metrics_count
+            )
+
+            if supplier_car is None:
+                continue
+
+            price: Decimal = supplier_car.price * self.get_unique_showroom_discount(
+                showroom, supplier_car
+            )
+            chosen_car: SupplierCar = supplier_car
+            discount: Optional[DiscountEntry] = self.discount_index.get(car_id)
+
+            if discount is not None:
+                car_with_max_discount: Optional[SupplierCar] = next(
+                    (car for car in available_cars if car.supplier_id == discount.owner_id),
+                    None,
+                )
+
+                if (
+                    car_with_max_discount is not None
+                    and car_with_max_discount.price * discount.precent <= price
+                ):
+                    price = car_with_max_discount.price * discount.precent
+                    chosen_car = car_with_max_discount
+
+            if showroom.balance > price:
+                available_cars.remove(chosen_car)
+                showroom.balance -= price
+                showroom.supplier_history_count += 1
+                purchases.append((chosen_car, price))
+
+        return purchases
+
+    def commit(self, showroom: ShowroomModel, purchases: list[tuple[SupplierCar, Decimal]]) -> None:
+        """
+        commit: Saves purchases of the showroom with bulk writes in one transaction.
+        Supplier cars are claimed and showroom balance is debited with conditional updates, so if
+        any car has been bought by another purchase or the balance has been changed, purchases of
+        the showroom are rolled back. Cached responses and sold supplier cars held by the discount
+        index are invalidated after commit.
+
+        Args:
+            showroom (ShowroomModel): Showroom instance with updated balance.
+            purchases (list[tuple[SupplierCar, Decimal]]): Bought supplier cars with prices.
+
+        Raises:
+            ReservationConflictError: Raises when supplier car is sold or balance is not enough.
+        """
+
+        if not purchases:
+            return
+
+        now = timezone.now()
+
+        for supplier_car, _ in purchases:
+            supplier_car.is_active = False
+            supplier_car.last_updated = now
+
+        using: str = router.db_for_write(ShowroomCar)
+
+        with transaction.atomic(using=using):
+            inventory_reservation.claim(
+                SupplierCar, [supplier_car.pk for supplier_car, _ in purchases], using
+            )
+            inventory_reservation.debit(
+                ShowroomModel, {showroom.pk: sum(price for _, price in purchases)}, using
+            )
+
+            ShowroomCar.objects.bulk_create(
+                [
+                    ShowroomCar(car_id=supplier_car.car_id, price=price, showroom=showroom)
+                    for supplier_car, price in purchases
+                ]
+            )
+            SupplierHistory.objects.bulk_create(
+                [
+                    SupplierHistory(
+                        supplier_id=supplier_car.supplier_id,
+                        car_id=supplier_car.car_id,
+                        sale_price=price,
+                        showroom=showroom,
+                    )
+                    for supplier_car, price in purchases
+                ]
+            )
+            transaction.on_commit(lambda: self.invalidate(purchases), using=using)
+
+    def invalidate(self, purchases: list[tuple[SupplierCar, Decimal]]) -> None:
+        """
+        invalidate: Invalidates cached history of the suppliers and discards sold supplier cars,
+        that are held by the discount index.
+
+        Args:
+            purchases (list[tuple[SupplierCar, Decimal]]): Committed purchases.
+        """
+
+        response_cache.invalidate_owners(
+            SupplierHistory, [supplier_car.supplier_id for supplier_car, _ in purchases]
+        )
+
+        for supplier_car, _ in purchases:
+            discount: Optional[DiscountEntry] = self.discount_index.get(supplier_car.car_id)
+
+            if (
+                discount is not None
+                and discount.car is not None
+                and discount.car.pk == supplier_car.pk
+            ):
+                self.discount_index.discard(supplier_car.car_id)
+
+    def lock(self, showroom: ShowroomModel, using: str) -> bool:
+        """
+        lock: Locks the showroom till the end of the transaction, if it is not locked by other run.
+
+        Args:
+            showroom (ShowroomModel): Showroom instance.
+            using (str): Database to lock in.
+
+        Returns:
+            bool: True if the showroom is locked and still active otherwise False.
+        """
+
+        return bool(
+            ShowroomModel.objects.using(using)
+            .select_for_update(skip_locked=True)
+            .filter(pk=showroom.pk, is_active=True)
+            .values_list('pk', flat=True)
+        )
+
+    def run(self, showrooms: QuerySet, lock: bool = False) -> None:
+        """
+        run: Buys supplier cars for specified showrooms.
+        Every showroom is planned and committed in its own transaction, so purchases of a showroom
+        are durable as soon as they are committed.
+
+        Args:
+            showrooms (QuerySet): Showrooms queryset.
+            lock (bool): Skips showrooms, that are locked by other run. Defaults to False.
+        """
+
+        using: str = showrooms.db
+        showroom_list: list[ShowroomModel] = self.get_showrooms(showrooms)
+        self.discount_index.ensure_fresh()
+
+        car_ids: set = {
+            car.pk for showroom in showroom_list for car in showroom.appropriate_cars.all()
+        }
+
+        sales_counts: dict[int, dict[int, int]] = self.get_sales_counts(showroom_list, using)
+        supplier_cars: dict[int, list[SupplierCar]] = self.get_supplier_cars(car_ids, using)
+        purchase_metrics_count: int = self.selection_engine.get_purchase_metrics_count(using)
+
+        for showroom in showroom_list:
+            try:
+                with transaction.atomic(using=using):
+                    if lock and not self.lock(showroom, using):
+                        continue
+
+                    purchases: list[tuple[SupplierCar, Decimal]] = self.plan(
+                        showroom,
+                        sales_counts.get(showroom.pk, {}),
+                        supplier_cars,
+                        purchase_metrics_count,
+                    )
+                    self.commit(showroom, purchases)
+            except ReservationConflictError as error:
+                logger.warning(
+                    f'Purchases of showroom {showroom.pk} are postponed till the next run: {error}'
+                )
+
+    def run_locked(self, showroom_ids: Iterable[int]) -> None:
+        """
+        run_locked: Buys supplier cars for specified showrooms that are not locked by other run.
+        Every showroom is locked only while its purchases are planned and committed, so
+        overlapping runs never buy for the same showroom at the same time. Every read of the run
+        goes to the database that is used for writing.
+
+        Args:
+            showroom_ids (Iterable[int]): Ids of the showrooms.
+        """
+
+        using: str = router.db_for_write(ShowroomModel)
+        self.run(
+            ShowroomModel.objects.using(using).filter(pk__in=showroom_ids, is_active=True),
+            lock=True,
+        )
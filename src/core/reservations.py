@@ -0,0 +1,112 @@
+"""
+reservations.py: File, containing inventory reservation for a core application.
+"""
+
+
+from typing import Any, Iterable, Optional
+from decimal import Decimal
+from django.utils import timezone
+from django.db.models import F, Case, When, Model, DecimalField
+from django.db.models.query import QuerySet
+
+
+class ReservationConflictError(Exception):
+    """
+    ReservationConflictError: Raises when reserved rows have been changed by another transaction.
+    """
+
+
+class InventoryReservation:
+    """
+    InventoryReservation: Reserves cars and debits balances without lost updates.
+    Available cars are locked with skip_locked, so concurrent workers take different rows instead
+    of waiting for each other. Cars are claimed with UPDATE ... WHERE is_active and balances are
+    debited with UPDATE ... WHERE balance >= amount, so a car is never sold twice and a balance
+    never goes below zero, whatever the isolation level. Claims and debits must be called inside
+    a transaction, which is rolled back by ReservationConflictError.
+    """
+
+    def lock_available(self, queryset: QuerySet) -> QuerySet:
+        """
+        lock_available: Returns active rows of the queryset that are not locked by others.
+
+        Args:
+            queryset (QuerySet): Queryset of cars.
+
+        Returns:
+            QuerySet: Queryset that locks returned rows till the end of the transaction.
+        """
+
+        return queryset.select_for_update(skip_locked=True, of=('self',)).filter(is_active=True)
+
+    def claim(
+        self,
+        model: type[Model],
+        pks: Iterable[int],
+        using: Optional[str] = None,
+        **values: Any,
+    ) -> None:
+        """
+        claim: Deactivates rows that are still active and sets values for them.
+
+        Args:
+            model (type[Model]): Model of the rows.
+            pks (Iterable[int]): Pks of the rows.
+            using (Optional[str]): Database to write to. Defaults to None.
+            values (Any): Values or expressions to set for claimed rows.
+
+        Raises:
+            ReservationConflictError: Raises when any row has been claimed by another transaction.
+        """
+
+        pks = set(pks)
+
+        claimed: int = (
+            model.objects.using(using)
+            .filter(pk__in=pks, is_active=True)
+            .update(is_active=False, last_updated=timezone.now(), **values)
+        )
+
+        if claimed != len(pks):
+            raise ReservationConflictError(
+                f'{len(pks) - claimed} of {len(pks)} {model.__name__} rows '
+                'have been claimed by another transaction.'
+            )
+
+    def debit(
+        self, model: type[Model], debits: dict[int, Decimal], using: Optional[str] = None
+    ) -> None:
+        """
+        debit: Subtracts amounts from balances that are not less than the amounts.
+
+        Args:
+            model (type[Model]): Model with balance field.
+            debits (dict[int, Decimal]): Amount to subtract for every pk.
+            using (Optional[str]): Database to write to. Defaults to None.
+
+        Raises:
+            ReservationConflictError: Raises when any balance is less than its amount.
+        """
+
+        if not debits:
+            return
+
+        amount = Case(
+            *[When(pk=pk, then=debit) for pk, debit in debits.items()],
+            output_field=DecimalField(),
+        )
+
+        debited: int = (
+            model.objects.using(using)
+            .filter(pk__in=debits, balance__gte=amount)
+            .update(balance=F('balance') - amount, last_updated=timezone.now())
+        )
+
+        if debited != len(debits):
+            raise ReservationConflictError(
+                f'{len(debits) - debited} of {len(debits)} {model.__name__} rows '
+                'have not enough money.'
+            )
+
+
+inventory_reservation: InventoryReservation = InventoryReservation()
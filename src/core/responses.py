@@ -0,0 +1,409 @@
+"""
+responses.py: File, containing cache of API responses for a core application.
+"""
+
+
+import json
+import hashlib
+from uuid import uuid4
+from typing import Any, Callable, ClassVar, Iterable, Optional, Awaitable
+from django.apps import apps
+from django.conf import settings
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from django.db.models import Model, signals
+from django.core.cache import cache
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
+
+
+class ResponseCache:
+    """
+    ResponseCache: Cache of successful GET responses with versions of the models they show.
+    Every response is keyed by versions of its models, so write to any of them makes every
+    cached response with the model unreachable. Versions are changed by save, delete and
+    m2m_changed signals, bulk writes must call invalidate by themselves. Rows of partitioned
+    models belong to an owner and their writes change only the version of the owner, so only
+    responses rendered for the owner are invalidated. Responses of partitioned models must be
+    rendered for an owner, bulk changes of partitioned models invalidate every owner.
+    """
+
+    key_prefix: ClassVar[str] = 'responses'
+
+    def __init__(self) -> None:
+        """
+        __init__: Instantiates ResponseCache instance.
+        """
+
+        self.watched: set[type[Model]] = set()
+        self.owner_fields: dict[type[Model], str] = {}
+
+    def get_version_key(self, model: type[Model], owner_id: Optional[int] = None) -> str:
+        """
+        get_version_key: Returns cache key of the model version or version of the model owner.
+
+        Args:
+            model (type[Model]): Model class.
+            owner_id (Optional[int]): Owner's pk. Defaults to None (the whole model).
+
+        Returns:
+            str: Cache key.
+        """
+
+        if owner_id is None:
+            return f'{self.key_prefix}:{model._meta.label_lower}:version'
+        return f'{self.key_prefix}:{model._meta.label_lower}:{owner_id}:version'
+
+    def get_versions(self, models: list[type[Model]], owner_id: Optional[int] = None) -> list[str]:
+        """
+        get_versions: Returns current versions of the models.
+        Versions of the owner are added for partitioned models.
+
+        Args:
+            models (list[type[Model]]): Model classes.
+            owner_id (Optional[int]): Owner's pk. Defaults to None.
+
+        Returns:
+            list[str]: Versions in order of models.
+        """
+
+        keys: list[str] = [self.get_version_key(model) for model in models]
+
+        if owner_id is not None:
+            keys += [
+                self.get_version_key(model, owner_id)
+                for model in models
+                if model in self.owner_fields
+            ]
+
+        versions: dict[str, Any] = cache.get_many(keys)
+
+        for key in keys:
+            if key not in versions:
+                cache.add(key, uuid4().hex, timeout=None)
+                versions[key] = cache.get(key)
+
+        return [versions[key] for key in keys]
+
+    def invalidate(self, *models: type[Model]) -> None:
+        """
+        invalidate: Changes versions of the models, so their cached responses are not used.
+
+        Args:
+            models (type[Model]): Model classes.
+        """
+
+        cache.set_many({self.get_version_key(model): uuid4().hex for model in models}, timeout=None)
+
+    def invalidate_owners(self, model: type[Model], owner_ids: Iterable[int]) -> None:
+        """
+        invalidate_owners: Changes versions of the owners of partitioned model, so only their
+        cached responses are not used.
+
+        Args:
+            model (type[Model]): Partitioned model class.
+            owner_ids (Iterable[int]): Owners' pks.
+        """
+
+        versions: dict[str, str] = {
+            self.get_version_key(model, owner_id): uuid4().hex for owner_id in set(owner_ids)
+        }
+
+        if versions:
+            cache.set_many(versions, timeout=None)
+
+    def receive(self, sender: type[Model], instance: Optional[Model] = None, **kwargs: Any) -> None:
+        """
+        receive: Invalidates responses of the model that sent the signal.
+        Responses of the owner are invalidated for rows of partitioned models.
+
+        Args:
+            sender (type[Model]): Model class.
+            instance (Optional[Model]): Changed row. Defaults to None.
+        """
+
+        owner_id: Optional[int] = (
+            getattr(instance, f'{self.owner_fields[sender]}_id')
+            if sender in self.owner_fields and instance is not None
+            else None
+        )
+
+        if owner_id is None:
+            self.invalidate(sender)
+        else:
+            self.invalidate_owners(sender, [owner_id])
+
+    def partition_models(self, owner_fields: dict[str, str]) -> None:
+        """
+        partition_models: Partitions versions of the models by their owners.
+
+        Args:
+            owner_fields (dict[str, str]): Names of the owner foreign keys for labels of the
+            models in format <app_label>.<model_name>.
+        """
+
+        for label, owner_field in owner_fields.items():
+            self.owner_fields[apps.get_model(label)] = owner_field
+
+    def watch_models(self, labels: list[str], deletes: bool = True) -> None:
+        """
+        watch_models: Connects signals of the models, that are specified by their labels.
+
+        Args:
+            labels (list[str]): Labels of the models in format <app_label>.<model_name>.
+            deletes (bool): Watch deletes of the models. Defaults to True.
+        """
+
+        for label in labels:
+            self.watch(apps.get_model(label), deletes)
+
+    def watch(self, model: type[Model], deletes: bool = True) -> None:
+        """
+        watch: Connects model signals, so writes to the model invalidate its responses.
+        Auto-created through models are watched for m2m changes only and models, whose deletes
+        are not watched, for saves only, so their cascade deletes stay bulk deletes.
+
+        Args:
+            model (type[Model]): Model class.
+            deletes (bool): Watch deletes of the model. Defaults to True.
+        """
+
+        if model in self.watched:
+            return
+
+        self.watched.add(model)
+        uid: str = f'response_cache:{model._meta.label_lower}'
+
+        if model._meta.auto_created:
+            signals.m2m_changed.connect(self.receive, sender=model, dispatch_uid=uid)
+        else:
+            signals.post_save.connect(self.receive, sender=model, dispatch_uid=uid)
+
+            if deletes:
+                signals.post_delete.connect(self.receive, sender=model, dispatch_uid=uid)
+
+    def get_key(
+        self,
+        request: Request,
+        scope: str,
+        models: list[type[Model]],
+        owner_id: Optional[int] = None,
+    ) -> str:
+        """
+        get_key: Returns cache key of the response to the request.
+
+        Args:
+            request (Request): Request instance.
+            scope (str): Scope of the response, e.g. the user it is rendered for.
+            models (list[type[Model]]): Models that the response shows.
+            owner_id (Optional[int]): Owner of the shown rows of partitioned models.
+            Defaults to None.
+
+        Returns:
+            str: Cache key.
+        """
+
+        digest: str = hashlib.sha256(
+            json.dumps(
+                [request.get_full_path(), scope, self.get_versions(models, owner_id)],
+            ).encode()
+        ).hexdigest()
+
+        return f'{self.key_prefix}:{digest}'
+
+    def get_etag(self, content: bytes) -> str:
+        """
+        get_etag: Returns strong ETag of the rendered response.
+
+        Args:
+            content (bytes): Rendered response.
+
+        Returns:
+            str: Quoted ETag.
+        """
+
+        return f'"{hashlib.sha256(content).hexdigest()}"'
+
+    def respond(
+        self,
+        request: Request,
+        scope: str,
+        models: list[type[Model]],
+        handler: Callable[[], Response],
+        owner_id: Optional[int] = None,
+    ) -> Response:
+        """
+        respond: Returns cached response or response of the handler, replies 304 on If-None-Match.
+
+        Args:
+            request (Request): Request instance.
+            scope (str): Scope of the response, e.g. the user it is rendered for.
+            models (list[type[Model]]): Models that the response shows.
+            handler (Callable[[], Response]): Renders response when it is not cached.
+            owner_id (Optional[int]): Owner of the shown rows of partitioned models.
+            Defaults to None.
+
+        Returns:
+            Response: Response instance.
+        """
+
+        key: str = self.get_key(request, scope, models, owner_id)
+        entry: Optional[tuple[str, Any]] = cache.get(key)
+
+        if entry is None:
+            response: Response = handler()
+
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+            entry = self.get_entry(response)
+            cache.set(key, entry, timeout=settings.RESPONSE_CACHE['TIMEOUT_SECONDS'])
+
+        return self.get_response(request, entry)
+
+    async def arespond(
+        self,
+        request: Request,
+        scope: str,
+        models: list[type[Model]],
+        handler: Callable[[], Awaitable[Response]],
+        owner_id: Optional[int] = None,
+    ) -> Response:
+        """
+        arespond: Async version of respond for async views.
+
+        Args:
+            request (Request): Request instance.
+            scope (str): Scope of the response, e.g. the user it is rendered for.
+            models (list[type[Model]]): Models that the response shows.
+            handler (Callable[[], Awaitable[Response]]): Renders response when it is not cached.
+            owner_id (Optional[int]): Owner of the shown rows of partitioned models.
+            Defaults to None.
+
+        Returns:
+            Response: Response instance.
+        """
+
+        key: str = await sync_to_async(self.get_key)(request, scope, models, owner_id)
+        entry: Optional[tuple[str, Any]] = await cache.aget(key)
+
+        if entry is None:
+            response: Response = await handler()
+
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+            entry = self.get_entry(response)
+            await cache.aset(key, entry, timeout=settings.RESPONSE_CACHE['TIMEOUT_SECONDS'])
+
+        return self.get_response(request, entry)
+
+    def get_entry(self, response: Response) -> tuple[str, Any]:
+        """
+        get_entry: Returns cache entry of the successful response.
+
+        Args:
+            response (Response): Response of the handler.
+
+        Returns:
+            tuple[str, Any]: ETag and data of the response.
+        """
+
+        content: bytes = JSONRenderer().render(response.data)
+        return self.get_etag(content), json.loads(content)
+
+    def get_response(self, request: Request, entry: tuple[str, Any]) -> Response:
+        """
+        get_response: Returns response of the cache entry, replies 304 on If-None-Match.
+
+        Args:
+            request (Request): Request instance.
+            entry (tuple[str, Any]): ETag and data of the response.
+
+        Returns:
+            Response: Response instance.
+        """
+
+        etag, data = entry
+
+        if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data, status=status.HTTP_200_OK)
+
+        response['ETag'] = etag
+        return response
+
+
+response_cache: ResponseCache = ResponseCache()
+
+
+class CachedResponseMixin:
+    """
+    CachedResponseMixin: Serves list and retrieve actions of a viewset from the response cache.
+    Responses are cached for every user separately and are invalidated by writes to
+    cache_models, which default to the model of the viewset queryset. The models must be listed
+    in RESPONSE_CACHE['WATCHED_MODELS'], so their signals are connected in every process.
+    """
+
+    cache_models: ClassVar[list[type[Model]]] = []
+
+    def get_cache_models(self) -> list[type[Model]]:
+        """
+        get_cache_models: Returns models that responses of the viewset show.
+
+        Returns:
+            list[type[Model]]: Model classes.
+        """
+
+        return self.cache_models or [self.queryset.model]
+
+    def get_cache_scope(self, request: Request) -> str:
+        """
+        get_cache_scope: Returns scope of the response, responses are not shared between scopes.
+
+        Args:
+            request (Request): Request instance.
+
+        Returns:
+            str: Scope of the response.
+        """
+
+        return f'user:{request.user.pk if request.user else None}'
+
+    def list(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        """
+        list: Returns cached list of the resources.
+
+        Args:
+            request (Request): Request instance.
+
+        Returns:
+            Response: Response instance.
+        """
+
+        return response_cache.respond(
+            request,
+            self.get_cache_scope(request),
+            self.get_cache_models(),
+            lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        """
+        retrieve: Returns cached resource.
+
+        Args:
+            request (Request): Request instance.
+
+        Returns:
+            Response: Response instance.
+        """
+
+        return response_cache.respond(
+            request,
+            self.get_cache_scope(request),
+            self.get_cache_models(),
+            lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs),
+        )
@@ -0,0 +1,228 @@
+"""
+schedulers.py: File, containing discount scheduler for a core application.
+"""
+
+
+from typing import ClassVar, Optional
+from datetime import datetime
+from redis import Redis
+from django.conf import settings
+from django.utils import timezone
+from django.db.models import Model
+from showroom.models import ShowroomCarDiscount
+from supplier.models import SupplierCarDiscount
+
+
+class DiscountScheduler:
+    """
+    DiscountScheduler: Activates discounts at start date and deactivates them at finish date.
+    Start and finish dates are kept in Redis sorted sets, so every run reads and updates only
+    discounts which are due instead of scanning discount tables.
+    """
+
+    discount_models: ClassVar[dict[str, type[Model]]] = {
+        'showroom': ShowroomCarDiscount,
+        'supplier': SupplierCarDiscount,
+    }
+    activation_key: ClassVar[str] = 'discounts:activation'
+    expiry_key: ClassVar[str] = 'discounts:expiry'
+
+    def __init__(self, url: Optional[str] = None) -> None:
+        """
+        __init__: Instantiates DiscountScheduler instance.
+
+        Args:
+            url (Optional[str]): Redis url. Defaults to None (url from DISCOUNTS settings).
+        """
+
+        self.url: Optional[str] = url
+        self._client: Optional[Redis] = None
+
+    @property
+    def client(self) -> Redis:
+        """
+        client: Returns Redis client, connects to Redis on first use.
+
+        Returns:
+            Redis: Redis client.
+        """
+
+        if self._client is None:
+            self._client = Redis.from_url(self.url or settings.DISCOUNTS['SCHEDULER_URL'])
+        return self._client
+
+    def get_member(self, discount: Model) -> str:
+        """
+        get_member: Returns member of sorted sets for the discount.
+
+        Args:
+            discount (Model): ShowroomCarDiscount or SupplierCarDiscount instance.
+
+        Returns:
+            str: Sorted set member in format <owner>:<pk>.
+        """
+
+        for owner, discount_model in self.discount_models.items():
+            if isinstance(discount, discount_model):
+                return f'{owner}:{discount.pk}'
+
+        raise TypeError(f'{type(discount).__name__} is not a discount model.')
+
+    def register(self, discount: Model) -> bool:
+        """
+        register: Deactivates discount till its start date, schedules its activation and expiry.
+
+        Args:
+            discount (Model): Created ShowroomCarDiscount or SupplierCarDiscount instance.
+
+        Returns:
+            bool: True if discount is active now otherwise False.
+        """
+
+        member: str = self.get_member(discount)
+
+        if discount.is_active and discount.start_date > timezone.now():
+            discount.is_active = False
+            type(discount).objects.filter(pk=discount.pk).update(is_active=False)
+
+        pipeline = self.client.pipeline()
+
+        if not discount.is_active:
+            pipeline.zadd(self.activation_key, {member: discount.start_date.timestamp()})
+
+        pipeline.zadd(self.expiry_key, {member: discount.finish_date.timestamp()})
+        pipeline.execute()
+
+        return discount.is_active
+
+    def get_due(self, key: str, now: datetime) -> tuple[list[bytes], dict[str, list[int]]]:
+        """
+        get_due: Returns discounts that are due without removing them from the sorted set.
+
+        Args:
+            key (str): Sorted set key.
+            now (datetime): Current time.
+
+        Returns:
+            tuple[list[bytes], dict[str, list[int]]]: Due members and ids of due discounts for
+            every owner.
+        """
+
+        members: list[bytes] = self.client.zrangebyscore(key, '-inf', now.timestamp())
+        due: dict[str, list[int]] = {}
+
+        for member in members:
+            owner, pk = member.decode().split(':')
+            due.setdefault(owner, []).append(int(pk))
+
+        return members, due
+
+    def remove(self, key: str, members: list[bytes]) -> None:
+        """
+        remove: Removes handled members from the sorted set.
+
+        Args:
+            key (str): Sorted set key.
+            members (list[bytes]): Sorted set members.
+        """
+
+        if members:
+            self.client.zrem(key, *members)
+
+    def activate(self, now: Optional[datetime] = None) -> dict[str, int]:
+        """
+        activate: Activates discounts whose start date has come.
+        Discounts of deleted owners and discounts that are already finished stay inactive.
+        Members are removed only after the update, so failed run is repeated by the next one.
+
+        Args:
+            now (Optional[datetime]): Current time. Defaults to None (timezone.now()).
+
+        Returns:
+            dict[str, int]: Number of activated discounts for every owner.
+        """
+
+        now = now or timezone.now()
+        members, due = self.get_due(self.activation_key, now)
+
+        activated: dict[str, int] = {
+            owner: (
+                self.discount_models[owner]
+                .objects.filter(
+                    pk__in=ids,
+                    is_active=False,
+                    start_date__lte=now,
+                    finish_date__gt=now,
+                    **{f'{owner}__is_active': True},
+                )
+                .update(is_active=True, last_updated=now)
+            )
+            for owner, ids in due.items()
+        }
+
+        self.remove(self.activation_key, members)
+        return activated
+
+    def expire(self, now: Optional[datetime] = None) -> dict[str, int]:
+        """
+        expire: Deactivates discounts whose finish date has come.
+        Members are removed only after the update, so failed run is repeated by the next one.
+
+        Args:
+            now (Optional[datetime]): Current time. Defaults to None (timezone.now()).
+
+        Returns:
+            dict[str, int]: Number of deactivated discounts for every owner.
+        """
+
+        now = now or timezone.now()
+        members, due = self.get_due(self.expiry_key, now)
+
+        expired: dict[str, int] = {
+            owner: (
+                self.discount_models[owner]
+                .objects.filter(
+                    pk__in=ids,
+                    is_active=True,
+                    finish_date__lte=now,
+                )
+                .update(is_active=False, last_updated=now)
+            )
+            for owner, ids in due.items()
+        }
+
+        self.remove(self.expiry_key, members)
+        return expired
+
+    def sync(self, now: Optional[datetime] = None) -> None:
+        """
+        sync: Schedules discounts which have not been registered, e.g. created by admin.
+        Every active discount is scheduled for expiry and every unfinished inactive discount for
+        activation, so discounts, whose dates have passed while they were not scheduled, are due
+        at the next run.
+
+        Args:
+            now (Optional[datetime]): Current time. Defaults to None (timezone.now()).
+        """
+
+        now = now or timezone.now()
+        pipeline = self.client.pipeline()
+
+        for owner, discount_model in self.discount_models.items():
+            for pk, finish_date in discount_model.objects.filter(is_active=True).values_list(
+                'pk', 'finish_date'
+            ):
+                pipeline.zadd(self.expiry_key, {f'{owner}:{pk}': finish_date.timestamp()})
+
+            for pk, start_date, finish_date in discount_model.objects.filter(
+                is_active=False,
+                finish_date__gt=now,
+                **{f'{owner}__is_active': True},
+            ).values_list('pk', 'start_date', 'finish_date'):
+                pipeline.zadd(self.activation_key, {f'{owner}:{pk}': start_date.timestamp()})
+                pipeline.zadd(self.expiry_key, {f'{owner}:{pk}': finish_date.timestamp()})
+
+        pipeline.execute()
+
+
+discount_scheduler: DiscountScheduler = DiscountScheduler()
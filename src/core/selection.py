@@ -0,0 +1,198 @@
+"""
+selection.py: File, containing set-based supplier selection engine for a core application.
+"""
+
+
+from typing import Iterable, Optional
+from decimal import Decimal
+from django.db import router, transaction
+from django.db.models import Max
+from django.db.models.query import QuerySet
+from core.responses import response_cache
+from showroom.models import ShowroomModel
+from supplier.models import SupplierCar, SupplierModel
+
+
+class SupplierSelectionEngine:
+    """
+    SupplierSelectionEngine: Finds the cheapest supplier for every appropriate car of showrooms.
+    Active supplier cars are loaded once per run, every (car, supplier) pair is scored in one pass
+    and current suppliers of all showrooms are rewritten with bulk inserts.
+    """
+
+    def get_purchase_metrics_count(self, using: Optional[str] = None) -> int:
+        """
+        get_purchase_metrics_count: Returns max number of sales among active suppliers.
+
+        Args:
+            using (Optional[str]): Database to read from. Defaults to None.
+
+        Returns:
+            int: Max number of sales after which supplier provides discount.
+        """
+
+        purchase_metrics_count: Optional[int] = (
+            SupplierModel.objects.using(using)
+            .filter(
+                is_active=True,
+            )
+            .aggregate(
+                Max('number_of_sales'),
+            )
+            .get('number_of_sales__max')
+        )
+
+        return purchase_metrics_count or 0
+
+    def get_total_price(self, supplier_car: SupplierCar, purchase_metrics_count: int) -> Decimal:
+        """
+        get_total_price: Returns price of the supplier car for hundred purchases.
+
+        Args:
+            supplier_car (SupplierCar): SupplierCar instance with selected supplier.
+            purchase_metrics_count (int): Max number of sales among active suppliers.
+
+        Returns:
+            Decimal: Total price for hundred purchases.
+        """
+
+        purchases_with_discount: int = (
+            purchase_metrics_count - supplier_car.supplier.number_of_sales
+        )
+
+        return (
+            purchases_with_discount
+            * supplier_car.price
+            * supplier_car.supplier.discount_for_unique_customers
+            + supplier_car.supplier.number_of_sales * supplier_car.price
+        )
+
+    def score(
+        self, supplier_cars: Iterable[SupplierCar], purchase_metrics_count: int
+    ) -> dict[int, SupplierCar]:
+        """
+        score: Scores every (car, supplier) pair and keeps the cheapest supplier car for each car.
+
+        Args:
+            supplier_cars (Iterable[SupplierCar]): Active supplier cars ordered by price.
+            purchase_metrics_count (int): Max number of sales among active suppliers.
+
+        Returns:
+            dict[int, SupplierCar]: Cheapest supplier car for every car id.
+        """
+
+        cheapest_cars: dict[int, SupplierCar] = {}
+        min_total_prices: dict[int, Decimal] = {}
+
+        for supplier_car in supplier_cars:
+            total_price: Decimal = self.get_total_price(supplier_car, purchase_metrics_count)
+
+            if supplier_car.car_id not in min_total_prices or (
+                total_price < min_total_prices[supplier_car.car_id]
+            ):
+                min_total_prices[supplier_car.car_id] = total_price
+                cheapest_cars[supplier_car.car_id] = supplier_car
+
+        return cheapest_cars
+
+    def find_cheapest_cars(self, car_ids: Iterable[int]) -> dict[int, SupplierCar]:
+        """
+        find_cheapest_cars: Finds the cheapest supplier car for every specified car.
+
+        Args:
+            car_ids (Iterable[int]): Ids of the cars.
+
+        Returns:
+            dict[int, SupplierCar]: Cheapest supplier car for every car id that has one.
+        """
+
+        supplier_cars: QuerySet = (
+            SupplierCar.objects.select_related(
+                'supplier',
+            )
+            .filter(
+                car_id__in=car_ids,
+                is_active=True,
+            )
+            .order_by('price', 'pk')
+        )
+
+        return self.score(supplier_cars, self.get_purchase_metrics_count())
+
+    def get_appropriate_cars(self, showrooms: QuerySet) -> dict[int, list[int]]:
+        """
+        get_appropriate_cars: Returns ids of appropriate cars for every showroom.
+
+        Args:
+            showrooms (QuerySet): Showrooms queryset.
+
+        Returns:
+            dict[int, list[int]]: Car ids for every showroom id.
+        """
+
+        appropriate_cars: dict[int, list[int]] = {}
+
+        for showroom_id, car_id in ShowroomModel.appropriate_cars.through.objects.filter(
+            showroommodel__in=showrooms,
+        ).values_list('showroommodel_id', 'carmodel_id'):
+            appropriate_cars.setdefault(showroom_id, []).append(car_id)
+
+        return appropriate_cars
+
+    def select(self, showrooms: QuerySet) -> dict[int, set[int]]:
+        """
+        select: Selects suppliers for every appropriate car of specified showrooms.
+
+        Args:
+            showrooms (QuerySet): Showrooms queryset.
+
+        Returns:
+            dict[int, set[int]]: Supplier ids for every showroom id.
+        """
+
+        appropriate_cars: dict[int, list[int]] = self.get_appropriate_cars(showrooms)
+
+        cheapest_cars: dict[int, SupplierCar] = self.find_cheapest_cars(
+            {car_id for car_ids in appropriate_cars.values() for car_id in car_ids}
+        )
+
+        return {
+            showroom_id: {
+                cheapest_cars[car_id].supplier_id for car_id in car_ids if car_id in cheapest_cars
+            }
+            for showroom_id, car_ids in appropriate_cars.items()
+        }
+
+    def save(self, showrooms: QuerySet, showroom_suppliers: dict[int, set[int]]) -> None:
+        """
+        save: Replaces current suppliers of showrooms with bulk insert, invalidates responses.
+
+        Args:
+            showrooms (QuerySet): Showrooms queryset.
+            showroom_suppliers (dict[int, set[int]]): Supplier ids for every showroom id.
+        """
+
+        through: type = SupplierModel.showrooms.through
+
+        with transaction.atomic(using=router.db_for_write(through)):
+            through.objects.filter(showroommodel__in=showrooms).delete()
+            through.objects.bulk_create(
+                [
+                    through(showroommodel_id=showroom_id, suppliermodel_id=supplier_id)
+                    for showroom_id, supplier_ids in showroom_suppliers.items()
+                    for supplier_id in supplier_ids
+                ],
+                ignore_conflicts=True,
+            )
+
+        response_cache.invalidate(through)
+
+    def run(self, showrooms: QuerySet) -> None:
+        """
+        run: Selects and saves current suppliers for specified showrooms.
+
+        Args:
+            showrooms (QuerySet): Showrooms queryset.
+        """
+
+        self.save(showrooms, self.select(showrooms))
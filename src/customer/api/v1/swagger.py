@@ -5,7 +5,8 @@ swagger.py: File, containg schema extensions for extend schema decorator.
 
 from rest_framework import status
 from drf_spectacular.utils import OpenApiResponse
-from config.swagger import ForbiddenSerializer, UnauthorizedSerializer
+from config.swagger import ForbiddenSerializer, RelatedListParameters, UnauthorizedSerializer
+from core.api.v1.serializers import SalesQuerySerializer, SalesStatisticsSerializer
 from customer.api.v1.serializers import CustomerSerializer, CustomerHistorySerializer
 
 
@@ -102,6 +103,7 @@ customer_get_statistics_schema_extension: dict = {
     'description': """
       Returns statistics for customer. Includes info about deals with showrooms.
     """,
+    'parameters': RelatedListParameters,
     'responses': {
         status.HTTP_200_OK: CustomerHistorySerializer,
         status.HTTP_401_UNAUTHORIZED: UnauthorizedSerializer,
@@ -109,6 +111,24 @@ customer_get_statistics_schema_extension: dict = {
     },
 }
 
+customer_get_analytics_schema_extension: dict = {
+    'summary': 'Getting sales analytics for customer',
+    'description': """
+      Returns spendings, bought cars, average purchase price, top cars
+      and purchases per day or week of the customer.
+    """,
+    'parameters': [SalesQuerySerializer],
+    'responses': {
+        status.HTTP_200_OK: SalesStatisticsSerializer,
+        status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+            response=SalesQuerySerializer,
+            description='Query parameters, that are not correct',
+        ),
+        status.HTTP_401_UNAUTHORIZED: UnauthorizedSerializer,
+        status.HTTP_403_FORBIDDEN: ForbiddenSerializer,
+    },
+}
+
 customer_make_offer_schema_extensions: dict = {
     'summary': 'Creating customer offer for buying a car.',
     'description': """
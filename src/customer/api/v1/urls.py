@@ -3,8 +3,11 @@ urls.py: File, containing routes for a customer application.
 """
 
 
+from django.conf import settings
+from django.urls import re_path
 from rest_framework.routers import SimpleRouter
 from customer.api.v1 import views
+from core.api.v1.views import SalesAnalyticsAsyncView
 
 
 app_name: str = 'customer'
@@ -14,3 +17,14 @@ router: SimpleRouter = SimpleRouter()
 router.register(prefix='customers', viewset=views.CustomerViewSet, basename='customer')
 
 urlpatterns: list = router.urls
+
+if settings.ASYNC_VIEWS:
+    urlpatterns = [
+        re_path(
+            r'^customers/(?P<pk>[^/.]+)/get_analytics/$',
+            SalesAnalyticsAsyncView.as_view(
+                viewset_class=views.CustomerViewSet, price='purchase_price'
+            ),
+            name='customer-get-analytics-async',
+        ),
+    ] + urlpatterns
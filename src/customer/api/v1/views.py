@@ -3,8 +3,10 @@ views.py: File, containing views for a customer application.
 """
 
 
-from typing import ClassVar
+from typing import Union, ClassVar
+from django.http import StreamingHttpResponse
 from rest_framework import status, viewsets
+from django.db.models import Prefetch
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from django.db.models.query import QuerySet
 from rest_framework.filters import SearchFilter, OrderingFilter
@@ -13,8 +15,12 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
+from core.analytics import sales_analytics
 from customer.models import CustomerModel, CustomerOffer
+from showroom.models import ShowroomCar
+from config.paginators import RelatedListMixin
 from customer.services import CustomerService
+from core.api.v1.serializers import SalesStatisticsSerializer
 from customer.api.v1.swagger import (
     customer_list_schema_extension,
     customer_create_schema_extension,
@@ -22,6 +28,7 @@ from customer.api.v1.swagger import (
     customer_destroy_schema_extension,
     customer_retrieve_schema_extension,
     customer_make_offer_schema_extensions,
+    customer_get_analytics_schema_extension,
     customer_get_statistics_schema_extension,
     customer_partial_update_schema_extension,
 )
@@ -42,9 +49,10 @@ from customer.api.v1.serializers import (
     retrieve=extend_schema(**customer_retrieve_schema_extension),
     partial_update=extend_schema(**customer_partial_update_schema_extension),
     get_statistics=extend_schema(**customer_get_statistics_schema_extension),
+    get_analytics=extend_schema(**customer_get_analytics_schema_extension),
     make_offer=extend_schema(**customer_make_offer_schema_extensions),
 )
-class CustomerViewSet(viewsets.ModelViewSet):
+class CustomerViewSet(RelatedListMixin, viewsets.ModelViewSet):
     """
     CustomerViewSet: Handling every action for a Customer resource.
     Maps HTTP methods to actions:
@@ -58,6 +66,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
         DELETE -> destroy
 
     Args:
+        RelatedListMixin (_type_): Paginates or streams related resources.
         viewsets.ModelViewSet (_type_): Builtin superclass for a CustomerViewSet.
     """
 
@@ -111,11 +120,23 @@ class CustomerViewSet(viewsets.ModelViewSet):
         'get_statistics': [
             IsAuthenticated & (IsCustomerOwner | IsAdminUser),
         ],
+        'get_analytics': [
+            IsAuthenticated & (IsCustomerOwner | IsAdminUser),
+        ],
         'make_offer': [
             IsAuthenticated & (IsCustomerOwner | IsAdminUser),
         ],
     }
 
+    prefetch_map: ClassVar[dict] = {
+        'list': [
+            Prefetch('cars', ShowroomCar.objects.only('pk', 'user')),
+        ],
+        'retrieve': [
+            Prefetch('cars', ShowroomCar.objects.only('pk', 'user')),
+        ],
+    }
+
     def get_permissions(self) -> list:
         """
         get_permissions: Returns apropriate permission classes according to action.
@@ -127,6 +148,16 @@ class CustomerViewSet(viewsets.ModelViewSet):
         self.permission_classes: list = self.permission_map.get(self.action, [])
         return super().get_permissions()
 
+    def get_queryset(self) -> QuerySet[CustomerModel]:
+        """
+        get_queryset: Returns queryset with relations that serializer of the action renders.
+
+        Returns:
+            QuerySet[CustomerModel]: Queryset of the resources.
+        """
+
+        return super().get_queryset().prefetch_related(*self.prefetch_map.get(self.action, []))
+
     def create(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
         """
         create: Creates customer object for current user.
@@ -168,7 +199,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(methods=['get'], detail=True, serializer_class=CustomerHistorySerializer)
-    def get_statistics(self, request: Request, pk: int) -> Response:
+    def get_statistics(self, request: Request, pk: int) -> Union[Response, StreamingHttpResponse]:
         """
         get_statistics: Returns statistics for customer's operations.
 
@@ -177,13 +208,29 @@ class CustomerViewSet(viewsets.ModelViewSet):
             pk (int): Customer's pk.
 
         Returns:
-            Response: HTTP 200 if has permissions otherwise 401/403.
+            Union[Response, StreamingHttpResponse]: HTTP 200 with page or NDJSON stream if has
+            permissions otherwise 401/403.
         """
 
         customer: CustomerModel = self.get_object()
         history: QuerySet = customer.history.all()
-        serializer: CustomerHistorySerializer = self.get_serializer(history, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.list_related(request, history)
+
+    @action(methods=['get'], detail=True, serializer_class=SalesStatisticsSerializer)
+    def get_analytics(self, request: Request, pk: int) -> Response:
+        """
+        get_analytics: Returns sales analytics of the customer, that is computed in database.
+
+        Args:
+            request (Request): Request instance.
+            pk (int): Customer's pk.
+
+        Returns:
+            Response: HTTP 200 if has permissions otherwise 400/401/403.
+        """
+
+        customer: CustomerModel = self.get_object()
+        return sales_analytics.respond(request, customer, 'purchase_price')
 
     @action(methods=['post'], detail=True, serializer_class=CustomerOfferSerializer)
     def make_offer(self, request: Request, pk: int) -> Response:
@@ -0,0 +1,21 @@
+# Generated by Django 4.1.3 on 2026-10-18 01:11
+
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('customer', '0004_alter_customerhistory_car'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customeroffer',
+            index=models.Index(
+                condition=models.Q(('is_active', True)),
+                fields=['created_at', 'id'],
+                name='customer_offer_pending_idx',
+            ),
+        ),
+    ]
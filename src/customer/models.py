@@ -74,6 +74,14 @@ class CustomerOffer(BaseModel):
         verbose_name_plural: ClassVar[str] = 'Customers offer'
         db_table: ClassVar[str] = 'CustomerOffer'
 
+        indexes: ClassVar[list] = [
+            models.Index(
+                fields=['created_at', 'id'],
+                condition=models.Q(is_active=True),
+                name='customer_offer_pending_idx',
+            ),
+        ]
+
 
 class CustomerHistory(BaseModel):
     """
@@ -3,7 +3,10 @@ sevices.py: File, containing services for a customer application.
 """
 
 
+from django.db import transaction
+from django.conf import settings
 from core.tasks import make_customer_offer
+from core.deletions import soft_deletion
 from customer.models import CustomerModel, CustomerOffer
 
 
@@ -14,21 +17,23 @@ class CustomerService:
 
     def delete_customer(self, customer: CustomerModel) -> None:
         """
-        delete_customer: Sets customer's field is_active to False.
+        delete_customer: Sets customer's field is_active to False and cancels pending offers.
 
         Args:
             customer (CustomerModel): Customer instance.
         """
 
-        customer.is_active = False
-        customer.save()
+        soft_deletion.delete(customer, ['offers'])
 
     def make_offer(self, offer: CustomerOffer) -> None:
         """
         make_offer: Makes customer's offer.
+        Offer is queued after commit, so the task always finds it.
+        In batch mode offer stays pending till the next batch settlement.
 
         Args:
             offer (CustomerOffer): CustomerOffer instance.
         """
 
-        make_customer_offer.delay(offer.id)
+        if not settings.OFFERS['BATCH_MODE']:
+            transaction.on_commit(lambda: make_customer_offer.delay(offer.id))
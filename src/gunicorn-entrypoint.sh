@@ -1,2 +1,6 @@
 #! /bin/bash
-gunicorn config.wsgi:application --workers=8 --certfile=certs/localhost-prod.crt --keyfile=certs/localhost-prod.key --bind ${DJANGO_GUNICORN_HOST}:${DJANGO_GUNICORN_PORT}
\ No newline at end of file
+if [[ "${DJANGO_SERVER_MODE}" == "asgi" ]]; then
+  gunicorn config.asgi:application --workers=8 --worker-class=uvicorn.workers.UvicornWorker --certfile=certs/localhost-prod.crt --keyfile=certs/localhost-prod.key --bind ${DJANGO_GUNICORN_HOST}:${DJANGO_GUNICORN_PORT}
+else
+  gunicorn config.wsgi:application --workers=8 --certfile=certs/localhost-prod.crt --keyfile=certs/localhost-prod.key --bind ${DJANGO_GUNICORN_HOST}:${DJANGO_GUNICORN_PORT}
+fi
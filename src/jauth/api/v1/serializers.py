@@ -5,8 +5,10 @@ serializers.py: File, containing serializers for a jauth application.
 
 from typing import ClassVar, Optional
 from rest_framework import serializers
+from jauth.caches import user_cache
 from jauth.models import User
 from jauth.tokens import Token
+from jauth.buffers import last_login_buffer
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -50,7 +52,10 @@ class UserSerializer(serializers.ModelSerializer):
         if password:
             instance.set_password(password)
 
-        return super().update(instance, validated_data)
+        updated_user: User = super().update(instance, validated_data)
+        user_cache.invalidate(updated_user.pk)
+
+        return updated_user
 
     class Meta:
         model: ClassVar[type[User]] = User
@@ -149,8 +154,9 @@ class AccessTokenSerializer(serializers.Serializer):
 
         if not user.is_active and user.is_verified:
             user.set_active()
+            user_cache.invalidate(user.pk)
 
-        user.set_last_login()
+        last_login_buffer.add(user)
 
         access_token, refresh_token = self.token_class.for_user(user)
 
@@ -222,7 +228,7 @@ class RefreshTokenSerializer(serializers.Serializer):
                 'Token is not correct.',
             )
 
-        user.set_last_login()
+        last_login_buffer.add(user)
 
         access_token, refresh_token = self.token_class.for_user(user)
 
@@ -6,6 +6,7 @@ swagger.py: File, containg schema extensions for extend schema decorator.
 from rest_framework import status
 from drf_spectacular.utils import OpenApiResponse
 from config.swagger import (
+    JWKSSerializer,
     ForbiddenSerializer,
     TokenPairSerializer,
     UnauthorizedSerializer,
@@ -175,6 +176,17 @@ token_create_schema_extension: dict = {
     },
 }
 
+jwks_list_schema_extension: dict = {
+    'summary': 'Public keys to verify tokens.',
+    'description': """
+      Returns public keys, that sign tokens, as JSON Web Key Set.
+      Tokens have kid header with id of the key, so they can be verified without the API.
+    """,
+    'responses': {
+        status.HTTP_200_OK: JWKSSerializer,
+    },
+}
+
 token_refresh_schema_extension: dict = {
     'summary': 'Refreshing a pair of token.',
     'description': """
@@ -13,5 +13,6 @@ router: SimpleRouter = SimpleRouter()
 
 router.register(prefix='users', viewset=views.UserViewSet, basename='user')
 router.register(prefix='token', viewset=views.TokenViewSet, basename='token')
+router.register(prefix='jwks', viewset=views.JWKSViewSet, basename='jwks')
 
 urlpatterns: list = router.urls
@@ -4,6 +4,7 @@ views.py: File, containing views for a jauth application.
 
 
 from typing import ClassVar, Optional
+from django.conf import settings
 from rest_framework import status, viewsets
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from django.db.models.query import QuerySet
@@ -11,11 +12,13 @@ from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
+from jauth.keys import KeyRing, keyring
 from jauth.models import User
 from jauth.services import UserService
 from jauth.api.v1.swagger import (
+    jwks_list_schema_extension,
     user_list_schema_extension,
     user_create_schema_extension,
     user_update_schema_extension,
@@ -315,3 +318,41 @@ class TokenViewSet(viewsets.GenericViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
+
+
+@extend_schema(tags=['Token'])
+@extend_schema_view(
+    list=extend_schema(**jwks_list_schema_extension),
+)
+class JWKSViewSet(viewsets.ViewSet):
+    """
+    JWKSViewSet: Publishes public keys of the keyring, so other services can verify tokens.
+
+    Args:
+        viewsets.ViewSet (_type_): Builtin superclass for a JWKSViewSet.
+    """
+
+    keyring: ClassVar[KeyRing] = keyring
+
+    authentication_classes: ClassVar[list] = []
+
+    permission_classes: ClassVar[list] = [AllowAny]
+
+    def list(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        """
+        list: Returns public keys as JSON Web Key Set.
+
+        Args:
+            request (Request): Request instance.
+
+        Returns:
+            Response: Response instance.
+        """
+
+        return Response(
+            self.keyring.get_jwks(),
+            status=status.HTTP_200_OK,
+            headers={
+                'Cache-Control': f'public, max-age={settings.JWT_TOKEN["JWKS_MAX_AGE_SECONDS"]}',
+            },
+        )
@@ -3,6 +3,7 @@ apps.py: Config file for a jauth application.
 """
 
 
+import atexit
 from typing import ClassVar
 from django.apps import AppConfig
 
@@ -19,3 +20,12 @@ class JauthConfig(AppConfig):
     name: ClassVar[str] = 'jauth'
     label: ClassVar[str] = 'jauth'
     verbose_name: ClassVar[str] = 'JWT Authentification'
+
+    def ready(self) -> None:
+        """
+        ready: Flushes buffered logins when process exits.
+        """
+
+        from jauth.buffers import last_login_buffer
+
+        atexit.register(last_login_buffer.flush)
@@ -8,6 +8,7 @@ from django.conf import settings
 from rest_framework import authentication
 from rest_framework.request import Request
 from rest_framework.exceptions import AuthenticationFailed
+from jauth.caches import UserCache, user_cache
 from jauth.models import User
 from jauth.tokens import Token
 
@@ -28,6 +29,7 @@ class JWTAuthentication(authentication.BaseAuthentication):
     """
 
     token_class: ClassVar[type[Token]] = Token
+    user_cache: ClassVar[UserCache] = user_cache
     www_authenticate_realm: ClassVar[str] = 'api'
     www_authenticate_error: ClassVar[str] = 'invalid_token'
 
@@ -76,7 +78,7 @@ class JWTAuthentication(authentication.BaseAuthentication):
 
             raise AuthenticationFailed('Token is invalid.')
 
-        user: Optional[User] = token.get_user_by_token()
+        user: Optional[User] = self.user_cache.get(token.get_user_id())
 
         if user is None:
             raise AuthenticationFailed('Token is not correct.')
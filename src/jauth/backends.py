@@ -4,10 +4,12 @@ backends.py: File, containing JWT backends for a jauth app.
 
 
 import logging
-from typing import ClassVar
+from typing import ClassVar, Optional
 from datetime import datetime, timezone, timedelta
-from jwt import InvalidTokenError, ExpiredSignatureError, decode, encode
+from jwt import InvalidTokenError, ExpiredSignatureError, decode, encode, get_unverified_header
 from django.conf import settings
+from jauth.keys import KeyRing, SigningKey, keyring
+from jauth.caches import PayloadCache, payload_cache
 
 
 logger = logging.getLogger(__name__)
@@ -23,6 +25,8 @@ class TokenBackend:
 
     token_invalid_error: ClassVar[type[InvalidTokenError]] = InvalidTokenError
     token_expired_error: ClassVar[type[ExpiredSignatureError]] = ExpiredSignatureError
+    payload_cache: ClassVar[PayloadCache] = payload_cache
+    keyring: ClassVar[KeyRing] = keyring
 
     @classmethod
     def generate_token(cls, *, type: str, user_id: int) -> str:
@@ -56,12 +60,20 @@ class TokenBackend:
             'exp': int(expiry_token_date.strftime('%s')),
         }
 
-        return encode(payload, settings.SECRET_KEY, settings.JWT_TOKEN['ENCODE_ALG'])
+        key: Optional[SigningKey] = cls.keyring.get_signing_key()
+
+        if key is None:
+            return encode(payload, settings.SECRET_KEY, settings.JWT_TOKEN['ENCODE_ALG'])
+
+        return encode(payload, key.private_key, key.alg, headers={'kid': key.kid})
 
     @classmethod
     def get_payload_by_token(cls, *, token: str) -> dict:
         """
         get_payload_by_token: Decodes token and return payload.
+        Tokens with kid header are verified by public key of the keyring, tokens without it are
+        verified by SECRET_KEY. Verified payloads are cached till their expiration, so signature
+        of the same token is verified once.
 
         Args:
             token (str): Token.
@@ -70,5 +82,17 @@ class TokenBackend:
             dict: Payload.
         """
 
-        payload: dict = decode(token, settings.SECRET_KEY, settings.JWT_TOKEN['DECODE_ALGS'])
+        payload: Optional[dict] = cls.payload_cache.get(token)
+
+        if payload is None:
+            kid: Optional[str] = get_unverified_header(token).get('kid')
+
+            if kid is None:
+                payload = decode(token, settings.SECRET_KEY, settings.JWT_TOKEN['DECODE_ALGS'])
+            else:
+                key: SigningKey = cls.keyring.get_verifying_key(kid)
+                payload = decode(token, key.public_key, [key.alg])
+
+            cls.payload_cache.set(token, payload)
+
         return payload
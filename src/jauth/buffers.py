@@ -0,0 +1,264 @@
+"""
+buffers.py: File, containing write-behind buffer of user logins for a jauth app.
+"""
+
+
+import logging
+from typing import ClassVar, Optional
+from datetime import datetime, timezone
+from threading import Lock, Timer
+from redis import Redis
+from django.db import router, connections
+from django.conf import settings
+from django.utils import timezone as django_timezone
+from django.db.models import Q, Case, When, DateTimeField
+from jauth.models import User
+
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """
+    LastLoginBuffer: Coalesces last_login updates of users and writes them in bulk.
+    Logins are buffered in process and flushed with one UPDATE per batch when the buffer reaches
+    LAST_LOGIN['FLUSH_SIZE'], by timer thread LAST_LOGIN['FLUSH_INTERVAL_SECONDS'] after the first
+    buffered login, and when process exits. In durable mode logins are buffered in Redis sorted
+    set instead, so they survive crash of the process and are flushed by flush_last_logins task,
+    which is scheduled only in this mode. Only the latest login of the user is kept and last_login
+    is never moved back.
+    """
+
+    key: ClassVar[str] = 'jauth:last_login'
+
+    def __init__(self, url: Optional[str] = None) -> None:
+        """
+        __init__: Instantiates LastLoginBuffer instance.
+
+        Args:
+            url (Optional[str]): Redis url. Defaults to None (url from LAST_LOGIN settings).
+        """
+
+        self.url: Optional[str] = url
+        self._client: Optional[Redis] = None
+        self.entries: dict[int, datetime] = {}
+        self.lock: Lock = Lock()
+        self.timer: Optional[Timer] = None
+
+    @property
+    def client(self) -> Redis:
+        """
+        client: Returns Redis client, connects to Redis on first use.
+
+        Returns:
+            Redis: Redis client.
+        """
+
+        if self._client is None:
+            self._client = Redis.from_url(self.url or settings.LAST_LOGIN['DURABLE_URL'])
+        return self._client
+
+    def add(self, user: User) -> None:
+        """
+        add: Sets last login of the user to now and buffers it.
+
+        Args:
+            user (User): User instance.
+        """
+
+        user.last_login = django_timezone.now()
+
+        if not settings.LAST_LOGIN['BUFFERED']:
+            self.write({user.pk: user.last_login})
+            return
+
+        if settings.LAST_LOGIN['DURABLE']:
+            self.client.zadd(self.key, {user.pk: user.last_login.timestamp()}, gt=True)
+            return
+
+        self.merge({user.pk: user.last_login})
+
+        with self.lock:
+            is_due: bool = len(self.entries) >= settings.LAST_LOGIN['FLUSH_SIZE']
+
+        if is_due:
+            self.flush()
+        else:
+            self.schedule()
+
+    def schedule(self) -> None:
+        """
+        schedule: Starts timer thread, that flushes the buffer, if logins are buffered and the
+        timer has not been started yet.
+        """
+
+        with self.lock:
+            if self.timer is not None or not self.entries:
+                return
+
+            self.timer = Timer(settings.LAST_LOGIN['FLUSH_INTERVAL_SECONDS'], self.flush_on_timer)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush_on_timer(self) -> None:
+        """
+        flush_on_timer: Flushes the buffer from timer thread and closes database connections of
+        the thread. Timer is started again for logins, that have not been written.
+        """
+
+        with self.lock:
+            self.timer = None
+
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+        self.schedule()
+
+    def merge(self, logins: dict[int, datetime]) -> None:
+        """
+        merge: Puts logins into in-process buffer, keeps the latest login of every user.
+
+        Args:
+            logins (dict[int, datetime]): Last login for every user id.
+        """
+
+        with self.lock:
+            for pk, login in logins.items():
+                self.entries[pk] = max(login, self.entries.get(pk, login))
+
+    def write(self, logins: dict[int, datetime]) -> int:
+        """
+        write: Updates last logins of the users in batches, older logins are not written.
+
+        Args:
+            logins (dict[int, datetime]): Last login for every user id.
+
+        Returns:
+            int: Number of updated users.
+        """
+
+        using: str = router.db_for_write(User)
+        items: list[tuple[int, datetime]] = list(logins.items())
+        size: int = settings.LAST_LOGIN['FLUSH_SIZE']
+        updated: int = 0
+
+        for start in range(0, len(items), size):
+            batch: list[tuple[int, datetime]] = items[start : start + size]
+
+            if connections[using].vendor == 'postgresql':
+                updated += self.write_values(batch, using)
+            else:
+                last_login = Case(
+                    *[When(pk=pk, then=login) for pk, login in batch],
+                    output_field=DateTimeField(),
+                )
+                updated += (
+                    User.objects.using(using)
+                    .filter(pk__in=[pk for pk, _ in batch])
+                    .filter(Q(last_login__isnull=True) | Q(last_login__lt=last_login))
+                    .update(last_login=last_login)
+                )
+
+        return updated
+
+    def write_values(self, batch: list[tuple[int, datetime]], using: str) -> int:
+        """
+        write_values: Updates last logins with UPDATE ... FROM (VALUES ...) statement.
+
+        Args:
+            batch (list[tuple[int, datetime]]): User ids with their last logins.
+            using (str): Database to write to.
+
+        Returns:
+            int: Number of updated users.
+        """
+
+        connection = connections[using]
+        field = User._meta.get_field('last_login')
+        db_type: str = field.db_type(connection)
+        table: str = connection.ops.quote_name(User._meta.db_table)
+        pk_column: str = connection.ops.quote_name(User._meta.pk.column)
+        column: str = connection.ops.quote_name(field.column)
+        values: str = ', '.join([f'(%s, %s::{db_type})'] * len(batch))
+        params: list = [
+            value
+            for pk, login in batch
+            for value in (pk, field.get_db_prep_value(login, connection))
+        ]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} AS u SET {column} = v.last_login '
+                f'FROM (VALUES {values}) AS v(id, last_login) '
+                f'WHERE u.{pk_column} = v.id '
+                f'AND (u.{column} IS NULL OR u.{column} < v.last_login)',
+                params,
+            )
+            return cursor.rowcount
+
+    def flush(self) -> int:
+        """
+        flush: Writes every buffered login of this process or of Redis in durable mode.
+        Logins that have not been written are kept in the buffer till the next flush.
+
+        Returns:
+            int: Number of updated users.
+        """
+
+        if settings.LAST_LOGIN['DURABLE']:
+            return self.flush_durable()
+
+        with self.lock:
+            logins: dict[int, datetime] = self.entries
+            self.entries = {}
+
+        if not logins:
+            return 0
+
+        try:
+            return self.write(logins)
+        except Exception:
+            logger.exception(f'Last logins of {len(logins)} users have not been written.')
+            self.merge(logins)
+            return 0
+
+    def flush_durable(self) -> int:
+        """
+        flush_durable: Pops buffered logins from Redis and writes them, puts them back on failure.
+
+        Returns:
+            int: Number of updated users.
+        """
+
+        updated: int = 0
+
+        while popped := self.client.zpopmin(self.key, settings.LAST_LOGIN['FLUSH_SIZE']):
+            logins: dict[int, datetime] = {
+                int(pk): datetime.fromtimestamp(score, tz=timezone.utc) for pk, score in popped
+            }
+
+            try:
+                updated += self.write(logins)
+            except Exception:
+                logger.exception(f'Last logins of {len(logins)} users have not been written.')
+                self.client.zadd(self.key, dict(popped), gt=True)
+                break
+
+        return updated
+
+    def clear(self) -> None:
+        """
+        clear: Drops every login buffered by this process without writing it and stops timer.
+        """
+
+        with self.lock:
+            self.entries.clear()
+
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+
+
+last_login_buffer: LastLoginBuffer = LastLoginBuffer()
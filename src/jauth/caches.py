@@ -0,0 +1,337 @@
+"""
+caches.py: File, containing caches of token payloads and authenticated users for a jauth app.
+"""
+
+
+import hashlib
+from time import time, monotonic
+from uuid import uuid4
+from typing import Any, ClassVar, Optional
+from threading import Lock
+from collections import OrderedDict
+from django.db import router
+from django.conf import settings
+from django.core.cache import cache
+from jauth.models import User
+
+
+class PayloadCache:
+    """
+    PayloadCache: Bounded in-process LRU of verified token payloads.
+    Payloads are keyed by hash of the token and are served only till their exp claim, so expired
+    token is never taken from the cache. Payloads without exp claim are not cached.
+    """
+
+    def __init__(self) -> None:
+        """
+        __init__: Instantiates PayloadCache instance.
+        """
+
+        self.entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self.lock: Lock = Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get_key(self, token: str) -> bytes:
+        """
+        get_key: Returns cache key of the token.
+
+        Args:
+            token (str): Encoded token.
+
+        Returns:
+            bytes: SHA-256 digest of the token.
+        """
+
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """
+        get: Returns copy of verified payload of the token if it is cached and not expired.
+
+        Args:
+            token (str): Encoded token.
+
+        Returns:
+            Optional[dict]: Payload or None.
+        """
+
+        key: bytes = self.get_key(token)
+
+        with self.lock:
+            entry: Optional[tuple[float, dict]] = self.entries.get(key)
+
+            if entry is not None and entry[0] <= time():
+                del self.entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def set(self, token: str, payload: dict) -> None:
+        """
+        set: Puts verified payload of the token into the cache, evicts least recently used token.
+
+        Args:
+            token (str): Encoded token.
+            payload (dict): Verified payload.
+        """
+
+        size: int = settings.JWT_TOKEN['PAYLOAD_CACHE_SIZE']
+
+        if not size or not isinstance(payload.get('exp'), (int, float)):
+            return
+
+        key: bytes = self.get_key(token)
+
+        with self.lock:
+            self.entries[key] = (payload['exp'], dict(payload))
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > size:
+                self.entries.popitem(last=False)
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        get_stats: Returns number of hits, misses and cached payloads.
+
+        Returns:
+            dict[str, int]: Cache metrics.
+        """
+
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries)}
+
+    def clear(self) -> None:
+        """
+        clear: Drops every cached payload and resets metrics.
+        """
+
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class UserCache:
+    """
+    UserCache: Two-tier cache of users, that are resolved by access tokens.
+    The first tier is in-process LRU with short lifetime, the second tier is shared cache. Entries
+    are stamped with version of the user, so user loaded before invalidation is never cached
+    after it. Invalidation drops entries of this process at once, entries of other processes
+    live till their lifetime is over. Every call returns new User instance, so cached users never
+    share related objects or unsaved changes.
+    """
+
+    key_prefix: ClassVar[str] = 'jauth:user'
+
+    def __init__(self) -> None:
+        """
+        __init__: Instantiates UserCache instance.
+        """
+
+        self.entries: OrderedDict[int, tuple[float, tuple]] = OrderedDict()
+        self.lock: Lock = Lock()
+
+    def get_entry_key(self, user_id: int) -> str:
+        """
+        get_entry_key: Returns shared cache key of the user.
+
+        Args:
+            user_id (int): User's id.
+
+        Returns:
+            str: Cache key.
+        """
+
+        return f'{self.key_prefix}:{user_id}'
+
+    def get_version_key(self, user_id: int) -> str:
+        """
+        get_version_key: Returns shared cache key of the user version.
+
+        Args:
+            user_id (int): User's id.
+
+        Returns:
+            str: Cache key.
+        """
+
+        return f'{self.key_prefix}:{user_id}:version'
+
+    def to_values(self, user: User) -> tuple:
+        """
+        to_values: Returns values of concrete fields of the user.
+
+        Args:
+            user (User): User instance.
+
+        Returns:
+            tuple: Field values in order of concrete fields.
+        """
+
+        return tuple(getattr(user, field.attname) for field in User._meta.concrete_fields)
+
+    def from_values(self, values: tuple) -> User:
+        """
+        from_values: Returns new User instance as if it is loaded from database.
+
+        Args:
+            values (tuple): Field values in order of concrete fields.
+
+        Returns:
+            User: User instance.
+        """
+
+        return User.from_db(
+            router.db_for_read(User),
+            [field.attname for field in User._meta.concrete_fields],
+            values,
+        )
+
+    def get_local(self, user_id: int) -> Optional[tuple]:
+        """
+        get_local: Returns values of the user from in-process tier if they are not expired.
+
+        Args:
+            user_id (int): User's id.
+
+        Returns:
+            Optional[tuple]: Field values or None.
+        """
+
+        with self.lock:
+            entry: Optional[tuple[float, tuple]] = self.entries.get(user_id)
+
+            if entry is None:
+                return None
+
+            if entry[0] <= monotonic():
+                del self.entries[user_id]
+                return None
+
+            self.entries.move_to_end(user_id)
+            return entry[1]
+
+    def set_local(self, user_id: int, values: tuple) -> None:
+        """
+        set_local: Puts values of the user into in-process tier, evicts least recently used user.
+
+        Args:
+            user_id (int): User's id.
+            values (tuple): Field values.
+        """
+
+        with self.lock:
+            self.entries[user_id] = (
+                monotonic() + settings.USER_CACHE['LOCAL_TTL_SECONDS'],
+                values,
+            )
+            self.entries.move_to_end(user_id)
+
+            while len(self.entries) > settings.USER_CACHE['LOCAL_SIZE']:
+                self.entries.popitem(last=False)
+
+    def get_shared(self, user_id: int) -> tuple[Optional[tuple], Optional[str]]:
+        """
+        get_shared: Returns values of the user from shared tier and current version of the user.
+
+        Args:
+            user_id (int): User's id.
+
+        Returns:
+            tuple[Optional[tuple], Optional[str]]: Field values or None and version of the user.
+        """
+
+        entry_key: str = self.get_entry_key(user_id)
+        version_key: str = self.get_version_key(user_id)
+        found: dict[str, Any] = cache.get_many([entry_key, version_key])
+        version: Optional[str] = found.get(version_key)
+
+        if version is None:
+            cache.add(version_key, uuid4().hex, timeout=settings.USER_CACHE['SHARED_TTL_SECONDS'])
+            version = cache.get(version_key)
+
+        entry: Optional[tuple[str, tuple]] = found.get(entry_key)
+
+        if entry is not None and entry[0] == version:
+            return entry[1], version
+        return None, version
+
+    def get(self, user_id: Optional[int]) -> Optional[User]:
+        """
+        get: Returns user by id from the cache or from database.
+
+        Args:
+            user_id (Optional[int]): User's id.
+
+        Returns:
+            Optional[User]: New User instance or None if user does not exist.
+        """
+
+        if user_id is None:
+            return None
+
+        values: Optional[tuple] = self.get_local(user_id)
+
+        if values is not None:
+            return self.from_values(values)
+
+        version: Optional[str] = None
+
+        if settings.USER_CACHE['SHARED']:
+            values, version = self.get_shared(user_id)
+
+        if values is None:
+            user: Optional[User] = User.objects.filter(pk=user_id).first()
+
+            if user is None:
+                return None
+
+            values = self.to_values(user)
+
+            if version is not None:
+                cache.set(
+                    self.get_entry_key(user_id),
+                    (version, values),
+                    timeout=settings.USER_CACHE['SHARED_TTL_SECONDS'],
+                )
+
+        self.set_local(user_id, values)
+        return self.from_values(values)
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        invalidate: Drops cached user, so the next request loads it from database.
+
+        Args:
+            user_id (int): User's id.
+        """
+
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+        if settings.USER_CACHE['SHARED']:
+            cache.set(
+                self.get_version_key(user_id),
+                uuid4().hex,
+                timeout=settings.USER_CACHE['SHARED_TTL_SECONDS'],
+            )
+            cache.delete(self.get_entry_key(user_id))
+
+    def clear(self) -> None:
+        """
+        clear: Drops every user cached by this process.
+        """
+
+        with self.lock:
+            self.entries.clear()
+
+
+payload_cache: PayloadCache = PayloadCache()
+user_cache: UserCache = UserCache()
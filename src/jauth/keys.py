@@ -0,0 +1,197 @@
+"""
+keys.py: File, containing keyring of asymmetric JWT keys for a jauth app.
+"""
+
+
+import json
+import logging
+from typing import Any, Optional, NamedTuple
+from pathlib import Path
+from threading import Lock
+from jwt import InvalidTokenError
+from django.conf import settings
+from jwt.algorithms import Algorithm, has_crypto, get_default_algorithms
+from django.core.exceptions import ImproperlyConfigured
+
+
+if has_crypto:
+    from cryptography.hazmat.primitives.serialization import (
+        load_pem_public_key,
+        load_pem_private_key,
+    )
+    from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey, RSAPrivateKey
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+        Ed25519PublicKey,
+        Ed25519PrivateKey,
+    )
+
+
+logger = logging.getLogger(__name__)
+
+
+class SigningKey(NamedTuple):
+    """
+    SigningKey: Key of the keyring with its id and algorithm. Retired keys have no private key.
+    """
+
+    kid: str
+    alg: str
+    private_key: Optional[Any]
+    public_key: Any
+
+
+class KeyRing:
+    """
+    KeyRing: In-process set of asymmetric keys, that are used to sign and verify tokens.
+    Keys are read once from JWT_TOKEN['KEYS_DIR'], where every <kid>.pem file is RSA or Ed25519
+    private key, that can sign tokens, or public key, that only verifies tokens signed before
+    rotation. Tokens are signed by JWT_TOKEN['SIGNING_KEY_ID'] key with its kid in the header.
+    When signing key is not specified, tokens are signed by SECRET_KEY as before.
+    """
+
+    def __init__(self) -> None:
+        """
+        __init__: Instantiates KeyRing instance.
+        """
+
+        self.keys: Optional[dict[str, SigningKey]] = None
+        self.lock: Lock = Lock()
+
+    def read_key(self, path: Path) -> SigningKey:
+        """
+        read_key: Reads private or public key from PEM file.
+
+        Args:
+            path (Path): Path to PEM file, name of the file is id of the key.
+
+        Raises:
+            ImproperlyConfigured: Raises when key is not RSA or Ed25519 key.
+
+        Returns:
+            SigningKey: Key of the keyring.
+        """
+
+        data: bytes = path.read_bytes()
+        private_key: Optional[Any] = None
+
+        try:
+            private_key = load_pem_private_key(data, password=None)
+            public_key: Any = private_key.public_key()
+        except ValueError:
+            public_key = load_pem_public_key(data)
+
+        if isinstance(public_key, RSAPublicKey):
+            alg: str = 'RS256'
+        elif isinstance(public_key, Ed25519PublicKey):
+            alg = 'EdDSA'
+        else:
+            raise ImproperlyConfigured(f'JWT key {path.name} must be RSA or Ed25519 key.')
+
+        if private_key is not None and not isinstance(
+            private_key, (RSAPrivateKey, Ed25519PrivateKey)
+        ):
+            raise ImproperlyConfigured(f'JWT key {path.name} must be RSA or Ed25519 key.')
+
+        return SigningKey(path.stem, alg, private_key, public_key)
+
+    def load(self) -> dict[str, SigningKey]:
+        """
+        load: Returns keys of the keyring, reads them on the first call.
+
+        Raises:
+            ImproperlyConfigured: Raises when asymmetric keys are used without cryptography.
+
+        Returns:
+            dict[str, SigningKey]: Keys by their ids.
+        """
+
+        with self.lock:
+            if self.keys is None:
+                keys_dir: Optional[str] = settings.JWT_TOKEN['KEYS_DIR']
+                keys: dict[str, SigningKey] = {}
+
+                if keys_dir:
+                    if not has_crypto:
+                        raise ImproperlyConfigured('Asymmetric JWT keys require cryptography.')
+
+                    for path in sorted(Path(keys_dir).glob('*.pem')):
+                        keys[path.stem] = self.read_key(path)
+
+                    logger.info(f'Loaded {len(keys)} JWT keys from {keys_dir}')
+
+                self.keys = keys
+
+            return self.keys
+
+    def reload(self) -> None:
+        """
+        reload: Drops loaded keys, so they are read again on the next call.
+        """
+
+        with self.lock:
+            self.keys = None
+
+    def get_signing_key(self) -> Optional[SigningKey]:
+        """
+        get_signing_key: Returns current key to sign new tokens.
+
+        Raises:
+            ImproperlyConfigured: Raises when current key does not exist or has no private key.
+
+        Returns:
+            Optional[SigningKey]: Current key or None if tokens are signed by SECRET_KEY.
+        """
+
+        kid: Optional[str] = settings.JWT_TOKEN['SIGNING_KEY_ID']
+
+        if not kid:
+            return None
+
+        key: Optional[SigningKey] = self.load().get(kid)
+
+        if key is None or key.private_key is None:
+            raise ImproperlyConfigured(f'JWT signing key {kid} has no private key.')
+
+        return key
+
+    def get_verifying_key(self, kid: str) -> SigningKey:
+        """
+        get_verifying_key: Returns key to verify token by id from token header.
+
+        Args:
+            kid (str): Id of the key.
+
+        Raises:
+            InvalidTokenError: Raises when key is not in the keyring.
+
+        Returns:
+            SigningKey: Key of the keyring.
+        """
+
+        key: Optional[SigningKey] = self.load().get(kid)
+
+        if key is None:
+            raise InvalidTokenError(f'Unknown key id: {kid}')
+
+        return key
+
+    def get_jwks(self) -> dict[str, list[dict]]:
+        """
+        get_jwks: Returns public keys of the keyring as JSON Web Key Set.
+
+        Returns:
+            dict[str, list[dict]]: JWK Set.
+        """
+
+        algorithms: dict[str, Algorithm] = get_default_algorithms()
+        jwks: list[dict] = []
+
+        for key in self.load().values():
+            jwk: dict = json.loads(algorithms[key.alg].to_jwk(key.public_key))
+            jwk.update({'kid': key.kid, 'alg': key.alg, 'use': 'sig'})
+            jwks.append(jwk)
+
+        return {'keys': jwks}
+
+
+keyring: KeyRing = KeyRing()
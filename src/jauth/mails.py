@@ -0,0 +1,276 @@
+"""
+mails.py: File, containing queue of outgoing mails for a jauth app.
+"""
+
+
+import json
+import logging
+import smtplib
+from time import time, monotonic
+from uuid import uuid4
+from typing import ClassVar, Optional
+from collections import deque
+from redis import Redis
+from redis.lock import Lock
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from redis.exceptions import LockError
+
+
+logger = logging.getLogger(__name__)
+
+
+class MailQueue:
+    """
+    MailQueue: Queue of outgoing mails that are sent in batches over one SMTP connection.
+    Mails are kept in Redis sorted set scored by time when they are due. Due mails are sent by
+    one worker at a time, so every mail does not open its own connection and TLS session. Every
+    recipient domain is limited by MAIL['DOMAIN_RATES'] mails per second, mails over the limit
+    are delayed. Due mails are leased for MAIL['LOCK_TIMEOUT_SECONDS'] instead of being removed
+    and every mail is removed only after delivery, so mails of a crashed worker are sent again
+    when their lease is over. The worker lock holds a unique token and is released only by its
+    owner, so a worker, whose lock has expired, never releases the lock of the next worker.
+    Transient SMTP failures are retried with exponential backoff till MAIL['MAX_ATTEMPTS'],
+    permanent failures are dropped.
+    """
+
+    key: ClassVar[str] = 'jauth:mails'
+    lock_key: ClassVar[str] = 'jauth:mails:lock'
+    schedule_key: ClassVar[str] = 'jauth:mails:scheduled'
+
+    def __init__(self, url: Optional[str] = None) -> None:
+        """
+        __init__: Instantiates MailQueue instance.
+
+        Args:
+            url (Optional[str]): Redis url. Defaults to None (url from MAIL settings).
+        """
+
+        self.url: Optional[str] = url
+        self._client: Optional[Redis] = None
+
+    @property
+    def client(self) -> Redis:
+        """
+        client: Returns Redis client, connects to Redis on first use.
+
+        Returns:
+            Redis: Redis client.
+        """
+
+        if self._client is None:
+            self._client = Redis.from_url(self.url or settings.MAIL['QUEUE_URL'])
+        return self._client
+
+    def push(self, mails: list[dict], due: float) -> None:
+        """
+        push: Puts mails into the queue.
+
+        Args:
+            mails (list[dict]): Mails with id, recipient, subject, body and number of attempts.
+            due (float): Timestamp when mails must be sent.
+        """
+
+        if mails:
+            self.client.zadd(self.key, {json.dumps(mail): due for mail in mails})
+
+    def enqueue(self, email: str, subject: str, body: str) -> None:
+        """
+        enqueue: Puts new mail into the queue to be sent as soon as possible.
+
+        Args:
+            email (str): Email address of the recipient.
+            subject (str): Subject of the mail.
+            body (str): Body of the mail.
+        """
+
+        self.push(
+            [{'id': uuid4().hex, 'to': email, 'subject': subject, 'body': body, 'attempts': 0}],
+            time(),
+        )
+
+    def lease_due(self) -> list[tuple[bytes, dict]]:
+        """
+        lease_due: Returns mails that are due, at most MAIL['BATCH_SIZE'] of them, and moves them
+        forward by MAIL['LOCK_TIMEOUT_SECONDS'], so they are not due while they are being sent.
+
+        Returns:
+            list[tuple[bytes, dict]]: Queue members with due mails.
+        """
+
+        now: float = time()
+        members: list[bytes] = self.client.zrangebyscore(
+            self.key, '-inf', now, start=0, num=settings.MAIL['BATCH_SIZE']
+        )
+
+        if members:
+            self.postpone(members, now + settings.MAIL['LOCK_TIMEOUT_SECONDS'])
+
+        return [(member, json.loads(member)) for member in members]
+
+    def postpone(self, members: list[bytes], due: float) -> None:
+        """
+        postpone: Sets new due time for mails that are in the queue.
+
+        Args:
+            members (list[bytes]): Queue members.
+            due (float): Timestamp when mails must be sent.
+        """
+
+        if members:
+            self.client.zadd(self.key, {member: due for member in members}, xx=True)
+
+    def ack(self, member: bytes) -> None:
+        """
+        ack: Removes mail from the queue, when it has been sent, retried or dropped.
+
+        Args:
+            member (bytes): Queue member.
+        """
+
+        self.client.zrem(self.key, member)
+
+    def get_next_due(self) -> Optional[float]:
+        """
+        get_next_due: Returns timestamp of the earliest mail in the queue.
+
+        Returns:
+            Optional[float]: Timestamp or None if the queue is empty.
+        """
+
+        first: list[tuple[bytes, float]] = self.client.zrange(self.key, 0, 0, withscores=True)
+        return first[0][1] if first else None
+
+    def get_domain(self, email: str) -> str:
+        """
+        get_domain: Returns domain of the email address.
+
+        Args:
+            email (str): Email address.
+
+        Returns:
+            str: Domain in lower case.
+        """
+
+        return email.rpartition('@')[2].lower()
+
+    def is_throttled(self, mail: dict, windows: dict[str, deque]) -> bool:
+        """
+        is_throttled: Checks if the mail exceeds the rate of its domain and records it otherwise.
+
+        Args:
+            mail (dict): Mail to send.
+            windows (dict[str, deque]): Send times within the last second for every domain.
+
+        Returns:
+            bool: True if the mail must be delayed.
+        """
+
+        domain: str = self.get_domain(mail['to'])
+        rates: dict[str, float] = settings.MAIL['DOMAIN_RATES']
+        window: deque = windows.setdefault(domain, deque())
+        now: float = monotonic()
+
+        while window and now - window[0] >= 1:
+            window.popleft()
+
+        if len(window) >= rates.get(domain, rates['default']):
+            return True
+
+        window.append(now)
+        return False
+
+    def is_transient(self, error: Exception) -> bool:
+        """
+        is_transient: Checks if sending can succeed later.
+
+        Args:
+            error (Exception): Error of sending.
+
+        Returns:
+            bool: True for connection errors and 4xx SMTP replies.
+        """
+
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return all(400 <= code < 500 for code, _ in error.recipients.values())
+
+        if isinstance(error, smtplib.SMTPResponseException):
+            return 400 <= error.smtp_code < 500
+
+        return isinstance(error, (smtplib.SMTPServerDisconnected, OSError))
+
+    def retry(self, mail: dict, error: Exception) -> None:
+        """
+        retry: Puts mail back with exponential backoff or drops it after the last attempt.
+
+        Args:
+            mail (dict): Mail that has not been sent.
+            error (Exception): Error of sending.
+        """
+
+        mail['attempts'] += 1
+
+        if not self.is_transient(error) or mail['attempts'] >= settings.MAIL['MAX_ATTEMPTS']:
+            logger.error(f'Mail to address {mail["to"]} has not been sent: {error}')
+            return
+
+        backoff: float = settings.MAIL['RETRY_BACKOFF_SECONDS'] * 2 ** (mail['attempts'] - 1)
+        self.push([mail], time() + backoff)
+        logger.warning(f'Mail to address {mail["to"]} will be retried in {backoff} seconds.')
+
+    def send(self) -> Optional[int]:
+        """
+        send: Sends due mails over one connection till there are no due mails.
+
+        Returns:
+            Optional[int]: Number of sent mails or None if mails are sent by another worker.
+        """
+
+        lock: Lock = self.client.lock(self.lock_key, timeout=settings.MAIL['LOCK_TIMEOUT_SECONDS'])
+
+        if not lock.acquire(blocking=False):
+            return None
+
+        sent: int = 0
+        windows: dict[str, deque] = {}
+        connection = get_connection(fail_silently=False)
+
+        try:
+            while mails := self.lease_due():
+                throttled: list[bytes] = []
+
+                for member, mail in mails:
+                    if self.is_throttled(mail, windows):
+                        throttled.append(member)
+                        continue
+
+                    message: EmailMessage = EmailMessage(
+                        mail['subject'], mail['body'], settings.EMAIL_HOST_USER, [mail['to']]
+                    )
+
+                    try:
+                        connection.open()
+                        sent += connection.send_messages([message])
+                    except Exception as error:
+                        self.retry(mail, error)
+                        connection.close()
+
+                    self.ack(member)
+
+                self.postpone(throttled, time() + 1)
+
+                if len(throttled) == len(mails):
+                    break
+        finally:
+            connection.close()
+
+            try:
+                lock.release()
+            except LockError:
+                logger.warning('Mail lock has expired before due mails have been sent.')
+
+        logger.info(f'{sent} mails have been sent.')
+        return sent
+
+
+mail_queue: MailQueue = MailQueue()
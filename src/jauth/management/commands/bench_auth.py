@@ -0,0 +1,97 @@
+"""
+bench_auth.py: File, containing benchmark of JWT authentication for a project.
+"""
+
+
+from time import perf_counter
+from argparse import ArgumentParser
+from django.conf import settings
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+from django.core.management.base import BaseCommand, CommandError
+from jauth.models import User
+from jauth.backends import TokenBackend
+from jauth.authentication import JWTAuthentication
+
+
+class Command(BaseCommand):
+    """
+    Command: Compares throughput of JWT authentication with and without payload cache.
+
+    Args:
+        BaseCommand (_type_): Builtin superclass for a BenchAuthCommand.
+    """
+
+    help: str = 'Compares throughput of JWT authentication with and without payload cache.'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """
+        add_arguments: Adds command arguments.
+
+        Args:
+            parser (ArgumentParser): Argument parser.
+        """
+
+        parser.add_argument('--iterations', type=int, default=10000)
+        parser.add_argument('--user-id', type=int, default=None)
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        """
+        handle: Main entrypoint that will be called when it is applied as manage.py command.
+
+        Raises:
+            CommandError: Raises when there is no user to authenticate.
+        """
+
+        users = User.objects.order_by('pk')
+
+        if options['user_id'] is not None:
+            users = users.filter(pk=options['user_id'])
+
+        user: User = users.first()
+
+        if user is None:
+            raise CommandError('There is no user to authenticate.')
+
+        token: str = TokenBackend.generate_token(type='access', user_id=user.pk)
+        request: Request = Request(
+            APIRequestFactory().get(
+                '/', HTTP_AUTHORIZATION=f"{settings.JWT_TOKEN['TOKEN_TYPE']} {token}"
+            )
+        )
+        cache_size: int = settings.JWT_TOKEN['PAYLOAD_CACHE_SIZE']
+
+        try:
+            settings.JWT_TOKEN['PAYLOAD_CACHE_SIZE'] = 0
+            uncached: float = self._measure(request, options['iterations'])
+        finally:
+            settings.JWT_TOKEN['PAYLOAD_CACHE_SIZE'] = cache_size
+
+        cached: float = self._measure(request, options['iterations'])
+
+        self.stdout.write(f'uncached: {uncached:.0f} requests/s')
+        self.stdout.write(f'cached: {cached:.0f} requests/s ({cached / uncached:.1f}x)')
+        self.stdout.write(f'payload cache: {TokenBackend.payload_cache.get_stats()}')
+
+    def _measure(self, request: Request, iterations: int) -> float:
+        """
+        _measure: Returns number of authenticated requests per second.
+
+        Args:
+            request (Request): Request with access token.
+            iterations (int): Number of authentications.
+
+        Returns:
+            float: Requests per second.
+        """
+
+        authentication: JWTAuthentication = JWTAuthentication()
+        TokenBackend.payload_cache.clear()
+        authentication.authenticate(request)
+
+        started: float = perf_counter()
+
+        for _ in range(iterations):
+            authentication.authenticate(request)
+
+        return iterations / (perf_counter() - started)
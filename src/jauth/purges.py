@@ -0,0 +1,193 @@
+"""
+purges.py: File, containing chunked purge of waste accounts for a jauth app.
+"""
+
+
+import logging
+from time import sleep, monotonic
+from typing import ClassVar
+from datetime import datetime
+from collections import Counter
+from django.db import router, transaction
+from django.conf import settings
+from django.utils import timezone
+from django.db.models import Q, Model, signals
+from django.core.cache import cache
+from dateutil.relativedelta import relativedelta
+from django.db.models.deletion import CASCADE, SET_NULL, DO_NOTHING
+from jauth.models import User
+
+
+logger = logging.getLogger(__name__)
+
+
+class WasteAccountPurge:
+    """
+    WasteAccountPurge: Deletes users that are inactive for a long time in bounded batches.
+    Candidates are walked by primary key, so every batch reads and deletes at most
+    ACCOUNT_PURGE['BATCH_SIZE'] users in its own short transaction. When no delete signals,
+    many-to-many relations or other on_delete handlers are involved, cascades are run as bulk
+    DELETE and UPDATE statements without loading rows into memory, otherwise every batch is
+    deleted by Django collector. The last deleted pk is kept in cache, so the purge that is
+    stopped by ACCOUNT_PURGE['MAX_SECONDS'] resumes from it.
+    """
+
+    cursor_key: ClassVar[str] = 'jauth:purge:cursor'
+    lock_key: ClassVar[str] = 'jauth:purge:lock'
+
+    def is_bulk_safe(self, model: type[Model], path: tuple = ()) -> bool:
+        """
+        is_bulk_safe: Checks if the model and every model it cascades to can be deleted in bulk.
+
+        Args:
+            model (type[Model]): Model to delete.
+            path (tuple): Models that cascade to the model. Defaults to ().
+
+        Returns:
+            bool: True if deletion needs neither signals, Python handlers nor cyclic cascades.
+        """
+
+        if (
+            model in path
+            or signals.pre_delete.has_listeners(model)
+            or signals.post_delete.has_listeners(model)
+            or model._meta.many_to_many
+            or model._meta.private_fields
+        ):
+            return False
+
+        for relation in model._meta.related_objects:
+            if relation.many_to_many or relation.on_delete not in (CASCADE, SET_NULL, DO_NOTHING):
+                return False
+
+            if relation.on_delete is CASCADE and not self.is_bulk_safe(
+                relation.related_model, (*path, model)
+            ):
+                return False
+
+        return True
+
+    def delete_bulk(self, model: type[Model], pks: list, using: str, deleted: Counter) -> None:
+        """
+        delete_bulk: Deletes rows with their cascades by bulk statements, children go first.
+
+        Args:
+            model (type[Model]): Model of the rows.
+            pks (list): Pks of the rows.
+            using (str): Database to write to.
+            deleted (Counter): Number of deleted rows for every model label.
+        """
+
+        for relation in model._meta.related_objects:
+            related = relation.related_model._base_manager.using(using).filter(
+                **{f'{relation.field.name}__in': pks}
+            )
+
+            if relation.on_delete is SET_NULL:
+                related.update(**{relation.field.name: None})
+            elif relation.on_delete is CASCADE:
+                related_pks: list = list(related.values_list('pk', flat=True))
+
+                if related_pks:
+                    self.delete_bulk(relation.related_model, related_pks, using, deleted)
+
+        deleted[model._meta.label] += (
+            model._base_manager.using(using).filter(pk__in=pks)._raw_delete(using)
+        )
+
+    def get_candidates(self, since: datetime) -> Q:
+        """
+        get_candidates: Returns condition of users that must be deleted.
+
+        Args:
+            since (datetime): Users that have not logged in since the date are deleted.
+
+        Returns:
+            Q: Condition of waste accounts.
+        """
+
+        return Q(is_active=False, last_login__lt=since)
+
+    def delete_batch(self, pks: list[int], since: datetime, bulk: bool) -> Counter:
+        """
+        delete_batch: Deletes users of the batch that are still waste accounts.
+
+        Args:
+            pks (list[int]): Pks of candidates.
+            since (datetime): Users that have not logged in since the date are deleted.
+            bulk (bool): Delete cascades by bulk statements.
+
+        Returns:
+            Counter: Number of deleted rows for every model label.
+        """
+
+        using: str = router.db_for_write(User)
+        deleted: Counter = Counter()
+
+        with transaction.atomic(using=using):
+            users = User.objects.using(using).filter(self.get_candidates(since), pk__in=pks)
+
+            if bulk:
+                locked: list[int] = list(
+                    users.select_for_update(skip_locked=True).values_list('pk', flat=True)
+                )
+
+                if locked:
+                    self.delete_bulk(User, locked, using, deleted)
+            else:
+                deleted.update(users.delete()[1])
+
+        return deleted
+
+    def run(self) -> Counter:
+        """
+        run: Deletes waste accounts batch by batch till all of them are deleted or time is over.
+
+        Returns:
+            Counter: Number of deleted rows for every model label.
+        """
+
+        options: dict = settings.ACCOUNT_PURGE
+        deleted: Counter = Counter()
+
+        if not cache.add(self.lock_key, True, timeout=options['MAX_SECONDS']):
+            logger.info('Purge of waste accounts is already running.')
+            return deleted
+
+        try:
+            since: datetime = timezone.now() - relativedelta(years=options['INACTIVE_YEARS'])
+            bulk: bool = self.is_bulk_safe(User)
+            cursor: int = cache.get(self.cursor_key, 0)
+            started: float = monotonic()
+
+            while True:
+                pks: list[int] = list(
+                    User.objects.filter(self.get_candidates(since), pk__gt=cursor)
+                    .order_by('pk')
+                    .values_list('pk', flat=True)[: options['BATCH_SIZE']]
+                )
+
+                if not pks:
+                    cache.delete(self.cursor_key)
+                    break
+
+                deleted.update(self.delete_batch(pks, since, bulk))
+                cursor = pks[-1]
+                cache.set(self.cursor_key, cursor, timeout=None)
+
+                logger.info(
+                    f'Purged {deleted[User._meta.label]} waste accounts till user {cursor}.'
+                )
+
+                if monotonic() - started >= options['MAX_SECONDS']:
+                    logger.info(f'Purge of waste accounts is stopped at user {cursor}.')
+                    break
+
+                sleep(options['SLEEP_SECONDS'])
+        finally:
+            cache.delete(self.lock_key)
+
+        return deleted
+
+
+waste_account_purge: WasteAccountPurge = WasteAccountPurge()
@@ -6,6 +6,7 @@ sevices.py: File, containing services for a jauth application.
 from typing import ClassVar, Optional
 from django.conf import settings
 from jauth.tasks import send_confirmation_mail
+from jauth.caches import UserCache, user_cache
 from jauth.models import User
 from jauth.tokens import Token
 
@@ -17,6 +18,7 @@ class UserService:
 
     token_class: ClassVar[type[Token]] = Token
     model_class: ClassVar[type[User]] = User
+    user_cache: ClassVar[UserCache] = user_cache
 
     def send_confirmation_link(self, email: str) -> None:
         """
@@ -77,6 +79,7 @@ class UserService:
 
         user.is_active = False
         user.save()
+        self.user_cache.invalidate(user.pk)
 
     def set_user_as_not_verified(self, user: User) -> None:
         """
@@ -88,6 +91,7 @@ class UserService:
 
         user.is_verified = False
         user.save()
+        self.user_cache.invalidate(user.pk)
 
     def set_user_as_verified(self, user: User) -> None:
         """
@@ -99,6 +103,7 @@ class UserService:
 
         user.is_verified = True
         user.save()
+        self.user_cache.invalidate(user.pk)
 
     def get_user_by_email(self, email: str) -> Optional[User]:
         """
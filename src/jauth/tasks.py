@@ -4,12 +4,15 @@ tasks.py: File, containing celery tasks for a jauth application.
 
 
 import logging
-from datetime import datetime
+from time import time
+from typing import Optional
+from collections import Counter
 from celery import shared_task
 from django.conf import settings
-from django.core.mail import send_mail
-from dateutil.relativedelta import relativedelta
-from jauth.models import User
+from django.core.cache import cache
+from jauth.mails import mail_queue
+from jauth.purges import waste_account_purge
+from jauth.buffers import last_login_buffer
 
 
 logger = logging.getLogger(__name__)
@@ -18,22 +21,53 @@ logger = logging.getLogger(__name__)
 @shared_task
 def send_confirmation_mail(email: str, confirmation_link: str) -> None:
     """
-    send_confirmation_mail: Sends confirmation link to email address.
+    send_confirmation_mail: Queues mail with confirmation link to email address.
+    Queued mails are sent in batches by send_queued_mails, which is scheduled once per
+    MAIL['BATCH_DELAY_SECONDS'].
 
     Args:
         email (str): Email address.
         confirmation_link (str): Confirmation link (usually token).
     """
-    try:
-        send_mail(
-            'Email Address Confirmation.',
-            f'Confirmation link: {confirmation_link}',
-            settings.EMAIL_HOST_USER,
-            [email],
-        )
-        logger.info(f'Mail to address {email} has been sent.')
-    except Exception:
-        logger.error(f'Mail to address {email} has not been sent.')
+
+    mail_queue.enqueue(
+        email, 'Email Address Confirmation.', f'Confirmation link: {confirmation_link}'
+    )
+    logger.info(f'Mail to address {email} has been queued.')
+    schedule_queued_mails(settings.MAIL['BATCH_DELAY_SECONDS'])
+
+
+def schedule_queued_mails(countdown: float) -> None:
+    """
+    schedule_queued_mails: Schedules send_queued_mails if it is not scheduled yet.
+
+    Args:
+        countdown (float): Seconds to wait before sending.
+    """
+
+    if cache.add(mail_queue.schedule_key, True, timeout=max(countdown, 1)):
+        send_queued_mails.apply_async(countdown=countdown)
+
+
+@shared_task
+def send_queued_mails() -> None:
+    """
+    send_queued_mails: Sends queued mails and schedules itself for mails that are delayed.
+    When mails are sent by another worker, it is scheduled not earlier than
+    MAIL['BATCH_DELAY_SECONDS'], so it does not spin while the lock is held.
+    """
+
+    cache.delete(mail_queue.schedule_key)
+    sent: Optional[int] = mail_queue.send()
+    next_due: Optional[float] = mail_queue.get_next_due()
+
+    if next_due is not None:
+        countdown: float = max(next_due - time(), 0)
+
+        if sent is None:
+            countdown = max(countdown, settings.MAIL['BATCH_DELAY_SECONDS'])
+
+        schedule_queued_mails(countdown)
 
 
 @shared_task
@@ -42,7 +76,16 @@ def clear_database_from_waste_accounts() -> None:
     clear_database_from_waste_accounts: Clears database from users that are inactive for one year.
     """
 
-    User.objects.filter(
-        is_active=False,
-        last_login__lt=datetime.now() - relativedelta(years=1),
-    ).delete()
+    deleted: Counter = waste_account_purge.run()
+    logger.info(f'Waste accounts have been purged: {dict(deleted)}.')
+
+
+@shared_task
+def flush_last_logins() -> None:
+    """
+    flush_last_logins: Writes last logins of users, that are buffered in Redis, to database.
+    It is scheduled only in durable mode, web processes flush their own buffers by timer.
+    """
+
+    updated: int = last_login_buffer.flush()
+    logger.info(f'Last logins of {updated} users have been written.')
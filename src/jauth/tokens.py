@@ -51,22 +51,35 @@ class Token:
         refresh_token: str = cls.backend_class.generate_token(type='refresh', user_id=user.id)
         return cls(token=access_token, type='access'), cls(token=refresh_token, type='refresh')
 
-    def get_user_by_token(self) -> User:
+    def get_user_id(self) -> Optional[int]:
         """
-        get_user_by_token: Returns user according to token.
+        get_user_id: Returns id of the user according to token.
 
         Raises:
             Exception: Raises when verify method is not called.
 
         Returns:
-            User: User instance.
+            Optional[int]: User's id or None if token has no user.
         """
 
         if not hasattr(self, '_payload'):
-            logger.error('Function get_user_by_token called before verify.')
+            logger.error('Function get_user_id called before verify.')
             raise Exception('You must call verify before any action with token.')
 
-        user_id: int = self._payload.get('sub', None)
+        return self._payload.get('sub', None)
+
+    def get_user_by_token(self) -> User:
+        """
+        get_user_by_token: Returns user according to token.
+
+        Raises:
+            Exception: Raises when verify method is not called.
+
+        Returns:
+            User: User instance.
+        """
+
+        user_id: Optional[int] = self.get_user_id()
 
         if user_id is None:
             return None
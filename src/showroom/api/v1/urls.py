@@ -3,8 +3,11 @@ urls.py: File, containing routes for a showroom application.
 """
 
 
+from django.conf import settings
+from django.urls import re_path
 from rest_framework.routers import SimpleRouter
 from showroom.api.v1 import views
+from core.api.v1.views import SalesAnalyticsAsyncView
 
 
 app_name: str = 'showroom'
@@ -14,3 +17,12 @@ router: SimpleRouter = SimpleRouter()
 router.register(prefix='showrooms', viewset=views.ShowroomViewSet, basename='showroom')
 
 urlpatterns: list = router.urls
+
+if settings.ASYNC_VIEWS:
+    urlpatterns = [
+        re_path(
+            r'^showrooms/(?P<pk>[^/.]+)/get_analytics/$',
+            SalesAnalyticsAsyncView.as_view(viewset_class=views.ShowroomViewSet),
+            name='showroom-get-analytics-async',
+        ),
+    ] + urlpatterns
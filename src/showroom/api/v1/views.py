@@ -3,8 +3,10 @@ views.py: File, containing views for a showroom application.
 """
 
 
-from typing import ClassVar, Iterable
+from typing import Union, ClassVar, Optional
+from django.http import StreamingHttpResponse
 from rest_framework import status, viewsets
+from django.db.models import Prefetch
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from django.db.models.query import QuerySet
 from rest_framework.filters import SearchFilter, OrderingFilter
@@ -13,8 +15,11 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
-from showroom.models import ShowroomModel
+from core.analytics import sales_analytics
+from showroom.models import ShowroomCar, ShowroomModel
+from config.paginators import RelatedListMixin
 from showroom.services import ShowroomService
+from core.api.v1.serializers import SalesStatisticsSerializer
 from showroom.api.v1.swagger import (
     showroom_list_schema_extension,
     showroom_create_schema_extension,
@@ -22,6 +27,7 @@ from showroom.api.v1.swagger import (
     showroom_destroy_schema_extension,
     showroom_get_cars_schema_extension,
     showroom_retrieve_schema_extension,
+    showroom_get_analytics_schema_extension,
     showroom_get_discounts_schema_extension,
     showroom_make_discount_schema_extension,
     showroom_get_statistics_schema_extension,
@@ -47,8 +53,9 @@ from showroom.api.v1.serializers import (
     get_discounts=extend_schema(**showroom_get_discounts_schema_extension),
     get_statistics=extend_schema(**showroom_get_statistics_schema_extension),
     get_cars=extend_schema(**showroom_get_cars_schema_extension),
+    get_analytics=extend_schema(**showroom_get_analytics_schema_extension),
 )
-class ShowroomViewSet(viewsets.ModelViewSet):
+class ShowroomViewSet(RelatedListMixin, viewsets.ModelViewSet):
     """
     ShowroomViewSet: Handling every action for a Showroom resource.
     Maps HTTP methods to actions:
@@ -62,6 +69,7 @@ class ShowroomViewSet(viewsets.ModelViewSet):
         DELETE -> destroy
 
     Args:
+        RelatedListMixin (_type_): Paginates or streams related resources.
         viewsets.ModelViewSet (_type_): Builtin superclass for a ShowroomViewSet.
     """
 
@@ -98,6 +106,29 @@ class ShowroomViewSet(viewsets.ModelViewSet):
         '-created_at',
     ]
 
+    prefetch_map: ClassVar[dict] = {
+        'list': [
+            'appropriate_cars',
+            'current_suppliers',
+            Prefetch('cars', ShowroomCar.objects.only('pk', 'showroom')),
+        ],
+        'retrieve': [
+            'appropriate_cars',
+            'current_suppliers',
+            Prefetch('cars', ShowroomCar.objects.only('pk', 'showroom')),
+        ],
+    }
+
+    def get_queryset(self) -> QuerySet[ShowroomModel]:
+        """
+        get_queryset: Returns queryset with relations that serializer of the action renders.
+
+        Returns:
+            QuerySet[ShowroomModel]: Queryset of the resources.
+        """
+
+        return super().get_queryset().prefetch_related(*self.prefetch_map.get(self.action, []))
+
     def create(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
         """
         create: Creates showroom, finds appropriates cars and suppliers for showroom.
@@ -112,9 +143,9 @@ class ShowroomViewSet(viewsets.ModelViewSet):
         serializer: ShowroomSerializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        cars: Iterable = self.service.find_appropriate_cars(request.data)
+        car_ids: list = self.service.find_appropriate_cars(request.data)
         showroom: ShowroomModel = serializer.save()
-        self.service.add_appropriate_cars(showroom, cars)
+        self.service.add_appropriate_cars(showroom, car_ids)
         self.service.find_appropriate_suppliers(showroom)
 
         headers: dict = self.get_success_headers(serializer.data)
@@ -132,9 +163,9 @@ class ShowroomViewSet(viewsets.ModelViewSet):
         """
 
         if 'charts' in request.data:
-            cars: Iterable = self.service.find_appropriate_cars(request.data)
+            car_ids: list = self.service.find_appropriate_cars(request.data)
             showroom: ShowroomModel = self.get_object()
-            self.service.add_appropriate_cars(showroom, cars)
+            self.service.add_appropriate_cars(showroom, car_ids)
             self.service.find_appropriate_suppliers(showroom)
 
         response: Response = super().update(request, *args, **kwargs)
@@ -148,10 +179,15 @@ class ShowroomViewSet(viewsets.ModelViewSet):
             request (Request): Request instance.
 
         Returns:
-            Response: HTTP 204 Response if showroom can be deleted otherwise HTTP 401/403.
+            Response: HTTP 204 Response if showroom is deleted, HTTP 202 Response with id of the
+            soft deletion job if its history is deleted in background, otherwise HTTP 401/403.
         """
 
-        self.service.delete_showroom(self.get_object())
+        job: Optional[str] = self.service.delete_showroom(self.get_object())
+
+        if job is not None:
+            return Response({'job': job}, status=status.HTTP_202_ACCEPTED)
+
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(methods=['post'], detail=True, serializer_class=ShowroomCarDiscountSerializer)
@@ -170,11 +206,11 @@ class ShowroomViewSet(viewsets.ModelViewSet):
         showroom: ShowroomModel = self.get_object()
         serializer: ShowroomCarDiscountSerializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(showroom=showroom)
+        self.service.register_discount(serializer.save(showroom=showroom))
         return Response(serializer.data, status.HTTP_200_OK)
 
     @action(methods=['get'], detail=True, serializer_class=ShowroomCarDiscountSerializer)
-    def get_discounts(self, request: Request, pk: int) -> Response:
+    def get_discounts(self, request: Request, pk: int) -> Union[Response, StreamingHttpResponse]:
         """
         get_statistics: Returns discounts of the showroom.
 
@@ -183,16 +219,16 @@ class ShowroomViewSet(viewsets.ModelViewSet):
             pk (int): Showroom's pk.
 
         Returns:
-            Response: HTTP 200 if has permissions otherwise 401/403.
+            Union[Response, StreamingHttpResponse]: HTTP 200 with page or NDJSON stream if has
+            permissions otherwise 401/403.
         """
 
         showroom: ShowroomModel = self.get_object()
-        discounts: QuerySet = showroom.discounts.all()
-        serializer: ShowroomHistorySerializer = self.get_serializer(discounts, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        discounts: QuerySet = showroom.discounts.prefetch_related('cars')
+        return self.list_related(request, discounts)
 
     @action(methods=['get'], detail=True, serializer_class=ShowroomHistorySerializer)
-    def get_statistics(self, request: Request, pk: int) -> Response:
+    def get_statistics(self, request: Request, pk: int) -> Union[Response, StreamingHttpResponse]:
         """
         get_statistics: Returns statistics for showrooms's operations.
 
@@ -201,16 +237,16 @@ class ShowroomViewSet(viewsets.ModelViewSet):
             pk (int): Showroom's pk.
 
         Returns:
-            Response: HTTP 200 if has permissions otherwise 401/403.
+            Union[Response, StreamingHttpResponse]: HTTP 200 with page or NDJSON stream if has
+            permissions otherwise 401/403.
         """
 
         showroom: ShowroomModel = self.get_object()
         history: QuerySet = showroom.history.all()
-        serializer: ShowroomHistorySerializer = self.get_serializer(history, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.list_related(request, history)
 
     @action(methods=['get'], detail=True, serializer_class=ShowroomCarSerializer)
-    def get_cars(self, request: Request, pk: int) -> Response:
+    def get_cars(self, request: Request, pk: int) -> Union[Response, StreamingHttpResponse]:
         """
         get_cars: Returns cars of the showroom.
 
@@ -219,10 +255,26 @@ class ShowroomViewSet(viewsets.ModelViewSet):
             pk (int): Showrooms's pk.
 
         Returns:
-            Response: HTTP 200 if has permissions otherwise 401/403.
+            Union[Response, StreamingHttpResponse]: HTTP 200 with page or NDJSON stream if has
+            permissions otherwise 401/403.
         """
 
         showroom: ShowroomModel = self.get_object()
         cars: QuerySet = showroom.cars.all()
-        serializer: ShowroomCarSerializer = self.get_serializer(cars, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.list_related(request, cars)
+
+    @action(methods=['get'], detail=True, serializer_class=SalesStatisticsSerializer)
+    def get_analytics(self, request: Request, pk: int) -> Response:
+        """
+        get_analytics: Returns sales analytics of the showroom, that is computed in database.
+
+        Args:
+            request (Request): Request instance.
+            pk (int): Showroom's pk.
+
+        Returns:
+            Response: HTTP 200 if has permissions otherwise 400/401/403.
+        """
+
+        showroom: ShowroomModel = self.get_object()
+        return sales_analytics.respond(request, showroom, 'sale_price')
@@ -0,0 +1,29 @@
+# Generated by Django 4.1.3 on 2026-10-18 01:05
+
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('showroom', '0004_alter_showroomcar_options'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='showroomcardiscount',
+            index=models.Index(
+                condition=models.Q(('is_active', True)),
+                fields=['finish_date'],
+                name='showroom_discount_finish_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='showroomcardiscount',
+            index=models.Index(
+                condition=models.Q(('is_active', False)),
+                fields=['start_date'],
+                name='showroom_discount_start_idx',
+            ),
+        ),
+    ]
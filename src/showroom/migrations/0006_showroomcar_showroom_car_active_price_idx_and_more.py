@@ -0,0 +1,29 @@
+# Generated by Django 4.1.3 on 2026-10-18 01:07
+
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('showroom', '0005_showroomcardiscount_showroom_discount_finish_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='showroomcar',
+            index=models.Index(
+                condition=models.Q(('is_active', True)),
+                fields=['car', 'price', 'id'],
+                name='showroom_car_active_price_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='showroomhistory',
+            index=models.Index(
+                condition=models.Q(('is_active', True)),
+                fields=['showroom', 'car'],
+                name='showroom_history_active_idx',
+            ),
+        ),
+    ]
@@ -131,6 +131,19 @@ class ShowroomCarDiscount(BaseModel):
         verbose_name_plural: ClassVar[str] = 'Showroom discounts.'
         db_table: ClassVar[str] = 'ShowroomDiscount'
 
+        indexes: ClassVar[list] = [
+            models.Index(
+                fields=['finish_date'],
+                condition=models.Q(is_active=True),
+                name='showroom_discount_finish_idx',
+            ),
+            models.Index(
+                fields=['start_date'],
+                condition=models.Q(is_active=False),
+                name='showroom_discount_start_idx',
+            ),
+        ]
+
 
 class ShowroomCar(BaseModel):
     """
@@ -180,6 +193,14 @@ class ShowroomCar(BaseModel):
         db_table: ClassVar[str] = 'ShowroomCar'
         ordering = ['price']
 
+        indexes: ClassVar[list] = [
+            models.Index(
+                fields=['car', 'price', 'id'],
+                condition=models.Q(is_active=True),
+                name='showroom_car_active_price_idx',
+            ),
+        ]
+
 
 class ShowroomHistory(BaseModel):
     """
@@ -228,3 +249,11 @@ class ShowroomHistory(BaseModel):
         verbose_name: ClassVar[str] = 'Showroom history entry'
         verbose_name_plural: ClassVar[str] = 'Showroom history'
         db_table: ClassVar[str] = 'ShowroomHistory'
+
+        indexes: ClassVar[list] = [
+            models.Index(
+                fields=['showroom', 'car'],
+                condition=models.Q(is_active=True),
+                name='showroom_history_active_idx',
+            ),
+        ]
@@ -4,11 +4,16 @@ sevices.py: File, containing services for a showroom application.
 
 
 import json
-from typing import Iterable
+from typing import Iterable, Optional
+from django.db import transaction
+from django.core.exceptions import FieldError, ValidationError
 from rest_framework.exceptions import ParseError
-from core.tasks import find_suppliers
-from core.models import CarModel
-from showroom.models import ShowroomModel
+from core.tasks import find_suppliers, soft_delete_related
+from core.charts import car_chart_resolver
+from core.deletions import soft_deletion
+from core.discounts import showroom_discount_index
+from core.schedulers import discount_scheduler
+from showroom.models import ShowroomModel, ShowroomCarDiscount
 
 
 class ShowroomService:
@@ -16,7 +21,7 @@ class ShowroomService:
     ShowroomService: Contains business logic for Showroom resourse.
     """
 
-    def find_appropriate_cars(self, data: dict) -> Iterable[CarModel]:
+    def find_appropriate_cars(self, data: dict) -> list[int]:
         """
         find_appropriate_cars: Finds appropriate cars for showroom.
 
@@ -27,31 +32,33 @@ class ShowroomService:
             ParseError: If json-field 'charts' is not correct.
 
         Returns:
-            Iterable[CarModel]: Cars iterable object.
+            list[int]: Ids of the appropriate cars.
         """
 
-        charts: str | list = data['charts']
-        cars_charts: list = json.loads(charts) if type(charts) is str else charts
-
         try:
-            cars: list = [
-                CarModel.objects.filter(**car_charts).first() for car_charts in cars_charts
-            ]
-            return filter(lambda car: car is not None, cars)
-        except Exception:
+            charts: str | list = data['charts']
+            cars_charts: list = json.loads(charts) if type(charts) is str else charts
+            return car_chart_resolver.resolve(cars_charts)
+        except (KeyError, TypeError, ValueError, FieldError, ValidationError):
             raise ParseError('Invalid json data')
 
-    def add_appropriate_cars(self, showroom: ShowroomModel, cars: Iterable[CarModel]) -> None:
+    def add_appropriate_cars(self, showroom: ShowroomModel, car_ids: Iterable[int]) -> None:
         """
-        add_appropriate_cars: Adds appropriate cars to appropriate_cars field of showroom.
+        add_appropriate_cars: Sets appropriate cars of showroom, writes only changed cars.
 
         Args:
             showroom (ShowroomModel): Showroom instance.
-            cars (Iterable[CarModel]): Car instance.
+            car_ids (Iterable[int]): Ids of the appropriate cars.
         """
 
-        showroom.appropriate_cars.clear()
-        showroom.appropriate_cars.add(*cars)
+        current_ids: set = set(showroom.appropriate_cars.values_list('pk', flat=True))
+        new_ids: set = set(car_ids)
+
+        if current_ids - new_ids:
+            showroom.appropriate_cars.remove(*(current_ids - new_ids))
+
+        if new_ids - current_ids:
+            showroom.appropriate_cars.add(*(new_ids - current_ids))
 
     def find_appropriate_suppliers(self, showroom: ShowroomModel) -> None:
         """
@@ -63,25 +70,36 @@ class ShowroomService:
 
         find_suppliers.delay(showroom.pk)
 
-    def delete_showroom(self, showroom: ShowroomModel) -> None:
+    def register_discount(self, discount: ShowroomCarDiscount) -> None:
         """
-        delete_showroom: Sets showroom's is_active field to False.
+        register_discount: Schedules discount and makes it visible if it has started.
 
         Args:
-            showroom (ShowroomModel): Showroom instance.
+            discount (ShowroomCarDiscount): Created discount instance.
+        """
+
+        if discount_scheduler.register(discount):
+            showroom_discount_index.invalidate()
+
+    def delete_showroom(self, showroom: ShowroomModel) -> Optional[str]:
         """
+        delete_showroom: Deactivates the showroom with its discounts, cars and history.
+        Large history is deactivated by background job. Job is queued and discount index is
+        invalidated after commit, so they never read the showroom before it is deactivated.
+
+        Args:
+            showroom (ShowroomModel): Showroom instance.
 
-        showroom.is_active = False
-        showroom.save()
+        Returns:
+            Optional[str]: Id of the soft deletion job or None if everything is deactivated.
+        """
 
-        for discount in showroom.discounts.all():
-            discount.is_active = False
-            discount.save()
+        job: Optional[str] = soft_deletion.delete(
+            showroom, ['discounts', 'cars'], deferred=['history']
+        )
 
-        for car in showroom.cars.all():
-            car.is_active = False
-            car.save()
+        if job is not None:
+            transaction.on_commit(lambda: soft_delete_related.delay(job))
 
-        for history_entry in showroom.history.all():
-            history_entry.is_active = False
-            history_entry.save()
+        transaction.on_commit(showroom_discount_index.invalidate)
+        return job
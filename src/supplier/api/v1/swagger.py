@@ -5,7 +5,12 @@ swagger.py: File, containg schema extensions for extend schema decorator.
 
 from rest_framework import status
 from drf_spectacular.utils import OpenApiResponse
-from config.swagger import ForbiddenSerializer, UnauthorizedSerializer
+from config.swagger import ForbiddenSerializer, RelatedListParameters, UnauthorizedSerializer
+from core.api.v1.serializers import (
+    SalesQuerySerializer,
+    SalesStatisticsSerializer,
+    SoftDeletionJobSerializer,
+)
 from supplier.api.v1.serializers import (
     SupplierSerializer,
     SupplierCarSerializer,
@@ -97,6 +102,10 @@ supplier_destroy_schema_extension: dict = {
             response=None,
             description='Supplier is deactivated.',
         ),
+        status.HTTP_202_ACCEPTED: OpenApiResponse(
+            response=SoftDeletionJobSerializer,
+            description='Supplier is deactivated, its history is deactivated in background.',
+        ),
         status.HTTP_401_UNAUTHORIZED: UnauthorizedSerializer,
         status.HTTP_403_FORBIDDEN: ForbiddenSerializer,
     },
@@ -120,6 +129,7 @@ supplier_get_discounts_schema_extension: dict = {
     'description': """
       Returns discounts for cars of the supplier.
     """,
+    'parameters': RelatedListParameters,
     'responses': {
         status.HTTP_200_OK: SupplierCarDiscountSerializer,
         status.HTTP_401_UNAUTHORIZED: UnauthorizedSerializer,
@@ -132,6 +142,7 @@ supplier_get_statistics_schema_extension: dict = {
     'description': """
       Returns statistics for supplier. Includes info about deals with showrooms and suppliers.
     """,
+    'parameters': RelatedListParameters,
     'responses': {
         status.HTTP_200_OK: SupplierHistorySerializer,
         status.HTTP_401_UNAUTHORIZED: UnauthorizedSerializer,
@@ -144,9 +155,28 @@ supplier_get_cars_schema_extension: dict = {
     'description': """
       Returns cars of the supplier.
     """,
+    'parameters': RelatedListParameters,
     'responses': {
         status.HTTP_200_OK: SupplierCarSerializer,
         status.HTTP_401_UNAUTHORIZED: UnauthorizedSerializer,
         status.HTTP_403_FORBIDDEN: ForbiddenSerializer,
     },
 }
+
+supplier_get_analytics_schema_extension: dict = {
+    'summary': 'Getting sales analytics for supplier',
+    'description': """
+      Returns revenue, sold cars, average sale price, top cars
+      and sales per day or week of the supplier.
+    """,
+    'parameters': [SalesQuerySerializer],
+    'responses': {
+        status.HTTP_200_OK: SalesStatisticsSerializer,
+        status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+            response=SalesQuerySerializer,
+            description='Query parameters, that are not correct',
+        ),
+        status.HTTP_401_UNAUTHORIZED: UnauthorizedSerializer,
+        status.HTTP_403_FORBIDDEN: ForbiddenSerializer,
+    },
+}
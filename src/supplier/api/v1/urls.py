@@ -3,8 +3,11 @@ urls.py: File, containing routes for a supplier application.
 """
 
 
+from django.conf import settings
+from django.urls import re_path
 from rest_framework.routers import SimpleRouter
 from supplier.api.v1 import views
+from core.api.v1.views import SalesAnalyticsAsyncView
 
 
 app_name: str = 'supplier'
@@ -14,3 +17,12 @@ router: SimpleRouter = SimpleRouter()
 router.register(prefix='suppliers', viewset=views.SupplierViewSet, basename='supplier')
 
 urlpatterns: list = router.urls
+
+if settings.ASYNC_VIEWS:
+    urlpatterns = [
+        re_path(
+            r'^suppliers/(?P<pk>[^/.]+)/get_analytics/$',
+            SalesAnalyticsAsyncView.as_view(viewset_class=views.SupplierViewSet),
+            name='supplier-get-analytics-async',
+        ),
+    ] + urlpatterns
@@ -3,8 +3,10 @@ views.py: File, containing views for a supplier application.
 """
 
 
-from typing import ClassVar
+from typing import Union, ClassVar, Optional
+from django.http import StreamingHttpResponse
 from rest_framework import status, viewsets
+from django.db.models import Prefetch
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from django.db.models.query import QuerySet
 from rest_framework.filters import SearchFilter, OrderingFilter
@@ -13,8 +15,12 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
-from supplier.models import SupplierModel
+from core.analytics import sales_analytics
+from core.responses import CachedResponseMixin
+from supplier.models import SupplierCar, SupplierModel
+from config.paginators import RelatedListMixin
 from supplier.services import SupplierService
+from core.api.v1.serializers import SalesStatisticsSerializer
 from supplier.api.v1.swagger import (
     supplier_list_schema_extension,
     supplier_create_schema_extension,
@@ -22,6 +28,7 @@ from supplier.api.v1.swagger import (
     supplier_destroy_schema_extension,
     supplier_get_cars_schema_extension,
     supplier_retrieve_schema_extension,
+    supplier_get_analytics_schema_extension,
     supplier_get_discounts_schema_extension,
     supplier_make_discount_schema_extension,
     supplier_get_statistics_schema_extension,
@@ -47,8 +54,9 @@ from supplier.api.v1.serializers import (
     get_discounts=extend_schema(**supplier_get_discounts_schema_extension),
     get_statistics=extend_schema(**supplier_get_statistics_schema_extension),
     get_cars=extend_schema(**supplier_get_cars_schema_extension),
+    get_analytics=extend_schema(**supplier_get_analytics_schema_extension),
 )
-class SupplierViewSet(viewsets.ModelViewSet):
+class SupplierViewSet(CachedResponseMixin, RelatedListMixin, viewsets.ModelViewSet):
     """
     SupplierViewSet: Handling every action for a Supplier resource.
     Maps HTTP methods to actions:
@@ -62,6 +70,8 @@ class SupplierViewSet(viewsets.ModelViewSet):
         DELETE -> destroy
 
     Args:
+        CachedResponseMixin (_type_): Serves list and retrieve from the response cache.
+        RelatedListMixin (_type_): Paginates or streams related resources.
         viewsets.ModelViewSet (_type_): Builtin superclass for a SupplierViewSet.
     """
 
@@ -71,6 +81,8 @@ class SupplierViewSet(viewsets.ModelViewSet):
 
     service: ClassVar[SupplierService] = SupplierService()
 
+    cache_models: ClassVar[list] = [SupplierModel, SupplierCar, SupplierModel.showrooms.through]
+
     permission_classes: ClassVar[list] = [IsAdminUser]
 
     filter_backends: ClassVar[list] = [
@@ -98,6 +110,27 @@ class SupplierViewSet(viewsets.ModelViewSet):
         '-created_at',
     ]
 
+    prefetch_map: ClassVar[dict] = {
+        'list': [
+            'showrooms',
+            Prefetch('cars', SupplierCar.objects.only('pk', 'supplier')),
+        ],
+        'retrieve': [
+            'showrooms',
+            Prefetch('cars', SupplierCar.objects.only('pk', 'supplier')),
+        ],
+    }
+
+    def get_queryset(self) -> QuerySet[SupplierModel]:
+        """
+        get_queryset: Returns queryset with relations that serializer of the action renders.
+
+        Returns:
+            QuerySet[SupplierModel]: Queryset of the resources.
+        """
+
+        return super().get_queryset().prefetch_related(*self.prefetch_map.get(self.action, []))
+
     def destroy(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
         """
         destroy: Instead of deleting from database this method set suppliers's is_active to False.
@@ -106,10 +139,15 @@ class SupplierViewSet(viewsets.ModelViewSet):
             request (Request): Request instance.
 
         Returns:
-            Response: HTTP 204 Response if supplier can be deleted otherwise HTTP 401/403.
+            Response: HTTP 204 Response if supplier is deleted, HTTP 202 Response with id of the
+            soft deletion job if its history is deleted in background, otherwise HTTP 401/403.
         """
 
-        self.service.delete_supplier(self.get_object())
+        job: Optional[str] = self.service.delete_supplier(self.get_object())
+
+        if job is not None:
+            return Response({'job': job}, status=status.HTTP_202_ACCEPTED)
+
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(methods=['post'], detail=True, serializer_class=SupplierCarDiscountSerializer)
@@ -128,11 +166,11 @@ class SupplierViewSet(viewsets.ModelViewSet):
         supplier: SupplierModel = self.get_object()
         serializer: SupplierCarDiscountSerializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(supplier=supplier)
+        self.service.register_discount(serializer.save(supplier=supplier))
         return Response(serializer.data, status.HTTP_200_OK)
 
     @action(methods=['get'], detail=True, serializer_class=SupplierCarDiscountSerializer)
-    def get_discounts(self, request: Request, pk: int) -> Response:
+    def get_discounts(self, request: Request, pk: int) -> Union[Response, StreamingHttpResponse]:
         """
         get_discounts: Return discounts of the supplier.
 
@@ -141,16 +179,16 @@ class SupplierViewSet(viewsets.ModelViewSet):
             pk (int): Supplier's pk.
 
         Returns:
-            Response: HTTP 200 if has permissions otherwise 401/403.
+            Union[Response, StreamingHttpResponse]: HTTP 200 with page or NDJSON stream if has
+            permissions otherwise 401/403.
         """
 
         supplier: SupplierModel = self.get_object()
-        discounts: QuerySet = supplier.discounts.all()
-        serializer: SupplierCarDiscountSerializer = self.get_serializer(discounts, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        discounts: QuerySet = supplier.discounts.prefetch_related('cars')
+        return self.list_related(request, discounts)
 
     @action(methods=['get'], detail=True, serializer_class=SupplierHistorySerializer)
-    def get_statistics(self, request: Request, pk: int) -> Response:
+    def get_statistics(self, request: Request, pk: int) -> Union[Response, StreamingHttpResponse]:
         """
         get_statistics: Returns statistics for suppliers's operations.
 
@@ -159,16 +197,16 @@ class SupplierViewSet(viewsets.ModelViewSet):
             pk (int): Supplier's pk.
 
         Returns:
-            Response: HTTP 200 if has permissions otherwise 401/403.
+            Union[Response, StreamingHttpResponse]: HTTP 200 with page or NDJSON stream if has
+            permissions otherwise 401/403.
         """
 
         supplier: SupplierModel = self.get_object()
         history: QuerySet = supplier.history.all()
-        serializer: SupplierHistorySerializer = self.get_serializer(history, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.list_related(request, history)
 
     @action(methods=['get'], detail=True, serializer_class=SupplierCarSerializer)
-    def get_cars(self, request: Request, pk: int) -> Response:
+    def get_cars(self, request: Request, pk: int) -> Union[Response, StreamingHttpResponse]:
         """
         get_cars: Returns cars of the supplier.
 
@@ -177,10 +215,26 @@ class SupplierViewSet(viewsets.ModelViewSet):
             pk (int): Supplier's pk.
 
         Returns:
-            Response: HTTP 200 if has permissions otherwise 401/403.
+            Union[Response, StreamingHttpResponse]: HTTP 200 with page or NDJSON stream if has
+            permissions otherwise 401/403.
         """
 
         supplier: SupplierModel = self.get_object()
         cars: QuerySet = supplier.cars.all()
-        serializer: SupplierCarSerializer = self.get_serializer(cars, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.list_related(request, cars)
+
+    @action(methods=['get'], detail=True, serializer_class=SalesStatisticsSerializer)
+    def get_analytics(self, request: Request, pk: int) -> Response:
+        """
+        get_analytics: Returns sales analytics of the supplier, that is computed in database.
+
+        Args:
+            request (Request): Request instance.
+            pk (int): Supplier's pk.
+
+        Returns:
+            Response: HTTP 200 if has permissions otherwise 400/401/403.
+        """
+
+        supplier: SupplierModel = self.get_object()
+        return sales_analytics.respond(request, supplier, 'sale_price')
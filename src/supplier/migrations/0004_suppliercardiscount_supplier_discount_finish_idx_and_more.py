@@ -0,0 +1,29 @@
+# Generated by Django 4.1.3 on 2026-10-18 01:05
+
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('supplier', '0003_alter_suppliercar_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='suppliercardiscount',
+            index=models.Index(
+                condition=models.Q(('is_active', True)),
+                fields=['finish_date'],
+                name='supplier_discount_finish_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='suppliercardiscount',
+            index=models.Index(
+                condition=models.Q(('is_active', False)),
+                fields=['start_date'],
+                name='supplier_discount_start_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.1.3 on 2026-10-18 01:07
+
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('supplier', '0004_suppliercardiscount_supplier_discount_finish_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='suppliercar',
+            index=models.Index(
+                condition=models.Q(('is_active', True)),
+                fields=['car', 'price', 'id'],
+                name='supplier_car_active_price_idx',
+            ),
+        ),
+    ]
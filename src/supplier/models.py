@@ -122,6 +122,19 @@ class SupplierCarDiscount(BaseModel):
         verbose_name_plural: ClassVar[str] = 'Supplier discounts'
         db_table: ClassVar[str] = 'SupplierDiscount'
 
+        indexes: ClassVar[list] = [
+            models.Index(
+                fields=['finish_date'],
+                condition=models.Q(is_active=True),
+                name='supplier_discount_finish_idx',
+            ),
+            models.Index(
+                fields=['start_date'],
+                condition=models.Q(is_active=False),
+                name='supplier_discount_start_idx',
+            ),
+        ]
+
 
 class SupplierCar(BaseModel):
     """
@@ -160,6 +173,14 @@ class SupplierCar(BaseModel):
         db_table: ClassVar[str] = 'SupplierCar'
         ordering = ['price']
 
+        indexes: ClassVar[list] = [
+            models.Index(
+                fields=['car', 'price', 'id'],
+                condition=models.Q(is_active=True),
+                name='supplier_car_active_price_idx',
+            ),
+        ]
+
 
 class SupplierHistory(BaseModel):
     """
@@ -3,7 +3,13 @@ sevices.py: File, containing services for a supplier application.
 """
 
 
-from supplier.models import SupplierModel
+from typing import Optional
+from django.db import transaction
+from core.tasks import soft_delete_related
+from core.deletions import soft_deletion
+from core.discounts import supplier_discount_index
+from core.schedulers import discount_scheduler
+from supplier.models import SupplierModel, SupplierCarDiscount
 
 
 class SupplierService:
@@ -11,25 +17,36 @@ class SupplierService:
     SupplierService: Contains business logic for Supplier resourse.
     """
 
-    def delete_supplier(self, supplier: SupplierModel) -> None:
+    def register_discount(self, discount: SupplierCarDiscount) -> None:
         """
-        delete_supplier: Sets supplier's is_active field to False.
+        register_discount: Schedules discount and makes it visible if it has started.
 
         Args:
-            supplier (SupplierModel): Supplier instance.
+            discount (SupplierCarDiscount): Created discount instance.
+        """
+
+        if discount_scheduler.register(discount):
+            supplier_discount_index.invalidate()
+
+    def delete_supplier(self, supplier: SupplierModel) -> Optional[str]:
         """
+        delete_supplier: Deactivates the supplier with its discounts, cars and history.
+        Large history is deactivated by background job. Job is queued and discount index is
+        invalidated after commit, so they never read the supplier before it is deactivated.
 
-        supplier.is_active = False
-        supplier.save()
+        Args:
+            supplier (SupplierModel): Supplier instance.
+
+        Returns:
+            Optional[str]: Id of the soft deletion job or None if everything is deactivated.
+        """
 
-        for discount in supplier.discounts.all():
-            discount.is_active = False
-            discount.save()
+        job: Optional[str] = soft_deletion.delete(
+            supplier, ['discounts', 'cars'], deferred=['history']
+        )
 
-        for car in supplier.cars.all():
-            car.is_active = False
-            car.save()
+        if job is not None:
+            transaction.on_commit(lambda: soft_delete_related.delay(job))
 
-        for history_entry in supplier.history.all():
-            history_entry.is_active = False
-            history_entry.save()
+        transaction.on_commit(supplier_discount_index.invalidate)
+        return job
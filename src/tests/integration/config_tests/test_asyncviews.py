@@ -0,0 +1,141 @@
+"""
+test_asyncviews.py: File, containing integration tests for config.asyncviews.
+"""
+
+
+import importlib
+import pytest
+from django.db import connection
+from django.test import Client, AsyncClient
+from django.urls import resolve, clear_url_caches
+from asgiref.sync import async_to_sync
+from rest_framework import status
+from core.models import CarModel
+from jauth.models import User
+from jauth.backends import TokenBackend
+from showroom.models import ShowroomCar, ShowroomModel, ShowroomHistory
+from config.asyncviews import AsyncViewSetView
+
+
+pytestmark = pytest.mark.django_db
+
+URLCONFS: list[str] = [
+    'core.api.v1.urls',
+    'showroom.api.v1.urls',
+    'supplier.api.v1.urls',
+    'customer.api.v1.urls',
+    'config.urls',
+]
+
+
+class TestAsyncViewSetView:
+    @pytest.fixture(scope='function', autouse=True)
+    def async_urls(self, settings, mocker):
+        mocker.patch.dict(connection.settings_dict, {'ATOMIC_REQUESTS': False})
+
+        def reload(async_views: bool) -> None:
+            settings.ASYNC_VIEWS = async_views
+
+            for urlconf in URLCONFS:
+                importlib.reload(importlib.import_module(urlconf))
+
+            clear_url_caches()
+
+        reload(True)
+        yield
+        reload(False)
+
+    @pytest.fixture(scope='function', autouse=True)
+    def resources(self):
+        self.client = Client(enforce_csrf_checks=True)
+        self.admin = User.objects.create(
+            username='username1', password='password1', email='email1@mail.com', is_staff=True
+        )
+        self.user = User.objects.create(
+            username='username2', password='password2', email='email2@mail.com'
+        )
+        self.car = CarModel.objects.create(
+            brand='tesla', transmission_type='auto', creation_year=2000, miliage=1000.0
+        )
+        self.showroom = ShowroomModel.objects.create(name='name', creation_year=2000, charts={})
+        ShowroomHistory.objects.create(showroom=self.showroom, car=self.car, sale_price=1000)
+
+    def get_token(self, user: User) -> str:
+        return f"Bearer {TokenBackend.generate_token(type='access', user_id=user.id)}"
+
+    def test_routes(self):
+        url = f'/api/v1/showroom/showrooms/{self.showroom.id}/get_analytics/'
+
+        assert resolve('/api/v1/core/cars/').url_name == 'car-list-async'
+        assert resolve(url).url_name == 'showroom-get-analytics-async'
+        assert resolve('/api/v1/core/cars/').func.csrf_exempt is True
+        assert issubclass(resolve('/api/v1/core/cars/').func.view_class, AsyncViewSetView)
+
+    def test_car_list(self):
+        response = self.client.get('/api/v1/core/cars/')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        response = self.client.get(
+            '/api/v1/core/cars/', HTTP_AUTHORIZATION=self.get_token(self.user)
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        response = self.client.get(
+            '/api/v1/core/cars/', {'brand': 'tesla'}, HTTP_AUTHORIZATION=self.get_token(self.admin)
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [car['brand'] for car in response.json()['results']] == ['tesla']
+        assert response.has_header('ETag')
+
+    def test_car_list_asgi(self):
+        client = AsyncClient(enforce_csrf_checks=True)
+
+        response = async_to_sync(client.get)(
+            '/api/v1/core/cars/', authorization=self.get_token(self.admin)
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [car['brand'] for car in response.json()['results']] == ['tesla']
+
+    def test_car_list_fallback(self):
+        response = self.client.post(
+            '/api/v1/core/cars/',
+            {'brand': 'audi', 'transmission_type': 'auto', 'creation_year': 2000, 'miliage': 1},
+            content_type='application/json',
+            HTTP_AUTHORIZATION=self.get_token(self.admin),
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert CarModel.objects.filter(brand='audi').exists()
+
+        response = self.client.delete(
+            '/api/v1/core/cars/', HTTP_AUTHORIZATION=self.get_token(self.admin)
+        )
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+    def test_sales_analytics(self):
+        url = f'/api/v1/showroom/showrooms/{self.showroom.id}/get_analytics/'
+        token = self.get_token(self.admin)
+
+        response = self.client.get(url, HTTP_AUTHORIZATION=token)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['units'] == 1
+
+        response = self.client.get(
+            '/api/v1/showroom/showrooms/0/get_analytics/', HTTP_AUTHORIZATION=token
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = self.client.get(url, {'bucket': 'year'}, HTTP_AUTHORIZATION=token)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_related_stream_asgi(self):
+        client = AsyncClient()
+        ShowroomCar.objects.create(price=1000, car=self.car, showroom=self.showroom)
+
+        response = async_to_sync(client.get)(
+            f'/api/v1/showroom/showrooms/{self.showroom.id}/get_cars/',
+            {'stream': 'ndjson'},
+            authorization=self.get_token(self.admin),
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/json'
+        assert [car['car'] for car in response.json()['results']] == [self.car.id]
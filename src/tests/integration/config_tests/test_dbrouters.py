@@ -0,0 +1,57 @@
+"""
+test_dbrouters.py: File, containing integration tests for config.dbrouters.
+Tests need a replica of the test database, that is listed in DB_REPLICA_HOSTS.
+"""
+
+
+import pytest
+from django.db import connections
+from django.conf import settings
+from django.test.utils import CaptureQueriesContext
+from core.models import CarModel
+from config.dbrouters import ReplicaRouter, replica_router
+
+
+REPLICAS: list[str] = settings.DATABASE_REPLICAS['REPLICAS']
+
+pytestmark = [
+    pytest.mark.django_db(databases='__all__'),
+    pytest.mark.skipif(not REPLICAS, reason='DB_REPLICA_HOSTS is not set.'),
+]
+
+
+class TestReplicaRouter:
+    @pytest.fixture(scope='function', autouse=True)
+    def replica(self, settings, mocker):
+        settings.DATABASE_REPLICAS = {**settings.DATABASE_REPLICAS, 'REPLICAS': REPLICAS}
+        mocker.patch.object(ReplicaRouter, 'lags', {})
+        replica_router.reset()
+        self.master = settings.DATABASE_REPLICAS['MASTER']
+        self.replicas = REPLICAS
+        yield
+        replica_router.reset()
+
+    def count_cars(self) -> tuple[int, int]:
+        with CaptureQueriesContext(connections[self.master]) as master:
+            with CaptureQueriesContext(connections[self.replicas[0]]) as replica:
+                CarModel.objects.filter(brand='audi').count()
+
+        return (
+            len([query for query in master if '"Car"' in query['sql']]),
+            len([query for query in replica if '"Car"' in query['sql']]),
+        )
+
+    def test_read(self, settings):
+        settings.DATABASE_REPLICAS = {**settings.DATABASE_REPLICAS, 'REPLICAS': self.replicas[:1]}
+        assert replica_router.get_lag(self.replicas[0]) <= 2
+        assert self.count_cars() == (0, 1)
+
+    def test_read_after_write(self):
+        CarModel.objects.create(
+            brand='audi', transmission_type='auto', creation_year=2000, miliage=1000.0
+        )
+        assert self.count_cars() == (1, 0)
+
+    def test_read_lagging(self, settings):
+        settings.DATABASE_REPLICAS = {**settings.DATABASE_REPLICAS, 'MAX_LAG_SECONDS': -1}
+        assert self.count_cars() == (1, 0)
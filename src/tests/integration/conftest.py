@@ -4,25 +4,66 @@ conftest.py: File, containing common fixtures for integration tests.
 
 
 import os
+from typing import Callable
 import pytest
+from django.db import connection
 from django.conf import settings
+from django.core.cache import cache
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
+from jauth.caches import user_cache
+from jauth.buffers import last_login_buffer
 
 
 @pytest.fixture(scope='session')
 def django_db_setup():
-    settings.DATABASES['default'] = {
-        'ENGINE': os.getenv('DB_ENGINE'),
-        'NAME': os.getenv('DB_NAME'),
-        'HOST': os.getenv('DB_HOST'),
-        'PORT': os.getenv('DB_PORT'),
-        'USER': os.getenv('DB_USER'),
-        'PASSWORD': os.getenv('DB_PASSWORD'),
-        'ATOMIC_REQUESTS': True,
-        'CONN_MAX_AGE': 0,
-    }
+    settings.DATABASES['default'].update(
+        {
+            'ENGINE': os.getenv('DB_ENGINE'),
+            'NAME': os.getenv('DB_NAME'),
+            'HOST': os.getenv('DB_HOST'),
+            'PORT': os.getenv('DB_PORT'),
+            'USER': os.getenv('DB_USER'),
+            'PASSWORD': os.getenv('DB_PASSWORD'),
+            'ATOMIC_REQUESTS': True,
+            'CONN_MAX_AGE': 0,
+        }
+    )
 
 
 @pytest.fixture(scope='function')
 def client():
     return APIClient()
+
+
+@pytest.fixture(scope='function', autouse=True)
+def no_replicas(settings):
+    settings.DATABASE_REPLICAS = {**settings.DATABASE_REPLICAS, 'REPLICAS': []}
+
+
+@pytest.fixture(scope='function', autouse=True)
+def clear_caches():
+    cache.clear()
+    user_cache.clear()
+    last_login_buffer.clear()
+
+
+@pytest.fixture(scope='function')
+def assert_constant_queries(client: APIClient) -> Callable[[str, int], None]:
+    def count_queries(url: str, page_size: int) -> int:
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'page_size': page_size}, format='json')
+
+        assert response.status_code == 200
+        assert len(response.data['results']) == page_size
+        return len([query for query in context if 'SAVEPOINT' not in query['sql']])
+
+    def assert_constant_queries(url: str, page_size: int) -> None:
+        count_queries(url, 1)
+        queries: int = count_queries(url, 1)
+
+        assert count_queries(url, page_size) == queries, f'Queries of {url} grow with page size'
+
+    return assert_constant_queries
@@ -0,0 +1,95 @@
+"""
+test_analytics.py: File, containing integration tests for core.analytics.
+"""
+
+
+from decimal import Decimal
+from datetime import datetime, timezone, timedelta
+import pytest
+from core.models import CarModel
+from core.analytics import sales_analytics
+from showroom.models import ShowroomModel, ShowroomHistory
+
+
+pytestmark = pytest.mark.django_db
+
+
+class TestSalesAnalytics:
+    @pytest.fixture(scope='function', autouse=True)
+    def history(self):
+        self.cars = [
+            CarModel.objects.create(
+                brand=brand,
+                transmission_type='auto',
+                creation_year=2000,
+                miliage=1000.0,
+            )
+            for brand in ['audi', 'bmw']
+        ]
+        self.showroom = ShowroomModel.objects.create(
+            name='analytics', creation_year=2000, charts={}
+        )
+        monday = datetime(2022, 11, 7, 12, tzinfo=timezone.utc)
+
+        for days, car, price, is_active in [
+            (0, self.cars[0], 1000, True),
+            (0, self.cars[1], 3000, True),
+            (1, self.cars[0], 2000, True),
+            (7, self.cars[0], 3000, True),
+            (7, None, 500, True),
+            (8, self.cars[1], 9000, False),
+        ]:
+            entry = ShowroomHistory.objects.create(
+                showroom=self.showroom, car=car, sale_price=price, is_active=is_active
+            )
+            ShowroomHistory.objects.filter(pk=entry.pk).update(
+                created_at=monday + timedelta(days=days)
+            )
+
+    def test_get_statistics(self, django_assert_num_queries):
+        with django_assert_num_queries(2):
+            statistics = sales_analytics.get_statistics(self.showroom.history.all(), 'sale_price')
+
+        assert statistics['revenue'] == Decimal(9500)
+        assert statistics['units'] == 5
+        assert statistics['average_price'] == Decimal(1900)
+        assert [bucket['units'] for bucket in statistics['buckets']] == [2, 1, 2]
+        assert [bucket['revenue'] for bucket in statistics['buckets']] == [
+            Decimal(4000),
+            Decimal(2000),
+            Decimal(3500),
+        ]
+        assert [
+            (car['car'], car['brand'], car['units'], car['average_price'])
+            for car in statistics['top_cars']
+        ] == [
+            (self.cars[0].pk, 'audi', 3, Decimal(2000)),
+            (self.cars[1].pk, 'bmw', 1, Decimal(3000)),
+        ]
+
+    def test_get_statistics_by_weeks(self):
+        statistics = sales_analytics.get_statistics(
+            self.showroom.history.all(), 'sale_price', bucket='week'
+        )
+
+        assert [bucket['units'] for bucket in statistics['buckets']] == [3, 2]
+        assert statistics['buckets'][0]['period'].date() == datetime(2022, 11, 7).date()
+
+    def test_get_statistics_period(self):
+        statistics = sales_analytics.get_statistics(
+            self.showroom.history.all(),
+            'sale_price',
+            since=datetime(2022, 11, 8).date(),
+            until=datetime(2022, 11, 14).date(),
+        )
+
+        assert statistics['units'] == 3
+        assert statistics['revenue'] == Decimal(5500)
+
+        statistics = sales_analytics.get_statistics(
+            self.showroom.history.all(), 'sale_price', since=datetime(2023, 1, 1).date()
+        )
+
+        assert statistics['units'] == 0
+        assert statistics['average_price'] is None
+        assert statistics['top_cars'] == []
@@ -4,7 +4,9 @@ test_api.py: File, containing integration tests for core api.
 
 
 import pytest
+from django.db import connection
 from rest_framework import status
+from django.test.utils import CaptureQueriesContext
 from core.models import CarModel
 from jauth.models import User
 from jauth.backends import TokenBackend
@@ -113,3 +115,34 @@ class TestCarApi:
 
         response = client.delete(f'/api/v1/core/cars/{self.car.id}/', format='json')
         assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_cached_cars(self, client):
+        admin_token = TokenBackend.generate_token(type='access', user_id=self.admin.id)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token}')
+
+        response = client.get('/api/v1/core/cars/', format='json')
+        etag = response['ETag']
+        assert response.status_code == status.HTTP_200_OK
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/core/cars/', format='json')
+            assert response.status_code == status.HTTP_200_OK
+            assert response['ETag'] == etag
+
+            response = client.get('/api/v1/core/cars/', format='json', HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        assert [query for query in queries if 'SELECT' in query['sql']] == []
+
+        response = client.post('/api/v1/core/cars/', self.car_json, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = client.get('/api/v1/core/cars/', format='json', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 2
+
+        self.car.is_active = False
+        self.car.save()
+
+        response = client.get(f'/api/v1/core/cars/{self.car.id}/', format='json')
+        assert response.data['is_active'] is False
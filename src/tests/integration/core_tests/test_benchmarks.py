@@ -0,0 +1,72 @@
+"""
+test_benchmarks.py: File, containing integration tests for core benchmarks.
+"""
+
+
+import json
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from core.models import CarModel
+from customer.models import CustomerModel, CustomerOffer, CustomerHistory
+from showroom.models import ShowroomModel
+from supplier.models import SupplierCar, SupplierModel
+
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class TestBenchmark:
+    @pytest.fixture(scope='function', autouse=True)
+    def seed(self):
+        call_command(
+            'fill', cars=20, suppliers=3, supplier_cars=100, showrooms=2, customers=5, offers=10
+        )
+
+    def test_fill(self):
+        assert CarModel.objects.count() == 20
+        assert SupplierModel.objects.count() == 3
+        assert SupplierCar.objects.count() == 100
+        assert CustomerModel.objects.count() == 5
+        assert CustomerOffer.objects.filter(is_active=True).count() == 10
+
+        for showroom in ShowroomModel.objects.all():
+            assert showroom.appropriate_cars.count() == len(showroom.charts)
+
+    @pytest.mark.parametrize('async_views', [False, True])
+    def test_benchmark(self, settings, tmp_path, async_views):
+        settings.ASYNC_VIEWS = async_views
+        output = tmp_path / 'results.json'
+        options = {
+            'requests': 4,
+            'concurrency': 2,
+            'task_calls': 2,
+            'endpoints': ['cars', 'showroom_cars', 'customer_statistics'],
+            'tasks': ['find_suppliers', 'make_customer_offer'],
+            'uncached': True,
+        }
+
+        call_command('benchmark', output=output, **options)
+
+        results = json.loads(output.read_text())
+        assert results['profile'] == ('asgi' if async_views else 'wsgi')
+        assert results['volumes']['cars'] == 20
+        assert results['tasks']['find_suppliers']['count'] == 2
+        assert results['tasks']['make_customer_offer']['count'] == 2
+        assert CustomerOffer.objects.filter(is_active=True).count() == (
+            10 - CustomerHistory.objects.count()
+        )
+
+        for summary in results['endpoints'].values():
+            assert summary['count'] == 4
+            assert summary['failed'] == 0
+
+        baseline = {**results, 'revision': 'baseline'}
+        baseline['endpoints'] = {
+            name: {**summary, 'p50_ms': 0.0, 'p95_ms': 0.0}
+            for name, summary in results['endpoints'].items()
+        }
+        (tmp_path / 'baseline.json').write_text(json.dumps(baseline))
+
+        with pytest.raises(CommandError, match='cars p50_ms 0.0 -> '):
+            call_command('benchmark', output=output, compare=tmp_path / 'baseline.json', **options)
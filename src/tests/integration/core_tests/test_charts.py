@@ -0,0 +1,76 @@
+"""
+test_charts.py: File, containing integration tests for core.charts.
+"""
+
+
+import pytest
+from core.charts import car_chart_resolver
+from core.models import CarModel
+
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCarChartResolver:
+    @pytest.fixture(scope='function', autouse=True)
+    def cars(self):
+        CarModel.objects.bulk_create(
+            [
+                CarModel(
+                    brand=brand,
+                    transmission_type=transmission_type,
+                    creation_year=2000 + i % 5,
+                    miliage=1000.0 * (i % 3),
+                )
+                for brand in ['audi', 'bmw']
+                for transmission_type in ['auto', 'manual']
+                for i in range(10)
+            ]
+        )
+        car_chart_resolver.invalidate()
+
+    @pytest.fixture(scope='function', autouse=True)
+    def charts(self, cars):
+        self.charts = [
+            {'brand': brand, 'transmission_type': 'auto', 'creation_year': year}
+            for brand in ['audi', 'bmw', 'opel']
+            for year in range(1999, 2006)
+        ] + [
+            {'brand': 'bmw', 'miliage': 2000},
+            {'miliage': 1000.0, 'brand': 'audi'},
+            {'creation_year__gte': 2003, 'brand': 'bmw'},
+            {'brand': 'audi', 'transmission_type': 'auto', 'creation_year': 2001},
+        ]
+
+    def test_resolve(self, django_assert_max_num_queries):
+        expected = [
+            car.pk
+            for car in (
+                CarModel.objects.filter(**chart).order_by('pk').first() for chart in self.charts
+            )
+            if car is not None
+        ]
+
+        with django_assert_max_num_queries(5):
+            car_ids = car_chart_resolver.resolve(self.charts)
+
+        assert car_ids == list(dict.fromkeys(expected))
+
+        with django_assert_max_num_queries(0):
+            assert (
+                car_chart_resolver.resolve([dict(reversed(chart.items())) for chart in self.charts])
+                == car_ids
+            )
+
+    def test_resolve_new_car(self):
+        assert car_chart_resolver.resolve([{'brand': 'tesla'}]) == []
+
+        car = CarModel.objects.create(
+            brand='tesla', transmission_type='auto', creation_year=2000, miliage=0.0
+        )
+
+        assert car_chart_resolver.resolve([{'brand': 'tesla'}]) == [car.pk]
+
+        car.delete()
+
+        assert car_chart_resolver.resolve([{'brand': 'tesla'}]) == []
@@ -0,0 +1,96 @@
+"""
+test_deletions.py: File, containing integration tests for core.deletions.
+"""
+
+
+import pytest
+from core.models import CarModel
+from core.deletions import soft_deletion
+from showroom.models import ShowroomCar, ShowroomModel, ShowroomHistory, ShowroomCarDiscount
+
+
+pytestmark = pytest.mark.django_db
+
+
+class TestSoftDeletion:
+    @pytest.fixture(scope='function', autouse=True)
+    def options(self, settings):
+        settings.SOFT_DELETE = {
+            'ASYNC_THRESHOLD': 10,
+            'CHUNK_SIZE': 4,
+            'SLEEP_SECONDS': 0,
+            'PROGRESS_TIMEOUT_SECONDS': 60,
+        }
+
+    @pytest.fixture(scope='function', autouse=True)
+    def showroom(self):
+        self.car = CarModel.objects.create(
+            brand='audi',
+            transmission_type='auto',
+            creation_year=2000,
+            miliage=1000.0,
+        )
+        self.showroom = ShowroomModel.objects.create(name='deleted', creation_year=2000, charts={})
+        self.other = ShowroomModel.objects.create(name='other', creation_year=2000, charts={})
+
+        for showroom in [self.showroom, self.other]:
+            ShowroomCar.objects.bulk_create(
+                [ShowroomCar(car=self.car, showroom=showroom, price=1000) for _ in range(3)]
+            )
+
+    def create_history(self, count: int) -> None:
+        for showroom in [self.showroom, self.other]:
+            ShowroomHistory.objects.bulk_create(
+                [ShowroomHistory(showroom=showroom, car=self.car, sale_price=1000)] * count
+            )
+
+    def assert_deleted(self) -> None:
+        for model in [ShowroomCar, ShowroomHistory]:
+            assert model.objects.filter(showroom=self.showroom, is_active=True).exists() is False
+            assert model.objects.filter(showroom=self.other, is_active=False).exists() is False
+
+        assert ShowroomModel.objects.get(pk=self.showroom.pk).is_active is False
+        assert ShowroomModel.objects.get(pk=self.other.pk).is_active is True
+
+    def test_delete(self, django_assert_max_num_queries):
+        self.create_history(10)
+
+        with django_assert_max_num_queries(8):
+            job = soft_deletion.delete(self.showroom, ['discounts', 'cars'], deferred=['history'])
+
+        assert job is None
+        assert self.showroom.is_active is False
+        self.assert_deleted()
+
+    def test_delete_deferred(self):
+        self.create_history(11)
+        ShowroomCarDiscount.objects.create(
+            name='discount',
+            description='description',
+            precent=0.3,
+            start_date='2022-01-01T00:00:00Z',
+            finish_date='2022-01-02T00:00:00Z',
+            showroom=self.showroom,
+        )
+
+        job = soft_deletion.delete(self.showroom, ['discounts', 'cars'], deferred=['history'])
+
+        assert ShowroomModel.objects.get(pk=self.showroom.pk).is_active is False
+        assert ShowroomCarDiscount.objects.filter(is_active=True).exists() is False
+        assert ShowroomCar.objects.filter(showroom=self.showroom, is_active=True).exists() is False
+        assert ShowroomHistory.objects.filter(showroom=self.showroom, is_active=True).count() == 11
+        assert soft_deletion.get_progress(job)['status'] == 'pending'
+        assert soft_deletion.get_progress(job)['total'] == 11
+
+        deleted = soft_deletion.run(job)
+
+        assert deleted == {'showroom.ShowroomHistory': 11}
+        self.assert_deleted()
+
+        progress = soft_deletion.get_progress(job)
+        assert progress['status'] == 'finished'
+        assert progress['done'] == 11
+        assert progress['rows'] == {'showroom.ShowroomHistory': 11}
+
+    def test_run_unknown(self):
+        assert soft_deletion.run('unknown') == {}
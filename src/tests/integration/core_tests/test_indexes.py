@@ -0,0 +1,233 @@
+"""
+test_indexes.py: File, containing EXPLAIN tests for indexes used by core tasks.
+"""
+
+
+from typing import Callable
+from datetime import timedelta
+import pytest
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from django_countries.fields import Country
+from core.tasks import find_suppliers, buy_showroom_cars, make_customer_offer
+from core.models import CarModel
+from jauth.models import User
+from core.schedulers import discount_scheduler
+from customer.models import CustomerModel, CustomerOffer
+from showroom.models import ShowroomCar, ShowroomModel, ShowroomHistory
+from supplier.models import SupplierCar, SupplierModel, SupplierCarDiscount
+
+
+pytestmark = pytest.mark.django_db
+
+
+def capture_queries(task: Callable, *args: object) -> list[str]:
+    """
+    capture_queries: Returns SQL of every select query executed by the task.
+
+    Args:
+        task (Callable): Task to run.
+        args (object): Task arguments.
+
+    Returns:
+        list[str]: SQL of executed select queries.
+    """
+
+    with CaptureQueriesContext(connection) as context:
+        task(*args)
+
+    return [query['sql'] for query in context.captured_queries if query['sql'].startswith('SELECT')]
+
+
+def explain(sql: str) -> str:
+    """
+    explain: Returns query plan of the SQL query.
+
+    Args:
+        sql (str): SQL query.
+
+    Returns:
+        str: Query plan.
+    """
+
+    prefix: str = 'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'{prefix} {sql}')
+        return '\n'.join(str(row) for row in cursor.fetchall())
+
+
+def assert_index_scan(queries: list[str], table: str, index: str) -> None:
+    """
+    assert_index_scan: Asserts that every query that reads from the table uses the index.
+
+    Args:
+        queries (list[str]): SQL queries.
+        table (str): Table name.
+        index (str): Index name.
+    """
+
+    table_queries: list[str] = [query for query in queries if f'FROM "{table}"' in query]
+
+    assert table_queries, f'No queries read from {table}.'
+
+    for query in table_queries:
+        plan: str = explain(query)
+
+        assert index in plan, f'{query} does not use {index}:\n{plan}'
+        assert f'Seq Scan on "{table}"' not in plan, plan
+
+
+class TestTaskIndexes:
+    @pytest.fixture(scope='function', autouse=True)
+    def cars(self):
+        self.cars = CarModel.objects.bulk_create(
+            [
+                CarModel(
+                    brand='audi',
+                    transmission_type='auto',
+                    creation_year=1950 + i,
+                    miliage=2000.00,
+                )
+                for i in range(50)
+            ]
+        )
+
+    @pytest.fixture(scope='function', autouse=True)
+    def suppliers(self, cars):
+        self.suppliers = SupplierModel.objects.bulk_create(
+            [
+                SupplierModel(
+                    name=f'supplier{i}',
+                    creation_year=2000,
+                    number_of_sales=10,
+                    discount_for_unique_customers=0.2,
+                )
+                for i in range(20)
+            ]
+        )
+
+        SupplierCar.objects.bulk_create(
+            [
+                SupplierCar(
+                    price=1000 + i * 10 + j,
+                    car=car,
+                    supplier=supplier,
+                    is_active=(i + j) % 10 == 0,
+                )
+                for i, car in enumerate(self.cars)
+                for j, supplier in enumerate(self.suppliers)
+                for _ in range(2)
+            ]
+        )
+
+        now = timezone.now()
+
+        SupplierCarDiscount.objects.bulk_create(
+            [
+                SupplierCarDiscount(
+                    name=f'discount{i}',
+                    description='description',
+                    precent=0.3,
+                    start_date=now - timedelta(days=2),
+                    finish_date=now - timedelta(days=1) + timedelta(minutes=i),
+                    supplier=self.suppliers[i % 20],
+                    is_active=i % 100 == 0,
+                )
+                for i in range(2000)
+            ]
+        )
+
+    @pytest.fixture(scope='function', autouse=True)
+    def showrooms(self, cars, suppliers):
+        self.showrooms = ShowroomModel.objects.bulk_create(
+            [
+                ShowroomModel(
+                    name=f'showroom{i}',
+                    creation_year=2001,
+                    balance=10,
+                    location=Country(code='NZ'),
+                    charts={},
+                )
+                for i in range(20)
+            ]
+        )
+
+        for i, showroom in enumerate(self.showrooms):
+            showroom.appropriate_cars.set(self.cars[i : i + 2])
+            showroom.current_suppliers.set(self.suppliers)
+
+        ShowroomCar.objects.bulk_create(
+            [
+                ShowroomCar(
+                    price=2000 + j,
+                    car=car,
+                    showroom=showroom,
+                    is_active=j % 10 == 0,
+                )
+                for car in self.cars
+                for showroom in self.showrooms
+                for j in range(3)
+            ]
+        )
+        ShowroomHistory.objects.bulk_create(
+            [
+                ShowroomHistory(
+                    showroom=showroom,
+                    car=car,
+                    sale_price=2000,
+                    is_active=j % 5 == 0,
+                )
+                for car in self.cars
+                for showroom in self.showrooms
+                for j in range(3)
+            ]
+        )
+
+    @pytest.fixture(scope='function', autouse=True)
+    def offer(self, cars, showrooms):
+        customer = CustomerModel.objects.create(
+            balance=0,
+            user=User.objects.create(
+                username='username1',
+                password='password1',
+                email='email1@mail.com',
+            ),
+        )
+
+        self.offer = CustomerOffer.objects.create(customer=customer, max_price=1, car=self.cars[0])
+
+    @pytest.fixture(scope='function', autouse=True)
+    def statistics(self, offer):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_make_customer_offer(self):
+        queries: list[str] = capture_queries(make_customer_offer, self.offer.id)
+
+        assert_index_scan(
+            [query for query in queries if 'LIMIT 1' in query],
+            'ShowroomCar',
+            'showroom_car_active_price_idx',
+        )
+
+    def test_find_suppliers(self):
+        queries: list[str] = capture_queries(find_suppliers, self.showrooms[0].id)
+
+        assert_index_scan(queries, 'SupplierCar', 'supplier_car_active_price_idx')
+
+    def test_buy_showroom_cars(self):
+        queries: list[str] = capture_queries(buy_showroom_cars, [self.showrooms[0].id])
+
+        assert_index_scan(queries, 'SupplierCar', 'supplier_car_active_price_idx')
+        assert_index_scan(queries, 'ShowroomHistory', 'showroom_history_active_idx')
+
+    def test_sync_discount_schedule(self):
+        queries: list[str] = capture_queries(discount_scheduler.sync)
+
+        assert_index_scan(
+            [query for query in queries if 'NOT' not in query and 'start_date' not in query],
+            'SupplierDiscount',
+            'supplier_discount_finish_idx',
+        )
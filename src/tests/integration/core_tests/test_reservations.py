@@ -0,0 +1,176 @@
+"""
+test_reservations.py: File, containing concurrency tests for inventory reservation.
+"""
+
+
+from typing import Callable
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from django.db import connection, connections
+from django.db.models import Sum
+from django_countries.fields import Country
+from core.tasks import offer_matcher, buy_showroom_cars, make_customer_offer
+from core.models import CarModel
+from jauth.models import User
+from core.discounts import showroom_discount_index, supplier_discount_index
+from customer.models import CustomerModel, CustomerOffer, CustomerHistory
+from showroom.models import ShowroomCar, ShowroomModel, ShowroomHistory
+from supplier.models import SupplierCar, SupplierModel, SupplierHistory
+
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.skipif(
+        connection.vendor != 'postgresql', reason='row locks are tested on PostgreSQL only'
+    ),
+]
+
+WORKERS: int = 8
+
+
+def run_concurrently(calls: list[tuple[Callable, tuple]]) -> None:
+    """
+    run_concurrently: Runs every call in a pool of threads, each thread uses its own connection.
+
+    Args:
+        calls (list[tuple[Callable, tuple]]): Callables with their arguments.
+    """
+
+    def run(task: Callable, args: tuple) -> None:
+        try:
+            task(*args)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        for future in [executor.submit(run, task, args) for task, args in calls]:
+            future.result()
+
+
+class TestReservations:
+    @pytest.fixture(scope='function', autouse=True)
+    def car(self):
+        self.car = CarModel.objects.create(
+            brand='audi',
+            transmission_type='auto',
+            creation_year=2000,
+            miliage=2000.00,
+        )
+        showroom_discount_index.invalidate()
+        supplier_discount_index.invalidate()
+
+    @pytest.fixture(scope='function', autouse=True)
+    def suppliers(self, car):
+        self.suppliers = SupplierModel.objects.bulk_create(
+            [
+                SupplierModel(
+                    name=f'supplier{i}',
+                    creation_year=2000,
+                    number_of_sales=100,
+                    discount_for_unique_customers=0.2,
+                )
+                for i in range(3)
+            ]
+        )
+        SupplierCar.objects.bulk_create(
+            [
+                SupplierCar(price=1000 + i, car=self.car, supplier=supplier)
+                for i in range(4)
+                for supplier in self.suppliers
+            ]
+        )
+
+    @pytest.fixture(scope='function', autouse=True)
+    def showrooms(self, suppliers):
+        self.showrooms = ShowroomModel.objects.bulk_create(
+            [
+                ShowroomModel(
+                    name=f'showroom{i}',
+                    creation_year=2001,
+                    balance=5000,
+                    location=Country(code='NZ'),
+                    charts={},
+                    number_of_sales=100,
+                )
+                for i in range(WORKERS * 2)
+            ]
+        )
+
+        for showroom in self.showrooms:
+            showroom.appropriate_cars.set([self.car])
+            showroom.current_suppliers.set(self.suppliers)
+
+        ShowroomCar.objects.bulk_create(
+            [
+                ShowroomCar(price=1000 + i, car=self.car, showroom=showroom)
+                for i, showroom in enumerate(self.showrooms[:5])
+            ]
+        )
+
+    @pytest.fixture(scope='function', autouse=True)
+    def customers(self, showrooms):
+        self.customers = CustomerModel.objects.bulk_create(
+            [
+                CustomerModel(
+                    balance=2500,
+                    user=User.objects.create(
+                        username=f'username{i}',
+                        password=f'password{i}',
+                        email=f'email{i}@mail.com',
+                    ),
+                )
+                for i in range(3)
+            ]
+        )
+        self.offers = CustomerOffer.objects.bulk_create(
+            [
+                CustomerOffer(customer=customer, max_price=2000, car=self.car)
+                for _ in range(10)
+                for customer in self.customers
+            ]
+        )
+
+    def test_customer_offers(self):
+        run_concurrently(
+            [(make_customer_offer, (offer.pk,)) for offer in self.offers]
+            + [(offer_matcher.run_batch, ()) for _ in range(WORKERS)]
+        )
+
+        sold_cars = ShowroomCar.objects.filter(is_active=False)
+
+        assert sold_cars.exists()
+        assert CustomerOffer.objects.filter(is_active=False).count() >= sold_cars.count()
+        assert sold_cars.filter(user__isnull=False).count() == sold_cars.count()
+        assert ShowroomHistory.objects.count() == sold_cars.count()
+        assert CustomerHistory.objects.count() == sold_cars.count()
+
+        for customer in self.customers:
+            customer.refresh_from_db()
+            spent = ShowroomHistory.objects.filter(customer=customer).aggregate(
+                spent=Sum('sale_price')
+            )['spent'] or Decimal('0')
+
+            assert customer.balance >= 0
+            assert customer.balance == Decimal('2500') - spent
+            assert sold_cars.filter(user=customer).count() == (
+                ShowroomHistory.objects.filter(customer=customer).count()
+            )
+
+    def test_buy_showroom_cars(self):
+        run_concurrently([(buy_showroom_cars, ([showroom.pk],)) for showroom in self.showrooms])
+
+        sold_cars: int = SupplierCar.objects.filter(is_active=False).count()
+
+        assert sold_cars > 0
+        assert sold_cars == SupplierHistory.objects.count()
+        assert sold_cars == ShowroomCar.objects.filter(showroom__in=self.showrooms).count() - 5
+
+        for showroom in self.showrooms:
+            showroom.refresh_from_db()
+            spent = SupplierHistory.objects.filter(showroom=showroom).aggregate(
+                spent=Sum('sale_price')
+            )['spent'] or Decimal('0')
+
+            assert showroom.balance >= 0
+            assert showroom.balance == Decimal('5000') - spent
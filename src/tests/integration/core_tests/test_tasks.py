@@ -0,0 +1,409 @@
+"""
+test_tasks.py: File, containing integration tests for core tasks.
+"""
+
+
+from decimal import Decimal
+from datetime import datetime, timedelta
+import pytest
+from django.utils import timezone
+from django.db.models.query import QuerySet
+from django_countries.fields import Country
+from core.tasks import (
+    find_suppliers,
+    check_suppliers,
+    buy_showroom_cars,
+    make_customer_offer,
+    settle_customer_offers,
+)
+from core.models import CarModel
+from jauth.models import User
+from config.celery import app
+from core.discounts import showroom_discount_index, supplier_discount_index
+from core.purchasing import PurchasingPipeline
+from core.schedulers import discount_scheduler
+from customer.models import CustomerModel, CustomerOffer, CustomerHistory
+from showroom.models import ShowroomCar, ShowroomModel, ShowroomHistory
+from supplier.models import SupplierCar, SupplierModel, SupplierHistory, SupplierCarDiscount
+
+
+pytestmark = pytest.mark.django_db
+
+
+class TestSupplierTasks:
+    @pytest.fixture(scope='function', autouse=True)
+    def cars(self):
+        self.cars = [
+            CarModel.objects.create(
+                brand='audi',
+                transmission_type='auto',
+                creation_year=2000 + i,
+                miliage=2000.00,
+            )
+            for i in range(3)
+        ]
+
+    @pytest.fixture(scope='function', autouse=True)
+    def suppliers(self, cars):
+        self.suppliers = [
+            SupplierModel.objects.create(
+                name=f'supplier{i}',
+                creation_year=2000,
+                number_of_sales=10 * (i + 1),
+                discount_for_unique_customers=0.2 + 0.1 * i,
+            )
+            for i in range(3)
+        ]
+
+        for i, supplier in enumerate(self.suppliers):
+            for j, car in enumerate(self.cars):
+                SupplierCar.objects.create(
+                    price=1000 + 300 * ((i + j) % 3),
+                    car=car,
+                    supplier=supplier,
+                )
+
+        SupplierCar.objects.create(
+            price=1,
+            car=self.cars[0],
+            supplier=self.suppliers[2],
+            is_active=False,
+        )
+
+    @pytest.fixture(scope='function', autouse=True)
+    def showrooms(self, cars, suppliers):
+        self.showrooms = [
+            ShowroomModel.objects.create(
+                name=f'showroom{i}',
+                creation_year=2001,
+                location=Country(code='NZ'),
+                charts={},
+            )
+            for i in range(2)
+        ]
+
+        self.showrooms[0].appropriate_cars.set(self.cars[:2])
+        self.showrooms[1].appropriate_cars.set(self.cars[1:])
+        self.showrooms[1].current_suppliers.set(self.suppliers)
+
+    def get_expected_suppliers(self, showroom):
+        purchase_metrics_count = max(supplier.number_of_sales for supplier in self.suppliers)
+        expected_suppliers = set()
+
+        for car in showroom.appropriate_cars.all():
+            prices = {
+                supplier_car.supplier_id: (
+                    (purchase_metrics_count - supplier_car.supplier.number_of_sales)
+                    * supplier_car.price
+                    * supplier_car.supplier.discount_for_unique_customers
+                    + supplier_car.supplier.number_of_sales * supplier_car.price
+                )
+                for supplier_car in SupplierCar.objects.filter(car=car, is_active=True)
+            }
+            expected_suppliers.add(min(prices, key=prices.get))
+
+        return expected_suppliers
+
+    def test_find_suppliers(self):
+        find_suppliers(self.showrooms[0].id)
+
+        assert {supplier.id for supplier in self.showrooms[0].current_suppliers.all()} == (
+            self.get_expected_suppliers(self.showrooms[0])
+        )
+        assert self.showrooms[1].current_suppliers.count() == 3
+
+        find_suppliers(0)
+
+    @pytest.fixture(scope='function')
+    def eager(self):
+        always_eager: bool = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+        yield
+        app.conf.task_always_eager = always_eager
+
+    def test_check_suppliers(self, eager):
+        check_suppliers()
+
+        for showroom in self.showrooms:
+            assert {supplier.id for supplier in showroom.current_suppliers.all()} == (
+                self.get_expected_suppliers(showroom)
+            )
+
+
+class TestPurchaseTasks:
+    @pytest.fixture(scope='function', autouse=True)
+    def car(self):
+        self.car = CarModel.objects.create(
+            brand='audi',
+            transmission_type='auto',
+            creation_year=2000,
+            miliage=2000.00,
+        )
+
+    @pytest.fixture(scope='function', autouse=True)
+    def suppliers(self, car):
+        self.supplier = SupplierModel.objects.create(
+            name='supplier1',
+            creation_year=2000,
+            number_of_sales=20,
+            discount_for_unique_customers=0.3,
+        )
+        self.discount_supplier = SupplierModel.objects.create(
+            name='supplier2',
+            creation_year=2000,
+            number_of_sales=20,
+            discount_for_unique_customers=0.3,
+        )
+
+        self.supplier_car = SupplierCar.objects.create(
+            price=1000, car=self.car, supplier=self.supplier
+        )
+        self.discount_car = SupplierCar.objects.create(
+            price=2000, car=self.car, supplier=self.discount_supplier
+        )
+
+        SupplierCarDiscount.objects.create(
+            name='discount',
+            description='description',
+            precent=0.3,
+            start_date=datetime.now(),
+            finish_date=datetime.now() + timedelta(hours=1),
+            supplier=self.discount_supplier,
+        ).cars.set([self.car])
+        supplier_discount_index.invalidate()
+
+    @pytest.fixture(scope='function', autouse=True)
+    def showrooms(self, car, suppliers):
+        self.showroom = ShowroomModel.objects.create(
+            name='showroom1',
+            creation_year=2001,
+            balance=1000,
+            location=Country(code='NZ'),
+            charts={},
+        )
+        self.poor_showroom = ShowroomModel.objects.create(
+            name='showroom2',
+            creation_year=2001,
+            balance=10,
+            location=Country(code='NZ'),
+            charts={},
+        )
+
+        for showroom in [self.showroom, self.poor_showroom]:
+            showroom.appropriate_cars.set([self.car])
+            showroom.current_suppliers.set([self.supplier])
+
+    def test_buy_showroom_cars(self):
+        buy_showroom_cars([self.showroom.id, self.poor_showroom.id])
+
+        showroom_car = ShowroomCar.objects.get(showroom=self.showroom)
+        assert showroom_car.car == self.car
+        assert showroom_car.price == Decimal('600')
+
+        history = SupplierHistory.objects.get(showroom=self.showroom)
+        assert history.supplier == self.discount_supplier
+        assert history.sale_price == Decimal('600')
+
+        self.showroom.refresh_from_db()
+        assert self.showroom.balance == Decimal('400')
+
+        self.discount_car.refresh_from_db()
+        assert self.discount_car.is_active is False
+
+        self.supplier_car.refresh_from_db()
+        assert self.supplier_car.is_active is True
+
+        assert not ShowroomCar.objects.filter(showroom=self.poor_showroom).exists()
+
+        buy_showroom_cars([self.showroom.id])
+
+        assert ShowroomCar.objects.filter(showroom=self.showroom).count() == 1
+
+    def test_purchasing_pipeline_run(self, mocker):
+        select_for_update = mocker.spy(QuerySet, 'select_for_update')
+
+        PurchasingPipeline().run(ShowroomModel.objects.filter(pk=self.showroom.pk))
+
+        select_for_update.assert_not_called()
+        assert ShowroomCar.objects.get(showroom=self.showroom).price == Decimal('600')
+
+
+class TestDiscountTasks:
+    @pytest.fixture(scope='function', autouse=True)
+    def discount(self):
+        self.now = timezone.now()
+        self.supplier = SupplierModel.objects.create(
+            name='supplier1',
+            creation_year=2000,
+            number_of_sales=20,
+            discount_for_unique_customers=0.3,
+        )
+        self.discount = SupplierCarDiscount.objects.create(
+            name='discount',
+            description='description',
+            precent=0.3,
+            start_date=self.now + timedelta(hours=1),
+            finish_date=self.now + timedelta(hours=2),
+            supplier=self.supplier,
+        )
+
+    def test_discount_schedule(self):
+        assert discount_scheduler.register(self.discount) is False
+
+        self.discount.refresh_from_db()
+        assert self.discount.is_active is False
+
+        discount_scheduler.activate(self.now + timedelta(minutes=30))
+        self.discount.refresh_from_db()
+        assert self.discount.is_active is False
+
+        discount_scheduler.activate(self.now + timedelta(hours=1))
+        self.discount.refresh_from_db()
+        assert self.discount.is_active is True
+
+        discount_scheduler.expire(self.now + timedelta(hours=2))
+        self.discount.refresh_from_db()
+        assert self.discount.is_active is False
+
+    def test_sync_discount_schedule(self):
+        overdue = SupplierCarDiscount.objects.create(
+            name='overdue',
+            description='description',
+            precent=0.3,
+            start_date=self.now - timedelta(hours=1),
+            finish_date=self.now + timedelta(hours=1),
+            is_active=False,
+            supplier=self.supplier,
+        )
+        expired = SupplierCarDiscount.objects.create(
+            name='expired',
+            description='description',
+            precent=0.3,
+            start_date=self.now - timedelta(hours=2),
+            finish_date=self.now - timedelta(hours=1),
+            supplier=self.supplier,
+        )
+        discount_scheduler.client.delete(
+            discount_scheduler.activation_key, discount_scheduler.expiry_key
+        )
+
+        discount_scheduler.sync(self.now)
+        discount_scheduler.activate(self.now)
+        discount_scheduler.expire(self.now)
+
+        overdue.refresh_from_db()
+        assert overdue.is_active is True
+
+        expired.refresh_from_db()
+        assert expired.is_active is False
+
+
+class TestOfferTasks:
+    @pytest.fixture(scope='function', autouse=True)
+    def car(self):
+        self.car = CarModel.objects.create(
+            brand='audi',
+            transmission_type='auto',
+            creation_year=2000,
+            miliage=2000.00,
+        )
+
+    @pytest.fixture(scope='function', autouse=True)
+    def showroom(self, car):
+        self.showroom = ShowroomModel.objects.create(
+            name='showroom1',
+            creation_year=2001,
+            location=Country(code='NZ'),
+            charts={},
+            number_of_sales=5,
+            discount_for_unique_customers=0.5,
+        )
+        self.cheapest_car = ShowroomCar.objects.create(
+            price=1000, car=self.car, showroom=self.showroom
+        )
+        self.expensive_car = ShowroomCar.objects.create(
+            price=3000, car=self.car, showroom=self.showroom
+        )
+
+    @pytest.fixture(scope='function', autouse=True)
+    def customer(self, showroom):
+        self.customer = CustomerModel.objects.create(
+            balance=5000,
+            user=User.objects.create(
+                username='username1',
+                password='password1',
+                email='email1@mail.com',
+            ),
+        )
+        self.offer = CustomerOffer.objects.create(
+            customer=self.customer, max_price=2000, car=self.car
+        )
+        showroom_discount_index.invalidate()
+
+    def add_history(self, count):
+        ShowroomHistory.objects.bulk_create(
+            [
+                ShowroomHistory(
+                    showroom=self.showroom,
+                    car=self.car,
+                    sale_price=100,
+                    customer=self.customer,
+                )
+                for _ in range(count)
+            ]
+        )
+
+    def test_make_customer_offer(self):
+        make_customer_offer(self.offer.id)
+
+        self.cheapest_car.refresh_from_db()
+        assert self.cheapest_car.is_active is False
+        assert self.cheapest_car.user == self.customer
+
+        self.customer.refresh_from_db()
+        assert self.customer.balance == Decimal('4000')
+        assert CustomerHistory.objects.get(customer=self.customer).purchase_price == 1000
+
+        make_customer_offer(self.offer.id)
+
+        self.expensive_car.refresh_from_db()
+        assert self.expensive_car.is_active is True
+
+    def test_make_customer_offer_with_unique_discount(self):
+        self.add_history(5)
+        make_customer_offer(self.offer.id)
+
+        self.customer.refresh_from_db()
+        assert self.customer.balance == Decimal('4500')
+
+    def test_make_customer_offer_queries(self, django_assert_max_num_queries):
+        make_customer_offer(self.offer.id)
+        self.add_history(500)
+
+        ShowroomCar.objects.create(price=1000, car=self.car, showroom=self.showroom)
+
+        offer = CustomerOffer.objects.create(customer=self.customer, max_price=2000, car=self.car)
+
+        with django_assert_max_num_queries(10):
+            make_customer_offer(offer.id)
+
+        assert ShowroomCar.objects.filter(car=self.car, is_active=True).count() == 1
+
+    def test_settle_customer_offers(self, django_assert_max_num_queries):
+        self.expensive_car.delete()
+        CustomerOffer.objects.bulk_create(
+            [CustomerOffer(customer=self.customer, max_price=2000, car=self.car) for _ in range(20)]
+        )
+
+        with django_assert_max_num_queries(12):
+            settle_customer_offers()
+
+        assert CustomerOffer.objects.filter(is_active=True).count() == 0
+        assert CustomerHistory.objects.filter(customer=self.customer).count() == 1
+
+        self.cheapest_car.refresh_from_db()
+        assert self.cheapest_car.is_active is False
+        assert self.cheapest_car.user == self.customer
+
+        self.customer.refresh_from_db()
+        assert self.customer.balance == Decimal('4000')
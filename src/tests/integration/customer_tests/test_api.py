@@ -163,6 +163,21 @@ class TestCustomerApi:
         response = client.get('/api/v1/customer/customers/', format='json')
         assert response.status_code == status.HTTP_200_OK
 
+    def test_list_customers_queries(self, client, assert_constant_queries):
+        for number in range(4):
+            CustomerModel.objects.create(
+                user=User.objects.create(
+                    username=f'customer_user{number}',
+                    password='customer_password',
+                    email=f'customer_email{number}@mail.com',
+                ),
+            )
+
+        admin_token = TokenBackend.generate_token(type='access', user_id=self.admin.id)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token}')
+
+        assert_constant_queries('/api/v1/customer/customers/', 5)
+
     def test_retrieve_customer(self, client):
         response = client.get(f'/api/v1/customer/customers/{self.customer.id}/', format='json')
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,73 @@
+"""
+conftest.py: File, containing fixtures for integration tests of jauth app.
+"""
+
+
+import socketserver
+from threading import Thread
+import pytest
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    SMTPHandler: Handles SMTP session, that is enough for smtplib to send mails.
+    """
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self) -> None:
+        self.server.connections += 1
+        self.reply('220 localhost ESMTP')
+
+        while line := self.rfile.readline():
+            command: str = line.decode().strip()
+
+            if command.upper().startswith(('EHLO', 'HELO')):
+                self.reply('250 localhost')
+            elif command.upper().startswith('RCPT') and '@later.' in command:
+                self.reply('451 Try again later')
+            elif command.upper() == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+
+                self.server.messages += 1
+                self.reply('250 OK')
+            elif command.upper() == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    """
+    SMTPServer: Local SMTP stand-in, that counts connections and accepted mails.
+    """
+
+    daemon_threads: bool = True
+    allow_reuse_address: bool = True
+
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.connections: int = 0
+        self.messages: int = 0
+
+
+@pytest.fixture(scope='function')
+def smtp_server(settings):
+    server = SMTPServer()
+    Thread(target=server.serve_forever, daemon=True).start()
+
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    settings.EMAIL_HOST, settings.EMAIL_PORT = server.server_address
+    settings.EMAIL_HOST_USER = 'sender@localhost'
+    settings.EMAIL_HOST_PASSWORD = ''
+    settings.EMAIL_USE_TLS = False
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
@@ -368,3 +368,15 @@ class TestTokenApi:
 
         response = client.post('/api/v1/auth/token/refresh/', refresh, format='json')
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestJWKSApi:
+    def test_list_jwks(self, client, settings):
+        response = client.get('/api/v1/auth/jwks/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'keys': []}
+        assert (
+            response['Cache-Control']
+            == f'public, max-age={settings.JWT_TOKEN["JWKS_MAX_AGE_SECONDS"]}'
+        )
@@ -4,9 +4,12 @@ test_authentication.py: File, containing integration tests for jauth authenticat
 
 
 import pytest
+from django.db import connection
 from rest_framework import status
+from django.test.utils import CaptureQueriesContext
 from jauth.models import User
 from jauth.backends import TokenBackend
+from jauth.services import UserService
 
 
 pytestmark = pytest.mark.django_db
@@ -67,3 +70,22 @@ class TestJWTAuth:
 
         response = client.get('/api/v1/supplier/suppliers/', format='json')
         assert response.status_code == status.HTTP_200_OK
+
+    def test_jwt_auth_user_cache(self, client):
+        admin_token = TokenBackend.generate_token(type='access', user_id=self.admin.id)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token}')
+
+        response = client.get('/api/v1/supplier/suppliers/', format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/supplier/suppliers/', format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not [query for query in context.captured_queries if 'FROM "User"' in query['sql']]
+
+        self.admin.is_staff = False
+        UserService().set_user_as_inactive(self.admin)
+
+        response = client.get('/api/v1/supplier/suppliers/', format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
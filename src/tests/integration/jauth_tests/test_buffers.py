@@ -0,0 +1,55 @@
+"""
+test_buffers.py: File, containing integration tests for jauth.buffers.
+"""
+
+
+from datetime import timedelta
+import pytest
+from django.utils import timezone
+from jauth.models import User
+from jauth.buffers import last_login_buffer
+
+
+pytestmark = pytest.mark.django_db
+
+
+class TestLastLoginBuffer:
+    @pytest.fixture(scope='function', autouse=True)
+    def users(self):
+        self.users = User.objects.bulk_create(
+            [
+                User(username=f'username{i}', password=f'password{i}', email=f'email{i}@mail.com')
+                for i in range(5)
+            ]
+        )
+
+    def test_write(self, django_assert_num_queries):
+        now = timezone.now()
+        User.objects.filter(pk=self.users[0].pk).update(last_login=now)
+
+        with django_assert_num_queries(1):
+            updated = last_login_buffer.write(
+                {self.users[0].pk: now - timedelta(minutes=1)}
+                | {user.pk: now for user in self.users[1:]}
+            )
+
+        assert updated == 4
+        assert User.objects.filter(last_login=now).count() == 5
+
+    def test_flush(self, settings, django_assert_num_queries):
+        settings.LAST_LOGIN = settings.LAST_LOGIN | {
+            'FLUSH_SIZE': 100,
+            'FLUSH_INTERVAL_SECONDS': 60.0,
+            'DURABLE': False,
+        }
+        last_login_buffer.flush()
+
+        with django_assert_num_queries(0):
+            for user in self.users:
+                last_login_buffer.add(user)
+
+        with django_assert_num_queries(1):
+            assert last_login_buffer.flush() == 5
+
+        for user in self.users:
+            assert User.objects.get(pk=user.pk).last_login == user.last_login
@@ -0,0 +1,62 @@
+"""
+test_mails.py: File, containing integration tests for jauth.mails.
+"""
+
+
+import pytest
+from jauth.mails import mail_queue
+
+
+class TestMailQueue:
+    @pytest.fixture(scope='function', autouse=True)
+    def queue(self, settings):
+        settings.MAIL = settings.MAIL | {'BATCH_SIZE': 10, 'DOMAIN_RATES': {'default': 100}}
+        mail_queue.client.delete(mail_queue.key)
+
+    def test_send(self, smtp_server):
+        for i in range(25):
+            mail_queue.enqueue(f'email{i}@mail.com', 'subject', 'body')
+
+        assert mail_queue.send() == 25
+        assert smtp_server.messages == 25
+        assert smtp_server.connections == 1
+        assert mail_queue.get_next_due() is None
+
+    def test_send_retry(self, smtp_server):
+        mail_queue.enqueue('email@later.com', 'subject', 'body')
+        mail_queue.enqueue('email@mail.com', 'subject', 'body')
+
+        assert mail_queue.send() == 1
+        assert smtp_server.messages == 1
+        assert smtp_server.connections == 2
+        assert mail_queue.get_next_due() is not None
+
+    def test_send_throttled(self, smtp_server, settings):
+        settings.MAIL['DOMAIN_RATES'] = {'default': 100, 'slow.com': 2}
+
+        for i in range(5):
+            mail_queue.enqueue(f'email{i}@slow.com', 'subject', 'body')
+
+        assert mail_queue.send() == 2
+        assert len(mail_queue.client.zrange(mail_queue.key, 0, -1)) == 3
+
+    def test_lease_due(self, smtp_server):
+        mail_queue.enqueue('email@mail.com', 'subject', 'body')
+
+        assert len(mail_queue.lease_due()) == 1
+        assert mail_queue.lease_due() == []
+        assert len(mail_queue.client.zrange(mail_queue.key, 0, -1)) == 1
+        assert smtp_server.messages == 0
+
+    def test_send_foreign_lock(self, smtp_server):
+        mail_queue.enqueue('email@mail.com', 'subject', 'body')
+        lock = mail_queue.client.lock(mail_queue.lock_key, timeout=60)
+        lock.acquire(blocking=False)
+
+        assert mail_queue.send() is None
+        assert lock.owned()
+
+        lock.release()
+
+        assert mail_queue.send() == 1
+        assert mail_queue.client.get(mail_queue.lock_key) is None
@@ -0,0 +1,97 @@
+"""
+test_purges.py: File, containing integration tests for jauth.purges.
+"""
+
+
+from datetime import timedelta
+import pytest
+from django.utils import timezone
+from django.core.cache import cache
+from core.models import CarModel
+from jauth.models import User
+from jauth.purges import waste_account_purge
+from customer.models import CustomerModel, CustomerOffer, CustomerHistory
+from showroom.models import ShowroomCar, ShowroomModel, ShowroomHistory
+
+
+pytestmark = pytest.mark.django_db
+
+
+class TestWasteAccountPurge:
+    @pytest.fixture(scope='function', autouse=True)
+    def settings_purge(self, settings):
+        settings.ACCOUNT_PURGE = {
+            'INACTIVE_YEARS': 1,
+            'BATCH_SIZE': 2,
+            'SLEEP_SECONDS': 0,
+            'MAX_SECONDS': 60,
+        }
+
+    @pytest.fixture(scope='function', autouse=True)
+    def users(self):
+        old_login = timezone.now() - timedelta(days=400)
+        self.users = User.objects.bulk_create(
+            [
+                User(
+                    username=f'username{i}',
+                    password=f'password{i}',
+                    email=f'email{i}@mail.com',
+                    is_active=i == 4,
+                    last_login=old_login if i != 3 else timezone.now(),
+                )
+                for i in range(5)
+            ]
+        )
+        car = CarModel.objects.create(
+            brand='audi', transmission_type='auto', creation_year=2000, miliage=2000.00
+        )
+        showroom = ShowroomModel.objects.create(
+            name='showroom', creation_year=2001, location='NZ', charts={}
+        )
+        self.customers = CustomerModel.objects.bulk_create(
+            [CustomerModel(user=user, balance=100) for user in self.users]
+        )
+
+        for customer in self.customers:
+            CustomerOffer.objects.create(customer=customer, max_price=100, car=car)
+            CustomerHistory.objects.create(
+                customer=customer, car=car, purchase_price=100, showroom='showroom'
+            )
+            ShowroomCar.objects.create(car=car, showroom=showroom, price=100, user=customer)
+            ShowroomHistory.objects.create(
+                showroom=showroom, car=car, sale_price=100, customer=customer
+            )
+
+    def test_run(self, django_assert_max_num_queries):
+        with django_assert_max_num_queries(30):
+            deleted = waste_account_purge.run()
+
+        assert deleted[User._meta.label] == 3
+        assert deleted[CustomerOffer._meta.label] == 3
+        assert list(User.objects.order_by('pk').values_list('username', flat=True)) == [
+            'username3',
+            'username4',
+        ]
+        assert CustomerModel.objects.count() == 2
+        assert CustomerOffer.objects.count() == 2
+        assert CustomerHistory.objects.count() == 2
+        assert ShowroomCar.objects.count() == 5
+        assert ShowroomCar.objects.filter(user__isnull=True).count() == 3
+        assert ShowroomHistory.objects.filter(customer__isnull=True).count() == 3
+
+    def test_run_resume(self, settings):
+        settings.ACCOUNT_PURGE['MAX_SECONDS'] = 0
+
+        assert waste_account_purge.run()[User._meta.label] == 2
+        assert cache.get(waste_account_purge.cursor_key) == self.users[1].pk
+
+        settings.ACCOUNT_PURGE['MAX_SECONDS'] = 60
+
+        assert waste_account_purge.run()[User._meta.label] == 1
+        assert cache.get(waste_account_purge.cursor_key) is None
+
+    def test_run_collector(self, mocker):
+        mocker.patch.object(waste_account_purge, 'is_bulk_safe', return_value=False)
+
+        assert waste_account_purge.run()[User._meta.label] == 3
+        assert ShowroomCar.objects.filter(user__isnull=True).count() == 3
@@ -3,14 +3,19 @@ test_api.py: File, containing integration tests for showroom api.
 """
 
 
+import json
 from datetime import datetime, timedelta
 import pytest
+from django.db import connection
 from rest_framework import status
+from django.db.models.query import QuerySet
 from django_countries.fields import Country
+from core.tasks import soft_delete_related
 from core.models import CarModel
 from jauth.models import User
 from jauth.backends import TokenBackend
 from showroom.models import ShowroomCar, ShowroomModel, ShowroomHistory, ShowroomCarDiscount
+from showroom.api.v1.views import ShowroomViewSet
 
 
 pytestmark = pytest.mark.django_db
@@ -256,6 +261,22 @@ class TestShowroomApi:
         response = client.get('/api/v1/showroom/showrooms/', format='json')
         assert response.status_code == status.HTTP_200_OK
 
+    def test_list_showrooms_queries(self, client, assert_constant_queries):
+        for number in range(4):
+            showroom = ShowroomModel.objects.create(
+                name=f'other_showroom{number}',
+                creation_year=2001,
+                location=Country(code='NZ'),
+                charts={},
+            )
+            showroom.appropriate_cars.add(self.car)
+            ShowroomCar.objects.create(price=1000, car=self.car, showroom=showroom)
+
+        admin_token = TokenBackend.generate_token(type='access', user_id=self.admin.id)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token}')
+
+        assert_constant_queries('/api/v1/showroom/showrooms/', 5)
+
     def test_retrieve_showroom(self, client):
         response = client.get(f'/api/v1/showroom/showrooms/{self.showroom.id}/', format='json')
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -397,3 +418,137 @@ class TestShowroomApi:
             format='json',
         )
         assert response.status_code == status.HTTP_200_OK
+
+    def test_get_showroom_cars_pages(self, client):
+        for _ in range(2):
+            ShowroomCar.objects.create(price=2000, car=self.car, showroom=self.showroom)
+
+        admin_token = TokenBackend.generate_token(type='access', user_id=self.admin.id)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token}')
+
+        response = client.get(
+            f'/api/v1/showroom/showrooms/{self.showroom.id}/get_cars/',
+            {'page_size': 2},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 2
+
+        response = client.get(response.data['next'], format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 1
+        assert response.data['next'] is None
+
+    def test_get_showroom_cars_stream(self, client):
+        admin_token = TokenBackend.generate_token(type='access', user_id=self.admin.id)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token}')
+
+        response = client.get(
+            f'/api/v1/showroom/showrooms/{self.showroom.id}/get_cars/',
+            {'stream': 'ndjson'},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+
+        lines = b''.join(response.streaming_content).splitlines()
+        assert [json.loads(line)['car'] for line in lines] == [self.car.id]
+
+    def test_get_showroom_cars_stream_without_cursors(self, client, mocker):
+        for _ in range(4):
+            ShowroomCar.objects.create(price=2000, car=self.car, showroom=self.showroom)
+
+        mocker.patch.object(ShowroomViewSet, 'stream_chunk_size', 2)
+        mocker.patch.dict(connection.settings_dict, {'DISABLE_SERVER_SIDE_CURSORS': True})
+        iterator = mocker.spy(QuerySet, 'iterator')
+        admin_token = TokenBackend.generate_token(type='access', user_id=self.admin.id)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token}')
+
+        response = client.get(
+            f'/api/v1/showroom/showrooms/{self.showroom.id}/get_cars/',
+            {'stream': 'ndjson'},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        lines = b''.join(response.streaming_content).splitlines()
+        created = [json.loads(line)['created_at'] for line in lines]
+        assert len(created) == 5
+        assert created == sorted(created, reverse=True)
+        iterator.assert_not_called()
+
+    def test_get_showroom_analytics(self, client):
+        url = f'/api/v1/showroom/showrooms/{self.showroom.id}/get_analytics/'
+
+        response = client.get(url, format='json')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        user_token = TokenBackend.generate_token(type='access', user_id=self.user.id)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {user_token}')
+
+        response = client.get(url, format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        admin_token = TokenBackend.generate_token(type='access', user_id=self.admin.id)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token}')
+
+        response = client.get(url, {'bucket': 'month'}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = client.get(url, {'bucket': 'week'}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        units = response.data['units']
+        assert response.data['top_cars'][0]['car'] == self.car.id
+
+        ShowroomHistory.objects.create(showroom=self.showroom, car=self.car, sale_price=1000)
+
+        response = client.get(url, {'bucket': 'week'}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['units'] == units + 1
+
+        ShowroomHistory.objects.filter(showroom=self.showroom).update(is_active=False)
+        other_showroom = ShowroomModel.objects.create(name='other', creation_year=2000, charts={})
+        ShowroomHistory.objects.create(showroom=other_showroom, car=self.car, sale_price=1000)
+
+        response = client.get(url, {'bucket': 'week'}, format='json')
+        assert response.data['units'] == units + 1
+
+        ShowroomHistory.objects.create(showroom=self.showroom, car=self.car, sale_price=1000)
+
+        response = client.get(url, {'bucket': 'week'}, format='json')
+        assert response.data['units'] == 1
+
+    def test_destroy_showroom_deferred(
+        self, client, settings, mocker, django_capture_on_commit_callbacks
+    ):
+        settings.SOFT_DELETE = {**settings.SOFT_DELETE, 'ASYNC_THRESHOLD': 0}
+        delay = mocker.patch.object(soft_delete_related, 'delay')
+
+        admin_token = TokenBackend.generate_token(type='access', user_id=self.admin.id)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token}')
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            response = client.delete(
+                f'/api/v1/showroom/showrooms/{self.showroom.id}/', format='json'
+            )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = response.data['job']
+        delay.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+
+        delay.assert_called_once_with(job)
+
+        response = client.get(f'/api/v1/core/deletions/{job}/', format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['status'] == 'pending'
+        assert response.data['total'] == 1
+
+        soft_delete_related(job)
+
+        response = client.get(f'/api/v1/core/deletions/{job}/', format='json')
+        assert response.data['status'] == 'finished'
+        assert response.data['rows'] == {'showroom.ShowroomHistory': 1}
+
+        response = client.get('/api/v1/core/deletions/unknown/', format='json')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
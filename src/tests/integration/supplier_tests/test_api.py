@@ -3,6 +3,7 @@ test_api.py: File, containing integration tests for supplier api.
 """
 
 
+import json
 from datetime import datetime, timedelta
 import pytest
 from rest_framework import status
@@ -211,6 +212,19 @@ class TestSupplierApi:
         response = client.get('/api/v1/supplier/suppliers/', format='json')
         assert response.status_code == status.HTTP_200_OK
 
+    def test_list_suppliers_queries(self, client, assert_constant_queries):
+        for number in range(4):
+            supplier = SupplierModel.objects.create(
+                name=f'other_supplier{number}',
+                creation_year=2001,
+            )
+            SupplierCar.objects.create(price=1000, car=self.car, supplier=supplier)
+
+        admin_token = TokenBackend.generate_token(type='access', user_id=self.admin.id)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token}')
+
+        assert_constant_queries('/api/v1/supplier/suppliers/', 5)
+
     def test_retrieve_supplier(self, client):
         response = client.get(f'/api/v1/supplier/suppliers/{self.supplier.id}/', format='json')
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -352,3 +366,16 @@ class TestSupplierApi:
             format='json',
         )
         assert response.status_code == status.HTTP_200_OK
+
+    def test_get_supplier_discounts_stream(self, client):
+        admin_token = TokenBackend.generate_token(type='access', user_id=self.admin.id)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {admin_token}')
+
+        response = client.get(
+            f'/api/v1/supplier/suppliers/{self.supplier.id}/get_discounts/',
+            {'stream': 'ndjson'},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        lines = b''.join(response.streaming_content).splitlines()
+        assert [json.loads(line)['cars'] for line in lines] == [[self.car.id]]
@@ -0,0 +1,118 @@
+"""
+test_dbrouters.py: File, containing unit tests for config.dbrouters.
+"""
+
+
+import asyncio
+import pytest
+from django.db import OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory
+from asgiref.sync import async_to_sync
+from celery.app.task import Context
+from core.models import CarModel
+from config.celery import pin_running_task, pin_published_task
+from config.dbrouters import ReplicaRouter
+from config.middleware import ReplicaPinMiddleware
+
+
+class TestReplicaRouter:
+    @pytest.fixture(scope='function', autouse=True)
+    def replica_router(self, settings, mocker):
+        settings.DATABASE_REPLICAS = {
+            'MASTER': 'master',
+            'REPLICAS': ['replica_0', 'replica_1'],
+            'PIN_SECONDS': 5,
+            'PIN_COOKIE': 'db_pinned',
+            'MAX_LAG_SECONDS': 2,
+            'LAG_CHECK_SECONDS': 1,
+        }
+        self.router = ReplicaRouter()
+        self.router.reset()
+        mocker.patch.object(ReplicaRouter, 'lags', {})
+        self.connections = mocker.patch('config.dbrouters.connections', mocker.MagicMock())
+        self.connections.__getitem__.return_value.vendor = 'postgresql'
+        self.cursor = self.connections.__getitem__.return_value.cursor.return_value.__enter__()
+        self.cursor.fetchone.return_value = (0.5,)
+        yield
+        self.router.reset()
+
+    def test_db_for_read(self):
+        assert {self.router.db_for_read(CarModel) for _ in range(100)} == {'replica_0', 'replica_1'}
+        assert self.cursor.execute.call_count == 2
+
+    def test_db_for_read_after_write(self, mocker):
+        assert self.router.db_for_write(CarModel) == 'master'
+        assert self.router.db_for_read(CarModel) == 'master'
+        assert self.router.has_written() is True
+
+        mocker.patch('config.dbrouters.monotonic', return_value=10**9)
+        assert self.router.db_for_read(CarModel) != 'master'
+
+    def test_db_for_read_lagging(self):
+        self.cursor.fetchone.return_value = (3.0,)
+        assert self.router.db_for_read(CarModel) == 'master'
+
+    def test_db_for_read_unavailable(self):
+        self.cursor.execute.side_effect = [OperationalError, None]
+        assert {self.router.db_for_read(CarModel) for _ in range(10)} == {'replica_1'}
+
+    def test_db_for_read_master_instance(self):
+        car = CarModel()
+        car._state.db = 'master'
+        assert self.router.db_for_read(CarModel, instance=car) == 'master'
+
+    def test_allow_migrate(self):
+        assert self.router.allow_migrate('master', 'core') is True
+        assert self.router.allow_migrate('replica_0', 'core') is False
+
+    def test_middleware(self):
+        factory = RequestFactory()
+
+        def write(request):
+            self.router.db_for_write(CarModel)
+            return HttpResponse()
+
+        response = ReplicaPinMiddleware(write)(factory.post('/'))
+        assert response.cookies['db_pinned']['max-age'] == 5
+
+        def read(request):
+            return HttpResponse(self.router.db_for_read(CarModel))
+
+        request = factory.get('/')
+        assert ReplicaPinMiddleware(read)(request).content != b'master'
+
+        request.COOKIES['db_pinned'] = '1'
+        response = ReplicaPinMiddleware(read)(request)
+        assert response.content == b'master'
+        assert 'db_pinned' not in response.cookies
+
+    def test_async_middleware(self):
+        async def read(request):
+            return HttpResponse(self.router.db_for_read(CarModel))
+
+        middleware = ReplicaPinMiddleware(read)
+        request = RequestFactory().get('/')
+        request.COOKIES['db_pinned'] = '1'
+
+        assert asyncio.iscoroutinefunction(middleware) is True
+        assert async_to_sync(middleware)(request).content == b'master'
+
+    def test_task_pin(self, mocker):
+        headers = {}
+        pin_published_task(headers)
+        assert headers == {}
+
+        self.router.db_for_write(CarModel)
+        pin_published_task(headers)
+        assert headers == {'db_pinned': True}
+
+        task = mocker.MagicMock()
+        task.request = Context(headers, is_eager=False)
+        pin_running_task(task)
+        assert self.router.is_pinned() is True
+        assert self.router.has_written() is False
+
+        task.request = Context(is_eager=False)
+        pin_running_task(task)
+        assert self.router.is_pinned() is False
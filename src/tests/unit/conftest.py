@@ -30,6 +30,11 @@ def disable_logging():
     logging.disable(logging.CRITICAL)
 
 
+@pytest.fixture(scope='function', autouse=True)
+def local_cache(settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
 @pytest.fixture(scope='function', autouse=True)
 def no_save(mocker):
     for model in [User, CustomerModel, SupplierModel, ShowroomModel, CarModel]:
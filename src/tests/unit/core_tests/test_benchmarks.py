@@ -0,0 +1,64 @@
+"""
+test_benchmarks.py: File, containing unit tests for core.benchmarks.
+"""
+
+
+import pytest
+from jauth.models import User
+from jauth.backends import TokenBackend
+from core.benchmarks import LoadDriver
+
+
+class TestLoadDriver:
+    @pytest.fixture(scope='function', autouse=True)
+    def load_driver(self):
+        self.driver = LoadDriver()
+
+    def test_get_headers(self, settings):
+        settings.ALLOWED_HOSTS = ['*', '.example.com']
+        headers = self.driver.get_headers(User(pk=1))
+
+        token_type, token = headers['authorization'].split()
+        assert token_type == settings.JWT_TOKEN['TOKEN_TYPE']
+        assert TokenBackend.get_payload_by_token(token=token)['sub'] == 1
+        assert headers['host'] == 'example.com'
+
+        settings.ALLOWED_HOSTS = ['*']
+        assert self.driver.get_headers(User(pk=1))['host'] == 'localhost'
+
+    def test_measure(self, mocker, settings):
+        measure_sync = mocker.patch.object(LoadDriver, 'measure_sync', return_value=(1.0, []))
+        measure_async = mocker.patch.object(
+            LoadDriver, 'measure_async', mocker.AsyncMock(return_value=(2.0, []))
+        )
+
+        settings.ASYNC_VIEWS = False
+        assert self.driver.measure(['/'], {}, 2) == (1.0, [])
+        measure_sync.assert_called_once_with(['/'], {}, 2)
+
+        settings.ASYNC_VIEWS = True
+        assert self.driver.measure(['/'], {}, 2) == (2.0, [])
+        measure_async.assert_awaited_once_with(['/'], {}, 2)
+
+    def test_time(self, mocker):
+        task = mocker.MagicMock()
+
+        elapsed, latencies = self.driver.time(task, [(1,), (2,), (3,)])
+
+        assert task.call_args_list == [mocker.call(1), mocker.call(2), mocker.call(3)]
+        assert len(latencies) == 3
+        assert elapsed >= sum(latencies)
+
+    def test_summarize(self):
+        latencies = [number / 1000 for number in range(100, 0, -1)]
+
+        assert self.driver.summarize(2.0, latencies, 3) == {
+            'count': 100,
+            'seconds': 2.0,
+            'per_second': 50.0,
+            'p50_ms': 50.0,
+            'p95_ms': 95.0,
+            'p99_ms': 99.0,
+            'failed': 3,
+        }
+        assert self.driver.summarize(0.0, [0.001])['per_second'] == 0.0
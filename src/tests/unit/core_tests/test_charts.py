@@ -0,0 +1,84 @@
+"""
+test_charts.py: File, containing unit tests for core.charts.
+"""
+
+
+import pytest
+from django.db.models import signals
+from core.charts import CarChartResolver, car_chart_resolver
+from core.models import CarModel
+
+
+class TestCarChartResolver:
+    @pytest.fixture(scope='function', autouse=True)
+    def resolver(self):
+        self.resolver = CarChartResolver()
+
+    def test_normalize(self):
+        assert self.resolver.normalize(
+            [
+                {'brand': 'audi', 'creation_year': 2000},
+                {'creation_year': 2000, 'brand': 'audi'},
+                {'brand': 'bmw'},
+            ]
+        ) == [{'brand': 'audi', 'creation_year': 2000}, {'brand': 'bmw'}]
+
+        with pytest.raises(TypeError):
+            self.resolver.normalize({'brand': 'audi'})
+
+        with pytest.raises(TypeError):
+            self.resolver.normalize(['audi'])
+
+    def test_get_key(self):
+        key = self.resolver.get_key([{'brand': 'audi'}])
+
+        assert key == self.resolver.get_key([{'brand': 'audi'}])
+        assert key != self.resolver.get_key([{'brand': 'bmw'}])
+
+        self.resolver.invalidate()
+
+        assert key != self.resolver.get_key([{'brand': 'audi'}])
+
+    def test_watch(self, mocker):
+        invalidate = mocker.patch.object(car_chart_resolver, 'invalidate')
+
+        signals.post_save.send(sender=CarModel, instance=CarModel(id=1), created=True)
+        signals.post_delete.send(sender=CarModel, instance=CarModel(id=1))
+
+        assert invalidate.call_count == 2
+
+    def test_get_fields(self):
+        assert self.resolver.get_fields({'brand': 'audi', 'miliage': 1}) == ('brand', 'miliage')
+        assert self.resolver.get_fields({'creation_year__gte': 2000}) is None
+        assert self.resolver.get_fields({'showrooms': 1}) is None
+        assert self.resolver.get_fields({}) is None
+
+    def test_get_values(self):
+        assert self.resolver.get_values({'creation_year': '2000', 'miliage': 1}) == (2000, 1.0)
+
+    def test_query(self, mocker):
+        objects = mocker.MagicMock()
+        mocker.patch.object(CarModel, 'objects', objects)
+        grouped = objects.filter.return_value.values.return_value.annotate.return_value
+        grouped.values_list.return_value = [('audi', 1), ('bmw', 2)]
+        objects.filter.return_value.order_by.return_value.values_list.return_value.first = (
+            mocker.MagicMock(return_value=3)
+        )
+
+        assert self.resolver.query(
+            [{'brand': 'bmw'}, {'creation_year__gte': 2000}, {'brand': 'audi'}, {'brand': 'vaz'}]
+        ) == [2, 3, 1]
+        assert objects.filter.call_count == 2
+
+    def test_resolve(self, mocker):
+        query = mocker.MagicMock(return_value=[1])
+        mocker.patch.object(self.resolver, 'query', query)
+
+        assert self.resolver.resolve([{'brand': 'audi'}]) == [1]
+        assert self.resolver.resolve([{'brand': 'audi'}, {'brand': 'audi'}]) == [1]
+        query.assert_called_once_with([{'brand': 'audi'}])
+
+        self.resolver.invalidate()
+
+        assert self.resolver.resolve([{'brand': 'audi'}]) == [1]
+        assert query.call_count == 2
@@ -4,9 +4,13 @@ test_commands.py: File, containing unit tests for core.management.commands.
 
 
 import pytest
+from django.core.management.base import CommandError
+from core.charts import car_chart_resolver
 from core.models import CarModel
 from supplier.models import SupplierCar, SupplierModel, SupplierCarDiscount
 from core.management.commands.fill import Command
+from core.management.commands.bench_concurrency import Command as BenchConcurrencyCommand
+from core.management.commands.bench_connections import Command as BenchConnectionsCommand
 
 
 class TestFillCommand:
@@ -27,19 +31,40 @@ class TestFillCommand:
         supplier_discounts = mocker.MagicMock()
         mocker.patch.object(Command, '_generate_supplier_discounts', supplier_discounts)
 
+        showrooms = mocker.MagicMock()
+        mocker.patch.object(Command, '_generate_showrooms', showrooms)
+
+        customers = mocker.MagicMock()
+        mocker.patch.object(Command, '_generate_customers', customers)
+
+        offers = mocker.MagicMock()
+        mocker.patch.object(Command, '_generate_customer_offers', offers)
+
         self.command.handle()
 
-        cars.assert_called_once()
-        suppliers.assert_called_once()
-        supplier_cars.assert_called_once()
+        cars.assert_called_once_with(9)
+        suppliers.assert_called_once_with(14)
+        supplier_cars.assert_called_once_with(999)
         supplier_discounts.assert_called_once()
+        showrooms.assert_called_once_with(0)
+        customers.assert_called_once_with(0)
+        offers.assert_called_once_with(0)
+
+        self.command.handle(cars=100, showrooms=5, offers=50)
+
+        cars.assert_called_with(100)
+        suppliers.assert_called_with(14)
+        showrooms.assert_called_with(5)
+        offers.assert_called_with(50)
 
     def test_generate_cars(self, mocker):
         mock = mocker.MagicMock()
         mocker.patch.object(CarModel.objects, 'get_or_create', mock)
+        invalidate = mocker.patch.object(car_chart_resolver, 'invalidate')
         self.command._generate_cars()
 
         assert mock.call_count == 9
+        invalidate.assert_called_once()
 
     def test_generate_suppliers(self, mocker):
         mock = mocker.MagicMock()
@@ -50,16 +75,23 @@ class TestFillCommand:
 
     def test_generate_supplier_cars(self, mocker):
         mock = mocker.MagicMock()
-        mocker.patch.object(SupplierCar.objects, 'get_or_create', mock)
-        suppliers = mocker.MagicMock(return_value={'id__min': 1, 'id__max': 1})
-        mocker.patch.object(SupplierModel.objects, 'aggregate', suppliers)
-        cars = mocker.MagicMock(return_value={'id__min': 1, 'id__max': 1})
-        mocker.patch.object(CarModel.objects, 'aggregate', cars)
-        mocker.patch.object(SupplierModel.objects, 'get', mocker.MagicMock())
-        mocker.patch.object(CarModel.objects, 'get', mocker.MagicMock())
+        mocker.patch.object(SupplierCar.objects, 'bulk_create', mock)
+        suppliers = mocker.MagicMock(return_value=[1, 2])
+        mocker.patch.object(SupplierModel.objects, 'values_list', suppliers)
+        cars = mocker.MagicMock(return_value=[3])
+        mocker.patch.object(CarModel.objects, 'values_list', cars)
         self.command._generate_supplier_cars()
 
-        assert mock.call_count == 999
+        supplier_cars = mock.call_args.args[0]
+        assert len(supplier_cars) == 999
+        assert {car.supplier_id for car in supplier_cars} <= {1, 2}
+        assert {car.car_id for car in supplier_cars} == {3}
+
+        mock.reset_mock()
+        cars.return_value = []
+        self.command._generate_supplier_cars()
+
+        mock.assert_not_called()
 
     def test_generate_supplier_discounts(self, mocker):
         mock = mocker.MagicMock(return_value=[SupplierCarDiscount(id=1), True])
@@ -89,3 +121,67 @@ class TestFillCommand:
 
         assert str1 != str2
         assert type(str1) is str and type(str2) is str
+
+
+class TestBenchConnectionsCommand:
+    @pytest.fixture(scope='function', autouse=True)
+    def command(self):
+        self.command = BenchConnectionsCommand()
+
+    def test_handle(self, mocker):
+        with pytest.raises(CommandError):
+            self.command.handle(requests=10, database='default', modes=['none', 'pool'])
+
+        measure = mocker.MagicMock(side_effect=[(2.0, 10), (1.0, 1)])
+        mocker.patch.object(BenchConnectionsCommand, '_measure', measure)
+        write = mocker.MagicMock()
+        mocker.patch.object(self.command.stdout, 'write', write)
+
+        self.command.handle(requests=10, database='default', modes=['none', 'persistent'])
+
+        assert measure.call_count == 2
+        assert write.call_args_list[1].args[0].endswith('1 connections opened (2.0x)')
+
+
+class TestBenchConcurrencyCommand:
+    @pytest.fixture(scope='function', autouse=True)
+    def command(self, mocker):
+        self.command = BenchConcurrencyCommand()
+        self.users = mocker.patch('core.management.commands.bench_concurrency.User.objects')
+        self.write = mocker.patch.object(self.command.stdout, 'write')
+        self.options = {
+            'url': '/api/v1/core/cars/',
+            'requests': 20,
+            'concurrency': 4,
+            'user_id': None,
+            'uncached': True,
+        }
+
+    def test_handle(self, mocker, settings):
+        first = self.users.filter.return_value.order_by.return_value.first
+        first.return_value = None
+
+        with pytest.raises(CommandError):
+            self.command.handle(**self.options)
+
+        first.return_value = mocker.MagicMock(pk=1)
+        results = [(0.01, 200)] * 19 + [(0.1, 500)]
+        driver = 'core.management.commands.bench_concurrency.load_driver'
+        mocker.patch(f'{driver}.get_headers', return_value={'host': 'localhost'})
+        measure = mocker.patch(f'{driver}.measure', side_effect=[(1.0, results), (0.5, results)])
+
+        settings.ASYNC_VIEWS = False
+        self.command.handle(**self.options)
+
+        urls, headers, concurrency = measure.call_args.args
+        assert len(set(urls)) == 20 and headers == {'host': 'localhost'} and concurrency == 4
+        assert (
+            self.write.call_args.args[0]
+            == 'wsgi: 20.0 requests/s, p50 10.0 ms, p95 10.0 ms, p99 100.0 ms, 1 failed'
+        )
+
+        settings.ASYNC_VIEWS = True
+        self.command.handle(**{**self.options, 'uncached': False})
+
+        assert set(measure.call_args.args[0]) == {'/api/v1/core/cars/'}
+        assert self.write.call_args.args[0].startswith('asgi: 40.0 requests/s')
@@ -0,0 +1,121 @@
+"""
+test_discounts.py: File, containing unit tests for core.discounts.
+"""
+
+
+from decimal import Decimal
+from datetime import timedelta
+import pytest
+from django.utils import timezone
+from django.core.cache import cache
+from core.discounts import DiscountEntry, SupplierDiscountIndex
+from supplier.models import SupplierCar, SupplierCarDiscount
+
+
+class TestDiscountIndex:
+    @pytest.fixture(scope='function', autouse=True)
+    def discount_index(self):
+        cache.clear()
+        self.index = SupplierDiscountIndex()
+
+    @pytest.fixture(scope='function', autouse=True)
+    def discounts(self, mocker):
+        self.finish_date = timezone.now() + timedelta(minutes=1)
+        self.rows = mocker.MagicMock()
+        self.rows.return_value.order_by.return_value.values_list.return_value = [
+            (1, 1, 1, Decimal('0.5'), self.finish_date + timedelta(minutes=1)),
+            (1, 2, 2, Decimal('0.3'), self.finish_date),
+            (2, 1, 1, Decimal('0.5'), self.finish_date + timedelta(minutes=1)),
+        ]
+        mocker.patch.object(SupplierCarDiscount.cars.through.objects, 'filter', self.rows)
+
+    @pytest.fixture(scope='function', autouse=True)
+    def cars(self, mocker):
+        self.first_car = SupplierCar(id=1, car_id=1, supplier_id=2, price=Decimal('900'))
+        self.second_car = SupplierCar(id=2, car_id=1, supplier_id=2, price=Decimal('1000'))
+        self.other_car = SupplierCar(id=3, car_id=2, supplier_id=2, price=Decimal('1000'))
+
+        self.cars = mocker.MagicMock()
+        self.cars.return_value.filter.return_value.order_by.return_value = [
+            self.first_car,
+            self.second_car,
+            self.other_car,
+        ]
+        mocker.patch.object(SupplierCar.objects, 'select_related', self.cars)
+
+    def test_build(self):
+        self.index.build()
+
+        assert self.index.get(1) == DiscountEntry(
+            2, 2, Decimal('0.3'), self.finish_date, self.first_car
+        )
+        assert self.index.get(2).car is None
+        assert self.index.get(3) is None
+        assert self.index.valid_until == self.finish_date
+        assert self.rows.call_count == 1
+        assert self.cars.call_count == 1
+        assert self.rows.call_args.kwargs['suppliercardiscount__finish_date__gt'] > (
+            self.finish_date - timedelta(minutes=1)
+        )
+
+    def test_build_with_finished_discount(self):
+        self.rows.return_value.order_by.return_value.values_list.return_value = [
+            (1, 2, 2, Decimal('0.3'), timezone.now() - timedelta(minutes=1)),
+            (2, 1, 1, Decimal('0.5'), self.finish_date),
+        ]
+
+        self.index.build()
+
+        assert self.index.valid_until == self.finish_date
+        assert self.index.is_fresh() is True
+
+    def test_ensure_fresh(self):
+        self.index.ensure_fresh()
+        self.index.ensure_fresh()
+
+        assert self.rows.call_count == 1
+
+        self.index.invalidate()
+        self.index.ensure_fresh()
+
+        assert self.rows.call_count == 2
+
+        self.index.valid_until = timezone.now()
+        self.index.ensure_fresh()
+
+        assert self.rows.call_count == 3
+
+    def test_expired_by_other_process(self):
+        self.index.ensure_fresh()
+        SupplierDiscountIndex().invalidate()
+
+        assert self.index.is_fresh() is False
+
+    def test_discard(self):
+        self.index.build()
+        other_index = SupplierDiscountIndex()
+        other_index.build()
+
+        rows = self.rows.return_value.filter.return_value
+        rows.order_by.return_value.values_list.return_value = [
+            (1, 2, 2, Decimal('0.3'), self.finish_date),
+        ]
+        self.cars.return_value.filter.return_value.order_by.return_value = [self.second_car]
+
+        self.index.discard(1)
+
+        self.rows.return_value.filter.assert_called_once_with(carmodel_id__in=[1])
+        assert self.index.get(1).car == self.second_car
+        assert self.index.get(2) is not None
+        assert self.index.is_fresh() is True
+        assert self.rows.return_value.filter.call_count == 1
+
+        assert other_index.is_fresh() is True
+        assert other_index.get(1).car == self.second_car
+        assert other_index.get(2).car is None
+        assert self.rows.return_value.filter.call_count == 2
+        assert self.rows.call_count == 4
+
+        other_index.get(1)
+
+        assert self.rows.return_value.filter.call_count == 2
@@ -0,0 +1,253 @@
+"""
+test_offers.py: File, containing unit tests for core.offers.
+"""
+
+
+from decimal import Decimal
+import pytest
+from core.offers import OfferMatcher
+from core.discounts import DiscountEntry
+from core.responses import response_cache
+from customer.models import CustomerModel, CustomerOffer, CustomerHistory
+from showroom.models import ShowroomCar, ShowroomModel, ShowroomHistory
+from core.reservations import ReservationConflictError, inventory_reservation
+
+
+class TestOfferMatcher:
+    @pytest.fixture(scope='function', autouse=True)
+    def matcher(self, mocker):
+        self.discount_index = mocker.MagicMock()
+        self.discount_index.get.return_value = None
+        self.matcher = OfferMatcher(self.discount_index)
+
+    @pytest.fixture(scope='function', autouse=True)
+    def offer(self):
+        self.customer = CustomerModel(id=1, balance=Decimal('5000'))
+        self.offer = CustomerOffer(
+            id=1, customer=self.customer, car_id=1, max_price=Decimal('1000')
+        )
+        self.showroom = ShowroomModel(
+            id=1, name='showroom', number_of_sales=2, discount_for_unique_customers=Decimal('0.8')
+        )
+        self.cheapest_car = ShowroomCar(
+            id=1, car_id=1, price=Decimal('900'), showroom=self.showroom
+        )
+
+    @pytest.fixture(scope='function', autouse=True)
+    def queries(self, mocker, offer):
+        self.get_cheapest_car = mocker.MagicMock(return_value=self.cheapest_car)
+        mocker.patch.object(self.matcher, 'get_cheapest_car', self.get_cheapest_car)
+        self.get_purchase_count = mocker.MagicMock(return_value=0)
+        mocker.patch.object(self.matcher, 'get_purchase_count', self.get_purchase_count)
+
+    def test_get_unique_customer_discount(self):
+        assert self.matcher.get_unique_customer_discount(1, self.showroom) == 1
+        assert self.matcher.get_unique_customer_discount(2, self.showroom) == Decimal('0.8')
+
+    def test_match(self):
+        assert self.matcher.match(self.offer) == (self.cheapest_car, Decimal('900'))
+        self.discount_index.ensure_fresh.assert_called_once()
+
+        self.get_purchase_count.return_value = 2
+
+        assert self.matcher.match(self.offer) == (self.cheapest_car, Decimal('720.0'))
+
+        self.get_cheapest_car.return_value = None
+
+        assert self.matcher.match(self.offer) is None
+
+    def test_match_with_discount(self):
+        discount_car = ShowroomCar(id=2, car_id=1, price=Decimal('1000'), showroom=self.showroom)
+        self.discount_index.get.return_value = DiscountEntry(
+            1, 1, Decimal('0.5'), None, discount_car
+        )
+
+        assert self.matcher.match(self.offer) == (discount_car, Decimal('500.0'))
+
+    def test_match_without_money(self):
+        self.offer.max_price = Decimal('900')
+
+        assert self.matcher.match(self.offer) is None
+
+        self.offer.max_price = Decimal('1000')
+        self.customer.balance = Decimal('800')
+
+        assert self.matcher.match(self.offer) is None
+
+    @pytest.fixture(scope='function')
+    def transaction(self, mocker):
+        transaction = mocker.patch('core.offers.transaction')
+        transaction.atomic.return_value.__exit__.return_value = False
+        transaction.on_commit.side_effect = lambda func, using: func()
+        return transaction
+
+    def test_settle(self, mocker, transaction):
+        invalidate_owners = mocker.patch.object(response_cache, 'invalidate_owners')
+        self.discount_index.get.return_value = DiscountEntry(
+            1, 1, Decimal('0.5'), None, self.cheapest_car
+        )
+        claim = mocker.MagicMock(side_effect=ReservationConflictError)
+        mocker.patch.object(inventory_reservation, 'claim', claim)
+        debit = mocker.MagicMock()
+        mocker.patch.object(inventory_reservation, 'debit', debit)
+
+        assert self.matcher.settle(self.offer, self.cheapest_car, Decimal('900')) is False
+        debit.assert_not_called()
+        transaction.on_commit.assert_not_called()
+
+        claim.side_effect = None
+        showroom_history = mocker.patch('core.offers.ShowroomHistory.objects.create')
+        customer_history = mocker.patch('core.offers.CustomerHistory.objects.create')
+
+        assert self.matcher.settle(self.offer, self.cheapest_car, Decimal('900')) is True
+        claim.assert_called_with(ShowroomCar, [1], 'default', user=self.customer)
+        debit.assert_called_once_with(CustomerModel, {1: Decimal('900')}, 'default')
+        showroom_history.assert_called_once()
+        customer_history.assert_called_once()
+        assert transaction.on_commit.call_args.kwargs == {'using': 'default'}
+        assert invalidate_owners.call_args_list == [
+            mocker.call(ShowroomHistory, [1]),
+            mocker.call(CustomerHistory, [1]),
+        ]
+        self.discount_index.discard.assert_called_once_with(1)
+        assert self.cheapest_car.is_active is False
+
+    def test_run(self, mocker, settings):
+        settings.OFFERS = {'MAX_ATTEMPTS': 2}
+        claim = mocker.MagicMock()
+        claim.return_value.update.return_value = 1
+        mocker.patch.object(CustomerOffer.objects, 'filter', claim)
+        mocker.patch.object(
+            CustomerOffer.objects, 'select_related', mocker.MagicMock()
+        ).return_value.get.return_value = self.offer
+        settle = mocker.MagicMock(return_value=False)
+        mocker.patch.object(self.matcher, 'settle', settle)
+        release = mocker.patch.object(self.matcher, 'release')
+        refresh_from_db = mocker.patch.object(self.customer, 'refresh_from_db')
+        self.discount_index.get.return_value = DiscountEntry(
+            1, 1, Decimal('0.5'), None, self.cheapest_car
+        )
+
+        self.matcher.run(1)
+
+        assert settle.call_count == 2
+        assert self.discount_index.discard.call_count == 2
+        refresh_from_db.assert_called_once_with(fields=['balance'])
+        release.assert_called_once_with(1)
+
+        release.reset_mock()
+        settle.reset_mock()
+        self.discount_index.discard.reset_mock()
+        settle.return_value = True
+        self.matcher.run(1)
+
+        settle.assert_called_once()
+        self.discount_index.discard.assert_not_called()
+        release.assert_not_called()
+
+        settle.reset_mock()
+        self.get_cheapest_car.return_value = None
+        self.matcher.run(1)
+
+        settle.assert_not_called()
+        release.assert_called_once_with(1)
+
+        claim.return_value.update.return_value = 0
+        release.reset_mock()
+        self.matcher.run(1)
+
+        release.assert_not_called()
+
+    def test_release(self, mocker):
+        release = mocker.MagicMock()
+        mocker.patch.object(CustomerOffer.objects, 'filter', release)
+
+        self.matcher.release(1)
+
+        release.assert_called_once_with(pk=1, is_active=False)
+        assert release.return_value.update.call_args.kwargs['is_active'] is True
+
+    def test_plan_batch(self):
+        other_offer = CustomerOffer(
+            id=2, customer=self.customer, car_id=1, max_price=Decimal('1000')
+        )
+        discount_car = ShowroomCar(
+            id=2, car_id=1, price=Decimal('1200'), showroom=ShowroomModel(id=2)
+        )
+        self.discount_index.get.return_value = DiscountEntry(
+            1, 2, Decimal('0.5'), None, discount_car
+        )
+        available_cars = {1: [self.cheapest_car, discount_car]}
+        purchase_counts = {1: 1}
+
+        purchases = self.matcher.plan_batch(
+            [self.offer, other_offer], purchase_counts, available_cars
+        )
+
+        assert purchases == [
+            (self.offer, discount_car, Decimal('600.0')),
+            (other_offer, self.cheapest_car, Decimal('720.0')),
+        ]
+        assert available_cars == {1: []}
+        assert purchase_counts == {1: 3}
+
+        assert self.matcher.plan_batch([self.offer], purchase_counts, available_cars) == []
+
+        self.customer.balance = Decimal('1000')
+        available_cars = {1: [self.cheapest_car, discount_car]}
+
+        assert self.matcher.plan_batch(
+            [self.offer, other_offer], purchase_counts, available_cars
+        ) == [(self.offer, discount_car, Decimal('600.0'))]
+
+    def test_commit_batch(self, mocker):
+        offers = mocker.MagicMock()
+        mocker.patch.object(CustomerOffer.objects, 'filter', offers)
+        claim = mocker.MagicMock()
+        mocker.patch.object(inventory_reservation, 'claim', claim)
+        debit = mocker.MagicMock()
+        mocker.patch.object(inventory_reservation, 'debit', debit)
+        showroom_history = mocker.patch('core.offers.ShowroomHistory.objects.bulk_create')
+        customer_history = mocker.patch('core.offers.CustomerHistory.objects.bulk_create')
+
+        self.matcher.commit_batch([self.offer], [])
+
+        offers.assert_called_once_with(pk__in=[1])
+        claim.assert_not_called()
+
+        self.matcher.commit_batch([self.offer], [(self.offer, self.cheapest_car, Decimal('900'))])
+
+        assert claim.call_args.args == (ShowroomCar, [1], 'default')
+        debit.assert_called_once_with(CustomerModel, {1: Decimal('900')}, 'default')
+        showroom_history.assert_called_once()
+        customer_history.assert_called_once()
+        assert self.cheapest_car.is_active is False
+        assert self.cheapest_car.user_id == 1
+
+    def test_run_batch(self, mocker, transaction):
+        get_pending_offers = mocker.MagicMock(return_value=[])
+        mocker.patch.object(self.matcher, 'get_pending_offers', get_pending_offers)
+        mocker.patch.object(self.matcher, 'get_purchase_counts', mocker.MagicMock(return_value={}))
+        mocker.patch.object(
+            self.matcher,
+            'get_available_cars',
+            mocker.MagicMock(return_value={1: [self.cheapest_car]}),
+        )
+        commit_batch = mocker.MagicMock()
+        mocker.patch.object(self.matcher, 'commit_batch', commit_batch)
+
+        assert self.matcher.run_batch() == 0
+        commit_batch.assert_not_called()
+
+        get_pending_offers.return_value = [self.offer]
+        self.discount_index.get.side_effect = [
+            None,
+            DiscountEntry(1, 1, Decimal('0.5'), None, self.cheapest_car),
+        ]
+
+        assert self.matcher.run_batch() == 1
+        commit_batch.assert_called_once_with(
+            [self.offer], [(self.offer, self.cheapest_car, Decimal('900'))]
+        )
+        self.discount_index.discard.assert_called_once_with(1)
+        assert transaction.on_commit.call_args.kwargs == {'using': 'default'}
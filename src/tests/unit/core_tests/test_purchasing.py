@@ -0,0 +1,201 @@
+"""
+test_purchasing.py: File, containing unit tests for core.purchasing.
+"""
+
+
+from decimal import Decimal
+import pytest
+from core.models import CarModel
+from core.discounts import DiscountEntry
+from core.purchasing import PurchasingPipeline
+from showroom.models import ShowroomCar, ShowroomModel
+from supplier.models import SupplierCar, SupplierModel, SupplierHistory
+from core.reservations import ReservationConflictError, inventory_reservation
+
+
+class TestPurchasingPipeline:
+    @pytest.fixture(scope='function', autouse=True)
+    def pipeline(self, mocker):
+        self.discount_index = mocker.MagicMock()
+        self.discount_index.get.return_value = None
+        self.pipeline = PurchasingPipeline(discount_index=self.discount_index)
+
+    @pytest.fixture(scope='function', autouse=True)
+    def showroom(self, mocker):
+        self.showroom = ShowroomModel(id=1, balance=Decimal('2500'))
+        self.showroom.supplier_history_count = 0
+
+        appropriate_cars = mocker.MagicMock()
+        appropriate_cars.all.return_value = [CarModel(id=1), CarModel(id=2), CarModel(id=3)]
+        mocker.patch.object(ShowroomModel, 'appropriate_cars', appropriate_cars)
+
+    @pytest.fixture(scope='function', autouse=True)
+    def suppliers(self, mocker):
+        self.supplier = SupplierModel(
+            id=1, number_of_sales=1, discount_for_unique_customers=Decimal('0.5')
+        )
+        self.other_supplier = SupplierModel(
+            id=2, number_of_sales=1, discount_for_unique_customers=Decimal('0.5')
+        )
+
+        current_suppliers = mocker.MagicMock()
+        current_suppliers.all.return_value = [self.supplier]
+        mocker.patch.object(ShowroomModel, 'current_suppliers', current_suppliers)
+
+    def test_get_cars_by_priority(self):
+        assert self.pipeline.get_cars_by_priority(self.showroom, {3: 5, 2: 1}) == [2, 3, 1]
+
+    def test_get_unique_showroom_discount(self):
+        supplier_car = SupplierCar(supplier=self.supplier)
+
+        assert self.pipeline.get_unique_showroom_discount(self.showroom, supplier_car) == 1
+
+        self.showroom.supplier_history_count = 1
+
+        assert self.pipeline.get_unique_showroom_discount(self.showroom, supplier_car) == Decimal(
+            '0.5'
+        )
+
+    def test_plan(self):
+        first_car = SupplierCar(id=1, car_id=1, price=Decimal('1000'), supplier=self.supplier)
+        second_car = SupplierCar(id=2, car_id=2, price=Decimal('2000'), supplier=self.supplier)
+        discount_car = SupplierCar(
+            id=3, car_id=2, price=Decimal('3000'), supplier=self.other_supplier
+        )
+        supplier_cars = {1: [first_car], 2: [second_car, discount_car]}
+        self.discount_index.get.side_effect = {
+            2: DiscountEntry(1, 2, Decimal('0.3'), None, discount_car)
+        }.get
+
+        purchases = self.pipeline.plan(self.showroom, {}, supplier_cars, 1)
+
+        assert purchases == [(first_car, Decimal('1000')), (discount_car, Decimal('900.0'))]
+        assert self.showroom.balance == Decimal('600.0')
+        assert self.showroom.supplier_history_count == 2
+        assert supplier_cars == {1: [], 2: [second_car]}
+
+    def test_plan_without_money(self):
+        supplier_cars = {
+            1: [SupplierCar(id=1, car_id=1, price=Decimal('3000'), supplier=self.supplier)]
+        }
+
+        assert self.pipeline.plan(self.showroom, {}, supplier_cars, 1) == []
+        assert self.showroom.balance == Decimal('2500')
+        assert len(supplier_cars[1]) == 1
+
+    @pytest.fixture(scope='function')
+    def transaction(self, mocker):
+        transaction = mocker.patch('core.purchasing.transaction')
+        transaction.atomic.return_value.__exit__.return_value = False
+        transaction.on_commit.side_effect = lambda func, using: func()
+        return transaction
+
+    def test_commit(self, mocker, transaction):
+        showroom_cars = mocker.MagicMock()
+        mocker.patch.object(ShowroomCar.objects, 'bulk_create', showroom_cars)
+        history = mocker.MagicMock()
+        mocker.patch.object(SupplierHistory.objects, 'bulk_create', history)
+        claim = mocker.MagicMock()
+        mocker.patch.object(inventory_reservation, 'claim', claim)
+        debit = mocker.MagicMock()
+        mocker.patch.object(inventory_reservation, 'debit', debit)
+
+        self.pipeline.commit(self.showroom, [])
+
+        showroom_cars.assert_not_called()
+
+        supplier_car = SupplierCar(id=1, car_id=1, price=Decimal('1000'), supplier=self.supplier)
+        self.discount_index.get.return_value = DiscountEntry(
+            1, 1, Decimal('0.5'), None, SupplierCar(id=1)
+        )
+        self.pipeline.commit(self.showroom, [(supplier_car, Decimal('1000'))])
+
+        showroom_cars.assert_called_once()
+        history.assert_called_once()
+        claim.assert_called_once_with(SupplierCar, [1], 'default')
+        debit.assert_called_once_with(ShowroomModel, {1: Decimal('1000')}, 'default')
+        self.discount_index.discard.assert_called_once_with(1)
+        assert transaction.on_commit.call_args.kwargs == {'using': 'default'}
+        assert supplier_car.is_active is False
+
+        claim.side_effect = ReservationConflictError
+
+        with pytest.raises(ReservationConflictError):
+            self.pipeline.commit(self.showroom, [(supplier_car, Decimal('1000'))])
+
+        showroom_cars.assert_called_once()
+
+    def test_run(self, mocker, transaction):
+        mocker.patch.object(
+            self.pipeline, 'get_showrooms', mocker.MagicMock(return_value=[self.showroom])
+        )
+        mocker.patch.object(self.pipeline, 'get_sales_counts', mocker.MagicMock(return_value={}))
+        mocker.patch.object(self.pipeline, 'get_supplier_cars', mocker.MagicMock(return_value={}))
+        mocker.patch.object(
+            self.pipeline.selection_engine,
+            'get_purchase_metrics_count',
+            mocker.MagicMock(return_value=0),
+        )
+        plan = mocker.MagicMock(return_value=[])
+        mocker.patch.object(self.pipeline, 'plan', plan)
+        commit = mocker.MagicMock()
+        mocker.patch.object(self.pipeline, 'commit', commit)
+
+        self.pipeline.run(mocker.MagicMock())
+
+        self.discount_index.ensure_fresh.assert_called_once()
+        plan.assert_called_once_with(self.showroom, {}, {}, 0)
+        commit.assert_called_once_with(self.showroom, [])
+
+        commit.side_effect = ReservationConflictError
+        self.pipeline.run(mocker.MagicMock())
+
+    def test_run_with_lock(self, mocker, transaction):
+        mocker.patch.object(
+            self.pipeline, 'get_showrooms', mocker.MagicMock(return_value=[self.showroom])
+        )
+        mocker.patch.object(self.pipeline, 'get_sales_counts', mocker.MagicMock(return_value={}))
+        mocker.patch.object(self.pipeline, 'get_supplier_cars', mocker.MagicMock(return_value={}))
+        mocker.patch.object(
+            self.pipeline.selection_engine,
+            'get_purchase_metrics_count',
+            mocker.MagicMock(return_value=0),
+        )
+        lock = mocker.patch.object(self.pipeline, 'lock', return_value=False)
+        commit = mocker.patch.object(self.pipeline, 'commit')
+        showrooms = mocker.MagicMock(db='default')
+
+        self.pipeline.run(showrooms, lock=True)
+
+        lock.assert_called_once_with(self.showroom, 'default')
+        commit.assert_not_called()
+
+        lock.return_value = True
+        self.pipeline.run(showrooms, lock=True)
+
+        commit.assert_called_once_with(self.showroom, [])
+        transaction.atomic.assert_called_with(using='default')
+
+    def test_lock(self, mocker):
+        locked = mocker.MagicMock()
+        locked.return_value.filter.return_value.values_list.return_value = [1]
+        mocker.patch.object(ShowroomModel.objects, 'using', mocker.MagicMock())
+        ShowroomModel.objects.using.return_value.select_for_update = locked
+
+        assert self.pipeline.lock(self.showroom, 'default') is True
+
+        locked.assert_called_once_with(skip_locked=True)
+        locked.return_value.filter.assert_called_once_with(pk=1, is_active=True)
+
+        locked.return_value.filter.return_value.values_list.return_value = []
+
+        assert self.pipeline.lock(self.showroom, 'default') is False
+
+    def test_run_locked(self, mocker):
+        run = mocker.MagicMock()
+        mocker.patch.object(self.pipeline, 'run', run)
+
+        self.pipeline.run_locked([1, 2])
+
+        assert run.call_args.kwargs == {'lock': True}
+        assert run.call_args.args[0].db == 'default'
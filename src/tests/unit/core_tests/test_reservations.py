@@ -0,0 +1,62 @@
+"""
+test_reservations.py: File, containing unit tests for core.reservations.
+"""
+
+
+from decimal import Decimal
+import pytest
+from customer.models import CustomerModel
+from showroom.models import ShowroomCar
+from core.reservations import ReservationConflictError, inventory_reservation
+
+
+class TestInventoryReservation:
+    @pytest.fixture(scope='function', autouse=True)
+    def rows(self, mocker):
+        self.showroom_cars = mocker.MagicMock()
+        mocker.patch.object(ShowroomCar.objects, 'using', self.showroom_cars)
+        self.customers = mocker.MagicMock()
+        mocker.patch.object(CustomerModel.objects, 'using', self.customers)
+
+    def test_lock_available(self, mocker):
+        queryset = mocker.MagicMock()
+        inventory_reservation.lock_available(queryset)
+
+        queryset.select_for_update.assert_called_once_with(skip_locked=True, of=('self',))
+        queryset.select_for_update.return_value.filter.assert_called_once_with(is_active=True)
+
+    def test_claim(self):
+        self.showroom_cars.return_value.filter.return_value.update.return_value = 2
+        inventory_reservation.claim(ShowroomCar, [1, 2, 2], 'default', user_id=1)
+
+        self.showroom_cars.assert_called_once_with('default')
+        self.showroom_cars.return_value.filter.assert_called_once_with(
+            pk__in={1, 2}, is_active=True
+        )
+        update = self.showroom_cars.return_value.filter.return_value.update
+        assert update.call_args.kwargs['is_active'] is False
+        assert update.call_args.kwargs['user_id'] == 1
+
+        update.return_value = 1
+
+        with pytest.raises(ReservationConflictError):
+            inventory_reservation.claim(ShowroomCar, [1, 2])
+
+    def test_debit(self):
+        inventory_reservation.debit(CustomerModel, {})
+
+        self.customers.assert_not_called()
+
+        self.customers.return_value.filter.return_value.update.return_value = 2
+        inventory_reservation.debit(CustomerModel, {1: Decimal('100'), 2: Decimal('200')})
+
+        assert self.customers.return_value.filter.call_args.kwargs['pk__in'] == {
+            1: Decimal('100'),
+            2: Decimal('200'),
+        }
+        assert 'balance__gte' in self.customers.return_value.filter.call_args.kwargs
+
+        self.customers.return_value.filter.return_value.update.return_value = 1
+
+        with pytest.raises(ReservationConflictError):
+            inventory_reservation.debit(CustomerModel, {1: Decimal('100'), 2: Decimal('200')})
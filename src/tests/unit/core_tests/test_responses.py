@@ -0,0 +1,135 @@
+"""
+test_responses.py: File, containing unit tests for core.responses.
+"""
+
+
+import pytest
+from rest_framework import status
+from django.db.models import signals
+from django.core.cache import cache
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+from rest_framework.response import Response
+from core.models import CarModel
+from core.responses import ResponseCache
+from showroom.models import ShowroomHistory
+from supplier.models import SupplierModel
+
+
+class TestResponseCache:
+    @pytest.fixture(scope='function', autouse=True)
+    def response_cache(self):
+        cache.clear()
+        self.cache = ResponseCache()
+        self.factory = APIRequestFactory()
+
+    def get_request(self, **headers: str) -> Request:
+        return Request(self.factory.get('/api/v1/core/cars/?page=1', **headers))
+
+    def test_respond(self, mocker):
+        handler = mocker.MagicMock(return_value=Response([{'id': 1}]))
+
+        response = self.cache.respond(self.get_request(), 'user:1', [CarModel], handler)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [{'id': 1}]
+        etag = response['ETag']
+
+        response = self.cache.respond(self.get_request(), 'user:1', [CarModel], handler)
+        assert response.data == [{'id': 1}]
+        assert response['ETag'] == etag
+        handler.assert_called_once()
+
+        self.cache.respond(self.get_request(), 'user:2', [CarModel], handler)
+        assert handler.call_count == 2
+
+    def test_respond_not_modified(self, mocker):
+        handler = mocker.MagicMock(return_value=Response([{'id': 1}]))
+        etag = self.cache.respond(self.get_request(), 'user:1', [CarModel], handler)['ETag']
+
+        request = self.get_request(HTTP_IF_NONE_MATCH=f'"other", {etag}')
+        response = self.cache.respond(request, 'user:1', [CarModel], handler)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert response.data is None
+
+    def test_respond_error(self, mocker):
+        handler = mocker.MagicMock(return_value=Response(status=status.HTTP_404_NOT_FOUND))
+
+        for _ in range(2):
+            response = self.cache.respond(self.get_request(), 'user:1', [CarModel], handler)
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+            assert response.has_header('ETag') is False
+
+        assert handler.call_count == 2
+
+    def test_invalidate(self):
+        request = self.get_request()
+        key = self.cache.get_key(request, 'user:1', [CarModel, SupplierModel])
+        assert self.cache.get_key(request, 'user:1', [CarModel, SupplierModel]) == key
+
+        self.cache.invalidate(SupplierModel)
+        assert self.cache.get_key(request, 'user:1', [CarModel, SupplierModel]) != key
+
+    def test_watch(self, mocker):
+        connect = mocker.patch.object(signals.post_save, 'connect')
+        mocker.patch.object(signals.post_delete, 'connect')
+        m2m_connect = mocker.patch.object(signals.m2m_changed, 'connect')
+
+        self.cache.watch(CarModel)
+        self.cache.watch(CarModel)
+        connect.assert_called_once_with(
+            self.cache.receive, sender=CarModel, dispatch_uid='response_cache:core.carmodel'
+        )
+
+        self.cache.watch(SupplierModel.showrooms.through)
+        m2m_connect.assert_called_once()
+
+    def test_receive(self):
+        version = self.cache.get_versions([CarModel])
+        self.cache.receive(sender=CarModel, instance=CarModel())
+        assert self.cache.get_versions([CarModel]) != version
+
+    def test_receive_partitioned(self):
+        self.cache.partition_models({'showroom.ShowroomHistory': 'showroom'})
+        request = self.get_request()
+        first_key = self.cache.get_key(request, 'analytics', [ShowroomHistory], owner_id=1)
+        second_key = self.cache.get_key(request, 'analytics', [ShowroomHistory], owner_id=2)
+
+        self.cache.receive(sender=ShowroomHistory, instance=ShowroomHistory(showroom_id=1))
+
+        assert self.cache.get_key(request, 'analytics', [ShowroomHistory], owner_id=1) != (
+            first_key
+        )
+        assert self.cache.get_key(request, 'analytics', [ShowroomHistory], owner_id=2) == (
+            second_key
+        )
+
+        self.cache.invalidate(ShowroomHistory)
+
+        assert self.cache.get_key(request, 'analytics', [ShowroomHistory], owner_id=2) != (
+            second_key
+        )
+
+    def test_invalidate_owners(self):
+        self.cache.partition_models({'showroom.ShowroomHistory': 'showroom'})
+        request = self.get_request()
+        keys = [
+            self.cache.get_key(request, 'analytics', [ShowroomHistory], owner_id=owner_id)
+            for owner_id in [1, 2, 3]
+        ]
+
+        self.cache.invalidate_owners(ShowroomHistory, [1, 3, 1])
+        self.cache.invalidate_owners(ShowroomHistory, [])
+
+        assert [
+            self.cache.get_key(request, 'analytics', [ShowroomHistory], owner_id=owner_id) == key
+            for owner_id, key in zip([1, 2, 3], keys)
+        ] == [False, True, False]
+
+    def test_watch_saves(self, mocker):
+        connect = mocker.patch.object(signals.post_save, 'connect')
+        delete_connect = mocker.patch.object(signals.post_delete, 'connect')
+
+        self.cache.watch(CarModel, deletes=False)
+        connect.assert_called_once()
+        delete_connect.assert_not_called()
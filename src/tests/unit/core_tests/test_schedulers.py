@@ -0,0 +1,125 @@
+"""
+test_schedulers.py: File, containing unit tests for core.schedulers.
+"""
+
+
+from datetime import timedelta
+import pytest
+from django.db import DatabaseError
+from django.utils import timezone
+from core.models import CarModel
+from core.schedulers import DiscountScheduler
+from showroom.models import ShowroomCarDiscount
+from supplier.models import SupplierCarDiscount
+
+
+class TestDiscountScheduler:
+    @pytest.fixture(scope='function', autouse=True)
+    def scheduler(self, mocker):
+        self.scheduler = DiscountScheduler()
+        self.scheduler._client = mocker.MagicMock()
+        self.pipeline = self.scheduler.client.pipeline.return_value
+
+    def test_get_member(self):
+        assert self.scheduler.get_member(ShowroomCarDiscount(id=1)) == 'showroom:1'
+        assert self.scheduler.get_member(SupplierCarDiscount(id=2)) == 'supplier:2'
+
+        with pytest.raises(TypeError):
+            self.scheduler.get_member(CarModel(id=1))
+
+    def test_register(self, mocker):
+        discounts = mocker.MagicMock()
+        mocker.patch.object(SupplierCarDiscount.objects, 'filter', discounts)
+        now = timezone.now()
+        discount = SupplierCarDiscount(
+            id=1, start_date=now - timedelta(hours=1), finish_date=now + timedelta(hours=1)
+        )
+
+        assert self.scheduler.register(discount) is True
+
+        discounts.assert_not_called()
+        self.pipeline.zadd.assert_called_once_with(
+            'discounts:expiry', {'supplier:1': discount.finish_date.timestamp()}
+        )
+
+        self.pipeline.reset_mock()
+        discount.start_date = now + timedelta(minutes=30)
+
+        assert self.scheduler.register(discount) is False
+
+        discounts.assert_called_once_with(pk=1)
+        discounts.return_value.update.assert_called_once_with(is_active=False)
+        self.pipeline.zadd.assert_any_call(
+            'discounts:activation', {'supplier:1': discount.start_date.timestamp()}
+        )
+        assert self.pipeline.zadd.call_count == 2
+
+    def test_get_due(self):
+        members = [b'showroom:1', b'supplier:2', b'showroom:3']
+        self.scheduler.client.zrangebyscore.return_value = members
+
+        assert self.scheduler.get_due('discounts:expiry', timezone.now()) == (
+            members,
+            {'showroom': [1, 3], 'supplier': [2]},
+        )
+
+    def test_remove(self):
+        self.scheduler.remove('discounts:expiry', [])
+
+        self.scheduler.client.zrem.assert_not_called()
+
+        self.scheduler.remove('discounts:expiry', [b'showroom:1'])
+
+        self.scheduler.client.zrem.assert_called_once_with('discounts:expiry', b'showroom:1')
+
+    def test_activate(self, mocker):
+        now = timezone.now()
+        members = [b'showroom:1', b'showroom:3']
+        mocker.patch.object(
+            self.scheduler,
+            'get_due',
+            mocker.MagicMock(return_value=(members, {'showroom': [1, 3]})),
+        )
+        remove = mocker.MagicMock()
+        mocker.patch.object(self.scheduler, 'remove', remove)
+        discounts = mocker.MagicMock()
+        discounts.return_value.update.return_value = 1
+        mocker.patch.object(ShowroomCarDiscount.objects, 'filter', discounts)
+
+        assert self.scheduler.activate(now) == {'showroom': 1}
+
+        discounts.assert_called_once_with(
+            pk__in=[1, 3],
+            is_active=False,
+            start_date__lte=now,
+            finish_date__gt=now,
+            showroom__is_active=True,
+        )
+        discounts.return_value.update.assert_called_once_with(is_active=True, last_updated=now)
+        remove.assert_called_once_with('discounts:activation', members)
+
+        remove.reset_mock()
+        discounts.return_value.update.side_effect = DatabaseError
+
+        with pytest.raises(DatabaseError):
+            self.scheduler.activate(now)
+
+        remove.assert_not_called()
+
+    def test_expire(self, mocker):
+        now = timezone.now()
+        members = [b'supplier:2']
+        mocker.patch.object(
+            self.scheduler, 'get_due', mocker.MagicMock(return_value=(members, {'supplier': [2]}))
+        )
+        remove = mocker.MagicMock()
+        mocker.patch.object(self.scheduler, 'remove', remove)
+        discounts = mocker.MagicMock()
+        discounts.return_value.update.return_value = 1
+        mocker.patch.object(SupplierCarDiscount.objects, 'filter', discounts)
+
+        assert self.scheduler.expire(now) == {'supplier': 1}
+
+        discounts.assert_called_once_with(pk__in=[2], is_active=True, finish_date__lte=now)
+        discounts.return_value.update.assert_called_once_with(is_active=False, last_updated=now)
+        remove.assert_called_once_with('discounts:expiry', members)
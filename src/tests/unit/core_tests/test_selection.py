@@ -0,0 +1,79 @@
+"""
+test_selection.py: File, containing unit tests for core.selection.
+"""
+
+
+from decimal import Decimal
+import pytest
+from core.selection import SupplierSelectionEngine
+from supplier.models import SupplierCar, SupplierModel
+
+
+class TestSupplierSelectionEngine:
+    @pytest.fixture(scope='function', autouse=True)
+    def engine(self):
+        self.engine = SupplierSelectionEngine()
+
+    @pytest.fixture(scope='function', autouse=True)
+    def suppliers(self):
+        self.cheap = SupplierModel(
+            id=1, number_of_sales=10, discount_for_unique_customers=Decimal('0.2')
+        )
+        self.expensive = SupplierModel(
+            id=2, number_of_sales=30, discount_for_unique_customers=Decimal('0.5')
+        )
+
+    def test_get_total_price(self):
+        supplier_car = SupplierCar(car_id=1, price=Decimal('100'), supplier=self.cheap)
+
+        assert self.engine.get_total_price(supplier_car, 30) == Decimal('1400')
+
+    def test_score(self):
+        supplier_cars = [
+            SupplierCar(id=1, car_id=1, price=Decimal('100'), supplier=self.cheap),
+            SupplierCar(id=2, car_id=1, price=Decimal('100'), supplier=self.expensive),
+            SupplierCar(id=3, car_id=2, price=Decimal('100'), supplier=self.expensive),
+            SupplierCar(id=4, car_id=2, price=Decimal('200'), supplier=self.cheap),
+            SupplierCar(id=5, car_id=2, price=Decimal('500'), supplier=self.cheap),
+        ]
+
+        cheapest_cars = self.engine.score(supplier_cars, 30)
+
+        assert cheapest_cars[1].id == 1
+        assert cheapest_cars[2].id == 4
+
+    def test_score_keeps_first_car_on_equal_price(self):
+        supplier_cars = [
+            SupplierCar(id=1, car_id=1, price=Decimal('100'), supplier=self.cheap),
+            SupplierCar(id=2, car_id=1, price=Decimal('100'), supplier=self.cheap),
+        ]
+
+        assert self.engine.score(supplier_cars, 30)[1].id == 1
+
+    def test_select(self, mocker):
+        mocker.patch.object(
+            self.engine,
+            'get_appropriate_cars',
+            mocker.MagicMock(return_value={1: [1, 2], 2: [2, 3], 3: []}),
+        )
+        cheapest_cars = mocker.MagicMock(
+            return_value={
+                1: SupplierCar(car_id=1, supplier_id=1),
+                2: SupplierCar(car_id=2, supplier_id=2),
+            }
+        )
+        mocker.patch.object(self.engine, 'find_cheapest_cars', cheapest_cars)
+
+        assert self.engine.select(mocker.MagicMock()) == {1: {1, 2}, 2: {2}, 3: set()}
+        cheapest_cars.assert_called_once_with({1, 2, 3})
+
+    def test_run(self, mocker):
+        select = mocker.MagicMock(return_value={1: {1}})
+        mocker.patch.object(self.engine, 'select', select)
+        save = mocker.MagicMock()
+        mocker.patch.object(self.engine, 'save', save)
+        showrooms = mocker.MagicMock()
+        self.engine.run(showrooms)
+
+        select.assert_called_once_with(showrooms)
+        save.assert_called_once_with(showrooms, {1: {1}})
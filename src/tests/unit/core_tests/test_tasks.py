@@ -0,0 +1,96 @@
+"""
+test_tasks.py: File, containing unit tests for core.tasks.
+"""
+
+
+from core.tasks import (
+    offer_matcher,
+    find_suppliers,
+    check_suppliers,
+    buy_showroom_cars,
+    buy_supplier_cars,
+    make_customer_offer,
+    purchasing_pipeline,
+    settle_customer_offers,
+    delete_finished_discounts,
+    activate_started_discounts,
+)
+from core.discounts import showroom_discount_index, supplier_discount_index
+from core.schedulers import discount_scheduler
+from showroom.models import ShowroomModel
+
+
+class TestCoreTasks:
+    def test_buy_showroom_cars(self, mocker):
+        mock = mocker.MagicMock()
+        mocker.patch.object(purchasing_pipeline, 'run_locked', mock)
+        buy_showroom_cars([1, 2])
+
+        mock.assert_called_once_with([1, 2])
+
+    def test_buy_supplier_cars(self, mocker, settings):
+        settings.PURCHASING = {'SHOWROOMS_PER_TASK': 2}
+        showrooms = mocker.MagicMock()
+        showrooms.return_value.order_by.return_value.values_list.return_value = [1, 2, 3]
+        mocker.patch.object(ShowroomModel.objects, 'filter', showrooms)
+        group = mocker.MagicMock()
+        mocker.patch('core.tasks.group', group)
+        signature = mocker.MagicMock(side_effect=lambda showroom_ids: showroom_ids)
+        mocker.patch.object(buy_showroom_cars, 's', signature)
+
+        buy_supplier_cars()
+
+        assert list(group.call_args.args[0]) == [[1, 2], [3]]
+        group.return_value.assert_called_once()
+
+    def test_check_suppliers(self, mocker):
+        showrooms = mocker.MagicMock()
+        showrooms.return_value.order_by.return_value.values_list.return_value = [1, 2]
+        mocker.patch.object(ShowroomModel.objects, 'filter', showrooms)
+        group = mocker.MagicMock()
+        mocker.patch('core.tasks.group', group)
+        signature = mocker.MagicMock(side_effect=lambda showroom_id: showroom_id)
+        mocker.patch.object(find_suppliers, 's', signature)
+
+        check_suppliers()
+
+        showrooms.assert_called_once_with(is_active=True)
+        assert list(group.call_args.args[0]) == [1, 2]
+        group.return_value.assert_called_once()
+
+    def test_delete_finished_discounts(self, mocker):
+        expire = mocker.MagicMock(return_value={'showroom': 0, 'supplier': 2})
+        mocker.patch.object(discount_scheduler, 'expire', expire)
+        showroom_invalidate = mocker.MagicMock()
+        mocker.patch.object(showroom_discount_index, 'invalidate', showroom_invalidate)
+        supplier_invalidate = mocker.MagicMock()
+        mocker.patch.object(supplier_discount_index, 'invalidate', supplier_invalidate)
+
+        delete_finished_discounts()
+
+        showroom_invalidate.assert_not_called()
+        supplier_invalidate.assert_called_once()
+
+    def test_activate_started_discounts(self, mocker):
+        activate = mocker.MagicMock(return_value={'showroom': 1})
+        mocker.patch.object(discount_scheduler, 'activate', activate)
+        showroom_invalidate = mocker.MagicMock()
+        mocker.patch.object(showroom_discount_index, 'invalidate', showroom_invalidate)
+
+        activate_started_discounts()
+
+        showroom_invalidate.assert_called_once()
+
+    def test_make_customer_offer(self, mocker):
+        mock = mocker.MagicMock()
+        mocker.patch.object(offer_matcher, 'run', mock)
+        make_customer_offer(1)
+
+        mock.assert_called_once_with(1)
+
+    def test_settle_customer_offers(self, mocker):
+        mock = mocker.MagicMock()
+        mocker.patch.object(offer_matcher, 'run_batch', mock)
+        settle_customer_offers()
+
+        mock.assert_called_once()
@@ -5,6 +5,7 @@ test_services.py: File, containing unit tests for customer.services.
 
 import pytest
 from core.tasks import make_customer_offer
+from core.deletions import soft_deletion
 from customer.models import CustomerModel
 from customer.services import CustomerService
 
@@ -18,15 +19,26 @@ class TestCustomerService:
     def customer(self, user):
         self.customer = CustomerModel(balance=0.0, user=user)
 
-    def test_delete_customer(self):
-        self.customer.is_active = True
+    def test_delete_customer(self, mocker):
+        delete = mocker.patch.object(soft_deletion, 'delete', return_value=None)
         self.service.delete_customer(self.customer)
 
-        assert self.customer.is_active is False
+        delete.assert_called_once_with(self.customer, ['offers'])
 
-    def test_make_offer(self, mocker):
+    def test_make_offer(self, mocker, settings):
+        settings.OFFERS = {'BATCH_MODE': False}
         mock = mocker.MagicMock(return_value=True)
         mocker.patch.object(make_customer_offer, 'delay', mock)
+        on_commit = mocker.patch('customer.services.transaction.on_commit')
+        self.service.make_offer(mocker.MagicMock(spec=['id']))
+
+        mock.assert_not_called()
+
+        on_commit.call_args.args[0]()
+
+        mock.assert_called_once()
+
+        settings.OFFERS = {'BATCH_MODE': True}
         self.service.make_offer(mocker.MagicMock(spec=['id']))
 
         mock.assert_called_once()
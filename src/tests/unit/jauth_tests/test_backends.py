@@ -4,6 +4,7 @@ test_backends.py: File, containing unit tests for jauth.backends.
 
 
 import pytest
+from jauth import backends
 from jauth.backends import TokenBackend
 
 
@@ -29,3 +30,18 @@ class TestTokenBackend:
         payload = self.token_backend.get_payload_by_token(token=access_token)
 
         assert isinstance(payload, dict)
+
+    def test_get_payload_by_token_cache(self, mocker):
+        access_token = self.token_backend.generate_token(type='access', user_id=1)
+        self.token_backend.payload_cache.clear()
+        decode = mocker.patch('jauth.backends.decode', side_effect=backends.decode)
+
+        payload = self.token_backend.get_payload_by_token(token=access_token)
+
+        assert self.token_backend.get_payload_by_token(token=access_token) == payload
+        decode.assert_called_once()
+
+        with pytest.raises(self.token_backend.token_invalid_error):
+            self.token_backend.get_payload_by_token(token=access_token[:-2])
+
+        assert self.token_backend.payload_cache.get_stats()['hits'] == 1
@@ -0,0 +1,136 @@
+"""
+test_buffers.py: File, containing unit tests for jauth.buffers.
+"""
+
+
+from datetime import datetime, timezone, timedelta
+import pytest
+from jauth.buffers import LastLoginBuffer
+
+
+class TestLastLoginBuffer:
+    @pytest.fixture(scope='function', autouse=True)
+    def buffer(self, settings, mocker):
+        settings.LAST_LOGIN = {
+            'BUFFERED': True,
+            'FLUSH_SIZE': 2,
+            'FLUSH_INTERVAL_SECONDS': 60.0,
+            'DURABLE': False,
+            'DURABLE_URL': 'redis://localhost',
+        }
+        self.buffer = LastLoginBuffer()
+        self.write = mocker.MagicMock(return_value=1)
+        mocker.patch.object(self.buffer, 'write', self.write)
+        yield
+        self.buffer.clear()
+
+    def test_add(self, user, settings):
+        self.buffer.add(user)
+        self.buffer.add(user)
+
+        assert self.buffer.entries == {user.pk: user.last_login}
+        self.write.assert_not_called()
+
+        settings.LAST_LOGIN['BUFFERED'] = False
+        self.buffer.add(user)
+
+        self.write.assert_called_once_with({user.pk: user.last_login})
+
+    def test_schedule(self, user, settings, mocker):
+        timer = mocker.patch('jauth.buffers.Timer')
+
+        self.buffer.schedule()
+
+        timer.assert_not_called()
+
+        self.buffer.add(user)
+        self.buffer.add(user)
+
+        timer.assert_called_once_with(60.0, self.buffer.flush_on_timer)
+        timer.return_value.start.assert_called_once()
+        assert timer.return_value.daemon is True
+
+        self.buffer.clear()
+
+        timer.return_value.cancel.assert_called_once()
+        assert self.buffer.timer is None
+
+    def test_flush_on_timer(self, user, mocker):
+        timer = mocker.patch('jauth.buffers.Timer')
+        close_all = mocker.patch('jauth.buffers.connections.close_all')
+        self.buffer.add(user)
+
+        self.buffer.flush_on_timer()
+
+        self.write.assert_called_once_with({user.pk: user.last_login})
+        close_all.assert_called_once()
+        assert self.buffer.timer is None
+
+        self.write.side_effect = Exception
+        self.buffer.add(user)
+        self.buffer.flush_on_timer()
+
+        assert self.buffer.entries == {user.pk: user.last_login}
+        assert timer.call_count == 3
+
+    def test_add_flush(self, user, mocker):
+        other_user = mocker.MagicMock(pk=user.pk + 1)
+        self.buffer.add(user)
+        self.buffer.add(other_user)
+
+        self.write.assert_called_once_with(
+            {user.pk: user.last_login, other_user.pk: other_user.last_login}
+        )
+        assert self.buffer.entries == {}
+
+    def test_add_durable(self, user, settings, mocker):
+        settings.LAST_LOGIN['DURABLE'] = True
+        client = mocker.MagicMock()
+        self.buffer._client = client
+
+        self.buffer.add(user)
+
+        client.zadd.assert_called_once_with(
+            LastLoginBuffer.key, {user.pk: user.last_login.timestamp()}, gt=True
+        )
+        assert self.buffer.entries == {}
+
+    def test_merge(self):
+        now = datetime.now(tz=timezone.utc)
+        self.buffer.merge({1: now})
+        self.buffer.merge({1: now - timedelta(seconds=1), 2: now})
+
+        assert self.buffer.entries == {1: now, 2: now}
+
+    def test_flush(self):
+        now = datetime.now(tz=timezone.utc)
+
+        assert self.buffer.flush() == 0
+        self.write.assert_not_called()
+
+        self.buffer.merge({1: now})
+        self.write.side_effect = Exception
+
+        assert self.buffer.flush() == 0
+        assert self.buffer.entries == {1: now}
+
+        self.write.side_effect = None
+
+        assert self.buffer.flush() == 1
+        assert self.buffer.entries == {}
+
+    def test_flush_durable(self, settings, mocker):
+        settings.LAST_LOGIN['DURABLE'] = True
+        now = datetime.now(tz=timezone.utc)
+        client = mocker.MagicMock()
+        client.zpopmin.side_effect = [[(b'1', now.timestamp())], []]
+        self.buffer._client = client
+
+        assert self.buffer.flush() == 1
+        self.write.assert_called_once_with({1: now})
+
+        client.zpopmin.side_effect = [[(b'1', now.timestamp())], []]
+        self.write.side_effect = Exception
+
+        assert self.buffer.flush() == 0
+        client.zadd.assert_called_once_with(LastLoginBuffer.key, {b'1': now.timestamp()}, gt=True)
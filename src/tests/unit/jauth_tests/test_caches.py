@@ -0,0 +1,128 @@
+"""
+test_caches.py: File, containing unit tests for jauth.caches.
+"""
+
+
+from time import time
+import pytest
+from django.core.cache import cache
+from jauth.caches import UserCache, PayloadCache
+from jauth.models import User
+
+
+class TestPayloadCache:
+    @pytest.fixture(scope='function', autouse=True)
+    def payload_cache(self, settings):
+        settings.JWT_TOKEN['PAYLOAD_CACHE_SIZE'] = 2
+        self.cache = PayloadCache()
+        self.payload = {'sub': 1, 'exp': time() + 60}
+
+    def test_get(self):
+        assert self.cache.get('token') is None
+
+        self.cache.set('token', self.payload)
+        payload = self.cache.get('token')
+
+        assert payload == self.payload
+        payload['sub'] = 2
+        assert self.cache.get('token') == self.payload
+        assert self.cache.get_stats() == {'hits': 2, 'misses': 1, 'size': 1}
+
+        self.cache.clear()
+
+        assert self.cache.get_stats() == {'hits': 0, 'misses': 0, 'size': 0}
+
+    def test_get_expired(self):
+        self.cache.set('token', {'sub': 1, 'exp': time() - 1})
+
+        assert self.cache.get('token') is None
+        assert self.cache.get_stats()['size'] == 0
+
+        self.cache.set('token', {'sub': 1})
+
+        assert self.cache.get('token') is None
+
+    def test_set(self, settings):
+        for token in ['first', 'second', 'third']:
+            self.cache.set(token, self.payload)
+
+        assert self.cache.get('first') is None
+        assert self.cache.get('third') == self.payload
+
+        settings.JWT_TOKEN['PAYLOAD_CACHE_SIZE'] = 0
+        self.cache.clear()
+        self.cache.set('token', self.payload)
+
+        assert self.cache.get('token') is None
+
+
+class TestUserCache:
+    @pytest.fixture(scope='function', autouse=True)
+    def user_cache(self, settings):
+        settings.USER_CACHE = {
+            'LOCAL_SIZE': 2,
+            'LOCAL_TTL_SECONDS': 60,
+            'SHARED': True,
+            'SHARED_TTL_SECONDS': 60,
+        }
+        self.cache = UserCache()
+        cache.clear()
+
+    @pytest.fixture(scope='function', autouse=True)
+    def users(self, user, mocker):
+        self.user = user
+        self.users = mocker.MagicMock()
+        self.users.return_value.first.return_value = user
+        mocker.patch.object(User.objects, 'filter', self.users)
+
+    def test_get(self):
+        assert self.cache.get(None) is None
+
+        cached_user = self.cache.get(1)
+
+        assert cached_user is not self.user
+        assert cached_user.username == self.user.username
+        assert cached_user._state.adding is False
+        assert self.cache.get(1) is not cached_user
+
+        self.cache.clear()
+
+        assert self.cache.get(1).email == self.user.email
+        self.users.assert_called_once_with(pk=1)
+
+        self.users.return_value.first.return_value = None
+
+        assert self.cache.get(2) is None
+
+    def test_get_local(self, settings):
+        settings.USER_CACHE['SHARED'] = False
+        self.cache.get(1)
+        self.cache.get(1)
+
+        self.users.assert_called_once()
+
+        self.cache.get(2)
+        self.cache.get(3)
+
+        assert list(self.cache.entries) == [2, 3]
+
+        settings.USER_CACHE['LOCAL_TTL_SECONDS'] = 0
+        self.cache.get(4)
+        self.cache.get(4)
+
+        assert self.users.call_count == 5
+
+    def test_invalidate(self):
+        self.cache.get(1)
+        self.user.is_staff = True
+        self.cache.invalidate(1)
+
+        assert self.cache.get(1).is_staff is True
+        assert self.users.call_count == 2
+
+    def test_invalidate_before_set(self):
+        values, version = self.cache.get_shared(1)
+        self.cache.invalidate(1)
+
+        assert values is None
+        assert self.cache.get_shared(1)[1] != version
@@ -0,0 +1,35 @@
+"""
+test_commands.py: File, containing unit tests for jauth.management.commands.
+"""
+
+
+import pytest
+from django.core.management.base import CommandError
+from jauth.models import User
+from jauth.authentication import JWTAuthentication
+from jauth.management.commands.bench_auth import Command
+
+
+class TestBenchAuthCommand:
+    @pytest.fixture(scope='function', autouse=True)
+    def command(self):
+        self.command = Command()
+
+    def test_handle(self, user, mocker):
+        users = mocker.MagicMock()
+        users.return_value.first.return_value = None
+        mocker.patch.object(User.objects, 'order_by', users)
+
+        with pytest.raises(CommandError):
+            self.command.handle(iterations=10, user_id=None)
+
+        users.return_value.filter.return_value.first.return_value = user
+        authenticate = mocker.MagicMock()
+        mocker.patch.object(JWTAuthentication, 'authenticate', authenticate)
+        write = mocker.MagicMock()
+        mocker.patch.object(self.command.stdout, 'write', write)
+
+        self.command.handle(iterations=10, user_id=1)
+
+        assert authenticate.call_count == 22
+        assert write.call_count == 3
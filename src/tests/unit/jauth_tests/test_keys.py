@@ -0,0 +1,123 @@
+"""
+test_keys.py: File, containing unit tests for jauth.keys.
+"""
+
+
+import pytest
+from jwt import InvalidTokenError, get_unverified_header
+from django.core.exceptions import ImproperlyConfigured
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa, ed25519
+from jauth import keys
+from jauth.keys import KeyRing
+from jauth.backends import TokenBackend
+
+
+class TestKeyRing:
+    @pytest.fixture(scope='function', autouse=True)
+    def keyring(self, settings, mocker):
+        settings.JWT_TOKEN['KEYS_DIR'] = None
+        settings.JWT_TOKEN['SIGNING_KEY_ID'] = None
+        self.keyring = KeyRing()
+        mocker.patch.object(TokenBackend, 'keyring', self.keyring)
+        TokenBackend.payload_cache.clear()
+
+    @pytest.fixture(scope='function')
+    def key_files(self, settings, tmp_path):
+        rsa_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        (tmp_path / 'rsa.pem').write_bytes(
+            rsa_key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+        (tmp_path / 'retired.pem').write_bytes(
+            rsa_key.public_key().public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+        )
+        (tmp_path / 'ed.pem').write_bytes(
+            ed25519.Ed25519PrivateKey.generate().private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+        settings.JWT_TOKEN['KEYS_DIR'] = str(tmp_path)
+
+    def test_secret_key_mode(self):
+        assert self.keyring.get_signing_key() is None
+        assert self.keyring.get_jwks() == {'keys': []}
+
+        token = TokenBackend.generate_token(type='access', user_id=1)
+
+        assert 'kid' not in get_unverified_header(token)
+        assert TokenBackend.get_payload_by_token(token=token)['sub'] == 1
+
+        with pytest.raises(InvalidTokenError):
+            self.keyring.get_verifying_key('unknown')
+
+    def test_load_without_cryptography(self, settings, mocker):
+        settings.JWT_TOKEN['KEYS_DIR'] = '/keys'
+        mocker.patch.object(keys, 'has_crypto', False)
+
+        with pytest.raises(ImproperlyConfigured):
+            self.keyring.load()
+
+    def test_load(self, key_files):
+        loaded = self.keyring.load()
+
+        assert sorted(loaded) == ['ed', 'retired', 'rsa']
+        assert loaded['rsa'].alg == 'RS256'
+        assert loaded['ed'].alg == 'EdDSA'
+        assert loaded['retired'].private_key is None
+        assert self.keyring.load() is loaded
+
+        self.keyring.reload()
+
+        assert self.keyring.load() is not loaded
+
+    def test_get_signing_key(self, settings, key_files):
+        settings.JWT_TOKEN['SIGNING_KEY_ID'] = 'retired'
+
+        with pytest.raises(ImproperlyConfigured):
+            self.keyring.get_signing_key()
+
+        settings.JWT_TOKEN['SIGNING_KEY_ID'] = 'ed'
+
+        assert self.keyring.get_signing_key().kid == 'ed'
+
+    def test_rotation(self, settings, key_files):
+        settings.JWT_TOKEN['SIGNING_KEY_ID'] = 'rsa'
+        rsa_token = TokenBackend.generate_token(type='access', user_id=1)
+        settings.JWT_TOKEN['SIGNING_KEY_ID'] = 'ed'
+        ed_token = TokenBackend.generate_token(type='access', user_id=2)
+
+        assert get_unverified_header(rsa_token) == {'alg': 'RS256', 'kid': 'rsa', 'typ': 'JWT'}
+        assert get_unverified_header(ed_token)['kid'] == 'ed'
+        assert TokenBackend.get_payload_by_token(token=rsa_token)['sub'] == 1
+        assert TokenBackend.get_payload_by_token(token=ed_token)['sub'] == 2
+
+        self.keyring.keys.pop('rsa')
+        TokenBackend.payload_cache.clear()
+
+        with pytest.raises(InvalidTokenError):
+            TokenBackend.get_payload_by_token(token=rsa_token)
+
+    def test_get_jwks(self, key_files):
+        jwks = {jwk['kid']: jwk for jwk in self.keyring.get_jwks()['keys']}
+
+        assert jwks['rsa']['kty'] == 'RSA'
+        assert jwks['rsa']['alg'] == 'RS256'
+        assert jwks['rsa']['n'] == jwks['retired']['n']
+        assert 'd' not in jwks['rsa']
+        assert jwks['ed'] == {
+            'kty': 'OKP',
+            'crv': 'Ed25519',
+            'x': jwks['ed']['x'],
+            'kid': 'ed',
+            'alg': 'EdDSA',
+            'use': 'sig',
+        }
@@ -0,0 +1,154 @@
+"""
+test_mails.py: File, containing unit tests for jauth.mails.
+"""
+
+
+import json
+import smtplib
+from time import time
+from collections import deque
+import pytest
+from django.core import mail
+from redis.exceptions import LockNotOwnedError
+from jauth.mails import MailQueue
+
+
+class TestMailQueue:
+    @pytest.fixture(scope='function', autouse=True)
+    def queue(self, settings, mocker):
+        settings.MAIL = {
+            'QUEUE_URL': 'redis://localhost',
+            'BATCH_SIZE': 10,
+            'BATCH_DELAY_SECONDS': 1.0,
+            'DOMAIN_RATES': {'default': 2, 'fast.com': 3},
+            'MAX_ATTEMPTS': 3,
+            'RETRY_BACKOFF_SECONDS': 10,
+            'LOCK_TIMEOUT_SECONDS': 60,
+        }
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        self.queue = MailQueue()
+        self.push = mocker.MagicMock()
+        mocker.patch.object(self.queue, 'push', self.push)
+        self.mails = [
+            {'id': str(i), 'to': f'email{i}@mail.com', 'subject': 's', 'body': 'b', 'attempts': 0}
+            for i in range(3)
+        ]
+        self.members = [json.dumps(mail).encode() for mail in self.mails]
+        self.queue._client = mocker.MagicMock()
+
+    def test_lease_due(self, mocker):
+        postpone = mocker.MagicMock()
+        mocker.patch.object(self.queue, 'postpone', postpone)
+        self.queue.client.zrangebyscore.return_value = []
+
+        assert self.queue.lease_due() == []
+        postpone.assert_not_called()
+
+        self.queue.client.zrangebyscore.return_value = self.members
+
+        assert self.queue.lease_due() == list(zip(self.members, self.mails))
+        assert postpone.call_args.args[0] == self.members
+        assert postpone.call_args.args[1] > time() + 59
+        self.queue.client.zrem.assert_not_called()
+
+    def test_postpone(self):
+        self.queue.postpone([], 1.0)
+
+        self.queue.client.zadd.assert_not_called()
+
+        self.queue.postpone(self.members[:1], 1.0)
+
+        self.queue.client.zadd.assert_called_once_with(
+            self.queue.key, {self.members[0]: 1.0}, xx=True
+        )
+
+    def test_is_throttled(self):
+        windows: dict[str, deque] = {}
+
+        assert [self.queue.is_throttled(mail, windows) for mail in self.mails] == [
+            False,
+            False,
+            True,
+        ]
+
+        fast = {'to': 'email@FAST.com'}
+
+        assert self.queue.is_throttled(fast, windows) is False
+        assert set(windows) == {'mail.com', 'fast.com'}
+
+    def test_is_transient(self):
+        assert self.queue.is_transient(smtplib.SMTPServerDisconnected()) is True
+        assert self.queue.is_transient(smtplib.SMTPResponseException(421, 'busy')) is True
+        assert self.queue.is_transient(smtplib.SMTPResponseException(550, 'no')) is False
+        assert (
+            self.queue.is_transient(smtplib.SMTPRecipientsRefused({'a@mail.com': (451, b'later')}))
+            is True
+        )
+        assert (
+            self.queue.is_transient(
+                smtplib.SMTPRecipientsRefused({'a@mail.com': (550, b'unknown')})
+            )
+            is False
+        )
+        assert self.queue.is_transient(ValueError()) is False
+
+    def test_retry(self):
+        self.queue.retry(self.mails[0], smtplib.SMTPServerDisconnected())
+
+        assert self.push.call_args.args[0] == [self.mails[0] | {'attempts': 1}]
+
+        self.push.reset_mock()
+        self.queue.retry(self.mails[1], smtplib.SMTPResponseException(550, 'no'))
+        self.queue.retry(self.mails[2] | {'attempts': 2}, smtplib.SMTPServerDisconnected())
+
+        self.push.assert_not_called()
+
+    def test_send(self, mocker):
+        mocker.patch.object(
+            self.queue,
+            'lease_due',
+            mocker.MagicMock(side_effect=[list(zip(self.members, self.mails)), []]),
+        )
+        postpone = mocker.MagicMock()
+        mocker.patch.object(self.queue, 'postpone', postpone)
+
+        assert self.queue.send() == 2
+        assert [message.to for message in mail.outbox] == [['email0@mail.com'], ['email1@mail.com']]
+        assert self.queue.client.zrem.call_args_list == [
+            mocker.call(self.queue.key, member) for member in self.members[:2]
+        ]
+        assert postpone.call_args.args[0] == [self.members[2]]
+        self.queue.client.lock.assert_called_once_with(self.queue.lock_key, timeout=60)
+        self.queue.client.lock.return_value.acquire.assert_called_once_with(blocking=False)
+        self.queue.client.lock.return_value.release.assert_called_once()
+
+    def test_send_expired_lock(self, mocker):
+        mocker.patch.object(self.queue, 'lease_due', mocker.MagicMock(return_value=[]))
+        self.queue.client.lock.return_value.release.side_effect = LockNotOwnedError
+
+        assert self.queue.send() == 0
+
+    def test_send_failure(self, mocker):
+        mocker.patch.object(
+            self.queue,
+            'lease_due',
+            mocker.MagicMock(side_effect=[[(self.members[0], self.mails[0])], []]),
+        )
+        mocker.patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=smtplib.SMTPServerDisconnected,
+        )
+        retry = mocker.MagicMock()
+        mocker.patch.object(self.queue, 'retry', retry)
+
+        assert self.queue.send() == 0
+        retry.assert_called_once()
+        self.queue.client.zrem.assert_called_once_with(self.queue.key, self.members[0])
+
+    def test_send_locked(self, mocker):
+        self.queue.client.lock.return_value.acquire.return_value = False
+        lease_due = mocker.MagicMock()
+        mocker.patch.object(self.queue, 'lease_due', lease_due)
+
+        assert self.queue.send() is None
+        lease_due.assert_not_called()
@@ -0,0 +1,61 @@
+"""
+test_purges.py: File, containing unit tests for jauth.purges.
+"""
+
+
+from collections import Counter
+import pytest
+from django.db.models import signals
+from django.core.cache import cache
+from jauth.models import User
+from jauth.purges import WasteAccountPurge
+from customer.models import CustomerOffer
+
+
+class TestWasteAccountPurge:
+    @pytest.fixture(scope='function', autouse=True)
+    def purge(self, settings):
+        settings.ACCOUNT_PURGE = {
+            'INACTIVE_YEARS': 1,
+            'BATCH_SIZE': 2,
+            'SLEEP_SECONDS': 0,
+            'MAX_SECONDS': 60,
+        }
+        cache.clear()
+        self.purge = WasteAccountPurge()
+
+    def test_is_bulk_safe(self):
+        def receiver(**kwargs):
+            pass
+
+        assert self.purge.is_bulk_safe(User) is True
+
+        signals.pre_delete.connect(receiver, sender=CustomerOffer)
+
+        try:
+            assert self.purge.is_bulk_safe(User) is False
+        finally:
+            signals.pre_delete.disconnect(receiver, sender=CustomerOffer)
+
+    def test_run(self, mocker):
+        candidates = mocker.MagicMock()
+        candidates.return_value.order_by.return_value.values_list.return_value.__getitem__ = (
+            mocker.MagicMock(side_effect=[[1, 2], [3], []])
+        )
+        mocker.patch.object(User.objects, 'filter', candidates)
+        delete_batch = mocker.MagicMock(return_value=Counter({User._meta.label: 1}))
+        mocker.patch.object(self.purge, 'delete_batch', delete_batch)
+
+        assert self.purge.run() == Counter({User._meta.label: 2})
+        assert delete_batch.call_count == 2
+        assert candidates.call_args_list[1].kwargs == {'pk__gt': 2}
+        assert cache.get(self.purge.cursor_key) is None
+        assert cache.get(self.purge.lock_key) is None
+
+    def test_run_locked(self, mocker):
+        cache.add(self.purge.lock_key, True)
+        delete_batch = mocker.MagicMock()
+        mocker.patch.object(self.purge, 'delete_batch', delete_batch)
+
+        assert self.purge.run() == Counter()
+        delete_batch.assert_not_called()
@@ -5,6 +5,7 @@ test_services.py: File, containing unit tests for jauth.services.
 
 import pytest
 from jauth.tasks import send_confirmation_mail
+from jauth.caches import user_cache
 from jauth.models import User
 from jauth.tokens import Token
 from jauth.services import UserService
@@ -50,23 +51,32 @@ class TestUserService:
 
         assert user == self.service.get_user_by_token('token')
 
-    def test_set_user_as_inactive(self, user):
+    def test_set_user_as_inactive(self, user, mocker):
+        invalidate = mocker.MagicMock()
+        mocker.patch.object(user_cache, 'invalidate', invalidate)
         user.is_active = True
         self.service.set_user_as_inactive(user)
 
         assert user.is_active is False
+        invalidate.assert_called_once_with(1)
 
-    def test_set_user_as_not_verified(self, user):
+    def test_set_user_as_not_verified(self, user, mocker):
+        invalidate = mocker.MagicMock()
+        mocker.patch.object(user_cache, 'invalidate', invalidate)
         user.is_verified = True
         self.service.set_user_as_not_verified(user)
 
         assert user.is_verified is False
+        invalidate.assert_called_once_with(1)
 
-    def test_set_user_as_verified(self, user):
+    def test_set_user_as_verified(self, user, mocker):
+        invalidate = mocker.MagicMock()
+        mocker.patch.object(user_cache, 'invalidate', invalidate)
         user.is_verified = False
         self.service.set_user_as_verified(user)
 
         assert user.is_verified is True
+        invalidate.assert_called_once_with(1)
 
     def test_get_user_by_email(self, user, mocker):
         mock = mocker.MagicMock(return_value=User.objects)
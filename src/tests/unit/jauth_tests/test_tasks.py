@@ -3,27 +3,69 @@ test_tasks.py: File, containing unit tests for jauth.tasks.
 """
 
 
-from jauth.tasks import send_confirmation_mail, clear_database_from_waste_accounts
-from jauth.models import User
+from time import time
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from jauth.mails import mail_queue
+from jauth.tasks import (
+    flush_last_logins,
+    send_queued_mails,
+    send_confirmation_mail,
+    clear_database_from_waste_accounts,
+)
+from jauth.purges import waste_account_purge
+from jauth.buffers import last_login_buffer
 
 
 class TestJauthTasks:
     def test_send_confirmation_mail(self, mocker):
-        mock = mocker.MagicMock()
-        mocker.patch('jauth.tasks.send_mail', mock)
+        cache.clear()
+        enqueue = mocker.MagicMock()
+        mocker.patch.object(mail_queue, 'enqueue', enqueue)
+        apply_async = mocker.MagicMock()
+        mocker.patch.object(send_queued_mails, 'apply_async', apply_async)
+        send_confirmation_mail('email', 'link')
         send_confirmation_mail('email', 'link')
 
-        mock.assert_called_once()
+        assert enqueue.call_count == 2
+        apply_async.assert_called_once()
 
-        mock = mocker.MagicMock(side_effect=Exception)
-        mocker.patch('jauth.tasks.send_mail', mock)
-        send_confirmation_mail('email', 'link')
+    def test_send_queued_mails(self, mocker):
+        cache.clear()
+        send = mocker.MagicMock(return_value=1)
+        mocker.patch.object(mail_queue, 'send', send)
+        get_next_due = mocker.MagicMock(return_value=None)
+        mocker.patch.object(mail_queue, 'get_next_due', get_next_due)
+        apply_async = mocker.MagicMock()
+        mocker.patch.object(send_queued_mails, 'apply_async', apply_async)
+        send_queued_mails()
 
-        mock.assert_called_once()
+        send.assert_called_once()
+        apply_async.assert_not_called()
+
+        get_next_due.return_value = time() + 30
+        send_queued_mails()
+
+        assert apply_async.call_args.kwargs['countdown'] > 0
+
+        cache.clear()
+        send.return_value = None
+        get_next_due.return_value = time()
+        send_queued_mails()
+
+        assert apply_async.call_args.kwargs['countdown'] >= settings.MAIL['BATCH_DELAY_SECONDS']
 
     def test_clear_database_from_waste_accounts(self, mocker):
-        mock = mocker.MagicMock()
-        mocker.patch.object(User.objects, 'filter', mock)
+        mock = mocker.MagicMock(return_value=Counter())
+        mocker.patch.object(waste_account_purge, 'run', mock)
         clear_database_from_waste_accounts()
 
         mock.assert_called_once()
+
+    def test_flush_last_logins(self, mocker):
+        mock = mocker.MagicMock(return_value=0)
+        mocker.patch.object(last_login_buffer, 'flush', mock)
+        flush_last_logins()
+
+        mock.assert_called_once()
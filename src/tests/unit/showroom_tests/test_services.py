@@ -4,9 +4,15 @@ test_services.py: File, containing unit tests for showroom.services.
 
 
 import pytest
-from core.tasks import find_suppliers
-from core.models import CarModel
-from showroom.models import ShowroomCar, ShowroomModel, ShowroomHistory, ShowroomCarDiscount
+from django.db import DatabaseError
+from django.core.exceptions import FieldError
+from rest_framework.exceptions import ParseError
+from core.tasks import find_suppliers, soft_delete_related
+from core.charts import car_chart_resolver
+from core.deletions import soft_deletion
+from core.discounts import showroom_discount_index
+from core.schedulers import discount_scheduler
+from showroom.models import ShowroomModel, ShowroomCarDiscount
 from showroom.services import ShowroomService
 
 
@@ -33,24 +39,38 @@ class TestShowroomService:
         }
 
     def test_find_appropriate_scars(self, mocker):
-        mock = mocker.MagicMock()
-        mocker.patch.object(CarModel, 'objects', mock)
+        resolve = mocker.MagicMock(return_value=[1])
+        mocker.patch.object(car_chart_resolver, 'resolve', resolve)
 
-        car = CarModel(id=1)
-        mock.filter.return_value.first.return_value = car
+        assert self.service.find_appropriate_cars(self.charts) == [1]
+        resolve.assert_called_once_with(self.charts['charts'])
 
-        assert next(self.service.find_appropriate_cars(self.charts)) == car
+        assert self.service.find_appropriate_cars({'charts': '[]'}) == [1]
+        resolve.assert_called_with([])
 
-        with pytest.raises(Exception):
-            mock.filter.return_value.first.side_effect = Exception
+        with pytest.raises(ParseError):
+            resolve.side_effect = FieldError
             self.service.find_appropriate_cars({"charts": [{"wrong": "value"}]})
 
+        with pytest.raises(ParseError):
+            self.service.find_appropriate_cars({"charts": "wrong"})
+
+        with pytest.raises(DatabaseError):
+            resolve.side_effect = DatabaseError
+            self.service.find_appropriate_cars(self.charts)
+
     def test_add_appropriate_cars(self, mocker):
         mock = mocker.MagicMock()
+        mock.values_list.return_value = [1, 2]
         mocker.patch.object(ShowroomModel, 'appropriate_cars', mock)
-        self.service.add_appropriate_cars(self.showroom, [CarModel(id=1)])
+        self.service.add_appropriate_cars(self.showroom, [2, 3])
+
+        mock.remove.assert_called_once_with(1)
+        mock.add.assert_called_once_with(3)
 
-        mock.clear.assert_called_once()
+        self.service.add_appropriate_cars(self.showroom, [1, 2])
+
+        mock.remove.assert_called_once()
         mock.add.assert_called_once()
 
     def test_find_appropriate_supplier(self, mocker):
@@ -60,38 +80,39 @@ class TestShowroomService:
 
         mock.assert_called_once()
 
-    def test_delete_showroom(self, mocker):
-        discount_mock = mocker.MagicMock()
-        mocker.patch.object(ShowroomCarDiscount, 'save', discount_mock)
-        mock = mocker.MagicMock()
-        car_discount = ShowroomCarDiscount(id=1, is_active=True)
-        mock.all.return_value = [car_discount]
-        mocker.patch.object(ShowroomModel, 'discounts', mock)
+    def test_register_discount(self, mocker):
+        invalidate = mocker.MagicMock()
+        mocker.patch.object(showroom_discount_index, 'invalidate', invalidate)
+        register = mocker.MagicMock(return_value=False)
+        mocker.patch.object(discount_scheduler, 'register', register)
+        discount = ShowroomCarDiscount(id=1)
 
-        car_mock = mocker.MagicMock()
-        mocker.patch.object(ShowroomCar, 'save', car_mock)
-        mock = mocker.MagicMock()
-        showroom_car = ShowroomCar(id=1, is_active=True)
-        mock.all.return_value = [showroom_car]
-        mocker.patch.object(ShowroomModel, 'cars', mock)
+        self.service.register_discount(discount)
 
-        history_mock = mocker.MagicMock()
-        mocker.patch.object(ShowroomHistory, 'save', history_mock)
-        mock = mocker.MagicMock()
-        showroom_history = ShowroomHistory(id=1, is_active=True)
-        mock.all.return_value = [showroom_history]
-        mocker.patch.object(ShowroomModel, 'history', mock)
+        register.assert_called_once_with(discount)
+        invalidate.assert_not_called()
+
+        register.return_value = True
+        self.service.register_discount(discount)
+
+        invalidate.assert_called_once()
+
+    def test_delete_showroom(self, mocker):
+        delete = mocker.patch.object(soft_deletion, 'delete', return_value=None)
+        delay = mocker.patch.object(soft_delete_related, 'delay')
+        invalidate = mocker.patch.object(showroom_discount_index, 'invalidate')
+        on_commit = mocker.patch('showroom.services.transaction.on_commit')
+        on_commit.side_effect = lambda func: func()
 
-        self.showroom.is_active = True
-        self.service.delete_showroom(self.showroom)
+        assert self.service.delete_showroom(self.showroom) is None
 
-        discount_mock.assert_called_once()
-        assert car_discount.is_active is False
+        delete.assert_called_once_with(self.showroom, ['discounts', 'cars'], deferred=['history'])
+        delay.assert_not_called()
+        invalidate.assert_called_once()
 
-        car_mock.assert_called_once()
-        assert showroom_car.is_active is False
+        delete.return_value = 'job'
 
-        history_mock.assert_called_once()
-        assert showroom_history.is_active is False
+        assert self.service.delete_showroom(self.showroom) == 'job'
 
-        assert self.showroom.is_active is False
+        delay.assert_called_once_with('job')
+        assert on_commit.call_count == 3
@@ -4,7 +4,11 @@ test_services.py: File, containing unit tests for supplier.services.
 
 
 import pytest
-from supplier.models import SupplierCar, SupplierModel, SupplierHistory, SupplierCarDiscount
+from core.tasks import soft_delete_related
+from core.deletions import soft_deletion
+from core.discounts import supplier_discount_index
+from core.schedulers import discount_scheduler
+from supplier.models import SupplierModel, SupplierCarDiscount
 from supplier.services import SupplierService
 
 
@@ -17,38 +21,39 @@ class TestSupplierService:
     def supplier(self):
         self.supplier = SupplierModel(id=1, name='supplier')
 
+    def test_register_discount(self, mocker):
+        invalidate = mocker.MagicMock()
+        mocker.patch.object(supplier_discount_index, 'invalidate', invalidate)
+        register = mocker.MagicMock(return_value=False)
+        mocker.patch.object(discount_scheduler, 'register', register)
+        discount = SupplierCarDiscount(id=1)
+
+        self.service.register_discount(discount)
+
+        register.assert_called_once_with(discount)
+        invalidate.assert_not_called()
+
+        register.return_value = True
+        self.service.register_discount(discount)
+
+        invalidate.assert_called_once()
+
     def test_delete_supplier(self, mocker):
-        discount_mock = mocker.MagicMock()
-        mocker.patch.object(SupplierCarDiscount, 'save', discount_mock)
-        mock = mocker.MagicMock()
-        supplier_discount = SupplierCarDiscount(id=1, is_active=True)
-        mock.all.return_value = [supplier_discount]
-        mocker.patch.object(SupplierModel, 'discounts', mock)
-
-        car_mock = mocker.MagicMock()
-        mocker.patch.object(SupplierCar, 'save', car_mock)
-        mock = mocker.MagicMock()
-        supplier_car = SupplierCar(id=1, is_active=True)
-        mock.all.return_value = [supplier_car]
-        mocker.patch.object(SupplierModel, 'cars', mock)
-
-        history_mock = mocker.MagicMock()
-        mocker.patch.object(SupplierHistory, 'save', history_mock)
-        mock = mocker.MagicMock()
-        supplier_history = SupplierHistory(id=1, is_active=True)
-        mock.all.return_value = [supplier_history]
-        mocker.patch.object(SupplierModel, 'history', mock)
-
-        self.supplier.is_active = True
-        self.service.delete_supplier(self.supplier)
-
-        discount_mock.assert_called_once()
-        assert supplier_discount.is_active is False
-
-        car_mock.assert_called_once()
-        assert supplier_car.is_active is False
-
-        history_mock.assert_called_once()
-        assert supplier_history.is_active is False
-
-        assert self.supplier.is_active is False
+        delete = mocker.patch.object(soft_deletion, 'delete', return_value=None)
+        delay = mocker.patch.object(soft_delete_related, 'delay')
+        invalidate = mocker.patch.object(supplier_discount_index, 'invalidate')
+        on_commit = mocker.patch('supplier.services.transaction.on_commit')
+        on_commit.side_effect = lambda func: func()
+
+        assert self.service.delete_supplier(self.supplier) is None
+
+        delete.assert_called_once_with(self.supplier, ['discounts', 'cars'], deferred=['history'])
+        delay.assert_not_called()
+        invalidate.assert_called_once()
+
+        delete.return_value = 'job'
+
+        assert self.service.delete_supplier(self.supplier) == 'job'
+
+        delay.assert_called_once_with('job')
+        assert on_commit.call_count == 3